@@ -0,0 +1,65 @@
+"""owner scoped indexes
+
+Revision ID: 27fae5dfc2f6
+Revises: be29b35071ff
+Create Date: 2026-10-17 09:01:00.000000
+
+Composite indexes for the owner-scoped listings and a partial index for the
+due-reminder scan. On PostgreSQL they are built with CREATE INDEX
+CONCURRENTLY outside the migration transaction, so writes keep flowing
+while a large table is indexed.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '27fae5dfc2f6'
+down_revision: Union[str, None] = 'be29b35071ff'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Reminder statuses are stored by enum name
+PENDING = sa.text("status = 'PENDING'")
+
+INDEXES = [
+    ('ix_events_owner_id_start_time', 'events', ['owner_id', 'start_time'], {}),
+    ('ix_events_owner_id_end_time', 'events', ['owner_id', 'end_time'], {}),
+    ('ix_reminders_owner_id_event_id', 'reminders', ['owner_id', 'event_id'], {}),
+    ('ix_reminders_owner_id_reminder_time', 'reminders', ['owner_id', 'reminder_time'], {}),
+    (
+        'ix_reminders_pending_reminder_time',
+        'reminders',
+        ['reminder_time'],
+        {'postgresql_where': PENDING, 'sqlite_where': PENDING},
+    ),
+]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    with op.get_context().autocommit_block():
+        for name, table, columns, kwargs in INDEXES:
+            op.create_index(
+                name,
+                table,
+                columns,
+                unique=False,
+                postgresql_concurrently=True,
+                if_not_exists=True,
+                **kwargs,
+            )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        for name, table, _, _ in reversed(INDEXES):
+            op.drop_index(
+                name,
+                table_name=table,
+                postgresql_concurrently=True,
+                if_exists=True,
+            )
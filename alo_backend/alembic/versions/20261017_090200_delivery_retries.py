@@ -0,0 +1,71 @@
+"""delivery retries
+
+Revision ID: 5c81d2e0a7b4
+Revises: 27fae5dfc2f6
+Create Date: 2026-10-17 09:02:00.000000
+
+Retry bookkeeping on reminders, the DEAD_LETTER status and the
+delivery_attempts table that records every delivery attempt.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5c81d2e0a7b4'
+down_revision: Union[str, None] = '27fae5dfc2f6'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+FAILED = sa.text("status = 'FAILED'")
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    if op.get_bind().dialect.name == 'postgresql':
+        # New enum values cannot be used inside the transaction that adds them
+        with op.get_context().autocommit_block():
+            op.execute("ALTER TYPE reminderstatus ADD VALUE IF NOT EXISTS 'DEAD_LETTER'")
+
+    with op.batch_alter_table('reminders') as batch_op:
+        batch_op.add_column(sa.Column('attempts', sa.Integer(), server_default='0', nullable=False))
+        batch_op.add_column(sa.Column('next_attempt_at', sa.DateTime(), nullable=True))
+    op.create_index(
+        'ix_reminders_failed_next_attempt_at',
+        'reminders',
+        ['next_attempt_at'],
+        unique=False,
+        postgresql_where=FAILED,
+        sqlite_where=FAILED,
+    )
+
+    op.create_table(
+        'delivery_attempts',
+        sa.Column('reminder_id', sa.Integer(), nullable=False),
+        sa.Column('attempt', sa.Integer(), nullable=False),
+        sa.Column('channel', sa.String(length=20), nullable=False),
+        sa.Column('outcome', sa.String(length=20), nullable=False),
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(['reminder_id'], ['reminders.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index(op.f('ix_delivery_attempts_id'), 'delivery_attempts', ['id'], unique=False)
+    op.create_index(op.f('ix_delivery_attempts_reminder_id'), 'delivery_attempts', ['reminder_id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_delivery_attempts_reminder_id'), table_name='delivery_attempts')
+    op.drop_index(op.f('ix_delivery_attempts_id'), table_name='delivery_attempts')
+    op.drop_table('delivery_attempts')
+
+    # PostgreSQL cannot drop an enum value; dead-lettered reminders go back to FAILED
+    op.execute("UPDATE reminders SET status = 'FAILED' WHERE status = 'DEAD_LETTER'")
+    op.drop_index('ix_reminders_failed_next_attempt_at', table_name='reminders')
+    with op.batch_alter_table('reminders') as batch_op:
+        batch_op.drop_column('next_attempt_at')
+        batch_op.drop_column('attempts')
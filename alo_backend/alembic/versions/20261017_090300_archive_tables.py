@@ -0,0 +1,98 @@
+"""archive tables
+
+Revision ID: 9e4f6a13c2d8
+Revises: 5c81d2e0a7b4
+Create Date: 2026-10-17 09:03:00.000000
+
+Cold tables the archival job (app.core.archive) moves old events and
+finished reminders into. Same columns as the hot tables plus archived_at,
+without foreign keys. Also indexes reminders.event_id, which the job and
+the event listing's reminder batch-load look reminders up by.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9e4f6a13c2d8'
+down_revision: Union[str, None] = '5c81d2e0a7b4'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'events_archive',
+        sa.Column('id', sa.Integer(), autoincrement=False, nullable=False),
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(), nullable=False),
+        sa.Column('title', sa.String(length=100), nullable=False),
+        sa.Column('description', sa.Text(), nullable=True),
+        sa.Column('start_time', sa.DateTime(), nullable=False),
+        sa.Column('end_time', sa.DateTime(), nullable=False),
+        sa.Column('location', sa.String(length=255), nullable=True),
+        sa.Column('is_all_day', sa.Boolean(), nullable=True),
+        sa.Column('status', sa.String(length=20), nullable=True),
+        sa.Column('owner_id', sa.Integer(), nullable=False),
+        sa.Column('archived_at', sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index('ix_events_archive_owner_id_start_time', 'events_archive', ['owner_id', 'start_time'], unique=False)
+
+    op.create_table(
+        'reminders_archive',
+        sa.Column('id', sa.Integer(), autoincrement=False, nullable=False),
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(), nullable=False),
+        sa.Column('message', sa.String(length=500), nullable=False),
+        sa.Column('reminder_time', sa.DateTime(), nullable=False),
+        sa.Column(
+            'reminder_type',
+            postgresql.ENUM('EMAIL', 'PUSH', 'SMS', 'IN_APP', name='remindertype', create_type=False),
+            nullable=False,
+        ),
+        sa.Column(
+            'status',
+            postgresql.ENUM('PENDING', 'SENT', 'FAILED', 'DEAD_LETTER', name='reminderstatus', create_type=False),
+            nullable=True,
+        ),
+        sa.Column('sent_at', sa.DateTime(), nullable=True),
+        sa.Column('attempts', sa.Integer(), nullable=False),
+        sa.Column('next_attempt_at', sa.DateTime(), nullable=True),
+        sa.Column('event_id', sa.Integer(), nullable=True),
+        sa.Column('owner_id', sa.Integer(), nullable=False),
+        sa.Column('archived_at', sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index('ix_reminders_archive_owner_id_reminder_time', 'reminders_archive', ['owner_id', 'reminder_time'], unique=False)
+    op.create_index('ix_reminders_archive_event_id', 'reminders_archive', ['event_id'], unique=False)
+
+    with op.get_context().autocommit_block():
+        op.create_index(
+            op.f('ix_reminders_event_id'),
+            'reminders',
+            ['event_id'],
+            unique=False,
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            op.f('ix_reminders_event_id'),
+            table_name='reminders',
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
+    op.drop_index('ix_reminders_archive_event_id', table_name='reminders_archive')
+    op.drop_index('ix_reminders_archive_owner_id_reminder_time', table_name='reminders_archive')
+    op.drop_table('reminders_archive')
+    op.drop_index('ix_events_archive_owner_id_start_time', table_name='events_archive')
+    op.drop_table('events_archive')
@@ -0,0 +1,75 @@
+"""recurring events
+
+Revision ID: 3b7d92c5e1f0
+Revises: 9e4f6a13c2d8
+Create Date: 2026-10-17 09:04:00.000000
+
+Recurrence rule and series end on events (and their archive), a partial
+index over recurring series, and the event_exceptions table holding
+cancelled or edited occurrences.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3b7d92c5e1f0'
+down_revision: Union[str, None] = '9e4f6a13c2d8'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+RECURRING = sa.text("recurrence_rule IS NOT NULL")
+
+
+def _rule_type() -> sa.types.TypeEngine:
+    return sa.JSON(none_as_null=True).with_variant(postgresql.JSONB(none_as_null=True), 'postgresql')
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    for table in ('events', 'events_archive'):
+        with op.batch_alter_table(table) as batch_op:
+            batch_op.add_column(sa.Column('recurrence_rule', _rule_type(), nullable=True))
+            batch_op.add_column(sa.Column('recurrence_end', sa.DateTime(), nullable=True))
+    op.create_index(
+        'ix_events_recurring_owner_id_start_time',
+        'events',
+        ['owner_id', 'start_time'],
+        unique=False,
+        postgresql_where=RECURRING,
+        sqlite_where=RECURRING,
+    )
+
+    op.create_table(
+        'event_exceptions',
+        sa.Column('event_id', sa.Integer(), nullable=False),
+        sa.Column('original_start', sa.DateTime(), nullable=False),
+        sa.Column('is_cancelled', sa.Boolean(), nullable=False),
+        sa.Column('title', sa.String(length=100), nullable=True),
+        sa.Column('description', sa.Text(), nullable=True),
+        sa.Column('start_time', sa.DateTime(), nullable=True),
+        sa.Column('end_time', sa.DateTime(), nullable=True),
+        sa.Column('location', sa.String(length=255), nullable=True),
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(['event_id'], ['events.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('event_id', 'original_start', name='uq_event_exceptions_event_id_original_start'),
+    )
+    op.create_index(op.f('ix_event_exceptions_id'), 'event_exceptions', ['id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_event_exceptions_id'), table_name='event_exceptions')
+    op.drop_table('event_exceptions')
+
+    op.drop_index('ix_events_recurring_owner_id_start_time', table_name='events')
+    for table in ('events_archive', 'events'):
+        with op.batch_alter_table(table) as batch_op:
+            batch_op.drop_column('recurrence_end')
+            batch_op.drop_column('recurrence_rule')
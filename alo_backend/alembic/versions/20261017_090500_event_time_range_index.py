@@ -0,0 +1,53 @@
+"""event time range index
+
+Revision ID: 7c2e5a9d4b18
+Revises: 3b7d92c5e1f0
+Create Date: 2026-10-17 09:05:00.000000
+
+GiST index over each owner's single events' time ranges, used by conflict
+detection (app.core.conflicts). PostgreSQL only: other databases use the
+in-memory interval trees instead. Combining owner_id with a range in one
+GiST index needs the btree_gist extension.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7c2e5a9d4b18'
+down_revision: Union[str, None] = '3b7d92c5e1f0'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+    with op.get_context().autocommit_block():
+        op.execute("CREATE EXTENSION IF NOT EXISTS btree_gist")
+        op.create_index(
+            'ix_events_owner_id_time_range',
+            'events',
+            ['owner_id', sa.text("tsrange(start_time, end_time, '[)')")],
+            unique=False,
+            postgresql_using='gist',
+            postgresql_where=sa.text("recurrence_rule IS NULL"),
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            'ix_events_owner_id_time_range',
+            table_name='events',
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
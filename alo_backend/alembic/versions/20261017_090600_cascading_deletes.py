@@ -0,0 +1,96 @@
+"""cascading deletes
+
+Revision ID: 4e1a8f3b6c52
+Revises: 7c2e5a9d4b18
+Create Date: 2026-10-17 09:06:00.000000
+
+ON DELETE CASCADE on the foreign keys from events and reminders to their
+owner and from reminders to their event, so deletes no longer load and
+delete every owned row through the ORM. Also users.deleted_at, which
+queues an account for the purge job (app.core.purge), with a partial index
+over the queue.
+
+On PostgreSQL the new constraints are added NOT VALID, which only locks
+the tables briefly, and validated after the commit, which scans them
+without blocking writes. SQLite's unnamed constraints are replaced by
+recreating the tables.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '4e1a8f3b6c52'
+down_revision: Union[str, None] = '7c2e5a9d4b18'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# (table, column, referred table), named as PostgreSQL names unnamed constraints
+FOREIGN_KEYS = [
+    ('events', 'owner_id', 'users'),
+    ('reminders', 'event_id', 'events'),
+    ('reminders', 'owner_id', 'users'),
+]
+
+# Lets batch mode on SQLite find the unnamed constraints by name
+NAMING_CONVENTION = {'fk': '%(table_name)s_%(column_0_name)s_fkey'}
+
+QUEUED = sa.text("deleted_at IS NOT NULL")
+
+
+def _replace_foreign_keys(ondelete: Union[str, None]) -> None:
+    if op.get_bind().dialect.name == 'postgresql':
+        action = f" ON DELETE {ondelete}" if ondelete else ""
+        for table, column, referred in FOREIGN_KEYS:
+            name = f'{table}_{column}_fkey'
+            op.execute(f"ALTER TABLE {table} DROP CONSTRAINT IF EXISTS {name}")
+            op.execute(
+                f"ALTER TABLE {table} ADD CONSTRAINT {name} "
+                f"FOREIGN KEY ({column}) REFERENCES {referred} (id){action} NOT VALID"
+            )
+        with op.get_context().autocommit_block():
+            for table, column, _ in FOREIGN_KEYS:
+                op.execute(f"ALTER TABLE {table} VALIDATE CONSTRAINT {table}_{column}_fkey")
+        return
+
+    for table in ('events', 'reminders'):
+        with op.batch_alter_table(table, naming_convention=NAMING_CONVENTION) as batch_op:
+            for fk_table, column, referred in FOREIGN_KEYS:
+                if fk_table != table:
+                    continue
+                name = f'{table}_{column}_fkey'
+                batch_op.drop_constraint(name, type_='foreignkey')
+                batch_op.create_foreign_key(name, referred, [column], ['id'], ondelete=ondelete)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('users', sa.Column('deleted_at', sa.DateTime(), nullable=True))
+    _replace_foreign_keys('CASCADE')
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_users_deleted_at',
+            'users',
+            ['deleted_at'],
+            unique=False,
+            postgresql_where=QUEUED,
+            sqlite_where=QUEUED,
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            'ix_users_deleted_at',
+            table_name='users',
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
+    _replace_foreign_keys(None)
+    with op.batch_alter_table('users') as batch_op:
+        batch_op.drop_column('deleted_at')
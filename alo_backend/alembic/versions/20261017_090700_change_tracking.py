@@ -0,0 +1,84 @@
+"""change tracking
+
+Revision ID: 8d3c1e7a5f24
+Revises: 4e1a8f3b6c52
+Create Date: 2026-10-17 09:07:00.000000
+
+Per-user change sequences for delta sync (app.core.sync): change_seq on
+users, events and reminders (and their archives), the tombstones table
+for deleted rows, and (owner_id, change_seq, id) indexes to read an
+owner's changes in order. Existing rows get sequence 0, which PostgreSQL
+adds without rewriting the tables; the indexes are built concurrently.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8d3c1e7a5f24'
+down_revision: Union[str, None] = '4e1a8f3b6c52'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+TABLES = ['users', 'events', 'events_archive', 'reminders', 'reminders_archive']
+
+INDEXES = [
+    ('ix_events_owner_id_change_seq', 'events'),
+    ('ix_reminders_owner_id_change_seq', 'reminders'),
+]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    for table in TABLES:
+        op.add_column(table, sa.Column('change_seq', sa.BigInteger(), server_default='0', nullable=False))
+
+    op.create_table(
+        'tombstones',
+        sa.Column('owner_id', sa.Integer(), nullable=False),
+        sa.Column('kind', sa.String(length=20), nullable=False),
+        sa.Column('row_id', sa.Integer(), nullable=False),
+        sa.Column('change_seq', sa.BigInteger(), nullable=False),
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(['owner_id'], ['users.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index(op.f('ix_tombstones_id'), 'tombstones', ['id'], unique=False)
+    op.create_index(
+        'ix_tombstones_owner_id_change_seq', 'tombstones', ['owner_id', 'change_seq', 'id'], unique=False
+    )
+
+    with op.get_context().autocommit_block():
+        for name, table in INDEXES:
+            op.create_index(
+                name,
+                table,
+                ['owner_id', 'change_seq', 'id'],
+                unique=False,
+                postgresql_concurrently=True,
+                if_not_exists=True,
+            )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        for name, table in reversed(INDEXES):
+            op.drop_index(
+                name,
+                table_name=table,
+                postgresql_concurrently=True,
+                if_exists=True,
+            )
+
+    op.drop_index('ix_tombstones_owner_id_change_seq', table_name='tombstones')
+    op.drop_index(op.f('ix_tombstones_id'), table_name='tombstones')
+    op.drop_table('tombstones')
+
+    for table in reversed(TABLES):
+        with op.batch_alter_table(table) as batch_op:
+            batch_op.drop_column('change_seq')
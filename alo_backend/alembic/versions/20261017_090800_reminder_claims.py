@@ -0,0 +1,37 @@
+"""reminder claims
+
+Revision ID: 2b9f6d4e8a31
+Revises: 8d3c1e7a5f24
+Create Date: 2026-10-17 09:08:00.000000
+
+claimed_until on reminders (and their archive): the reminder dispatcher
+marks a batch in flight with it and commits before delivering, instead
+of holding row locks during delivery. A nullable column without a
+default, which PostgreSQL adds without rewriting the tables.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '2b9f6d4e8a31'
+down_revision: Union[str, None] = '8d3c1e7a5f24'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+TABLES = ['reminders', 'reminders_archive']
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    for table in TABLES:
+        op.add_column(table, sa.Column('claimed_until', sa.DateTime(), nullable=True))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for table in reversed(TABLES):
+        with op.batch_alter_table(table) as batch_op:
+            batch_op.drop_column('claimed_until')
@@ -0,0 +1,52 @@
+"""groups
+
+Revision ID: 6f4b2d8e1c93
+Revises: 2b9f6d4e8a31
+Create Date: 2026-10-17 09:09:00.000000
+
+groups and group_members: group availability is limited to users who
+share a group with the caller. Memberships go with the group or the user
+(ON DELETE CASCADE), and a (user_id, group_id) index finds a user's groups.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '6f4b2d8e1c93'
+down_revision: Union[str, None] = '2b9f6d4e8a31'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'groups',
+        sa.Column('name', sa.String(length=100), nullable=False),
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index(op.f('ix_groups_id'), 'groups', ['id'], unique=False)
+
+    op.create_table(
+        'group_members',
+        sa.Column('group_id', sa.Integer(), nullable=False),
+        sa.Column('user_id', sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(['group_id'], ['groups.id'], ondelete='CASCADE'),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('group_id', 'user_id'),
+    )
+    op.create_index('ix_group_members_user_id_group_id', 'group_members', ['user_id', 'group_id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_group_members_user_id_group_id', table_name='group_members')
+    op.drop_table('group_members')
+    op.drop_index(op.f('ix_groups_id'), table_name='groups')
+    op.drop_table('groups')
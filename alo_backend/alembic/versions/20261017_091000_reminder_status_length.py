@@ -0,0 +1,48 @@
+"""reminder status length
+
+Revision ID: 9a7e3c5b1d46
+Revises: 6f4b2d8e1c93
+Create Date: 2026-10-17 09:10:00.000000
+
+Widens reminders.status for DEAD_LETTER. Without native enums the column
+is a VARCHAR sized to the longest name in the initial schema, 7 for
+PENDING, while the model's Enum now sizes it 11. SQLite does not enforce
+the length, but the migrated schema should match a created one. The
+table is recreated in batch mode. PostgreSQL's reminderstatus type
+already got the value in the delivery retries revision.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9a7e3c5b1d46'
+down_revision: Union[str, None] = '6f4b2d8e1c93'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+STATUSES = ('PENDING', 'SENT', 'FAILED')
+
+
+def _alter_status(existing: Sequence[str], new: Sequence[str]) -> None:
+    if op.get_bind().dialect.name == 'postgresql':
+        return
+    with op.batch_alter_table('reminders') as batch_op:
+        batch_op.alter_column(
+            'status',
+            existing_type=sa.Enum(*existing, name='reminderstatus'),
+            type_=sa.Enum(*new, name='reminderstatus'),
+            existing_nullable=True,
+        )
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    _alter_status(STATUSES, STATUSES + ('DEAD_LETTER',))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    _alter_status(STATUSES + ('DEAD_LETTER',), STATUSES)
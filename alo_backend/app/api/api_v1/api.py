@@ -1,6 +1,6 @@
 from fastapi import APIRouter
 
-from app.api.api_v1.endpoints import auth, users, events, reminders
+from app.api.api_v1.endpoints import auth, users, events, reminders, availability, groups, sync, push, health
 
 api_router = APIRouter()
 
@@ -9,3 +9,8 @@ api_router.include_router(auth.router, prefix="/auth", tags=["Authentication"])
 api_router.include_router(users.router, prefix="/users", tags=["Users"])
 api_router.include_router(events.router, prefix="/events", tags=["Events"])
 api_router.include_router(reminders.router, prefix="/reminders", tags=["Reminders"])
+api_router.include_router(availability.router, prefix="/availability", tags=["Availability"])
+api_router.include_router(groups.router, prefix="/groups", tags=["Groups"])
+api_router.include_router(sync.router, prefix="/sync", tags=["Sync"])
+api_router.include_router(push.router, prefix="/push", tags=["Push"])
+api_router.include_router(health.router, prefix="/health", tags=["Health"])
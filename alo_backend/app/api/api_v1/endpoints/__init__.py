@@ -3,10 +3,12 @@ from .auth import router as auth_router
 from .users import router as users_router
 from .events import router as events_router
 from .reminders import router as reminders_router
+from .health import router as health_router
 
 __all__ = [
     "auth_router",
     "users_router",
     "events_router",
     "reminders_router",
+    "health_router",
 ]
@@ -3,50 +3,57 @@ from typing import Any, Dict
 
 from fastapi import APIRouter, Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordRequestForm
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from app import models, schemas
 from app.api import deps
 from app.core import security
 from app.core.config import get_settings
+from app.core.repository import user_repository
 
 router = APIRouter()
 settings = get_settings()
 
 @router.post("/register", response_model=schemas.UserResponse)
-def register(
-    user_in: schemas.UserCreate, db: Session = Depends(deps.get_db)
+async def register(
+    user_in: schemas.UserCreate, db: AsyncSession = Depends(deps.get_db)
 ) -> Any:
     """Register a new user."""
-    # Check if user with this email already exists
-    db_user = db.query(models.User).filter(models.User.email == user_in.email).first()
-    if db_user:
+    # Create new user (bcrypt runs on the bounded password hashing pool);
+    # the unique index on email catches addresses that are already taken
+    hashed_password = await security.password_hasher.hash(user_in.password)
+    try:
+        user = await user_repository.insert(db, {
+            "email": user_in.email,
+            "hashed_password": hashed_password,
+            "full_name": user_in.full_name,
+            "is_active": True,
+        })
+    except IntegrityError:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Email already registered",
         )
-    
-    # Create new user
-    user = models.User(
-        email=user_in.email,
-        hashed_password=security.get_password_hash(user_in.password),
-        full_name=user_in.full_name,
-        is_active=True,
-    )
-    db.add(user)
-    db.commit()
-    db.refresh(user)
+    await db.commit()
     
     return user
 
 @router.post("/login", response_model=schemas.Token)
-def login(
-    db: Session = Depends(deps.get_db), form_data: OAuth2PasswordRequestForm = Depends()
+async def login(
+    db: AsyncSession = Depends(deps.get_db), form_data: OAuth2PasswordRequestForm = Depends()
 ) -> Dict[str, str]:
     """Get access token for future requests."""
     # Authenticate user
-    user = db.query(models.User).filter(models.User.email == form_data.username).first()
-    if not user or not security.verify_password(form_data.password, user.hashed_password):
+    result = await db.execute(select(models.User).filter(models.User.email == form_data.username))
+    user = result.scalars().first()
+    valid, new_hash = False, None
+    if user:
+        valid, new_hash = await security.password_hasher.verify_and_update(
+            form_data.password, user.hashed_password
+        )
+    if not valid:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect email or password",
@@ -59,6 +66,11 @@ def login(
             detail="Inactive user",
         )
     
+    # Transparently upgrade hashes created with a different bcrypt cost
+    if new_hash is not None:
+        user.hashed_password = new_hash
+        await db.commit()
+    
     # Create access token
     access_token_expires = timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
     access_token = security.create_access_token(
@@ -68,7 +80,7 @@ def login(
     return {"access_token": access_token, "token_type": "bearer"}
 
 @router.get("/me", response_model=schemas.UserResponse)
-def read_users_me(
+async def read_users_me(
     current_user: models.User = Depends(deps.get_current_active_user),
 ) -> Any:
     """Get current user."""
@@ -0,0 +1,83 @@
+from datetime import datetime, timedelta
+from typing import Any, List
+
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlalchemy import or_, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app import models, schemas
+from app.api import deps
+from app.core.availability import group_free_windows
+from app.core.config import get_settings
+from app.core.freebusy import MAX_WINDOW
+from app.core.serialization import FastJSONResponse
+from app.core.utils import to_naive_utc
+
+router = APIRouter()
+settings = get_settings()
+
+@router.get("/group", response_model=schemas.GroupAvailability, response_class=FastJSONResponse)
+async def read_group_availability(
+    start_time: datetime,
+    end_time: datetime,
+    user_ids: List[int] = Query(...),
+    min_duration_minutes: int = 0,
+    db: AsyncSession = Depends(deps.get_db),
+    current_user: models.User = Depends(deps.get_current_active_user),
+) -> Any:
+    """Get the windows in which the current user and the given users are all free.
+
+    The given users must share a group with the current user, unless that
+    is a superuser. Only the common free windows are returned, never the
+    members' events or busy times. Windows are limited to 366 days.
+    """
+    start_time, end_time = to_naive_utc(start_time), to_naive_utc(end_time)
+    if end_time <= start_time:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="End time must be after start time",
+        )
+    if end_time - start_time > MAX_WINDOW:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Window must not exceed {MAX_WINDOW.days} days",
+        )
+    
+    # The requesting user is always part of the group
+    member_ids = sorted({current_user.id, *user_ids})
+    if len(member_ids) > settings.GROUP_AVAILABILITY_MAX_MEMBERS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Groups are limited to {settings.GROUP_AVAILABILITY_MAX_MEMBERS} members",
+        )
+    
+    query = (
+        select(models.User.id)
+        .filter(models.User.id.in_(member_ids))
+        .filter(models.User.is_active == True)
+    )
+    if not current_user.is_superuser:
+        members = models.group_members
+        shared = select(members.c.user_id).where(
+            members.c.group_id.in_(select(members.c.group_id).where(members.c.user_id == current_user.id))
+        )
+        query = query.filter(or_(models.User.id == current_user.id, models.User.id.in_(shared)))
+    result = await db.execute(query)
+    # Users outside the caller's groups are reported like unknown ones, so
+    # the response does not tell which ids exist
+    missing = set(member_ids) - set(result.scalars().all())
+    if missing:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Users not found: {', '.join(str(user_id) for user_id in sorted(missing))}",
+        )
+    
+    free = await group_free_windows(
+        db, member_ids, start_time, end_time, timedelta(minutes=max(0, min_duration_minutes))
+    )
+    return FastJSONResponse({
+        "start": start_time,
+        "end": end_time,
+        "user_ids": member_ids,
+        "free": [{"start": start, "end": end} for start, end in free],
+    })
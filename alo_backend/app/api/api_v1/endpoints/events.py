@@ -1,171 +1,582 @@
-from datetime import datetime
-from typing import Any, List, Optional
+from datetime import datetime, time, timedelta
+from typing import Any, Dict, List, Optional, Tuple, Union
 
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, Request, status
+from sqlalchemy import delete, or_, select
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from app import models, schemas
 from app.api import deps
+from app.core.archive import with_archive
+from app.core.batch import BatchResults, insert_returning_ids
+from app.core.conflicts import conflict_index, event_change, find_conflicts
+from app.core.etag import calendar_etag, if_none_match, not_modified
+from app.core.freebusy import MAX_WINDOW, freebusy_cache
+from app.core.pagination import KeysetPage
+from app.core.push import push_hub
+from app.core.recurrence import expand_series, normalize_rule, occurrence_cache, occurrences, recurrence_columns
+from app.core.repository import event_repository
+from app.core.serialization import FastJSONResponse, event_row_to_dict, group_by
+from app.core.slots import MAX_SUGGESTIONS, suggest_slots
+from app.core.sync import advance, record_deletes
+from app.core.utils import format_link_header, get_cursor_links, to_naive_utc, to_utc_clock
 
 router = APIRouter()
 
-@router.get("/", response_model=List[schemas.EventResponse])
-def read_events(
-    db: Session = Depends(deps.get_db),
+async def _reject_conflicts(
+    db: AsyncSession,
+    owner_id: int,
+    start_time: datetime,
+    end_time: datetime,
+    exclude_id: Optional[int] = None,
+) -> None:
+    """Raise 409 if the time range overlaps one of the owner's events."""
+    conflicts = await find_conflicts(db, owner_id, start_time, end_time, exclude_id)
+    if conflicts:
+        ids = ", ".join(str(event_id) for event_id in dict.fromkeys(row["id"] for row in conflicts))
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=f"Event conflicts with existing events: {ids}",
+        )
+
+async def _update_event(
+    db: AsyncSession,
+    event_id: int,
+    user: models.User,
+    update_data: Dict[str, Any],
+) -> Dict[str, Any]:
+    """Write a partial update of an event the user may update and return the row.
+
+    The rule is normalized, ``updated_at`` set and the series end recomputed
+    from the rule and times as updated. Raises 404/403 like the repository,
+    and 400 if the event would end before it starts. Callers refresh the
+    caches once the transaction commits.
+    """
+    if "recurrence_rule" in update_data:
+        update_data = {**update_data, "recurrence_rule": normalize_rule(update_data["recurrence_rule"])}
+    # The owner check is part of the statement
+    event = await event_repository.update(
+        db, event_id, user, {**update_data, "updated_at": datetime.utcnow()}
+    )
+    if event["end_time"] <= event["start_time"]:
+        # Only a partial update gets here; the request's session is rolled back
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="End time must be after start time",
+        )
+    if update_data.keys() & {"start_time", "end_time", "recurrence_rule"}:
+        # The series end follows the rule and times as updated
+        series = recurrence_columns(event["recurrence_rule"], event["start_time"], event["end_time"])
+        if series["recurrence_end"] != event["recurrence_end"]:
+            event = await event_repository.update(
+                db, event_id, user, {"recurrence_end": series["recurrence_end"]}
+            )
+    return event
+
+@router.get(
+    "/",
+    response_model=Union[List[schemas.EventResponse], schemas.Page[schemas.EventResponse]],
+    response_class=FastJSONResponse,
+)
+async def read_events(
+    request: Request,
+    db: AsyncSession = Depends(deps.get_db),
     skip: int = 0,
     limit: int = 100,
+    cursor: Optional[str] = None,
     current_user: models.User = Depends(deps.get_current_active_user),
     start_date: Optional[datetime] = None,
     end_date: Optional[datetime] = None,
+    include_archived: bool = False,
 ) -> Any:
-    """Retrieve events for the current user."""
-    query = db.query(models.Event).filter(models.Event.owner_id == current_user.id)
+    """Retrieve events for the current user.
+
+    Pass ``cursor`` (empty for the first page) to get a page envelope with
+    next/prev cursors; the Link header carries the same cursors either way.
+    ``include_archived`` also reads rows moved out by the archival job.
+
+    With both ``start_date`` and ``end_date``, recurring events are expanded
+    into their occurrences in that window, each marked with ``recurrence_id``;
+    reminders are listed on the series, not on its occurrences. Otherwise
+    recurring events are listed once, as their series.
+
+    Responses carry an ETag; with a matching ``If-None-Match`` nothing has
+    changed and the response is 304.
+    """
+    etag = await calendar_etag(db, request, current_user.id)
+    if if_none_match(request, etag):
+        return not_modified(etag)
+    start_date, end_date = to_naive_utc(start_date), to_naive_utc(end_date)
+    
+    events_table = with_archive(models.Event.__table__, include_archived)
+    reminders_table = with_archive(models.Reminder.__table__, include_archived)
+
+    query = select(events_table).where(events_table.c.owner_id == current_user.id)
     
     if start_date:
-        query = query.filter(models.Event.start_time >= start_date)
+        query = query.where(events_table.c.start_time >= start_date)
     if end_date:
-        query = query.filter(models.Event.end_time <= end_date)
-    
-    events = query.offset(skip).limit(limit).all()
-    
-    # Process the events to manually convert enum values to strings
-    # This ensures proper serialization according to SSCS and ALO Project Development Rules
-    result = []
-    for event in events:
-        # Create a dictionary representation of the event
-        event_dict = {
-            "title": event.title,
-            "description": event.description,
-            "start_time": event.start_time,
-            "end_time": event.end_time,
-            "location": event.location,
-            "is_all_day": event.is_all_day,
-            "id": event.id,
-            "owner_id": event.owner_id,
-            "created_at": event.created_at,
-            "updated_at": event.updated_at,
-            "status": event.status,
-            "reminders": []
-        }
-        
-        # Process reminders if any
-        for reminder in event.reminders:
-            reminder_dict = {
-                "id": reminder.id,
-                "message": reminder.message,
-                "reminder_time": reminder.reminder_time,
-                "reminder_type": reminder.reminder_type.value if hasattr(reminder.reminder_type, "value") else str(reminder.reminder_type),
-                "status": reminder.status.value if hasattr(reminder.status, "value") else str(reminder.status),
-                "sent_at": reminder.sent_at,
-                "event_id": reminder.event_id,
-                "owner_id": reminder.owner_id,
-                "created_at": reminder.created_at,
-                "updated_at": reminder.updated_at
-            }
-            event_dict["reminders"].append(reminder_dict)
-        
-        result.append(event_dict)
-    
-    return result
-
-@router.post("/", response_model=schemas.EventResponse, status_code=status.HTTP_201_CREATED)
-def create_event(
-    event_in: schemas.EventCreate,
-    db: Session = Depends(deps.get_db),
+        query = query.where(events_table.c.end_time <= end_date)
+    
+    # Expand only the series that have occurrences in the requested window
+    expanded = []
+    if start_date and end_date:
+        series_rows = (await db.execute(
+            select(events_table)
+            .where(events_table.c.owner_id == current_user.id)
+            .where(events_table.c.recurrence_rule.isnot(None))
+            .where(events_table.c.start_time <= end_date)
+            .where(or_(events_table.c.recurrence_end.is_(None), events_table.c.recurrence_end >= start_date))
+        )).mappings().all()
+        if series_rows:
+            exceptions_table = models.EventException.__table__
+            exception_rows = await db.execute(
+                select(exceptions_table)
+                .where(exceptions_table.c.event_id.in_([series["id"] for series in series_rows]))
+            )
+            expanded = expand_series(series_rows, exception_rows.mappings().all(), start_date, end_date)
+        query = query.where(events_table.c.recurrence_rule.is_(None))
+    
+    page = KeysetPage([events_table.c.start_time, events_table.c.id], cursor, limit, skip)
+    rows = (await db.execute(page.apply(query, offset=not expanded))).mappings().all()
+    events, next_cursor, prev_cursor = page.paginate(page.merge(rows, expanded) if expanded else rows)
+    
+    # Load the reminders of the whole page in one query instead of one per event
+    reminders_by_event = {}
+    if events:
+        reminder_rows = await db.execute(
+            select(reminders_table)
+            .where(reminders_table.c.event_id.in_([event["id"] for event in events]))
+            .order_by(reminders_table.c.id)
+        )
+        reminders_by_event = group_by(reminder_rows.mappings(), "event_id")
+    
+    # Serialize rows straight to JSON; enum values are converted to strings
+    # as required by SSCS and ALO Project Development Rules
+    items = [
+        event_row_to_dict(
+            event,
+            reminders_by_event.get(event["id"], ()) if event.get("recurrence_id") is None else (),
+        )
+        for event in events
+    ]
+    headers = {"ETag": etag}
+    link_header = format_link_header(get_cursor_links(request.url, next_cursor, prev_cursor))
+    if link_header:
+        headers["Link"] = link_header
+    return FastJSONResponse(
+        {"items": items, "next_cursor": next_cursor, "prev_cursor": prev_cursor}
+        if cursor is not None else items,
+        headers=headers,
+    )
+
+@router.get("/conflicts", response_model=List[schemas.EventResponse], response_class=FastJSONResponse)
+async def read_conflicts(
+    start_time: datetime,
+    end_time: datetime,
+    exclude_event_id: Optional[int] = None,
+    db: AsyncSession = Depends(deps.get_db),
     current_user: models.User = Depends(deps.get_current_active_user),
 ) -> Any:
-    """Create a new event."""
-    # Check if end time is after start time
-    if event_in.end_time <= event_in.start_time:
+    """List the current user's events and occurrences overlapping a time range.
+
+    ``exclude_event_id`` leaves out an event being rescheduled. Reminders are
+    not included.
+    """
+    start_time, end_time = to_naive_utc(start_time), to_naive_utc(end_time)
+    if end_time <= start_time:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="End time must be after start time",
         )
     
-    # Create event
-    event = models.Event(**event_in.dict(), owner_id=current_user.id)
-    db.add(event)
-    db.commit()
-    db.refresh(event)
-    return event
+    conflicts = await find_conflicts(db, current_user.id, start_time, end_time, exclude_event_id)
+    return FastJSONResponse([event_row_to_dict(row) for row in conflicts])
 
-@router.get("/{event_id}", response_model=schemas.EventResponse)
-def read_event(
-    event_id: int,
+@router.get("/freebusy", response_model=schemas.FreeBusy, response_class=FastJSONResponse)
+async def read_freebusy(
+    start_time: datetime,
+    end_time: datetime,
+    db: AsyncSession = Depends(deps.get_db),
     current_user: models.User = Depends(deps.get_current_active_user),
-    db: Session = Depends(deps.get_db),
 ) -> Any:
-    """Get a specific event by id."""
-    event = db.query(models.Event).filter(models.Event.id == event_id).first()
-    if not event:
+    """Get the current user's busy blocks between two times.
+
+    Overlapping and adjacent events and occurrences are merged into disjoint
+    blocks, clipped to the window. Windows are limited to 366 days.
+    """
+    start_time, end_time = to_naive_utc(start_time), to_naive_utc(end_time)
+    if end_time <= start_time:
         raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Event not found",
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="End time must be after start time",
         )
-    
-    # Check if the current user is the owner of the event
-    if event.owner_id != current_user.id and not current_user.is_superuser:
+    if end_time - start_time > MAX_WINDOW:
         raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Not enough permissions to access this event",
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Window must not exceed {MAX_WINDOW.days} days",
         )
     
-    return event
+    busy = await freebusy_cache.get(db, current_user.id, start_time, end_time)
+    return FastJSONResponse({
+        "start": start_time,
+        "end": end_time,
+        "busy": [{"start": start, "end": end} for start, end in busy],
+    })
 
-@router.put("/{event_id}", response_model=schemas.EventResponse)
-def update_event(
-    event_id: int,
-    event_in: schemas.EventUpdate,
+@router.get("/suggest-slots", response_model=List[schemas.SuggestedSlot], response_class=FastJSONResponse)
+async def read_suggested_slots(
+    start_time: datetime,
+    end_time: datetime,
+    duration_minutes: int,
+    work_start: time = time(9),
+    work_end: time = time(17),
+    include_weekends: bool = False,
+    step_minutes: int = 15,
+    limit: int = 10,
+    db: AsyncSession = Depends(deps.get_db),
     current_user: models.User = Depends(deps.get_current_active_user),
-    db: Session = Depends(deps.get_db),
 ) -> Any:
-    """Update an event."""
-    event = db.query(models.Event).filter(models.Event.id == event_id).first()
-    if not event:
+    """Suggest free slots for a new event of the given length.
+
+    Slots lie within working hours, start on multiples of ``step_minutes``
+    past midnight and never overlap each other. Slots with more free time
+    around them come first, then earlier ones. Windows are limited to 366
+    days. Times with a UTC offset are converted to naive UTC, and working
+    hours with one to the UTC clock.
+    """
+    start_time, end_time = to_naive_utc(start_time), to_naive_utc(end_time)
+    work_start, work_end = to_utc_clock(work_start), to_utc_clock(work_end)
+    if end_time <= start_time:
         raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Event not found",
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="End time must be after start time",
+        )
+    if end_time - start_time > MAX_WINDOW:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Window must not exceed {MAX_WINDOW.days} days",
+        )
+    if work_end <= work_start:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Working hours must end after they start",
+        )
+    if duration_minutes < 1 or not 1 <= step_minutes <= 24 * 60:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Duration and step must be positive, and the step at most a day",
+        )
+    if not 1 <= limit <= MAX_SUGGESTIONS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Limit must be between 1 and {MAX_SUGGESTIONS}",
         )
     
-    # Check if the current user is the owner of the event
-    if event.owner_id != current_user.id and not current_user.is_superuser:
+    slots = await suggest_slots(
+        db,
+        current_user.id,
+        start_time,
+        end_time,
+        timedelta(minutes=duration_minutes),
+        work_start=work_start,
+        work_end=work_end,
+        weekends=include_weekends,
+        step=timedelta(minutes=step_minutes),
+        limit=limit,
+    )
+    return FastJSONResponse([{"start": start, "end": end, "score": score} for start, end, score in slots])
+
+@router.post(
+    "/",
+    response_model=schemas.EventResponse,
+    response_class=FastJSONResponse,
+    status_code=status.HTTP_201_CREATED,
+)
+async def create_event(
+    event_in: schemas.EventCreate,
+    reject_on_conflict: bool = False,
+    db: AsyncSession = Depends(deps.get_db),
+    current_user: models.User = Depends(deps.get_current_active_user),
+) -> Any:
+    """Create a new event.
+
+    With ``reject_on_conflict`` an event overlapping one of the user's events
+    is refused with 409. For a recurring event its first occurrence is checked.
+    """
+    # Check if end time is after start time
+    if event_in.end_time <= event_in.start_time:
         raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Not enough permissions to update this event",
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="End time must be after start time",
+        )
+    if reject_on_conflict:
+        await _reject_conflicts(db, current_user.id, event_in.start_time, event_in.end_time)
+    
+    # Create event
+    data = event_in.dict()
+    data.update(recurrence_columns(data["recurrence_rule"], data["start_time"], data["end_time"]))
+    event = await event_repository.insert(db, {**data, "owner_id": current_user.id})
+    await db.commit()
+    conflict_index.apply(current_user.id, [event_change(event)])
+    freebusy_cache.invalidate(current_user.id)
+    push_hub.publish([(current_user.id, "event", "created", event["id"])])
+    return FastJSONResponse(event_row_to_dict(event), status_code=status.HTTP_201_CREATED)
+
+@router.post(":batch", response_model=schemas.BatchResponse, response_class=FastJSONResponse)
+async def batch_events(
+    batch: schemas.BatchRequest,
+    db: AsyncSession = Depends(deps.get_db),
+    current_user: models.User = Depends(deps.get_current_active_user),
+) -> Any:
+    """Create, update and delete many events in one transaction.
+
+    Every item gets the status code and error a single call would return.
+    An atomic batch (the default) with a failing item is refused with 400
+    and nothing is written; otherwise the other items are still written.
+    Conflicts are not checked.
+    """
+    results = BatchResults(batch.items, schemas.EventCreate, schemas.EventUpdate)
+    ids = results.target_ids()
+    events = {}
+    if ids:
+        table = models.Event.__table__
+        rows = await db.execute(
+            select(table.c.id, table.c.owner_id, table.c.start_time, table.c.end_time, table.c.change_seq)
+            .where(table.c.id.in_(ids))
         )
+        events = {row.id: row for row in rows}
+    
+    creates, updates, deletes = [], [], []
+    for index, item in enumerate(batch.items):
+        if not results.ok(index):
+            continue
+        if item.op == schemas.BatchOperation.CREATE:
+            event_in = results.parsed[index]
+            if event_in.end_time <= event_in.start_time:
+                results.fail(index, status.HTTP_400_BAD_REQUEST, "End time must be after start time")
+                continue
+            creates.append(index)
+            continue
+        event = events.get(item.id)
+        if not results.check_owner(index, event, current_user, "Event"):
+            continue
+        if item.op == schemas.BatchOperation.DELETE:
+            deletes.append((index, event.id, event.owner_id))
+            continue
+        update_data = results.parsed[index].dict(exclude_unset=True)
+        if (update_data.get("end_time") or event.end_time) <= (update_data.get("start_time") or event.start_time):
+            results.fail(index, status.HTTP_400_BAD_REQUEST, "End time must be after start time")
+            continue
+        updates.append((index, event.id, update_data))
+    if batch.atomic and results.failed:
+        return results.response(atomic=True)
     
-    # Update event data
+    changed, pushed = [], []
+    indexed: Dict[int, List[Any]] = {}
+    if deletes:
+        delete_ids = [event_id for _, event_id, _ in deletes]
+        # The database deletes their reminders (ON DELETE CASCADE); sync
+        # clients learn of both from tombstones
+        await record_deletes(db, models.Reminder.__table__.c.event_id, delete_ids)
+        await record_deletes(db, models.Event.__table__.c.id, delete_ids)
+        await db.execute(
+            delete(models.Event)
+            .where(models.Event.id.in_(delete_ids))
+            .execution_options(synchronize_session=False)
+        )
+        for index, event_id, owner_id in deletes:
+            results.succeed(index, status.HTTP_200_OK, event_id)
+            pushed.append((owner_id, "event", "deleted", event_id))
+            indexed.setdefault(owner_id, []).append(event_change(events[event_id], deleted=True))
+        changed += delete_ids
+    # Stamped after the tombstones, so a new row reusing a deleted id
+    # (SQLite) comes after them in a sync; updates are written like single
+    # ones, which stamp each row
+    owners = {current_user.id} if creates else set()
+    sequences = await advance(db, owners)
+    for index, event_id, update_data in updates:
+        event = await _update_event(db, event_id, current_user, update_data)
+        results.succeed(index, status.HTTP_200_OK, event_id)
+        changed.append(event_id)
+        owners.add(event["owner_id"])
+        pushed.append((event["owner_id"], "event", "updated", event_id))
+        indexed.setdefault(event["owner_id"], []).append(event_change(event))
+    owners.update(owner_id for _, _, owner_id in deletes)
+    if creates:
+        rows = []
+        for index in creates:
+            data = results.parsed[index].dict()
+            data.update(recurrence_columns(data["recurrence_rule"], data["start_time"], data["end_time"]))
+            rows.append({**data, "owner_id": current_user.id, "change_seq": sequences[current_user.id]})
+        created_ids = await insert_returning_ids(db, models.Event.__table__, rows)
+        for index, event_id, row in zip(creates, created_ids, rows):
+            results.succeed(index, status.HTTP_201_CREATED, event_id)
+            pushed.append((current_user.id, "event", "created", event_id))
+            indexed.setdefault(current_user.id, []).append(event_change({**row, "id": event_id}))
+    await db.commit()
+    
+    for event_id in changed:
+        occurrence_cache.invalidate(event_id)
+    for owner_id, changes in indexed.items():
+        conflict_index.apply(owner_id, changes)
+    for owner_id in owners:
+        freebusy_cache.invalidate(owner_id)
+    push_hub.publish(pushed)
+    return results.response(batch.atomic)
+
+@router.get("/{event_id}", response_model=schemas.EventResponse, response_class=FastJSONResponse)
+async def read_event(
+    event_id: int,
+    request: Request,
+    current_user: models.User = Depends(deps.get_current_active_user),
+    db: AsyncSession = Depends(deps.get_db),
+) -> Any:
+    """Get a specific event by id.
+
+    The response carries an ETag, and with a matching ``If-None-Match`` it
+    is 304. Superusers get no ETag: they can read other users' events,
+    which their own version does not cover.
+    """
+    etag = None if current_user.is_superuser else await calendar_etag(db, request, current_user.id)
+    if etag is not None and if_none_match(request, etag):
+        return not_modified(etag)
+    event = await event_repository.get(db, event_id, current_user)
+    reminders = await event_repository.dependents(db, models.Reminder.__table__.c.event_id, event_id)
+    return FastJSONResponse(event_row_to_dict(event, reminders), headers={"ETag": etag} if etag else None)
+
+@router.put("/{event_id}", response_model=schemas.EventResponse, response_class=FastJSONResponse)
+async def update_event(
+    event_id: int,
+    event_in: schemas.EventUpdate,
+    reject_on_conflict: bool = False,
+    current_user: models.User = Depends(deps.get_current_active_user),
+    db: AsyncSession = Depends(deps.get_db),
+) -> Any:
+    """Update an event.
+
+    With ``reject_on_conflict`` a change making the event overlap another of
+    the owner's events is refused with 409.
+    """
     update_data = event_in.dict(exclude_unset=True)
-    for field, value in update_data.items():
-        setattr(event, field, value)
+    if reject_on_conflict:
+        # The conflict check needs the current times of a partial update
+        current = await event_repository.get(db, event_id, current_user, "update")
+        await _reject_conflicts(
+            db,
+            current["owner_id"],
+            update_data.get("start_time") or current["start_time"],
+            update_data.get("end_time") or current["end_time"],
+            exclude_id=event_id,
+        )
     
-    event.updated_at = datetime.utcnow()
-    db.add(event)
-    db.commit()
-    db.refresh(event)
-    return event
+    event = await _update_event(db, event_id, current_user, update_data)
+    reminders = await event_repository.dependents(db, models.Reminder.__table__.c.event_id, event_id)
+    await db.commit()
+    occurrence_cache.invalidate(event_id)
+    conflict_index.apply(event["owner_id"], [event_change(event)])
+    freebusy_cache.invalidate(event["owner_id"])
+    push_hub.publish([(event["owner_id"], "event", "updated", event_id)])
+    return FastJSONResponse(event_row_to_dict(event, reminders))
 
-@router.delete("/{event_id}", response_model=schemas.EventResponse)
-def delete_event(
+@router.delete("/{event_id}", response_model=schemas.EventResponse, response_class=FastJSONResponse)
+async def delete_event(
     event_id: int,
     current_user: models.User = Depends(deps.get_current_active_user),
-    db: Session = Depends(deps.get_db),
+    db: AsyncSession = Depends(deps.get_db),
 ) -> Any:
-    """Delete an event."""
-    event = db.query(models.Event).filter(models.Event.id == event_id).first()
-    if not event:
+    """Delete an event and its reminders."""
+    # The cascade would delete the reminders too, but the response lists them
+    reminders = await event_repository.delete_dependents(
+        db, models.Reminder.__table__.c.event_id, event_id, current_user
+    )
+    event = await event_repository.delete(db, event_id, current_user)
+    await db.commit()
+    occurrence_cache.invalidate(event_id)
+    conflict_index.apply(event["owner_id"], [event_change(event, deleted=True)])
+    freebusy_cache.invalidate(event["owner_id"])
+    push_hub.publish(
+        [(event["owner_id"], "event", "deleted", event_id)]
+        + [(reminder["owner_id"], "reminder", "deleted", reminder["id"]) for reminder in reminders]
+    )
+    return FastJSONResponse(event_row_to_dict(event, reminders))
+
+async def _get_occurrence_exception(
+    db: AsyncSession,
+    event_id: int,
+    recurrence_id: datetime,
+    current_user: models.User,
+) -> Tuple[Dict[str, Any], models.EventException]:
+    """Load a series and the exception row of one occurrence, creating it if needed."""
+    event = await event_repository.get(db, event_id, current_user, "update")
+    
+    # The occurrence must be one the rule generates
+    if not event["recurrence_rule"] or next(
+        occurrences(event["recurrence_rule"], event["start_time"], recurrence_id, recurrence_id), None
+    ) != recurrence_id:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
-            detail="Event not found",
+            detail="Occurrence not found",
         )
     
-    # Check if the current user is the owner of the event
-    if event.owner_id != current_user.id and not current_user.is_superuser:
+    result = await db.execute(
+        select(models.EventException)
+        .filter(models.EventException.event_id == event_id)
+        .filter(models.EventException.original_start == recurrence_id)
+    )
+    exception = result.scalars().first()
+    if exception is None:
+        exception = models.EventException(event_id=event_id, original_start=recurrence_id)
+    
+    # Touching the series invalidates its cached occurrence windows
+    event = await event_repository.update(db, event_id, current_user, {"updated_at": datetime.utcnow()})
+    db.add(exception)
+    return event, exception
+
+@router.put("/{event_id}/occurrences/{recurrence_id}", response_model=schemas.EventExceptionResponse)
+async def update_occurrence(
+    event_id: int,
+    recurrence_id: datetime,
+    occurrence_in: schemas.EventOccurrenceUpdate,
+    current_user: models.User = Depends(deps.get_current_active_user),
+    db: AsyncSession = Depends(deps.get_db),
+) -> Any:
+    """Edit one occurrence of a recurring event, identified by its original start."""
+    recurrence_id = to_naive_utc(recurrence_id)
+    event, exception = await _get_occurrence_exception(db, event_id, recurrence_id, current_user)
+    for field, value in occurrence_in.dict(exclude_unset=True).items():
+        setattr(exception, field, value)
+    exception.is_cancelled = False
+    
+    # Check if end time is after start time, filling in the series duration
+    start_time = exception.start_time or recurrence_id
+    if exception.end_time is not None and exception.end_time <= start_time:
         raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Not enough permissions to delete this event",
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="End time must be after start time",
         )
     
-    db.delete(event)
-    db.commit()
-    return event
+    await db.commit()
+    await db.refresh(exception)
+    occurrence_cache.invalidate(event_id)
+    freebusy_cache.invalidate(event["owner_id"])
+    push_hub.publish([(event["owner_id"], "event", "updated", event_id)])
+    return exception
+
+@router.delete("/{event_id}/occurrences/{recurrence_id}", response_model=schemas.EventExceptionResponse)
+async def cancel_occurrence(
+    event_id: int,
+    recurrence_id: datetime,
+    current_user: models.User = Depends(deps.get_current_active_user),
+    db: AsyncSession = Depends(deps.get_db),
+) -> Any:
+    """Cancel one occurrence of a recurring event, identified by its original start."""
+    recurrence_id = to_naive_utc(recurrence_id)
+    event, exception = await _get_occurrence_exception(db, event_id, recurrence_id, current_user)
+    exception.is_cancelled = True
+    await db.commit()
+    await db.refresh(exception)
+    occurrence_cache.invalidate(event_id)
+    freebusy_cache.invalidate(event["owner_id"])
+    push_hub.publish([(event["owner_id"], "event", "updated", event_id)])
+    return exception
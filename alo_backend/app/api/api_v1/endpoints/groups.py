@@ -0,0 +1,143 @@
+from typing import Any, Dict, Iterable, List
+
+from fastapi import APIRouter, Depends, HTTPException, status
+from sqlalchemy import delete, insert, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app import models, schemas
+from app.api import deps
+
+router = APIRouter()
+
+members = models.group_members
+
+async def _members_by_group(db: AsyncSession, group_ids: Iterable[int]) -> Dict[int, List[int]]:
+    """Load the member ids of groups in one query."""
+    rows = await db.execute(
+        select(members.c.group_id, members.c.user_id)
+        .where(members.c.group_id.in_(list(group_ids)))
+        .order_by(members.c.group_id, members.c.user_id)
+    )
+    by_group: Dict[int, List[int]] = {}
+    for group_id, user_id in rows:
+        by_group.setdefault(group_id, []).append(user_id)
+    return by_group
+
+def _group_dict(group: models.Group, member_ids: List[int]) -> Dict[str, Any]:
+    return {
+        "id": group.id,
+        "name": group.name,
+        "member_ids": member_ids,
+        "created_at": group.created_at,
+        "updated_at": group.updated_at,
+    }
+
+async def _group_response(db: AsyncSession, group: models.Group) -> Dict[str, Any]:
+    return _group_dict(group, (await _members_by_group(db, [group.id])).get(group.id, []))
+
+async def _get_group(db: AsyncSession, group_id: int) -> models.Group:
+    group = await db.get(models.Group, group_id)
+    if group is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Group not found",
+        )
+    return group
+
+async def _check_users_exist(db: AsyncSession, user_ids: Iterable[int]) -> None:
+    user_ids = set(user_ids)
+    result = await db.execute(select(models.User.id).filter(models.User.id.in_(user_ids)))
+    missing = user_ids - set(result.scalars().all())
+    if missing:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Users not found: {', '.join(str(user_id) for user_id in sorted(missing))}",
+        )
+
+@router.get("/", response_model=List[schemas.GroupResponse])
+async def read_groups(
+    db: AsyncSession = Depends(deps.get_db),
+    current_user: models.User = Depends(deps.get_current_active_user),
+) -> Any:
+    """List the groups the current user is a member of."""
+    result = await db.execute(
+        select(models.Group)
+        .where(models.Group.id.in_(select(members.c.group_id).where(members.c.user_id == current_user.id)))
+        .order_by(models.Group.id)
+    )
+    groups = result.scalars().all()
+    by_group = await _members_by_group(db, [group.id for group in groups])
+    return [_group_dict(group, by_group.get(group.id, [])) for group in groups]
+
+@router.post("/", response_model=schemas.GroupResponse, status_code=status.HTTP_201_CREATED)
+async def create_group(
+    group_in: schemas.GroupCreate,
+    db: AsyncSession = Depends(deps.get_db),
+    current_user: models.User = Depends(deps.get_current_active_superuser),
+) -> Any:
+    """Create a group (admin only).
+
+    Members see each other's common free time (``/availability/group``),
+    so only admins decide who is in a group.
+    """
+    member_ids = sorted(set(group_in.member_ids))
+    if member_ids:
+        await _check_users_exist(db, member_ids)
+    group = models.Group(name=group_in.name)
+    db.add(group)
+    await db.flush()
+    if member_ids:
+        await db.execute(insert(members), [{"group_id": group.id, "user_id": user_id} for user_id in member_ids])
+    await db.commit()
+    return await _group_response(db, group)
+
+@router.put("/{group_id}/members/{user_id}", response_model=schemas.GroupResponse)
+async def add_group_member(
+    group_id: int,
+    user_id: int,
+    db: AsyncSession = Depends(deps.get_db),
+    current_user: models.User = Depends(deps.get_current_active_superuser),
+) -> Any:
+    """Add a user to a group (admin only); adding a member again does nothing."""
+    group = await _get_group(db, group_id)
+    await _check_users_exist(db, [user_id])
+    exists = await db.execute(
+        select(members.c.user_id).where(members.c.group_id == group_id).where(members.c.user_id == user_id)
+    )
+    if exists.first() is None:
+        await db.execute(insert(members).values(group_id=group_id, user_id=user_id))
+        await db.commit()
+    return await _group_response(db, group)
+
+@router.delete("/{group_id}/members/{user_id}", response_model=schemas.GroupResponse)
+async def remove_group_member(
+    group_id: int,
+    user_id: int,
+    db: AsyncSession = Depends(deps.get_db),
+    current_user: models.User = Depends(deps.get_current_active_superuser),
+) -> Any:
+    """Remove a user from a group (admin only)."""
+    group = await _get_group(db, group_id)
+    result = await db.execute(
+        delete(members).where(members.c.group_id == group_id).where(members.c.user_id == user_id)
+    )
+    if not result.rowcount:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="User is not a member of the group",
+        )
+    await db.commit()
+    return await _group_response(db, group)
+
+@router.delete("/{group_id}", response_model=schemas.GroupResponse)
+async def delete_group(
+    group_id: int,
+    db: AsyncSession = Depends(deps.get_db),
+    current_user: models.User = Depends(deps.get_current_active_superuser),
+) -> Any:
+    """Delete a group and its memberships (admin only)."""
+    group = await _get_group(db, group_id)
+    response = await _group_response(db, group)
+    await db.delete(group)
+    await db.commit()
+    return response
@@ -0,0 +1,85 @@
+from typing import Any
+
+from fastapi import APIRouter, Depends
+
+from app import models
+from app.api import deps
+from app.core.archive import archive_job
+from app.core.conflicts import conflict_index
+from app.core.database import db_circuit_breaker
+from app.core.delivery import delivery_pipeline
+from app.core.freebusy import freebusy_cache
+from app.core.dispatcher import reminder_dispatcher
+from app.core.security import password_hasher, token_cache
+from app.core.pool_health import pool_health_monitor
+from app.core.purge import purge_job
+from app.core.push import push_hub
+from app.core.recurrence import occurrence_cache
+from app.core.user_cache import user_cache
+
+router = APIRouter()
+
+@router.get("/database")
+async def read_database_health(
+    current_user: models.User = Depends(deps.get_current_active_superuser),
+) -> Any:
+    """Get connection pool health, circuit breaker state and counters (admin only)."""
+    return {
+        **pool_health_monitor.stats(),
+        "circuit_breaker": db_circuit_breaker.stats(),
+    }
+
+@router.get("/cache")
+async def read_cache_health(
+    current_user: models.User = Depends(deps.get_current_active_superuser),
+) -> Any:
+    """Get user, token, occurrence, conflict index and free/busy cache sizes and counters (admin only)."""
+    return {
+        "users": user_cache.stats(),
+        "tokens": token_cache.stats(),
+        "occurrences": occurrence_cache.stats(),
+        "conflicts": conflict_index.stats(),
+        "freebusy": freebusy_cache.stats(),
+    }
+
+@router.get("/password-hasher")
+async def read_password_hasher_health(
+    current_user: models.User = Depends(deps.get_current_active_superuser),
+) -> Any:
+    """Get password hashing pool queue depth and counters (admin only)."""
+    return password_hasher.stats()
+
+@router.get("/reminders")
+async def read_reminder_dispatcher_health(
+    current_user: models.User = Depends(deps.get_current_active_superuser),
+) -> Any:
+    """Get reminder dispatcher state and sent/failed counters (admin only)."""
+    return reminder_dispatcher.stats()
+
+@router.get("/delivery")
+async def read_delivery_health(
+    current_user: models.User = Depends(deps.get_current_active_superuser),
+) -> Any:
+    """Get per-channel delivery throughput, latency and counters (admin only)."""
+    return delivery_pipeline.stats()
+
+@router.get("/archive")
+async def read_archive_health(
+    current_user: models.User = Depends(deps.get_current_active_superuser),
+) -> Any:
+    """Get archival job settings, last run and counters (admin only)."""
+    return archive_job.stats()
+
+@router.get("/purge")
+async def read_purge_health(
+    current_user: models.User = Depends(deps.get_current_active_superuser),
+) -> Any:
+    """Get account purge job settings, last run and counters (admin only)."""
+    return purge_job.stats()
+
+@router.get("/push")
+async def read_push_health(
+    current_user: models.User = Depends(deps.get_current_active_superuser),
+) -> Any:
+    """Get this worker's open push connections and fanout counters (admin only)."""
+    return push_hub.stats()
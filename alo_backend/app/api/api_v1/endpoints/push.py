@@ -0,0 +1,90 @@
+import asyncio
+from typing import Any, AsyncIterator
+
+from fastapi import APIRouter, Depends, HTTPException, Query, WebSocket, status
+from fastapi.responses import StreamingResponse
+from starlette.background import BackgroundTask
+from starlette.websockets import WebSocketDisconnect
+
+from app import models
+from app.api import deps
+from app.core import database
+from app.core.config import get_settings
+from app.core.push import Subscription, push_hub
+
+router = APIRouter()
+
+settings = get_settings()
+
+async def _event_stream(subscription: Subscription) -> AsyncIterator[str]:
+    while True:
+        message = await subscription.get(timeout=settings.PUSH_KEEPALIVE)
+        if subscription.closed:
+            return
+        # A comment line keeps idle connections open through proxies
+        yield f"data: {message}\n\n" if message is not None else ": keepalive\n\n"
+
+@router.get("/sse")
+async def push_sse(
+    current_user: models.User = Depends(deps.get_stream_user),
+) -> Any:
+    """Stream the current user's event and reminder changes as Server-Sent Events.
+
+    Each message's data is ``{"changes": [{"type", "op", "id"}, ...]}``;
+    call ``GET /sync`` when one arrives, and after connecting. Pass the
+    access token as ``access_token``.
+    """
+    subscription = push_hub.subscribe(current_user.id)
+    return StreamingResponse(
+        _event_stream(subscription),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+        # Also runs when the client disconnects
+        background=BackgroundTask(push_hub.unsubscribe, subscription),
+    )
+
+async def _close_on_disconnect(websocket: WebSocket, subscription: Subscription) -> None:
+    # Clients only listen; anything they send is ignored
+    try:
+        while True:
+            await websocket.receive_text()
+    except WebSocketDisconnect:
+        pass
+    finally:
+        subscription.close()
+
+async def _authenticate(access_token: str) -> models.User:
+    # A session of its own, closed before the socket is accepted: a
+    # dependency's session would live as long as the socket
+    if database.AsyncSessionLocal is None:
+        database.initialize_async_database()
+    async with database.AsyncSessionLocal() as db:
+        return await deps.get_stream_user(db, access_token)
+
+@router.websocket("/ws")
+async def push_websocket(
+    websocket: WebSocket,
+    access_token: str = Query(...),
+) -> None:
+    """Send the current user's event and reminder changes over a WebSocket.
+
+    Messages are the same as on ``/push/sse``. A bad token closes the
+    socket with code 1008. Open sockets hold no database session.
+    """
+    try:
+        current_user = await _authenticate(access_token)
+    except HTTPException:
+        await websocket.close(code=status.WS_1008_POLICY_VIOLATION)
+        return
+    await websocket.accept()
+    subscription = push_hub.subscribe(current_user.id)
+    receiver = asyncio.ensure_future(_close_on_disconnect(websocket, subscription))
+    try:
+        while True:
+            message = await subscription.get()
+            if message is None:
+                break
+            await websocket.send_text(message)
+    finally:
+        push_hub.unsubscribe(subscription)
+        receiver.cancel()
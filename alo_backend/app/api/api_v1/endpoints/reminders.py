@@ -1,180 +1,294 @@
 from datetime import datetime
-from typing import Any, List, Optional
+from typing import Any, List, Optional, Union
 
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, Request, status
+from sqlalchemy import case, delete, select
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from app import models, schemas
 from app.api import deps
+from app.core.archive import with_archive
+from app.core.batch import BatchResults, insert_returning_ids
+from app.core.dispatcher import reminder_dispatcher
+from app.core.etag import calendar_etag, if_none_match, not_modified
+from app.core.pagination import KeysetPage
+from app.core.push import push_hub
+from app.core.repository import event_repository, reminder_repository
+from app.core.serialization import FastJSONResponse, reminder_row_to_dict
+from app.core.sync import advance, record_deletes
+from app.core.utils import format_link_header, get_cursor_links
 
 router = APIRouter()
 
-@router.get("/", response_model=List[schemas.ReminderResponse])
-def read_reminders(
-    db: Session = Depends(deps.get_db),
+def _to_model_enums(data: dict) -> dict:
+    """Map schema enums onto the model enums, which SQLAlchemy persists by name."""
+    if data.get("reminder_type") is not None:
+        data["reminder_type"] = models.ReminderType(data["reminder_type"])
+    if data.get("status") is not None:
+        data["status"] = models.ReminderStatus(data["status"])
+    return data
+
+async def _update_reminder(
+    db: AsyncSession,
+    reminder_id: int,
+    user: models.User,
+    update_data: dict,
+) -> dict:
+    """Write a partial update of a reminder the user may update and return the row.
+
+    Status transitions compare against the stored status inside the
+    statement, so the row is never loaded first. Raises 404/403 like the
+    repository.
+    """
+    reminders = models.Reminder.__table__
+    now = datetime.utcnow()
+    update_data = {**update_data, "updated_at": now}
+    new_status = update_data.get("status")
+    if new_status is not None:
+        changed = reminders.c.status.is_distinct_from(new_status)
+        # If status is being updated to SENT, set sent_at to current time
+        if new_status == models.ReminderStatus.SENT:
+            update_data["sent_at"] = case((changed, now), else_=reminders.c.sent_at)
+        # Requeueing a failed or dead-lettered reminder starts its retries over
+        if new_status == models.ReminderStatus.PENDING:
+            update_data["attempts"] = case((changed, 0), else_=reminders.c.attempts)
+            update_data["next_attempt_at"] = case((changed, None), else_=reminders.c.next_attempt_at)
+    return await reminder_repository.update(db, reminder_id, user, update_data)
+
+@router.get(
+    "/",
+    response_model=Union[List[schemas.ReminderResponse], schemas.Page[schemas.ReminderResponse]],
+    response_class=FastJSONResponse,
+)
+async def read_reminders(
+    request: Request,
+    db: AsyncSession = Depends(deps.get_db),
     skip: int = 0,
     limit: int = 100,
+    cursor: Optional[str] = None,
     current_user: models.User = Depends(deps.get_current_active_user),
     event_id: Optional[int] = None,
     status: Optional[schemas.ReminderStatus] = None,
+    include_archived: bool = False,
 ) -> Any:
-    """Retrieve reminders for the current user."""
-    query = db.query(models.Reminder).filter(models.Reminder.owner_id == current_user.id)
+    """Retrieve reminders for the current user.
+
+    Pass ``cursor`` (empty for the first page) to get a page envelope with
+    next/prev cursors; the Link header carries the same cursors either way.
+    ``include_archived`` also reads rows moved out by the archival job.
+
+    Responses carry an ETag; with a matching ``If-None-Match`` nothing has
+    changed and the response is 304.
+    """
+    etag = await calendar_etag(db, request, current_user.id)
+    if if_none_match(request, etag):
+        return not_modified(etag)
+    
+    reminders_table = with_archive(models.Reminder.__table__, include_archived)
+    query = select(reminders_table).where(reminders_table.c.owner_id == current_user.id)
     
     if event_id is not None:
-        query = query.filter(models.Reminder.event_id == event_id)
+        query = query.where(reminders_table.c.event_id == event_id)
     if status is not None:
-        query = query.filter(models.Reminder.status == status)
+        query = query.where(reminders_table.c.status == models.ReminderStatus(status))
     
-    reminders = query.offset(skip).limit(limit).all()
-    
-    # Process the reminders to manually convert enum values to strings
-    # This ensures proper serialization according to SSCS and ALO Project Development Rules
-    result = []
-    for reminder in reminders:
-        reminder_dict = {
-            "id": reminder.id,
-            "message": reminder.message,
-            "reminder_time": reminder.reminder_time,
-            "reminder_type": reminder.reminder_type.value if hasattr(reminder.reminder_type, "value") else str(reminder.reminder_type),
-            "status": reminder.status.value if hasattr(reminder.status, "value") else str(reminder.status),
-            "sent_at": reminder.sent_at,
-            "event_id": reminder.event_id,
-            "owner_id": reminder.owner_id,
-            "created_at": reminder.created_at,
-            "updated_at": reminder.updated_at
-        }
-        result.append(reminder_dict)
+    page = KeysetPage([reminders_table.c.reminder_time, reminders_table.c.id], cursor, limit, skip)
+    reminders, next_cursor, prev_cursor = page.paginate(
+        (await db.execute(page.apply(query))).mappings().all()
+    )
     
-    return result
+    # Serialize rows straight to JSON; enum values are converted to strings
+    # as required by SSCS and ALO Project Development Rules
+    items = [reminder_row_to_dict(reminder) for reminder in reminders]
+    headers = {"ETag": etag}
+    link_header = format_link_header(get_cursor_links(request.url, next_cursor, prev_cursor))
+    if link_header:
+        headers["Link"] = link_header
+    return FastJSONResponse(
+        {"items": items, "next_cursor": next_cursor, "prev_cursor": prev_cursor}
+        if cursor is not None else items,
+        headers=headers,
+    )
 
-@router.post("/", response_model=schemas.ReminderResponse, status_code=status.HTTP_201_CREATED)
-def create_reminder(
+@router.post(
+    "/",
+    response_model=schemas.ReminderResponse,
+    response_class=FastJSONResponse,
+    status_code=status.HTTP_201_CREATED,
+)
+async def create_reminder(
     reminder_in: schemas.ReminderCreate,
-    db: Session = Depends(deps.get_db),
+    db: AsyncSession = Depends(deps.get_db),
     current_user: models.User = Depends(deps.get_current_active_user),
 ) -> Any:
     """Create a new reminder."""
     # If event_id is provided, verify the event exists and belongs to the user
     if reminder_in.event_id is not None:
-        event = db.query(models.Event).filter(models.Event.id == reminder_in.event_id).first()
-        if not event:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail="Event not found",
-            )
-        if event.owner_id != current_user.id and not current_user.is_superuser:
-            raise HTTPException(
-                status_code=status.HTTP_403_FORBIDDEN,
-                detail="Not enough permissions to add reminder to this event",
-            )
+        await event_repository.check(db, reminder_in.event_id, current_user, "add reminder to")
     
     # Create reminder
-    reminder = models.Reminder(
-        **reminder_in.dict(),
-        owner_id=current_user.id,
-        status=schemas.ReminderStatus.PENDING
-    )
-    db.add(reminder)
-    db.commit()
-    db.refresh(reminder)
-    return reminder
+    reminder = await reminder_repository.insert(db, {
+        **_to_model_enums(reminder_in.dict(exclude={"status"})),
+        "owner_id": current_user.id,
+        "status": models.ReminderStatus.PENDING,
+    })
+    await db.commit()
+    reminder_dispatcher.schedule(reminder["id"], reminder["reminder_time"])
+    push_hub.publish([(current_user.id, "reminder", "created", reminder["id"])])
+    return FastJSONResponse(reminder_row_to_dict(reminder), status_code=status.HTTP_201_CREATED)
 
-@router.get("/{reminder_id}", response_model=schemas.ReminderResponse)
-def read_reminder(
-    reminder_id: int,
+@router.post(":batch", response_model=schemas.BatchResponse, response_class=FastJSONResponse)
+async def batch_reminders(
+    batch: schemas.BatchRequest,
+    db: AsyncSession = Depends(deps.get_db),
     current_user: models.User = Depends(deps.get_current_active_user),
-    db: Session = Depends(deps.get_db),
 ) -> Any:
-    """Get a specific reminder by id."""
-    reminder = db.query(models.Reminder).filter(models.Reminder.id == reminder_id).first()
-    if not reminder:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Reminder not found",
+    """Create, update and delete many reminders in one transaction.
+
+    Every item gets the status code and error a single call would return.
+    An atomic batch (the default) with a failing item is refused with 400
+    and nothing is written; otherwise the other items are still written.
+    """
+    results = BatchResults(batch.items, schemas.ReminderCreate, schemas.ReminderUpdate)
+    ids = results.target_ids()
+    reminders = {}
+    if ids:
+        table = models.Reminder.__table__
+        rows = await db.execute(
+            select(table.c.id, table.c.owner_id, table.c.event_id).where(table.c.id.in_(ids))
         )
+        reminders = {row.id: row for row in rows}
     
-    # Check if the current user is the owner of the reminder
-    if reminder.owner_id != current_user.id and not current_user.is_superuser:
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Not enough permissions to access this reminder",
+    # Events the items attach reminders to, checked like the reminders themselves
+    event_ids = {
+        parsed.event_id for parsed in results.parsed
+        if parsed is not None and parsed.event_id is not None
+    }
+    events = {}
+    if event_ids:
+        rows = await db.execute(
+            select(models.Event.id, models.Event.owner_id).filter(models.Event.id.in_(event_ids))
         )
+        events = {row.id: row for row in rows}
     
-    return reminder
+    creates, updates, deletes = [], [], []
+    for index, item in enumerate(batch.items):
+        if not results.ok(index):
+            continue
+        reminder_in = results.parsed[index]
+        if item.op == schemas.BatchOperation.CREATE:
+            if reminder_in.event_id is not None and not results.check_owner(
+                index, events.get(reminder_in.event_id), current_user, "Event"
+            ):
+                continue
+            creates.append(index)
+            continue
+        reminder = reminders.get(item.id)
+        if not results.check_owner(index, reminder, current_user, "Reminder"):
+            continue
+        if item.op == schemas.BatchOperation.DELETE:
+            deletes.append((index, reminder.id, reminder.owner_id))
+            continue
+        if reminder_in.event_id is not None and reminder_in.event_id != reminder.event_id and not results.check_owner(
+            index, events.get(reminder_in.event_id), current_user, "Event"
+        ):
+            continue
+        updates.append((index, reminder.id, _to_model_enums(reminder_in.dict(exclude_unset=True))))
+    if batch.atomic and results.failed:
+        return results.response(atomic=True)
+    
+    scheduled, pushed = [], []
+    if deletes:
+        delete_ids = [reminder_id for _, reminder_id, _ in deletes]
+        await record_deletes(db, models.Reminder.__table__.c.id, delete_ids)
+        await db.execute(
+            delete(models.Reminder)
+            .where(models.Reminder.id.in_(delete_ids))
+            .execution_options(synchronize_session=False)
+        )
+        for index, reminder_id, owner_id in deletes:
+            results.succeed(index, status.HTTP_200_OK, reminder_id)
+            pushed.append((owner_id, "reminder", "deleted", reminder_id))
+    # Stamped after the tombstones, so a new row reusing a deleted id
+    # (SQLite) comes after them in a sync; updates are written like single
+    # ones, which stamp each row
+    sequences = await advance(db, [current_user.id] if creates else [])
+    for index, reminder_id, update_data in updates:
+        reminder = await _update_reminder(db, reminder_id, current_user, update_data)
+        results.succeed(index, status.HTTP_200_OK, reminder_id)
+        pushed.append((reminder["owner_id"], "reminder", "updated", reminder_id))
+        if reminder["status"] == models.ReminderStatus.PENDING:
+            scheduled.append((reminder_id, reminder["reminder_time"]))
+    if creates:
+        rows = [
+            {
+                **_to_model_enums(results.parsed[index].dict(exclude={"status"})),
+                "owner_id": current_user.id,
+                "status": models.ReminderStatus.PENDING,
+                "change_seq": sequences[current_user.id],
+            }
+            for index in creates
+        ]
+        created_ids = await insert_returning_ids(db, models.Reminder.__table__, rows)
+        for index, reminder_id, row in zip(creates, created_ids, rows):
+            results.succeed(index, status.HTTP_201_CREATED, reminder_id)
+            scheduled.append((reminder_id, row["reminder_time"]))
+            pushed.append((current_user.id, "reminder", "created", reminder_id))
+    await db.commit()
+    
+    for reminder_id, reminder_time in scheduled:
+        reminder_dispatcher.schedule(reminder_id, reminder_time)
+    push_hub.publish(pushed)
+    return results.response(batch.atomic)
+
+@router.get("/{reminder_id}", response_model=schemas.ReminderResponse, response_class=FastJSONResponse)
+async def read_reminder(
+    reminder_id: int,
+    request: Request,
+    current_user: models.User = Depends(deps.get_current_active_user),
+    db: AsyncSession = Depends(deps.get_db),
+) -> Any:
+    """Get a specific reminder by id.
 
-@router.put("/{reminder_id}", response_model=schemas.ReminderResponse)
-def update_reminder(
+    The response carries an ETag, and with a matching ``If-None-Match`` it
+    is 304. Superusers get no ETag: they can read other users' reminders,
+    which their own version does not cover.
+    """
+    etag = None if current_user.is_superuser else await calendar_etag(db, request, current_user.id)
+    if etag is not None and if_none_match(request, etag):
+        return not_modified(etag)
+    reminder = await reminder_repository.get(db, reminder_id, current_user)
+    return FastJSONResponse(reminder_row_to_dict(reminder), headers={"ETag": etag} if etag else None)
+
+@router.put("/{reminder_id}", response_model=schemas.ReminderResponse, response_class=FastJSONResponse)
+async def update_reminder(
     reminder_id: int,
     reminder_in: schemas.ReminderUpdate,
     current_user: models.User = Depends(deps.get_current_active_user),
-    db: Session = Depends(deps.get_db),
+    db: AsyncSession = Depends(deps.get_db),
 ) -> Any:
     """Update a reminder."""
-    reminder = db.query(models.Reminder).filter(models.Reminder.id == reminder_id).first()
-    if not reminder:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Reminder not found",
-        )
-    
-    # Check if the current user is the owner of the reminder
-    if reminder.owner_id != current_user.id and not current_user.is_superuser:
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Not enough permissions to update this reminder",
-        )
-    
     # If event_id is being updated, verify the new event exists and belongs to the user
-    if reminder_in.event_id is not None and reminder_in.event_id != reminder.event_id:
-        event = db.query(models.Event).filter(models.Event.id == reminder_in.event_id).first()
-        if not event:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail="Event not found",
-            )
-        if event.owner_id != current_user.id and not current_user.is_superuser:
-            raise HTTPException(
-                status_code=status.HTTP_403_FORBIDDEN,
-                detail="Not enough permissions to associate with this event",
-            )
-    
-    # Update reminder data
-    update_data = reminder_in.dict(exclude_unset=True)
-    for field, value in update_data.items():
-        setattr(reminder, field, value)
-    
-    # If status is being updated to SENT, set sent_at to current time
-    if reminder_in.status == schemas.ReminderStatus.SENT and reminder.status != schemas.ReminderStatus.SENT:
-        reminder.sent_at = datetime.utcnow()
+    if reminder_in.event_id is not None:
+        await event_repository.check(db, reminder_in.event_id, current_user, "associate with")
     
-    reminder.updated_at = datetime.utcnow()
-    db.add(reminder)
-    db.commit()
-    db.refresh(reminder)
-    return reminder
-
-@router.delete("/{reminder_id}", response_model=schemas.ReminderResponse)
-def delete_reminder(
+    reminder = await _update_reminder(
+        db, reminder_id, current_user, _to_model_enums(reminder_in.dict(exclude_unset=True))
+    )
+    await db.commit()
+    if reminder["status"] == models.ReminderStatus.PENDING:
+        reminder_dispatcher.schedule(reminder["id"], reminder["reminder_time"])
+    push_hub.publish([(reminder["owner_id"], "reminder", "updated", reminder["id"])])
+    return FastJSONResponse(reminder_row_to_dict(reminder))
+
+@router.delete("/{reminder_id}", response_model=schemas.ReminderResponse, response_class=FastJSONResponse)
+async def delete_reminder(
     reminder_id: int,
     current_user: models.User = Depends(deps.get_current_active_user),
-    db: Session = Depends(deps.get_db),
+    db: AsyncSession = Depends(deps.get_db),
 ) -> Any:
     """Delete a reminder."""
-    reminder = db.query(models.Reminder).filter(models.Reminder.id == reminder_id).first()
-    if not reminder:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Reminder not found",
-        )
-    
-    # Check if the current user is the owner of the reminder
-    if reminder.owner_id != current_user.id and not current_user.is_superuser:
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Not enough permissions to delete this reminder",
-        )
-    
-    db.delete(reminder)
-    db.commit()
-    return reminder
+    reminder = await reminder_repository.delete(db, reminder_id, current_user)
+    await db.commit()
+    push_hub.publish([(reminder["owner_id"], "reminder", "deleted", reminder_id)])
+    return FastJSONResponse(reminder_row_to_dict(reminder))
@@ -0,0 +1,28 @@
+from typing import Any, Optional
+
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app import models, schemas
+from app.api import deps
+from app.core.serialization import FastJSONResponse
+from app.core.sync import MAX_CHANGES, changes_since
+
+router = APIRouter()
+
+@router.get("/", response_model=schemas.SyncResponse, response_class=FastJSONResponse)
+async def sync(
+    cursor: Optional[str] = None,
+    limit: int = Query(MAX_CHANGES, ge=1, le=MAX_CHANGES),
+    db: AsyncSession = Depends(deps.get_db),
+    current_user: models.User = Depends(deps.get_current_active_user),
+) -> Any:
+    """Get the current user's events and reminders changed since ``cursor``.
+
+    Without a cursor everything is returned. Deleted rows are listed in
+    ``deleted``; apply them before the events and reminders of the same
+    response, which may reuse their ids. Pass the returned ``cursor`` to
+    the next call, and call again at once while ``has_more`` is set. A
+    cursor stays valid for as long as the account exists.
+    """
+    return FastJSONResponse(await changes_since(db, current_user.id, cursor, limit))
@@ -1,40 +1,71 @@
-from typing import Any, List
+from datetime import datetime
+from typing import Any, List, Optional, Union
 
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
+from sqlalchemy import func, select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from app import models, schemas
 from app.api import deps
-from app.core.security import get_password_hash
+from app.core.etag import if_none_match, make_etag, not_modified
+from app.core.pagination import KeysetPage
+from app.core.purge import purge_job
+from app.core.repository import user_repository
+from app.core.security import password_hasher
+from app.core.user_cache import user_cache
+from app.core.utils import format_link_header, get_cursor_links
 
 router = APIRouter()
 
-@router.get("/", response_model=List[schemas.UserResponse])
-def read_users(
-    db: Session = Depends(deps.get_db),
+@router.get("/", response_model=Union[List[schemas.UserResponse], schemas.Page[schemas.UserResponse]])
+async def read_users(
+    request: Request,
+    response: Response,
+    db: AsyncSession = Depends(deps.get_db),
     skip: int = 0,
     limit: int = 100,
+    cursor: Optional[str] = None,
     current_user: models.User = Depends(deps.get_current_active_superuser),
 ) -> Any:
-    """Retrieve users (admin only)."""
-    users = db.query(models.User).offset(skip).limit(limit).all()
+    """Retrieve users (admin only), paginated by id."""
+    page = KeysetPage([models.User.id], cursor, limit, skip)
+    users, next_cursor, prev_cursor = page.paginate(
+        (await db.execute(page.apply(select(models.User)))).scalars().all()
+    )
+    
+    link_header = format_link_header(get_cursor_links(request.url, next_cursor, prev_cursor))
+    if link_header:
+        response.headers["Link"] = link_header
+    if cursor is not None:
+        return {"items": users, "next_cursor": next_cursor, "prev_cursor": prev_cursor}
     return users
 
 @router.get("/me", response_model=schemas.UserResponse)
-def read_user_me(
+async def read_user_me(
+    request: Request,
+    response: Response,
     current_user: models.User = Depends(deps.get_current_active_user),
 ) -> Any:
-    """Get current user."""
+    """Get current user.
+
+    With a matching ``If-None-Match`` the response is 304.
+    """
+    # Every update of the user sets updated_at
+    etag = make_etag(current_user.id, current_user.updated_at.isoformat())
+    if if_none_match(request, etag):
+        return not_modified(etag)
+    response.headers["ETag"] = etag
     return current_user
 
 @router.get("/{user_id}", response_model=schemas.UserResponse)
-def read_user_by_id(
+async def read_user_by_id(
     user_id: int,
     current_user: models.User = Depends(deps.get_current_active_user),
-    db: Session = Depends(deps.get_db),
+    db: AsyncSession = Depends(deps.get_db),
 ) -> Any:
     """Get a specific user by id."""
-    user = db.query(models.User).filter(models.User.id == user_id).first()
+    user = await db.get(models.User, user_id)
     if user is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -49,54 +80,53 @@ def read_user_by_id(
     return user
 
 @router.put("/me", response_model=schemas.UserResponse)
-def update_user_me(
+async def update_user_me(
     user_in: schemas.UserUpdate,
     current_user: models.User = Depends(deps.get_current_active_user),
-    db: Session = Depends(deps.get_db),
+    db: AsyncSession = Depends(deps.get_db),
 ) -> Any:
     """Update own user."""
-    if user_in.email and user_in.email != current_user.email:
-        # Check if email is already taken
-        existing_user = db.query(models.User).filter(models.User.email == user_in.email).first()
-        if existing_user:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="Email already registered",
-            )
-    
-    # Update user data
     user_data = user_in.dict(exclude_unset=True)
     if "password" in user_data:
-        user_data["hashed_password"] = get_password_hash(user_data.pop("password"))
-    
-    for field, value in user_data.items():
-        setattr(current_user, field, value)
+        user_data["hashed_password"] = await password_hasher.hash(user_data.pop("password"))
     
-    db.add(current_user)
-    db.commit()
-    db.refresh(current_user)
-    return current_user
+    # The unique index on email catches addresses that are already taken
+    try:
+        user = await user_repository.update(db, current_user.id, current_user, user_data)
+    except IntegrityError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Email already registered",
+        )
+    await db.commit()
+    user_cache.invalidate(current_user.id)
+    return user
 
-@router.delete("/{user_id}", response_model=schemas.UserResponse)
-def delete_user(
+@router.delete("/{user_id}", response_model=schemas.UserResponse, status_code=status.HTTP_202_ACCEPTED)
+async def delete_user(
     user_id: int,
     current_user: models.User = Depends(deps.get_current_active_user),
-    db: Session = Depends(deps.get_db),
+    db: AsyncSession = Depends(deps.get_db),
 ) -> Any:
-    """Delete a user (admin only)."""
+    """Delete a user (admin only).
+
+    The account is deactivated at once and queued for deletion; its events,
+    reminders and archived rows, then the user, are purged in the background
+    (app.core.purge).
+    """
     if not current_user.is_superuser:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Not enough permissions",
         )
     
-    user = db.query(models.User).filter(models.User.id == user_id).first()
-    if not user:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="User not found",
-        )
-    
-    db.delete(user)
-    db.commit()
+    users = models.User.__table__
+    user = await user_repository.update(db, user_id, current_user, {
+        "is_active": False,
+        # Deleting twice keeps the account's place in the queue
+        "deleted_at": func.coalesce(users.c.deleted_at, datetime.utcnow()),
+    }, action="delete")
+    await db.commit()
+    user_cache.invalidate(user_id)
+    purge_job.wake()
     return user
@@ -1,47 +1,48 @@
-from typing import Generator, Optional
+from typing import Optional
 
-from fastapi import Depends, HTTPException, status
+from fastapi import Depends, HTTPException, Query, status
 from fastapi.security import OAuth2PasswordBearer
 from jose import jwt
 from pydantic import ValidationError
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from app import models, schemas
 from app.core import security
 from app.core.config import get_settings
-from app.core.database import SessionLocal
+from app.core.database import get_async_db
+from app.core.user_cache import user_cache
 
 settings = get_settings()
 
-def get_db() -> Generator:
-    """Get database session."""
-    try:
-        db = SessionLocal()
-        yield db
-    finally:
-        db.close()
+# Async database session dependency shared by all API routers
+get_db = get_async_db
 
-def get_current_user(
-    db: Session = Depends(get_db), token: str = Depends(security.oauth2_scheme)
+async def get_current_user(
+    db: AsyncSession = Depends(get_db), token: str = Depends(security.oauth2_scheme)
 ) -> models.User:
     """Get current active user from JWT token."""
     try:
-        payload = jwt.decode(
-            token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM]
-        )
+        payload = security.verify_token(token)
         token_data = schemas.TokenPayload(**payload)
     except (jwt.JWTError, ValidationError):
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Could not validate credentials",
         )
-    
-    user = db.query(models.User).filter(models.User.id == token_data.sub).first()
+
+    user = user_cache.get(token_data.sub)
+    if user is not None:
+        # Copy into the session as clean state, without a SELECT: only what
+        # a handler then changes on the copy is flushed
+        return await db.merge(user, load=False)
+
+    user = await db.get(models.User, token_data.sub)
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
+    user_cache.set(user)
     return user
 
-def get_current_active_user(
+async def get_current_active_user(
     current_user: models.User = Depends(get_current_user),
 ) -> models.User:
     """Get current active user."""
@@ -49,13 +50,26 @@ def get_current_active_user(
         raise HTTPException(status_code=400, detail="Inactive user")
     return current_user
 
-def get_current_active_superuser(
+async def get_current_active_superuser(
     current_user: models.User = Depends(get_current_user),
 ) -> models.User:
     """Get current active superuser."""
     if not current_user.is_superuser:
         raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN, 
+            status_code=status.HTTP_403_FORBIDDEN,
             detail="The user doesn't have enough privileges"
         )
-    return current_user
\ No newline at end of file
+    return current_user
+
+async def get_stream_user(
+    db: AsyncSession = Depends(get_db), access_token: str = Query(...)
+) -> models.User:
+    """Get the active user of a push stream from the ``access_token`` query parameter.
+
+    Browsers cannot send an Authorization header with EventSource or
+    WebSocket. The session is closed before the stream starts, so open
+    streams hold no database connection.
+    """
+    user = await get_current_active_user(await get_current_user(db, access_token))
+    await db.close()
+    return user
@@ -0,0 +1,233 @@
+"""Hot/cold archival of old events and reminders.
+
+Events that ended more than ``ARCHIVE_AFTER_DAYS`` ago, and reminders past
+that horizon that are SENT or DEAD_LETTER, are moved to ``events_archive``
+and ``reminders_archive``. Owner-scoped listings then only touch recent rows
+unless they ask for ``include_archived``.
+
+Rows move in chunks of ``ARCHIVE_BATCH_SIZE``. Each chunk is copied and
+deleted in one transaction, and the selection depends only on the data, so
+an interrupted run leaves no partial chunk behind and the next run carries
+on from where it stopped. Each chunk then advances its owners' change
+sequences (app.core.sync), whose listings it changed, and drops their
+conflict trees and free/busy windows, which still hold the moved events.
+Run it in the background (``ARCHIVE_ENABLED``) or from cron with
+``python -m app.core.archive``.
+"""
+import asyncio
+import logging
+import time
+from datetime import datetime, timedelta
+from typing import Any, Dict, Iterable, Optional
+
+from sqlalchemy import delete, exists, insert, literal, select, union_all
+from sqlalchemy.sql import FromClause
+from sqlalchemy.sql.schema import Table
+
+from . import database
+from .config import get_settings
+from .conflicts import conflict_index
+from .freebusy import freebusy_cache
+from .sync import advance
+from ..models import DeliveryAttempt, Event, Reminder, ReminderStatus, events_archive, reminders_archive
+
+logger = logging.getLogger(__name__)
+
+# Reminders that still have deliveries ahead of them stay hot
+OUTSTANDING = (ReminderStatus.PENDING, ReminderStatus.FAILED)
+FINISHED = (ReminderStatus.SENT, ReminderStatus.DEAD_LETTER)
+
+
+def with_archive(table: Table, include_archived: bool) -> FromClause:
+    """Return the hot table, or the union of it and its archive.
+
+    Either way the result has exactly the columns of the hot table, so
+    callers filter and order it the same way.
+    """
+    if not include_archived:
+        return table
+    archive = events_archive if table is Event.__table__ else reminders_archive
+    return union_all(
+        select(table),
+        select(*[archive.c[column.name] for column in table.columns]),
+    ).subquery(f"{table.name}_all")
+
+
+def _copy(source: Table, archive: Table, where: Any, now: datetime):
+    names = [column.name for column in source.columns]
+    return insert(archive).from_select(
+        names + ["archived_at"],
+        select(*[source.c[name] for name in names], literal(now, archive.c.archived_at.type)).where(where),
+    )
+
+
+class ArchiveJob:
+    """Move old rows to the archive tables in batched, resumable chunks."""
+
+    def __init__(self, after_days: int = 365, batch_size: int = 1000, interval: float = 3600.0) -> None:
+        self.after_days = after_days
+        self.batch_size = batch_size
+        self.interval = interval
+        self.counters: Dict[str, int] = {"events": 0, "reminders": 0, "chunks": 0, "runs": 0, "errors": 0}
+        self.last_run_at: Optional[datetime] = None
+        self._task: Optional[asyncio.Task] = None
+
+    async def _advance_owners(self, owner_ids: Iterable[int]) -> None:
+        # The owners' listings changed, so their versions (and ETags, see
+        # app.core.etag) must too. Advanced once the move has committed, so
+        # user rows are locked before their events and reminders, never after
+        owner_ids = set(owner_ids)
+        async with database.AsyncSessionLocal() as session:
+            async with session.begin():
+                await advance(session, owner_ids)
+        for owner_id in owner_ids:
+            conflict_index.invalidate(owner_id)
+            freebusy_cache.invalidate(owner_id)
+
+    async def _archive_events_chunk(self, cutoff: datetime) -> int:
+        events = Event.__table__
+        reminders = Reminder.__table__
+        async with database.AsyncSessionLocal() as session:
+            async with session.begin():
+                now = datetime.utcnow()
+                rows = (await session.execute(
+                    select(events.c.id, events.c.owner_id)
+                    .where(events.c.end_time < cutoff)
+                    # A series is one row however long it runs; it stays hot
+                    .where(events.c.recurrence_rule.is_(None))
+                    .where(~exists().where(
+                        reminders.c.event_id == events.c.id,
+                        reminders.c.status.in_(OUTSTANDING),
+                    ))
+                    .order_by(events.c.id)
+                    .limit(self.batch_size)
+                    .with_for_update(skip_locked=True)
+                )).all()
+                if not rows:
+                    return 0
+                ids = [row.id for row in rows]
+
+                # An event takes all of its reminders along
+                owned = reminders.c.event_id.in_(ids)
+                await session.execute(_copy(reminders, reminders_archive, owned, now))
+                await session.execute(
+                    delete(DeliveryAttempt.__table__)
+                    .where(DeliveryAttempt.reminder_id.in_(select(reminders.c.id).where(owned)))
+                )
+                result = await session.execute(delete(reminders).where(owned))
+                await session.execute(_copy(events, events_archive, events.c.id.in_(ids), now))
+                await session.execute(delete(events).where(events.c.id.in_(ids)))
+        await self._advance_owners(row.owner_id for row in rows)
+        self.counters["events"] += len(ids)
+        self.counters["reminders"] += result.rowcount
+        return len(ids)
+
+    async def _archive_reminders_chunk(self, cutoff: datetime) -> int:
+        reminders = Reminder.__table__
+        async with database.AsyncSessionLocal() as session:
+            async with session.begin():
+                now = datetime.utcnow()
+                rows = (await session.execute(
+                    select(reminders.c.id, reminders.c.owner_id)
+                    .where(reminders.c.status.in_(FINISHED))
+                    .where(reminders.c.reminder_time < cutoff)
+                    .order_by(reminders.c.id)
+                    .limit(self.batch_size)
+                    .with_for_update(skip_locked=True)
+                )).all()
+                if not rows:
+                    return 0
+                ids = [row.id for row in rows]
+
+                chunk = reminders.c.id.in_(ids)
+                await session.execute(_copy(reminders, reminders_archive, chunk, now))
+                await session.execute(
+                    delete(DeliveryAttempt.__table__).where(DeliveryAttempt.reminder_id.in_(ids))
+                )
+                await session.execute(delete(reminders).where(chunk))
+        await self._advance_owners(row.owner_id for row in rows)
+        self.counters["reminders"] += len(ids)
+        return len(ids)
+
+    async def run_once(self) -> Dict[str, int]:
+        """Archive everything past the horizon, one chunk at a time.
+
+        Returns:
+            dict: Number of events and reminders archived by this run
+        """
+        if database.AsyncSessionLocal is None:
+            database.initialize_async_database()
+        cutoff = datetime.utcnow() - timedelta(days=self.after_days)
+        archived = {"events": 0, "reminders": 0}
+        for kind, archive_chunk in (
+            ("events", self._archive_events_chunk),
+            ("reminders", self._archive_reminders_chunk),
+        ):
+            while True:
+                moved = await archive_chunk(cutoff)
+                if not moved:
+                    break
+                archived[kind] += moved
+                self.counters["chunks"] += 1
+        self.counters["runs"] += 1
+        self.last_run_at = datetime.utcnow()
+        logger.info(f"Archived {archived['events']} events and {archived['reminders']} standalone reminders")
+        return archived
+
+    async def _run(self) -> None:
+        while True:
+            started = time.monotonic()
+            try:
+                await self.run_once()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self.counters["errors"] += 1
+                logger.error(f"Archival run failed: {str(e)}")
+            await asyncio.sleep(max(0.0, self.interval - (time.monotonic() - started)))
+
+    def start(self) -> None:
+        """Run the job every ``interval`` seconds on the running event loop."""
+        if self._task is not None and not self._task.done():
+            return
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            logger.warning("No running event loop, archival job not started")
+            return
+        self._task = loop.create_task(self._run())
+        logger.info(f"Archival job started (horizon: {self.after_days} days)")
+
+    async def stop(self) -> None:
+        """Stop the background job."""
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    def stats(self) -> Dict[str, Any]:
+        """Return the job settings and counters."""
+        return {
+            "running": self._task is not None and not self._task.done(),
+            "after_days": self.after_days,
+            "batch_size": self.batch_size,
+            "last_run_at": self.last_run_at.isoformat() if self.last_run_at else None,
+            "counters": dict(self.counters),
+        }
+
+
+settings = get_settings()
+archive_job = ArchiveJob(
+    after_days=settings.ARCHIVE_AFTER_DAYS,
+    batch_size=settings.ARCHIVE_BATCH_SIZE,
+    interval=settings.ARCHIVE_INTERVAL,
+)
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    print(asyncio.run(archive_job.run_once()))
@@ -0,0 +1,125 @@
+"""Common availability of a group of users.
+
+The group is free wherever no member is busy. The single events of all
+members are read in one owner-IN query, in start order, and streamed in
+batches; on PostgreSQL the range index serves the overlap condition.
+Recurring series are expanded into one start-ordered stream each, and the
+streams are combined with a heap-based k-way merge (``heapq.merge``). A
+sweep over the merged stream emits the gaps between busy intervals as
+common free windows, so whatever the group's size or calendars, only one
+batch of rows is held at a time.
+"""
+import heapq
+from itertools import chain
+from datetime import datetime, timedelta
+from typing import AsyncIterator, Dict, Iterable, Iterator, List, Sequence, Tuple
+
+from sqlalchemy import and_, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from .conflicts import USE_RANGE_INDEX, find_occurrences, is_active, overlaps
+from ..models import Event
+
+Interval = Tuple[datetime, datetime]
+
+# Rows fetched per round trip while streaming busy intervals
+STREAM_BATCH_SIZE = 1000
+
+
+async def _stream_busy(
+    db: AsyncSession, user_ids: Sequence[int], start: datetime, end: datetime
+) -> AsyncIterator[List[Interval]]:
+    # Batches of the members' single events, in start order
+    events = Event.__table__
+    if USE_RANGE_INDEX:
+        overlapping = overlaps(events, start, end)
+    else:
+        overlapping = and_(events.c.start_time < end, events.c.end_time > start)
+    query = (
+        select(events.c.start_time, events.c.end_time)
+        .where(events.c.owner_id.in_(user_ids))
+        .where(events.c.recurrence_rule.is_(None))
+        .where(is_active(events))
+        .where(overlapping)
+        .order_by(events.c.start_time)
+        .execution_options(yield_per=STREAM_BATCH_SIZE)
+    )
+    result = await db.stream(query)
+    try:
+        async for rows in result.partitions(STREAM_BATCH_SIZE):
+            yield [(row[0], row[1]) for row in rows]
+    finally:
+        await result.close()
+
+
+class _Sweep:
+    """Collects the gaps between start-ordered busy intervals."""
+
+    def __init__(self, start: datetime, end: datetime, min_duration: timedelta) -> None:
+        self.cursor = start
+        self.end = end
+        self.min_duration = min_duration
+        self.free: List[Interval] = []
+
+    def feed(self, intervals: Iterable[Interval]) -> bool:
+        """Consume intervals; False once the window is exhausted."""
+        cursor, end, min_duration, free = self.cursor, self.end, self.min_duration, self.free
+        for busy_start, busy_end in intervals:
+            if busy_start > cursor and busy_start - cursor >= min_duration:
+                free.append((cursor, busy_start))
+            if busy_end > cursor:
+                cursor = busy_end
+                if cursor >= end:
+                    break
+        self.cursor = cursor
+        return cursor < end
+
+    def finish(self) -> List[Interval]:
+        if self.end > self.cursor and self.end - self.cursor >= self.min_duration:
+            self.free.append((self.cursor, self.end))
+        return self.free
+
+
+async def group_free_windows(
+    db: AsyncSession,
+    user_ids: Sequence[int],
+    start: datetime,
+    end: datetime,
+    min_duration: timedelta = timedelta(0),
+) -> List[Interval]:
+    """Find the windows in [start, end) where none of the users is busy.
+
+    Args:
+        db: Database session
+        user_ids: Members of the group
+        start: Start of the window
+        end: End of the window
+        min_duration: Shortest free window to report
+
+    Returns:
+        list: (start, end) of the common free windows, in order
+    """
+    # Recurring series are few; each one's occurrences are a sorted stream
+    by_series: Dict[int, List[Interval]] = {}
+    for occurrence in await find_occurrences(db, user_ids, start, end):
+        by_series.setdefault(occurrence["id"], []).append((occurrence["start_time"], occurrence["end_time"]))
+    streams: List[Iterator[Interval]] = [iter(sorted(intervals)) for intervals in by_series.values()]
+    sweep = _Sweep(start, end, min_duration)
+
+    local = heapq.merge(*streams)
+    pending = next(local, None)
+    batches = _stream_busy(db, user_ids, start, end)
+    try:
+        async for batch in batches:
+            # Merge in the occurrences up to the batch's last start
+            ahead = []
+            while pending is not None and pending[0] <= batch[-1][0]:
+                ahead.append(pending)
+                pending = next(local, None)
+            if not sweep.feed(heapq.merge(batch, ahead)):
+                return sweep.finish()
+    finally:
+        await batches.aclose()
+    if pending is not None:
+        sweep.feed(chain([pending], local))
+    return sweep.finish()
@@ -0,0 +1,131 @@
+"""Batched writes for the ``:batch`` endpoints.
+
+A batch is a list of create, update and delete operations. Every item is
+validated first and the rows the batch touches are loaded, and checked for
+ownership, with one query per table; all valid items are then written in
+one transaction. New rows are inserted with one multi-row
+``INSERT ... RETURNING id`` per chunk where the database supports it
+(PostgreSQL) and one INSERT each otherwise.
+
+In atomic mode any failing item fails the whole batch and nothing is
+written. In best-effort mode the valid items are written and the others
+are reported, each with the status code a single call would have returned.
+"""
+from typing import Any, Dict, List, Mapping, Optional, Sequence, Type
+
+from fastapi import HTTPException, status
+from pydantic import BaseModel, ValidationError
+from sqlalchemy import Table, insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from .config import get_settings
+from .database import supports_returning
+from .serialization import FastJSONResponse
+
+# Rows per multi-row INSERT, well below the drivers' bind parameter limits
+INSERT_CHUNK_SIZE = 500
+
+
+class BatchResults:
+    """Parsed items of a batch and the outcome of each, in request order.
+
+    Items are ``schemas.BatchItem``: an ``op`` of create, update or delete,
+    the ``id`` of the row to update or delete, and the ``data`` to parse
+    with the create or update schema.
+    """
+
+    def __init__(
+        self,
+        items: Sequence[Any],
+        create_schema: Type[BaseModel],
+        update_schema: Type[BaseModel],
+    ) -> None:
+        if len(items) > settings.BATCH_MAX_ITEMS:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Batches are limited to {settings.BATCH_MAX_ITEMS} items",
+            )
+        self.items = items
+        self.results: List[Dict[str, Any]] = [
+            {"index": index, "op": item.op.value, "status": None, "id": item.id, "error": None}
+            for index, item in enumerate(items)
+        ]
+        self.parsed: List[Optional[BaseModel]] = [None] * len(items)
+
+        seen = set()
+        for index, item in enumerate(items):
+            if item.op == "create":
+                self._parse(index, create_schema, item.data)
+                continue
+            if item.id is None:
+                self.fail(index, status.HTTP_400_BAD_REQUEST, f"An id is required to {item.op.value}")
+            elif item.id in seen:
+                self.fail(index, status.HTTP_400_BAD_REQUEST, "Only one operation per id is allowed")
+            else:
+                seen.add(item.id)
+                if item.op == "update":
+                    self._parse(index, update_schema, item.data)
+
+    def _parse(self, index: int, schema: Type[BaseModel], data: Mapping[str, Any]) -> None:
+        try:
+            self.parsed[index] = schema.parse_obj(data)
+        except ValidationError as exc:
+            self.fail(index, status.HTTP_422_UNPROCESSABLE_ENTITY, exc.errors())
+
+    def target_ids(self) -> List[int]:
+        """Ids of the rows the valid updates and deletes touch."""
+        return [item.id for index, item in enumerate(self.items) if item.id is not None and self.ok(index)]
+
+    def ok(self, index: int) -> bool:
+        return self.results[index]["error"] is None
+
+    @property
+    def failed(self) -> bool:
+        return any(result["error"] is not None for result in self.results)
+
+    def fail(self, index: int, status_code: int, error: Any) -> None:
+        self.results[index].update(status=status_code, error=error)
+
+    def succeed(self, index: int, status_code: int, row_id: int) -> None:
+        self.results[index].update(status=status_code, id=row_id)
+
+    def check_owner(self, index: int, row: Any, user: Any, noun: str) -> bool:
+        """Fail the item unless the row exists and the user may change it."""
+        if row is None:
+            self.fail(index, status.HTTP_404_NOT_FOUND, f"{noun} not found")
+            return False
+        if row.owner_id != user.id and not user.is_superuser:
+            self.fail(
+                index,
+                status.HTTP_403_FORBIDDEN,
+                f"Not enough permissions to {self.items[index].op.value} this {noun.lower()}",
+            )
+            return False
+        return True
+
+    def response(self, atomic: bool) -> FastJSONResponse:
+        """Render the results; a failed atomic batch is a 400 with nothing applied."""
+        if atomic and self.failed:
+            for result in self.results:
+                if result["error"] is None:
+                    result.update(status=status.HTTP_424_FAILED_DEPENDENCY, error="Not applied: another item failed")
+            return FastJSONResponse({"results": self.results}, status_code=status.HTTP_400_BAD_REQUEST)
+        return FastJSONResponse({"results": self.results})
+
+
+async def insert_returning_ids(db: AsyncSession, table: Table, rows: Sequence[Mapping[str, Any]]) -> List[int]:
+    """Insert rows, all with the same keys, and return their ids in order."""
+    if not supports_returning(db):
+        statement = insert(table)
+        return [(await db.execute(statement, row)).inserted_primary_key[0] for row in rows]
+    ids: List[int] = []
+    for offset in range(0, len(rows), INSERT_CHUNK_SIZE):
+        result = await db.execute(
+            insert(table).values(list(rows[offset:offset + INSERT_CHUNK_SIZE])).returning(table.c.id)
+        )
+        # RETURNING order is unspecified, but ids are drawn in VALUES order
+        ids += sorted(result.scalars().all())
+    return ids
+
+
+settings = get_settings()
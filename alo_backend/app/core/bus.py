@@ -0,0 +1,150 @@
+"""Pub/sub message bus shared by the worker processes.
+
+``LocalBus`` delivers messages inside the current process and is the default
+for single-worker deployments. When ``REDIS_URL`` is configured ``RedisBus``
+fans messages out to every worker through Redis pub/sub; any server speaking
+the Redis protocol works (see the ``redis`` service in docker-compose.yml).
+"""
+import asyncio
+import logging
+from collections import defaultdict
+from typing import Callable, Dict, List, Optional
+
+from .config import get_settings
+
+logger = logging.getLogger(__name__)
+
+try:
+    import redis.asyncio as aioredis
+except ImportError:
+    aioredis = None
+
+Handler = Callable[[str], None]
+
+
+class LocalBus:
+    """In-process bus; publishing calls the local subscribers directly."""
+
+    def __init__(self) -> None:
+        self._handlers: Dict[str, List[Handler]] = defaultdict(list)
+
+    def subscribe(self, channel: str, handler: Handler) -> None:
+        """Register a handler for messages on ``channel``."""
+        self._handlers[channel].append(handler)
+
+    def _dispatch(self, channel: str, message: str) -> None:
+        for handler in list(self._handlers.get(channel, [])):
+            try:
+                handler(message)
+            except Exception as e:
+                logger.error(f"Error handling message on {channel}: {str(e)}")
+
+    async def publish(self, channel: str, message: str) -> None:
+        """Deliver a message to every subscriber of ``channel``."""
+        self._dispatch(channel, message)
+
+    def publish_nowait(self, channel: str, message: str) -> None:
+        """Publish from synchronous code."""
+        self._dispatch(channel, message)
+
+    def start(self) -> None:
+        """Nothing to start for the in-process bus."""
+
+    async def stop(self) -> None:
+        """Nothing to stop for the in-process bus."""
+
+
+class RedisBus(LocalBus):
+    """Bus that fans messages out to every worker over Redis pub/sub.
+
+    Messages published by this worker come back through the subscription, so
+    local subscribers are reached the same way as remote ones.
+    """
+
+    def __init__(self, url: str, reconnect_delay: float = 1.0) -> None:
+        super().__init__()
+        self._redis = aioredis.from_url(url, decode_responses=True)
+        self._reconnect_delay = reconnect_delay
+        self._task: Optional[asyncio.Task] = None
+
+    def subscribe(self, channel: str, handler: Handler) -> None:
+        super().subscribe(channel, handler)
+        # Resubscribe a running listener so it picks up the new channel
+        if self._task is not None and not self._task.done():
+            self._task.cancel()
+            self._task = None
+            self.start()
+
+    async def publish(self, channel: str, message: str) -> None:
+        await self._redis.publish(channel, message)
+
+    def publish_nowait(self, channel: str, message: str) -> None:
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            # Outside the event loop (scripts, sync code) only this process hears it
+            self._dispatch(channel, message)
+            return
+        loop.create_task(self._publish_or_log(channel, message))
+
+    async def _publish_or_log(self, channel: str, message: str) -> None:
+        try:
+            await self.publish(channel, message)
+        except Exception as e:
+            # Nobody awaits it; redis-py reconnects on the next publish
+            logger.error(f"Error publishing message on {channel}: {str(e)}")
+
+    async def _listen(self) -> None:
+        while True:
+            pubsub = self._redis.pubsub()
+            try:
+                await pubsub.subscribe(*self._handlers.keys())
+                async for message in pubsub.listen():
+                    if message["type"] == "message":
+                        self._dispatch(message["channel"], message["data"])
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Redis bus connection lost: {str(e)}")
+                await asyncio.sleep(self._reconnect_delay)
+            finally:
+                await pubsub.close()
+
+    def start(self) -> None:
+        """Start listening for messages on the running event loop."""
+        if self._task is not None and not self._task.done():
+            return
+        if not self._handlers:
+            return
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            logger.warning("No running event loop, Redis bus not started")
+            return
+        self._task = loop.create_task(self._listen())
+
+    async def stop(self) -> None:
+        """Stop listening and close the Redis connection."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        await self._redis.close()
+
+
+def create_bus() -> LocalBus:
+    """Create the configured message bus, falling back to the local bus."""
+    url = get_settings().REDIS_URL
+    if not url:
+        return LocalBus()
+    if aioredis is None:
+        logger.warning("REDIS_URL is set but redis is not installed, using the in-process bus")
+        return LocalBus()
+    logger.info("Using Redis message bus")
+    return RedisBus(url)
+
+
+message_bus = create_bus()
@@ -0,0 +1,98 @@
+"""Circuit breaker guarding the database during outages.
+
+After ``failure_threshold`` consecutive connection failures the circuit opens
+and requests fail fast instead of piling up on a dead database. Once
+``reset_timeout`` seconds have passed a single probe request is let through
+(half-open); its outcome closes the circuit or opens it again.
+"""
+import logging
+import math
+import threading
+import time
+from typing import Any, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class CircuitBreaker:
+    """Thread-safe closed/open/half-open circuit breaker."""
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 30.0) -> None:
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = self.CLOSED
+        self.failures = 0
+        self.opened_at: Optional[float] = None
+        self.counters: Dict[str, int] = {"opened": 0, "probes": 0, "rejected": 0}
+        self._probe_in_flight = False
+        self._lock = threading.Lock()
+
+    def allow_request(self) -> bool:
+        """Check whether a request may use the database right now.
+
+        Returns:
+            bool: False while the circuit is open or a half-open probe is running
+        """
+        with self._lock:
+            if self.state == self.CLOSED:
+                return True
+            if self.state == self.OPEN and time.monotonic() - self.opened_at >= self.reset_timeout:
+                logger.info("Database circuit half-open, letting a probe request through")
+                self.state = self.HALF_OPEN
+                self._probe_in_flight = False
+            if self.state == self.HALF_OPEN and not self._probe_in_flight:
+                self._probe_in_flight = True
+                self.counters["probes"] += 1
+                return True
+            self.counters["rejected"] += 1
+            return False
+
+    def record_success(self) -> None:
+        """Record a request that completed without a connection failure."""
+        with self._lock:
+            if self.state != self.CLOSED:
+                logger.info("Database circuit closed")
+            self.state = self.CLOSED
+            self.failures = 0
+            self.opened_at = None
+            self._probe_in_flight = False
+
+    def record_failure(self) -> bool:
+        """Record a connection failure.
+
+        Returns:
+            bool: True if this failure opened the circuit
+        """
+        with self._lock:
+            self.failures += 1
+            if self.state == self.HALF_OPEN or (
+                self.state == self.CLOSED and self.failures >= self.failure_threshold
+            ):
+                logger.warning(f"Database circuit opened after {self.failures} failure(s)")
+                self.state = self.OPEN
+                self.opened_at = time.monotonic()
+                self._probe_in_flight = False
+                self.counters["opened"] += 1
+                return True
+            return False
+
+    def retry_after(self) -> int:
+        """Seconds until the next half-open probe, for the Retry-After header."""
+        if self.opened_at is None:
+            return 1
+        remaining = self.reset_timeout - (time.monotonic() - self.opened_at)
+        return max(1, math.ceil(remaining))
+
+    def stats(self) -> Dict[str, Any]:
+        """Return the breaker state and counters."""
+        return {
+            "state": self.state,
+            "consecutive_failures": self.failures,
+            "failure_threshold": self.failure_threshold,
+            "reset_timeout_seconds": self.reset_timeout,
+            "counters": dict(self.counters),
+        }
@@ -111,10 +111,95 @@ class Settings(BaseModel):
     def validate_db_url(cls, v):
         return validate_database_url(v)
 
+    # Connection pool sizing (shared by the sync and async engines)
+    DATABASE_POOL_SIZE: int = config('DATABASE_POOL_SIZE', default=5, cast=int)
+    DATABASE_MAX_OVERFLOW: int = config('DATABASE_MAX_OVERFLOW', default=10, cast=int)
+    # Seconds between background validations of idle pooled connections
+    DATABASE_HEALTH_CHECK_INTERVAL: int = config('DATABASE_HEALTH_CHECK_INTERVAL', default=30, cast=int)
+    # Consecutive connection failures before requests fail fast, and seconds
+    # before a half-open probe is allowed through
+    DATABASE_BREAKER_FAILURE_THRESHOLD: int = config('DATABASE_BREAKER_FAILURE_THRESHOLD', default=5, cast=int)
+    DATABASE_BREAKER_RESET_TIMEOUT: int = config('DATABASE_BREAKER_RESET_TIMEOUT', default=30, cast=int)
+
+    # Redis-protocol message bus shared by workers (in-process bus when empty)
+    REDIS_URL: str = config('REDIS_URL', default='')
+
+    # Authenticated-user cache
+    USER_CACHE_TTL: int = config('USER_CACHE_TTL', default=60, cast=int)
+    USER_CACHE_MAX_SIZE: int = config('USER_CACHE_MAX_SIZE', default=10000, cast=int)
+
     # Security
     SECRET_KEY: str = config('SECRET_KEY', default='your-secret-key-here')
     ALGORITHM: str = config('ALGORITHM', default='HS256')
     ACCESS_TOKEN_EXPIRE_MINUTES: int = config('ACCESS_TOKEN_EXPIRE_MINUTES', default=60 * 24 * 7, cast=int)  # 7 days
+    TOKEN_CACHE_MAX_SIZE: int = config('TOKEN_CACHE_MAX_SIZE', default=10000, cast=int)
+
+    # Password hashing: bcrypt cost, and the dedicated pool that runs it
+    # ("thread" or "process"); requests beyond workers + queue get 503
+    BCRYPT_ROUNDS: int = config('BCRYPT_ROUNDS', default=12, cast=int)
+    PASSWORD_HASH_EXECUTOR: str = config('PASSWORD_HASH_EXECUTOR', default='thread')
+    PASSWORD_HASH_WORKERS: int = config('PASSWORD_HASH_WORKERS', default=os.cpu_count() or 1, cast=int)
+    PASSWORD_HASH_QUEUE_SIZE: int = config('PASSWORD_HASH_QUEUE_SIZE', default=32, cast=int)
+
+    # Reminder dispatcher: claim batch size, and how far ahead (seconds) and
+    # how many upcoming reminders are kept in memory between table scans
+    REMINDER_DISPATCHER_ENABLED: bool = config('REMINDER_DISPATCHER_ENABLED', default=True, cast=bool)
+    REMINDER_DISPATCH_BATCH_SIZE: int = config('REMINDER_DISPATCH_BATCH_SIZE', default=500, cast=int)
+    REMINDER_DISPATCH_LOOKAHEAD: int = config('REMINDER_DISPATCH_LOOKAHEAD', default=60, cast=int)
+    REMINDER_DISPATCH_MAX_SCHEDULED: int = config('REMINDER_DISPATCH_MAX_SCHEDULED', default=10000, cast=int)
+    # Seconds a claimed batch stays reserved for its worker; a worker that
+    # dies mid-delivery leaves its reminders to be claimed again after this
+    REMINDER_CLAIM_TIMEOUT: int = config('REMINDER_CLAIM_TIMEOUT', default=300, cast=int)
+
+    # Failed deliveries: attempts before dead-lettering and the exponential
+    # backoff range in seconds
+    REMINDER_MAX_ATTEMPTS: int = config('REMINDER_MAX_ATTEMPTS', default=5, cast=int)
+    REMINDER_RETRY_BASE_DELAY: int = config('REMINDER_RETRY_BASE_DELAY', default=30, cast=int)
+    REMINDER_RETRY_MAX_DELAY: int = config('REMINDER_RETRY_MAX_DELAY', default=3600, cast=int)
+
+    # Notification delivery: workers and queue per channel, and provider
+    # endpoints; reminders of a channel without one stay pending unless stub
+    # transports (development and load tests only) stand in
+    DELIVERY_WORKERS: int = config('DELIVERY_WORKERS', default=4, cast=int)
+    DELIVERY_QUEUE_SIZE: int = config('DELIVERY_QUEUE_SIZE', default=1000, cast=int)
+    DELIVERY_TIMEOUT: int = config('DELIVERY_TIMEOUT', default=10, cast=int)
+    DELIVERY_STUB_TRANSPORTS: bool = config('DELIVERY_STUB_TRANSPORTS', default=False, cast=bool)
+    DELIVERY_STUB_LATENCY_MS: int = config('DELIVERY_STUB_LATENCY_MS', default=0, cast=int)
+    SMTP_URL: str = config('SMTP_URL', default='')
+    SMTP_SENDER: str = config('SMTP_SENDER', default='reminders@alo.local')
+    PUSH_PROVIDER_URL: str = config('PUSH_PROVIDER_URL', default='')
+    SMS_PROVIDER_URL: str = config('SMS_PROVIDER_URL', default='')
+
+    # Archival of old events and finished reminders to the *_archive tables
+    ARCHIVE_ENABLED: bool = config('ARCHIVE_ENABLED', default=False, cast=bool)
+    ARCHIVE_AFTER_DAYS: int = config('ARCHIVE_AFTER_DAYS', default=365, cast=int)
+    ARCHIVE_BATCH_SIZE: int = config('ARCHIVE_BATCH_SIZE', default=1000, cast=int)
+    ARCHIVE_INTERVAL: int = config('ARCHIVE_INTERVAL', default=3600, cast=int)
+
+    # Expanded occurrences of recurring events, cached per (event, window)
+    OCCURRENCE_CACHE_MAX_SIZE: int = config('OCCURRENCE_CACHE_MAX_SIZE', default=10000, cast=int)
+
+    # In-memory interval trees for conflict detection without PostgreSQL range indexes
+    CONFLICT_INDEX_MAX_USERS: int = config('CONFLICT_INDEX_MAX_USERS', default=1000, cast=int)
+
+    # Merged busy blocks, cached per (user, window)
+    FREEBUSY_CACHE_MAX_SIZE: int = config('FREEBUSY_CACHE_MAX_SIZE', default=10000, cast=int)
+
+    # Group availability
+    GROUP_AVAILABILITY_MAX_MEMBERS: int = config('GROUP_AVAILABILITY_MAX_MEMBERS', default=100, cast=int)
+
+    # Batch endpoints (/events:batch, /reminders:batch)
+    BATCH_MAX_ITEMS: int = config('BATCH_MAX_ITEMS', default=1000, cast=int)
+
+    # Purging of deleted accounts in batches
+    PURGE_ENABLED: bool = config('PURGE_ENABLED', default=True, cast=bool)
+    PURGE_BATCH_SIZE: int = config('PURGE_BATCH_SIZE', default=5000, cast=int)
+    PURGE_INTERVAL: int = config('PURGE_INTERVAL', default=300, cast=int)
+
+    # Push of calendar changes over SSE and WebSocket (/push); keepalive in seconds
+    PUSH_ENABLED: bool = config('PUSH_ENABLED', default=True, cast=bool)
+    PUSH_QUEUE_SIZE: int = config('PUSH_QUEUE_SIZE', default=100, cast=int)
+    PUSH_KEEPALIVE: int = config('PUSH_KEEPALIVE', default=15, cast=int)
     
     # CORS
     BACKEND_CORS_ORIGINS: List[AnyHttpUrl] = [
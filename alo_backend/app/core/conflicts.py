@@ -0,0 +1,480 @@
+"""Overlap queries over a user's events.
+
+Two events conflict when their time ranges overlap: ``a.start < b.end`` and
+``a.end > b.start``. On PostgreSQL the single events are found through a
+GiST index on ``(owner_id, tsrange(start_time, end_time))``. Other
+databases have no range index, so each user's single events are loaded
+into an in-memory ``DynamicIntervalTree``, built lazily. Every worker
+applies each committed write to it in O(log n) amortized, in the order of
+the events' change sequences (app.core.sync); bulk changes such as
+archival drop it instead. An overlap query costs O(log n + k) in the user's
+event count on PostgreSQL and O(log² n + k) with the trees.
+
+Recurring series are few and are expanded into their occurrences around
+the queried range instead (app.core.recurrence). Cancelled events take up
+no time and are left out.
+"""
+import heapq
+import json
+import logging
+import threading
+from bisect import bisect_left
+from collections import OrderedDict
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Sequence, Set, Tuple
+
+from sqlalchemy import func, literal_column, or_, select
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.sql import FromClause
+from sqlalchemy.sql.elements import ColumnElement
+
+from .bus import message_bus
+from .config import get_settings
+from .recurrence import expand_series
+from .utils import to_naive_utc
+from ..models import Event, EventException
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+logger = logging.getLogger(__name__)
+
+INVALIDATION_CHANNEL = "conflict-index:invalidate"
+CHANGES_CHANNEL = "conflict-index:changes"
+
+# Beyond this many overlapping events, fetch them by range instead of by id
+MAX_ID_LOOKUP = 1000
+
+
+class IntervalTree:
+    """Static interval index over (start, end, id) triples.
+
+    Intervals are sorted by start, and an implicit binary tree over them
+    holds the latest end of every subtree. Intervals starting inside a range
+    are a contiguous run found by bisection; of those starting before it, a
+    query descends only into subtrees whose latest end is after its start.
+    Removed intervals stay in place, marked dead, until the tree is rebuilt.
+    """
+
+    def __init__(self, intervals: Iterable[Tuple[datetime, datetime, int]]) -> None:
+        items = sorted(intervals)
+        self.starts = [item[0] for item in items]
+        self.ends = [item[1] for item in items]
+        self.ids = [item[2] for item in items]
+        self._arrays: Optional[Tuple[Any, Any]] = None
+        self._dead: Set[int] = set()
+        self._alive: Any = None
+        self._size = 1
+        while self._size < len(items):
+            self._size *= 2
+        self._max_end = [datetime.min] * (2 * self._size)
+        self._max_end[self._size:self._size + len(items)] = self.ends
+        for node in range(self._size - 1, 0, -1):
+            self._max_end[node] = max(self._max_end[2 * node], self._max_end[2 * node + 1])
+
+    def __len__(self) -> int:
+        return len(self.ids) - len(self._dead)
+
+    def items(self) -> List[Tuple[datetime, datetime, int]]:
+        """Return the live intervals as (start, end, id), in order."""
+        return [
+            (self.starts[leaf], self.ends[leaf], self.ids[leaf])
+            for leaf in range(len(self.ids)) if leaf not in self._dead
+        ]
+
+    def remove(self, start: datetime, end: datetime, interval_id: int) -> bool:
+        """Mark an interval dead; False if the tree does not hold it."""
+        leaf = bisect_left(self.starts, start)
+        while leaf < len(self.starts) and self.starts[leaf] == start:
+            if self.ids[leaf] == interval_id and self.ends[leaf] == end and leaf not in self._dead:
+                self._dead.add(leaf)
+                self._alive = None
+                # A dead leaf ends before anything, so queries never descend to it
+                node = self._size + leaf
+                self._max_end[node] = datetime.min
+                while node > 1:
+                    node //= 2
+                    self._max_end[node] = max(self._max_end[2 * node], self._max_end[2 * node + 1])
+                return True
+            leaf += 1
+        return False
+
+    def overlapping(self, start: datetime, end: datetime) -> List[int]:
+        """Return the ids of intervals overlapping [start, end), by start."""
+        return [self.ids[leaf] for leaf in self._leaves(start, end)]
+
+    def spans(self, start: datetime, end: datetime) -> Tuple[List[datetime], List[datetime]]:
+        """Return the starts and ends of intervals overlapping [start, end), by start."""
+        leaves = self._leaves(start, end)
+        return [self.starts[leaf] for leaf in leaves], [self.ends[leaf] for leaf in leaves]
+
+    def span_arrays(self, start: datetime, end: datetime) -> Tuple[Any, Any]:
+        """Like ``spans``, as NumPy datetime64 arrays; requires NumPy."""
+        if self._arrays is None:
+            # Converting datetimes one by one is slow, so it is done once per tree
+            self._arrays = (
+                np.array(self.starts, dtype="datetime64[us]"),
+                np.array(self.ends, dtype="datetime64[us]"),
+            )
+        first, limit = self._run(start, end)
+        leaves = np.concatenate((
+            np.array(self._straddling(start, first), dtype=np.intp), np.arange(first, limit, dtype=np.intp)
+        ))
+        if self._dead:
+            if self._alive is None:
+                self._alive = np.ones(len(self.ids), dtype=bool)
+                self._alive[list(self._dead)] = False
+            leaves = leaves[self._alive[leaves]]
+        return tuple(array[leaves] for array in self._arrays)
+
+    def _leaves(self, start: datetime, end: datetime) -> List[int]:
+        first, limit = self._run(start, end)
+        run = range(first, limit)
+        if self._dead:
+            run = [leaf for leaf in run if leaf not in self._dead]
+        return self._straddling(start, first) + list(run)
+
+    def _run(self, start: datetime, end: datetime) -> Tuple[int, int]:
+        # Every interval starting inside the range overlaps it
+        return bisect_left(self.starts, start), bisect_left(self.starts, end)
+
+    def _straddling(self, start: datetime, limit: int) -> List[int]:
+        # Of the intervals before ``limit``, those still running at ``start``
+        found = []
+        # Nodes as (index, first leaf, last leaf + 1), leftmost first
+        stack = [(1, 0, self._size)] if limit else []
+        while stack:
+            node, low, high = stack.pop()
+            if low >= limit or self._max_end[node] <= start:
+                continue
+            if node >= self._size:
+                found.append(low)
+                continue
+            middle = (low + high) // 2
+            stack.append((2 * node + 1, middle, high))
+            stack.append((2 * node, low, middle))
+        return found
+
+
+class DynamicIntervalTree:
+    """Interval index over (start, end, id) triples taking inserts and removals.
+
+    The logarithmic method: intervals live in static ``IntervalTree``s, each
+    at least twice the size of the next. An insert merges the trees no
+    larger than it into a new one, so every interval is merged O(log n)
+    times. A removal marks the interval dead in its tree, and the trees are
+    rebuilt as one once half their intervals are dead. Queries ask each of
+    the O(log n) trees.
+    """
+
+    def __init__(self, intervals: Iterable[Tuple[datetime, datetime, int]] = ()) -> None:
+        self._trees: List[IntervalTree] = []
+        self._spans: Dict[int, Tuple[datetime, datetime]] = {}
+        self._dead = 0
+        self._rebuild([(start, end, interval_id) for start, end, interval_id in intervals])
+
+    def __len__(self) -> int:
+        return len(self._spans)
+
+    def insert(self, start: datetime, end: datetime, interval_id: int) -> None:
+        """Add an interval, replacing the one with the same id."""
+        if self._spans.get(interval_id) == (start, end):
+            return
+        self.remove(interval_id)
+        self._spans[interval_id] = (start, end)
+        items = [(start, end, interval_id)]
+        while self._trees and len(self._trees[-1]) <= len(items):
+            items = self._trees.pop().items() + items
+            self._dead = sum(len(tree._dead) for tree in self._trees)
+        self._trees.append(IntervalTree(items))
+
+    def remove(self, interval_id: int) -> None:
+        """Remove the interval with this id, if any."""
+        span = self._spans.pop(interval_id, None)
+        if span is None:
+            return
+        for tree in self._trees:
+            if tree.remove(*span, interval_id):
+                self._dead += 1
+                break
+        if self._dead > len(self._spans):
+            self._rebuild([(start, end, interval_id) for interval_id, (start, end) in self._spans.items()])
+
+    def overlapping(self, start: datetime, end: datetime) -> List[int]:
+        """Return the ids of intervals overlapping [start, end), in no particular order."""
+        return [interval_id for tree in self._trees for interval_id in tree.overlapping(start, end)]
+
+    def spans(self, start: datetime, end: datetime) -> Tuple[List[datetime], List[datetime]]:
+        """Return the starts and ends of intervals overlapping [start, end), by start."""
+        if len(self._trees) == 1:
+            return self._trees[0].spans(start, end)
+        merged = list(heapq.merge(*(zip(*tree.spans(start, end)) for tree in self._trees)))
+        return [span[0] for span in merged], [span[1] for span in merged]
+
+    def span_arrays(self, start: datetime, end: datetime) -> Tuple[Any, Any]:
+        """Like ``spans``, as NumPy datetime64 arrays in no particular order; requires NumPy."""
+        if len(self._trees) == 1:
+            return self._trees[0].span_arrays(start, end)
+        parts = [tree.span_arrays(start, end) for tree in self._trees]
+        return (
+            np.concatenate([part[0] for part in parts] or [np.array([], dtype="datetime64[us]")]),
+            np.concatenate([part[1] for part in parts] or [np.array([], dtype="datetime64[us]")]),
+        )
+
+    def _rebuild(self, items: List[Tuple[datetime, datetime, int]]) -> None:
+        self._trees = [IntervalTree(items)] if items else []
+        self._spans = {interval_id: (start, end) for start, end, interval_id in items}
+        self._dead = 0
+
+
+# A change to an event, as applied to its owner's tree: (id, start, end,
+# version), with no start or end when the event is no longer indexed. The
+# version orders changes to an id: (change_seq, 1) for a deletion, which
+# comes after every write of the event, else (change_seq, 0)
+Change = Tuple[int, Optional[datetime], Optional[datetime], Tuple[int, int]]
+
+
+def event_change(event: Any, deleted: bool = False) -> Change:
+    """The change a written (or deleted) event, a row or a model, makes to the index."""
+    def field(name: str) -> Any:
+        return event.get(name) if isinstance(event, Mapping) else getattr(event, name)
+
+    indexed = not deleted and field("recurrence_rule") is None and field("status") != "cancelled"
+    return (
+        field("id"),
+        field("start_time") if indexed else None,
+        field("end_time") if indexed else None,
+        (field("change_seq") or 0, int(deleted)),
+    )
+
+
+class ConflictIndex:
+    """Per-user interval trees for databases without range indexes."""
+
+    def __init__(self, max_users: int = 1000) -> None:
+        self.max_users = max_users
+        self.counters: Dict[str, int] = {
+            "hits": 0, "builds": 0, "evictions": 0, "updates": 0, "invalidations": 0,
+        }
+        self._trees: "OrderedDict[int, DynamicIntervalTree]" = OrderedDict()
+        # Version of the last change applied to each event of a tree
+        self._versions: Dict[int, Dict[int, Tuple[int, int]]] = {}
+        # Bumped on every change so a tree built from an older read is not kept
+        self._generations: Dict[int, int] = {}
+        self._lock = threading.Lock()
+
+    async def get(self, db: AsyncSession, owner_id: int) -> DynamicIntervalTree:
+        """Return the user's tree, building it from their single events if needed."""
+        with self._lock:
+            tree = self._trees.get(owner_id)
+            if tree is not None:
+                self._trees.move_to_end(owner_id)
+                self.counters["hits"] += 1
+                return tree
+            generation = self._generations.get(owner_id, 0)
+
+        events = Event.__table__
+        rows = (await db.execute(
+            select(events.c.start_time, events.c.end_time, events.c.id, events.c.change_seq)
+            .where(events.c.owner_id == owner_id)
+            .where(events.c.recurrence_rule.is_(None))
+            .where(is_active(events))
+        )).all()
+        tree = DynamicIntervalTree((row.start_time, row.end_time, row.id) for row in rows)
+        with self._lock:
+            self.counters["builds"] += 1
+            if self._generations.get(owner_id, 0) != generation:
+                return tree
+            self._trees[owner_id] = tree
+            self._versions[owner_id] = {row.id: (row.change_seq or 0, 0) for row in rows}
+            self._trees.move_to_end(owner_id)
+            while len(self._trees) > self.max_users:
+                evicted, _ = self._trees.popitem(last=False)
+                del self._versions[evicted]
+                self.counters["evictions"] += 1
+        return tree
+
+    def apply(self, owner_id: int, changes: Sequence[Change]) -> None:
+        """Apply committed changes to a user's events to their tree on every worker.
+
+        Call after the commit, with ``event_change`` of each written or
+        deleted event.
+        """
+        if not changes:
+            return
+        self.apply_local(owner_id, changes)
+        payload = [
+            [event_id, start and start.isoformat(), end and end.isoformat(), *version]
+            for event_id, start, end, version in changes
+        ]
+        message_bus.publish_nowait(CHANGES_CHANNEL, f"{owner_id} {json.dumps(payload)}")
+
+    def apply_local(self, owner_id: int, changes: Iterable[Change]) -> None:
+        """Apply changes to a user's tree in this worker.
+
+        A change older than the last one applied to its event is skipped, so
+        changes may arrive late, out of order or twice.
+        """
+        with self._lock:
+            self._generations[owner_id] = self._generations.get(owner_id, 0) + 1
+            tree = self._trees.get(owner_id)
+            if tree is None:
+                return
+            versions = self._versions[owner_id]
+            for event_id, start, end, version in changes:
+                if event_id in versions and version <= versions[event_id]:
+                    continue
+                versions[event_id] = version
+                if start is None:
+                    tree.remove(event_id)
+                else:
+                    tree.insert(start, end, event_id)
+                self.counters["updates"] += 1
+
+    def discard(self, owner_id: int) -> None:
+        """Drop a user's tree from this worker."""
+        with self._lock:
+            self._generations[owner_id] = self._generations.get(owner_id, 0) + 1
+            self._versions.pop(owner_id, None)
+            if self._trees.pop(owner_id, None) is not None:
+                self.counters["invalidations"] += 1
+
+    def invalidate(self, owner_id: int) -> None:
+        """Drop a user's tree from every worker, after bulk changes."""
+        self.discard(owner_id)
+        message_bus.publish_nowait(INVALIDATION_CHANNEL, str(owner_id))
+
+    def stats(self) -> Dict[str, Any]:
+        """Return the number of indexed users and events, and counters."""
+        with self._lock:
+            users = len(self._trees)
+            intervals = sum(len(tree) for tree in self._trees.values())
+        return {
+            "users": users,
+            "max_users": self.max_users,
+            "intervals": intervals,
+            "counters": dict(self.counters),
+        }
+
+
+def is_active(table: FromClause) -> ColumnElement:
+    """Condition for events that take up time, i.e. are not cancelled."""
+    return or_(table.c.status.is_(None), table.c.status != "cancelled")
+
+
+def overlaps(table: FromClause, start: datetime, end: datetime) -> ColumnElement:
+    """PostgreSQL range overlap condition served by ix_events_owner_id_time_range."""
+    # The bounds are inlined so the expression matches the indexed one
+    bounds = literal_column("'[)'")
+    return func.tsrange(table.c.start_time, table.c.end_time, bounds).op("&&")(
+        func.tsrange(start, end, bounds)
+    )
+
+
+async def find_occurrences(
+    db: AsyncSession,
+    owner_ids: Sequence[int],
+    start: datetime,
+    end: datetime,
+    exclude_id: Optional[int] = None,
+) -> List[Dict[str, Any]]:
+    """Expand users' recurring events into the occurrences overlapping [start, end)."""
+    events = Event.__table__
+    query = (
+        select(events)
+        .where(events.c.owner_id.in_(owner_ids))
+        .where(events.c.recurrence_rule.isnot(None))
+        .where(is_active(events))
+        .where(events.c.start_time < end)
+        .where(or_(events.c.recurrence_end.is_(None), events.c.recurrence_end > start))
+    )
+    if exclude_id is not None:
+        query = query.where(events.c.id != exclude_id)
+    series_rows = (await db.execute(query)).mappings().all()
+    if not series_rows:
+        return []
+
+    exceptions = EventException.__table__
+    exception_rows = await db.execute(
+        select(exceptions).where(exceptions.c.event_id.in_([series["id"] for series in series_rows]))
+    )
+    return expand_series(series_rows, exception_rows.mappings().all(), start, end, overlapping=True)
+
+
+async def find_conflicts(
+    db: AsyncSession,
+    owner_id: int,
+    start: datetime,
+    end: datetime,
+    exclude_id: Optional[int] = None,
+) -> List[Mapping[str, Any]]:
+    """Find a user's events and occurrences overlapping [start, end).
+
+    Cancelled events never conflict.
+
+    Args:
+        db: Database session
+        owner_id: User whose calendar is checked
+        start: Start of the range; aware times are converted to naive UTC
+        end: End of the range
+        exclude_id: Event to leave out, e.g. the one being updated
+
+    Returns:
+        list: Event rows, occurrences marked with ``recurrence_id``, by start
+    """
+    start, end = to_naive_utc(start), to_naive_utc(end)
+    events = Event.__table__
+    owned = events.c.owner_id == owner_id
+    query = select(events).where(events.c.recurrence_rule.is_(None)).where(is_active(events))
+    if USE_RANGE_INDEX:
+        query = query.where(owned).where(overlaps(events, start, end))
+    else:
+        ids = (await conflict_index.get(db, owner_id)).overlapping(start, end)
+        if len(ids) > MAX_ID_LOOKUP:
+            # A wide range is cheaper read as a range than as a list of ids
+            query = query.where(owned).where(events.c.start_time < end).where(events.c.end_time > start)
+        else:
+            # By primary key alone: given the owner as well, SQLite's planner
+            # reads every one of their events through the owner's index. The
+            # owner is checked on the rows instead
+            query = query.where(events.c.id.in_(ids))
+    if exclude_id is not None:
+        query = query.where(events.c.id != exclude_id)
+    singles = [row for row in (await db.execute(query)).mappings() if row["owner_id"] == owner_id]
+
+    occurrences = await find_occurrences(db, [owner_id], start, end, exclude_id)
+    return sorted([*singles, *occurrences], key=lambda row: (row["start_time"], row["id"]))
+
+
+def _on_remote_invalidation(message: str) -> None:
+    try:
+        conflict_index.discard(int(message))
+    except ValueError:
+        logger.warning(f"Ignoring malformed conflict index invalidation: {message}")
+
+
+def _on_remote_changes(message: str) -> None:
+    owner_id, _, payload = message.partition(" ")
+    try:
+        changes = [
+            (
+                event_id,
+                start and datetime.fromisoformat(start),
+                end and datetime.fromisoformat(end),
+                (change_seq, deleted),
+            )
+            for event_id, start, end, change_seq, deleted in json.loads(payload)
+        ]
+        conflict_index.apply_local(int(owner_id), changes)
+    except ValueError:
+        logger.warning(f"Ignoring malformed conflict index changes: {message[:100]}")
+
+
+settings = get_settings()
+USE_RANGE_INDEX = make_url(settings.DATABASE_URL).get_backend_name() == "postgresql"
+conflict_index = ConflictIndex(max_users=settings.CONFLICT_INDEX_MAX_USERS)
+message_bus.subscribe(INVALIDATION_CHANNEL, _on_remote_invalidation)
+message_bus.subscribe(CHANGES_CHANNEL, _on_remote_changes)
@@ -1,14 +1,21 @@
+import asyncio
 import logging
 import os
+import threading
 import time
-from typing import Optional, Tuple
+from typing import Any, AsyncGenerator, Dict, Optional, Tuple
 
+from fastapi import HTTPException, status
 from sqlalchemy import create_engine, exc, event
-from sqlalchemy.engine import Engine
+from sqlalchemy.engine import Engine, make_url
+from sqlalchemy.engine.url import URL
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, create_async_engine
 from sqlalchemy.orm import sessionmaker, scoped_session, Session
 from sqlalchemy.pool import QueuePool
 
+from .circuit_breaker import CircuitBreaker
 from .config import get_settings
+from .pool_health import pool_health_monitor
 from ..models import Base
 
 # Configure logging
@@ -19,6 +26,89 @@ logger = logging.getLogger(__name__)
 engine = None
 SessionLocal = None
 
+# Async engine used by the API routers, initialized on the first request
+async_engine = None
+AsyncSessionLocal = None
+
+# Shared by the sync and async session dependencies so an outage trips once
+db_circuit_breaker = CircuitBreaker(
+    failure_threshold=get_settings().DATABASE_BREAKER_FAILURE_THRESHOLD,
+    reset_timeout=get_settings().DATABASE_BREAKER_RESET_TIMEOUT,
+)
+
+# Serialize engine rebuilds so concurrent failures trigger only one
+_reinit_lock = threading.Lock()
+_async_reinit_lock: Optional[asyncio.Lock] = None
+
+
+def _engine_options(db_url: str, is_async: bool = False) -> Dict[str, Any]:
+    """Build create_engine keyword arguments for the target database
+
+    SQLite (used for tests and local runs) does not accept QueuePool sizing
+    arguments, and psycopg2/asyncpg name their connect timeout differently.
+
+    Args:
+        db_url: Database URL the engine will connect to
+        is_async: Whether the options are for the asyncpg/aiosqlite engine
+
+    Returns:
+        dict: Keyword arguments for create_engine/create_async_engine
+    """
+    if make_url(db_url).get_backend_name() == "sqlite":
+        return {"connect_args": {"check_same_thread": False}}
+
+    # No pool_pre_ping: idle connections are validated in the background by
+    # pool_health_monitor instead of with a round trip on every checkout
+    settings = get_settings()
+    return {
+        "pool_recycle": 300,          # Recycle connections after 5 minutes
+        "pool_size": settings.DATABASE_POOL_SIZE,
+        "max_overflow": settings.DATABASE_MAX_OVERFLOW,
+        # Timeout after 10 seconds
+        "connect_args": {"timeout": 10} if is_async else {"connect_timeout": 10},
+    }
+
+
+def _enforce_sqlite_foreign_keys(engine: Engine) -> None:
+    """Make SQLite enforce foreign keys, including ON DELETE CASCADE, like PostgreSQL.
+
+    SQLite ignores them unless every connection turns them on.
+    """
+    if engine.dialect.name != "sqlite":
+        return
+
+    @event.listens_for(engine, "connect")
+    def enable_foreign_keys(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        cursor.execute("PRAGMA foreign_keys=ON")
+        cursor.close()
+
+
+def supports_returning(db: AsyncSession) -> bool:
+    """Whether the session's database can return rows from INSERT, UPDATE and DELETE."""
+    return db.bind.dialect.full_returning
+
+
+def get_async_database_url(db_url: str) -> URL:
+    """Map a sync database URL onto its async driver
+
+    postgresql:// URLs are served by asyncpg and sqlite:// URLs by aiosqlite,
+    so a single DATABASE_URL drives both engines.
+
+    Args:
+        db_url: Sync database URL from settings
+
+    Returns:
+        URL: The same database addressed through its async driver
+    """
+    url = make_url(db_url)
+    backend = url.get_backend_name()
+    if backend == "postgresql":
+        url = url.set(drivername="postgresql+asyncpg")
+    elif backend == "sqlite":
+        url = url.set(drivername="sqlite+aiosqlite")
+    return url
+
 # Improve performance by deferring database initialization
 def initialize_database(force: bool = False) -> Tuple[Engine, scoped_session]:
     """Lazy initialization of database connection
@@ -89,15 +179,9 @@ def initialize_database(force: bool = False) -> Tuple[Engine, scoped_session]:
         else:
             # Normal PostgreSQL engine creation
             engine = create_engine(
-                settings.DATABASE_URL,
-                pool_pre_ping=True,        # Verify connections before using them
-                pool_recycle=300,          # Recycle connections after 5 minutes
-                pool_size=5,               # Start with 5 connections
-                max_overflow=10,           # Allow up to 10 additional connections
-                connect_args={
-                    "connect_timeout": 10,  # Timeout after 10 seconds
-                },
+                settings.DATABASE_URL, **_engine_options(settings.DATABASE_URL)
             )
+            _enforce_sqlite_foreign_keys(engine)
     
         # Add connection pool event listeners for better diagnostics
         @event.listens_for(engine, "connect")
@@ -111,6 +195,8 @@ def initialize_database(force: bool = False) -> Tuple[Engine, scoped_session]:
         @event.listens_for(engine, "checkin")
         def checkin(dbapi_connection, connection_record):
             logger.debug("Database connection checked in")
+
+        pool_health_monitor.register("sync", engine)
             
         # Create a configured "Session" class
         SessionLocal = scoped_session(
@@ -178,11 +264,63 @@ def initialize_database(force: bool = False) -> Tuple[Engine, scoped_session]:
 if os.environ.get('DEFER_DB_INIT') != 'true':
     engine, SessionLocal = initialize_database()
 
+def is_connection_error(error: BaseException) -> bool:
+    """Check whether an error means the database is unreachable
+
+    Query errors (constraint violations, bad SQL) leave the engine usable and
+    must not trip the circuit breaker or trigger a rebuild.
+
+    Args:
+        error: Exception raised while the session was in use
+
+    Returns:
+        bool: True for disconnects and connection failures
+    """
+    if isinstance(error, exc.DBAPIError) and error.connection_invalidated:
+        return True
+    # asyncpg raises OSError subclasses directly when the server is unreachable
+    return isinstance(error, (exc.OperationalError, exc.InterfaceError, OSError))
+
+
+def _circuit_open_error() -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        detail="Database temporarily unavailable",
+        headers={"Retry-After": str(db_circuit_breaker.retry_after())},
+    )
+
+
+def reinitialize_database(failed_engine: Optional[Engine]) -> Tuple[Engine, scoped_session]:
+    """Rebuild the sync engine once after a connection failure
+
+    Callers pass the engine their failing session was bound to. The first
+    caller rebuilds the engine and disposes the old pool; callers that
+    failed on the same engine find it already replaced and reuse the new one.
+
+    Args:
+        failed_engine: Engine in use when the failure happened
+
+    Returns:
+        tuple: (engine, session_factory)
+    """
+    with _reinit_lock:
+        if engine is not failed_engine:
+            return engine, SessionLocal
+
+        logger.info("Attempting to reinitialize database connection")
+        new_engine, new_session = initialize_database(force=True)
+        if failed_engine is not None:
+            failed_engine.dispose()
+        return new_engine, new_session
+
+
 def get_db():
     """Dependency for getting database session with robust error handling
     
     This function is used as a FastAPI dependency to provide database sessions
-    to API endpoints. It includes robust error handling and automatic reconnection.
+    to API endpoints. Connection failures are reported to the circuit breaker;
+    when it opens, the engine is rebuilt once and further requests fail fast
+    with 503 until a half-open probe succeeds.
     
     Yields:
         Session: A SQLAlchemy session for database operations
@@ -193,33 +331,158 @@ def get_db():
     if SessionLocal is None:
         logger.info("Lazy initializing database on first use")
         _, SessionLocal = initialize_database()
+
+    if not db_circuit_breaker.allow_request():
+        raise _circuit_open_error()
     
+    # No per-request connection test: pool_health_monitor validates idle
+    # connections in the background and disconnects invalidate the pool
+    bound_engine = engine
     db = SessionLocal()
     try:
-        # Test the connection by executing a simple query
-        # This will fail early if the connection is invalid
-        db.execute("SELECT 1")
         yield db
-    except exc.SQLAlchemyError as e:
+    except Exception as e:
+        if not is_connection_error(e):
+            db_circuit_breaker.record_success()
+            raise
         logger.error(f"Database connection error in get_db: {str(e)}")
-        # Attempt to reconnect once before failing
+        if db_circuit_breaker.record_failure():
+            reinitialize_database(bound_engine)
+        raise
+    else:
+        db_circuit_breaker.record_success()
+    finally:
+        db.close()
+
+
+def initialize_async_database(force: bool = False) -> Tuple[AsyncEngine, sessionmaker]:
+    """Lazy initialization of the async database engine
+
+    Async counterpart of initialize_database(). The API routers run as
+    ``async def`` handlers on this engine, so a request waiting on the
+    database no longer occupies a threadpool worker.
+
+    Args:
+        force: Force reinitialization even if already initialized
+
+    Returns:
+        tuple: (async_engine, async_session_factory)
+    """
+    global async_engine, AsyncSessionLocal
+
+    # Only initialize once unless forced
+    if async_engine is not None and AsyncSessionLocal is not None and not force:
+        return async_engine, AsyncSessionLocal
+
+    settings = get_settings()
+    db_url = settings.DATABASE_URL
+
+    # Mirror the sync engine's handling of Railway.com placeholder URLs
+    if 'hostname' in db_url or 'port' in db_url:
+        logger.warning("Detected Railway.com placeholder URL - using async SQLite memory database as fallback")
+        async_url = make_url('sqlite+aiosqlite:///:memory:')
+        options = _engine_options('sqlite://', is_async=True)
+    else:
+        async_url = get_async_database_url(db_url)
+        options = _engine_options(db_url, is_async=True)
+
+    logger.info(f"Initializing async database engine with driver: {async_url.drivername}")
+
+    async_engine = create_async_engine(async_url, **options)
+    _enforce_sqlite_foreign_keys(async_engine.sync_engine)
+    pool_health_monitor.register("async", async_engine)
+    AsyncSessionLocal = sessionmaker(
+        bind=async_engine,
+        class_=AsyncSession,
+        autocommit=False,
+        autoflush=False,
+        # Keep loaded attributes after commit; lazy refreshes are not
+        # possible outside the greenlet bridge
+        expire_on_commit=False,
+    )
+
+    logger.info("Async database initialization completed successfully")
+    return async_engine, AsyncSessionLocal
+
+
+async def get_async_db() -> AsyncGenerator[AsyncSession, None]:
+    """Dependency for getting an async database session
+
+    This function is used as a FastAPI dependency by the API routers. The
+    session is closed (and any open transaction rolled back) when the
+    request finishes.
+
+    Yields:
+        AsyncSession: An async SQLAlchemy session for database operations
+    """
+    global AsyncSessionLocal
+
+    if AsyncSessionLocal is None:
+        logger.info("Lazy initializing async database on first use")
+        _, AsyncSessionLocal = initialize_async_database()
+        pool_health_monitor.start()
+
+    if not db_circuit_breaker.allow_request():
+        raise _circuit_open_error()
+
+    bound_engine = async_engine
+    async with AsyncSessionLocal() as db:
         try:
-            db.close()
-            # Force reinitialization
-            logger.info("Attempting to reinitialize database connection")
-            _, SessionLocal = initialize_database(force=True)
-            db = SessionLocal()
-            db.execute("SELECT 1")  # Verify the new connection works
             yield db
         except Exception as e:
-            logger.critical(f"Critical database connection failure: {str(e)}")
-            # Re-raise so FastAPI can return a 500 error
+            if not is_connection_error(e):
+                db_circuit_breaker.record_success()
+                raise
+            logger.error(f"Database connection error in get_async_db: {str(e)}")
+            if db_circuit_breaker.record_failure():
+                await reinitialize_async_database(bound_engine)
             raise
-    except Exception as e:
-        logger.error(f"Unexpected error in get_db: {str(e)}")
-        raise
-    finally:
-        db.close()
+        else:
+            db_circuit_breaker.record_success()
+
+
+async def reinitialize_async_database(
+    failed_engine: Optional[AsyncEngine],
+) -> Tuple[AsyncEngine, sessionmaker]:
+    """Rebuild the async engine once after a connection failure
+
+    Async counterpart of reinitialize_database(): concurrent callers wait on
+    the same lock and only the first one replaces and disposes the engine.
+
+    Args:
+        failed_engine: Async engine in use when the failure happened
+
+    Returns:
+        tuple: (async_engine, async_session_factory)
+    """
+    global _async_reinit_lock
+
+    # Created lazily so the lock binds to the serving event loop
+    if _async_reinit_lock is None:
+        _async_reinit_lock = asyncio.Lock()
+
+    async with _async_reinit_lock:
+        if async_engine is not failed_engine:
+            return async_engine, AsyncSessionLocal
+
+        logger.info("Attempting to reinitialize async database connection")
+        new_engine, new_session = initialize_async_database(force=True)
+        if failed_engine is not None:
+            await failed_engine.dispose()
+        return new_engine, new_session
+
+
+async def dispose_async_database() -> None:
+    """Close all pooled connections held by the async engine."""
+    global async_engine, AsyncSessionLocal
+
+    await pool_health_monitor.stop()
+    pool_health_monitor.unregister("async")
+    if async_engine is not None:
+        await async_engine.dispose()
+        logger.info("Async database engine disposed")
+    async_engine = None
+    AsyncSessionLocal = None
 
 
 def init_db(max_retries: int = 5, retry_interval: int = 2) -> bool:
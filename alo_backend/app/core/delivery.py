@@ -0,0 +1,385 @@
+"""Notification delivery pipeline.
+
+Every reminder channel (``ReminderType``) has a transport and its own bounded
+pool of asyncio workers. Workers micro-batch: each takes whatever is queued
+for its channel, up to the transport's batch size, and sends it in one
+provider call over a reused connection. Because the pools are separate, a
+slow or failing provider only backs up its own channel.
+
+A channel without a configured provider has no transport: the dispatcher
+leaves its reminders PENDING until one is configured. For development and
+load tests, ``DELIVERY_STUB_TRANSPORTS`` puts ``StubTransport``, a local
+sink that reports everything delivered, in place of the missing providers.
+"""
+import asyncio
+import logging
+import random
+import smtplib
+import time
+from collections import deque
+from email.message import EmailMessage
+from typing import Any, Collection, Deque, Dict, List, Mapping, Optional, Tuple
+from urllib.parse import urlparse
+
+from .config import get_settings
+from ..models import ReminderType
+
+logger = logging.getLogger(__name__)
+
+try:
+    import httpx
+except ImportError:
+    httpx = None
+
+Reminder = Mapping[str, Any]
+
+
+class Transport:
+    """Sends batches of reminders for one channel."""
+
+    # Most reminders sent in one provider call
+    batch_size = 1
+
+    def __init__(self, channel: ReminderType) -> None:
+        self.channel = channel
+
+    async def send(self, reminders: List[Reminder]) -> Collection[int]:
+        """Send reminders and return the ids that were delivered."""
+        raise NotImplementedError
+
+    async def close(self) -> None:
+        """Release provider connections."""
+
+
+class InAppTransport(Transport):
+    """In-app reminders are delivered by being marked SENT."""
+
+    batch_size = 500
+
+    async def send(self, reminders: List[Reminder]) -> Collection[int]:
+        return [reminder["id"] for reminder in reminders]
+
+
+class StubTransport(Transport):
+    """Local sink standing in for a provider in development and load tests.
+
+    Each call takes ``latency`` seconds and each reminder fails with
+    probability ``failure_rate``.
+    """
+
+    def __init__(
+        self,
+        channel: ReminderType,
+        batch_size: int = 100,
+        latency: float = 0.0,
+        failure_rate: float = 0.0,
+    ) -> None:
+        super().__init__(channel)
+        self.batch_size = batch_size
+        self.latency = latency
+        self.failure_rate = failure_rate
+        self.calls = 0
+
+    async def send(self, reminders: List[Reminder]) -> Collection[int]:
+        self.calls += 1
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        return [
+            reminder["id"] for reminder in reminders
+            if not self.failure_rate or random.random() >= self.failure_rate
+        ]
+
+
+class SMTPTransport(Transport):
+    """Email over SMTP, reusing idle connections between batches."""
+
+    batch_size = 50
+
+    def __init__(self, url: str, sender: str, timeout: float = 10.0) -> None:
+        super().__init__(ReminderType.EMAIL)
+        parsed = urlparse(url)
+        self.host = parsed.hostname or "localhost"
+        self.port = parsed.port or (465 if parsed.scheme == "smtps" else 25)
+        self.use_ssl = parsed.scheme == "smtps"
+        self.starttls = parsed.scheme == "smtp+starttls"
+        self.username = parsed.username
+        self.password = parsed.password
+        self.sender = sender
+        self.timeout = timeout
+        self._idle: List[smtplib.SMTP] = []
+
+    def _connect(self) -> smtplib.SMTP:
+        if self.use_ssl:
+            conn = smtplib.SMTP_SSL(self.host, self.port, timeout=self.timeout)
+        else:
+            conn = smtplib.SMTP(self.host, self.port, timeout=self.timeout)
+            if self.starttls:
+                conn.starttls()
+        if self.username:
+            conn.login(self.username, self.password or "")
+        return conn
+
+    def _send_sync(self, conn: smtplib.SMTP, reminders: List[Reminder]) -> Tuple[List[int], bool]:
+        """Send one message per reminder.
+
+        Returns:
+            tuple: (ids of the messages sent, whether the connection is still usable)
+        """
+        delivered = []
+        for reminder in reminders:
+            message = EmailMessage()
+            message["From"] = self.sender
+            message["To"] = reminder["owner_email"]
+            message["Subject"] = "Reminder"
+            message.set_content(reminder["message"])
+            try:
+                conn.send_message(message)
+            except smtplib.SMTPRecipientsRefused:
+                logger.warning(f"SMTP refused recipient for reminder {reminder['id']}")
+                continue
+            except smtplib.SMTPResponseException as e:
+                # The server rejected this message and reset the session
+                logger.warning(f"SMTP rejected reminder {reminder['id']}: {e.smtp_code}")
+                continue
+            except (smtplib.SMTPException, OSError) as e:
+                # Messages sent before the connection broke stay delivered
+                logger.error(f"SMTP connection lost after {len(delivered)} of {len(reminders)} messages: {str(e)}")
+                return delivered, False
+            delivered.append(reminder["id"])
+        return delivered, True
+
+    async def send(self, reminders: List[Reminder]) -> Collection[int]:
+        conn = self._idle.pop() if self._idle else None
+        if conn is None:
+            try:
+                conn = await asyncio.to_thread(self._connect)
+            except (smtplib.SMTPException, OSError) as e:
+                logger.error(f"SMTP delivery failed: {str(e)}")
+                return []
+        delivered, usable = await asyncio.to_thread(self._send_sync, conn, reminders)
+        if usable:
+            self._idle.append(conn)
+        else:
+            # Drop the connection; the next batch opens a fresh one
+            conn.close()
+        return delivered
+
+    async def close(self) -> None:
+        while self._idle:
+            conn = self._idle.pop()
+            try:
+                await asyncio.to_thread(conn.quit)
+            except (smtplib.SMTPException, OSError):
+                pass
+
+
+class HTTPTransport(Transport):
+    """Push or SMS through an HTTP provider, one request per batch.
+
+    The provider receives ``{"messages": [...]}`` and may answer with
+    ``{"failed": [ids]}``; any non-2xx response fails the whole batch.
+    """
+
+    def __init__(self, channel: ReminderType, url: str, batch_size: int = 100, timeout: float = 10.0) -> None:
+        super().__init__(channel)
+        self.url = url
+        self.batch_size = batch_size
+        # One client per transport keeps provider connections alive
+        self._client = httpx.AsyncClient(timeout=timeout)
+
+    async def send(self, reminders: List[Reminder]) -> Collection[int]:
+        payload = {
+            "channel": self.channel.value,
+            "messages": [
+                {"id": reminder["id"], "owner_id": reminder["owner_id"], "message": reminder["message"]}
+                for reminder in reminders
+            ],
+        }
+        try:
+            response = await self._client.post(self.url, json=payload)
+            response.raise_for_status()
+        except httpx.HTTPError as e:
+            logger.error(f"{self.channel.value} provider request failed: {str(e)}")
+            return []
+        failed = set(response.json().get("failed", [])) if response.content else set()
+        return [reminder["id"] for reminder in reminders if reminder["id"] not in failed]
+
+    async def close(self) -> None:
+        await self._client.aclose()
+
+
+class ChannelPool:
+    """Bounded queue and asyncio workers delivering one channel."""
+
+    def __init__(self, transport: Transport, workers: int = 4, queue_size: int = 1000) -> None:
+        self.transport = transport
+        self.workers = workers
+        self.counters: Dict[str, int] = {"sent": 0, "failed": 0, "calls": 0, "errors": 0}
+        self._queue: Optional[asyncio.Queue] = None
+        self._queue_size = queue_size
+        self._tasks: List[asyncio.Task] = []
+        self._latencies: Deque[float] = deque(maxlen=1000)
+        self._started_at: Optional[float] = None
+
+    def _start(self) -> None:
+        if self._tasks:
+            return
+        self._queue = asyncio.Queue(maxsize=self._queue_size)
+        self._started_at = time.monotonic()
+        loop = asyncio.get_running_loop()
+        self._tasks = [loop.create_task(self._work()) for _ in range(self.workers)]
+
+    async def submit(self, reminders: List[Reminder]) -> Collection[int]:
+        """Queue reminders for delivery and wait for their outcome.
+
+        Waits for queue space when the channel is backed up.
+        """
+        self._start()
+        loop = asyncio.get_running_loop()
+        futures = []
+        for reminder in reminders:
+            future = loop.create_future()
+            await self._queue.put((reminder, future, time.monotonic()))
+            futures.append(future)
+        results = await asyncio.gather(*futures)
+        return [reminder["id"] for reminder, delivered in zip(reminders, results) if delivered]
+
+    async def _work(self) -> None:
+        while True:
+            batch: List[Tuple[Reminder, asyncio.Future, float]] = [await self._queue.get()]
+            while len(batch) < self.transport.batch_size and not self._queue.empty():
+                batch.append(self._queue.get_nowait())
+            try:
+                delivered = set(await self.transport.send([item[0] for item in batch]))
+            except asyncio.CancelledError:
+                for _, future, _ in batch:
+                    future.cancel()
+                raise
+            except Exception as e:
+                logger.error(f"{self.transport.channel.value} transport error: {str(e)}")
+                self.counters["errors"] += 1
+                delivered = set()
+            self.counters["calls"] += 1
+            now = time.monotonic()
+            for reminder, future, queued_at in batch:
+                ok = reminder["id"] in delivered
+                self.counters["sent" if ok else "failed"] += 1
+                self._latencies.append(now - queued_at)
+                if not future.done():
+                    future.set_result(ok)
+                self._queue.task_done()
+
+    async def stop(self) -> None:
+        """Cancel the workers and close the transport."""
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        await self.transport.close()
+
+    def stats(self) -> Dict[str, Any]:
+        """Return throughput, latency percentiles and counters."""
+        latencies = sorted(self._latencies)
+
+        def percentile(p: float) -> Optional[float]:
+            if not latencies:
+                return None
+            return round(latencies[min(len(latencies) - 1, int(p * len(latencies)))] * 1000, 2)
+
+        uptime = time.monotonic() - self._started_at if self._started_at else 0.0
+        return {
+            "transport": type(self.transport).__name__,
+            "workers": self.workers,
+            "queued": self._queue.qsize() if self._queue is not None else 0,
+            "throughput_per_second": round(self.counters["sent"] / uptime, 2) if uptime else 0.0,
+            "latency_ms": {"p50": percentile(0.5), "p95": percentile(0.95), "p99": percentile(0.99)},
+            "counters": dict(self.counters),
+        }
+
+
+class DeliveryPipeline:
+    """Route reminders to the pool of their channel."""
+
+    def __init__(self, transports: List[Transport], workers: int = 4, queue_size: int = 1000) -> None:
+        self.pools: Dict[ReminderType, ChannelPool] = {
+            transport.channel: ChannelPool(transport, workers, queue_size)
+            for transport in transports
+        }
+
+    @property
+    def channels(self) -> List[ReminderType]:
+        """Channels with a transport; reminders of the others are not claimed."""
+        return list(self.pools)
+
+    async def deliver(self, reminders: List[Reminder]) -> Collection[int]:
+        """Deliver reminders of any channels and return the delivered ids.
+
+        Reminders of a channel without a transport are not delivered.
+        """
+        by_channel: Dict[ReminderType, List[Reminder]] = {}
+        for reminder in reminders:
+            channel = ReminderType(reminder["reminder_type"])
+            if channel not in self.pools:
+                logger.error(f"No transport for {channel.value}, reminder {reminder['id']} not delivered")
+                continue
+            by_channel.setdefault(channel, []).append(reminder)
+        results = await asyncio.gather(*(
+            self.pools[channel].submit(batch) for channel, batch in by_channel.items()
+        ))
+        return [reminder_id for delivered in results for reminder_id in delivered]
+
+    async def stop(self) -> None:
+        """Stop every channel pool."""
+        for pool in self.pools.values():
+            await pool.stop()
+
+    def stats(self) -> Dict[str, Any]:
+        """Return per-channel delivery stats; unconfigured channels are null."""
+        return {
+            channel.value: self.pools[channel].stats() if channel in self.pools else None
+            for channel in ReminderType
+        }
+
+
+def _unconfigured(channel: ReminderType, setting: str, stubs: bool, batch_size: int, latency: float) -> Optional[Transport]:
+    if stubs:
+        return StubTransport(channel, batch_size=batch_size, latency=latency)
+    logger.warning(
+        f"{setting} is not set: {channel.value} reminders stay pending until it is "
+        "(DELIVERY_STUB_TRANSPORTS=true stubs it for development)"
+    )
+    return None
+
+
+def create_pipeline() -> DeliveryPipeline:
+    """Create the pipeline from settings.
+
+    Channels without a provider get no transport, or a stub one with
+    ``DELIVERY_STUB_TRANSPORTS``.
+    """
+    settings = get_settings()
+    stubs = settings.DELIVERY_STUB_TRANSPORTS
+    stub_latency = settings.DELIVERY_STUB_LATENCY_MS / 1000
+    transports: List[Optional[Transport]] = [InAppTransport(ReminderType.IN_APP)]
+    if settings.SMTP_URL:
+        transports.append(SMTPTransport(settings.SMTP_URL, settings.SMTP_SENDER, settings.DELIVERY_TIMEOUT))
+    else:
+        transports.append(_unconfigured(ReminderType.EMAIL, "SMTP_URL", stubs, SMTPTransport.batch_size, stub_latency))
+    for channel, setting, url in (
+        (ReminderType.PUSH, "PUSH_PROVIDER_URL", settings.PUSH_PROVIDER_URL),
+        (ReminderType.SMS, "SMS_PROVIDER_URL", settings.SMS_PROVIDER_URL),
+    ):
+        if url and httpx is not None:
+            transports.append(HTTPTransport(channel, url, timeout=settings.DELIVERY_TIMEOUT))
+            continue
+        if url:
+            logger.warning(f"{setting} is set but httpx is not installed: pip install -e \".[delivery]\"")
+        transports.append(_unconfigured(channel, setting, stubs, 100, stub_latency))
+    return DeliveryPipeline(
+        [transport for transport in transports if transport is not None],
+        workers=settings.DELIVERY_WORKERS,
+        queue_size=settings.DELIVERY_QUEUE_SIZE,
+    )
+
+
+delivery_pipeline = create_pipeline()
@@ -0,0 +1,432 @@
+"""Background dispatcher for due reminders.
+
+Due PENDING reminders are claimed in batches with ``SELECT ... FOR UPDATE
+SKIP LOCKED`` and marked in flight by setting ``claimed_until`` to a lease,
+in a short transaction that commits before delivery starts. The marking
+UPDATE repeats the claim condition, so on SQLite, where the SELECT locks
+nothing, a row claimed by a concurrent worker is skipped rather than sent
+twice. A worker that dies mid-delivery leaves its rows to be claimed again
+once the lease has passed. Outcomes are written back in a second
+transaction with one bulk UPDATE per status, together with one
+``delivery_attempts`` row per reminder. Failed reminders are retried from
+``next_attempt_at`` with exponential backoff and jitter, and moved to
+DEAD_LETTER after ``max_attempts``. Each channel is claimed and drained by
+its own task, so a slow provider holds back only reminders of its own type.
+
+Between batches the dispatcher does not poll. It keeps a min-heap of the
+reminders due within the next ``lookahead`` seconds, reloaded once per
+lookahead period, and sleeps until the earliest one is due. Reminders created
+or rescheduled in the meantime are pushed onto the heap through the message
+bus, so every worker hears about them.
+"""
+import asyncio
+import heapq
+import logging
+import random
+import time
+from datetime import datetime, timedelta
+from typing import Any, Awaitable, Callable, Collection, Dict, List, Mapping, Optional, Set, Tuple
+
+from sqlalchemy import and_, bindparam, insert, or_, select, update
+
+from . import database
+from .bus import message_bus
+from .config import get_settings
+from .delivery import delivery_pipeline
+from .push import push_hub
+from .sync import stamps
+from ..models import DeliveryAttempt, Reminder, ReminderStatus, ReminderType, User
+
+logger = logging.getLogger(__name__)
+
+SCHEDULE_CHANNEL = "reminders:schedule"
+
+# Receives a claimed batch and returns the ids that were delivered;
+# the rest of the batch is marked FAILED
+Deliver = Callable[[List[Mapping[str, Any]]], Awaitable[Collection[int]]]
+
+
+class ReminderDispatcher:
+    """Claim due reminders in batches and hand them to a delivery function."""
+
+    def __init__(
+        self,
+        batch_size: int = 500,
+        lookahead: float = 60.0,
+        max_scheduled: int = 10000,
+        max_attempts: int = 5,
+        retry_base_delay: float = 30.0,
+        retry_max_delay: float = 3600.0,
+        claim_timeout: float = 300.0,
+        deliver: Optional[Deliver] = None,
+        channels: Optional[Collection[ReminderType]] = None,
+    ) -> None:
+        self.batch_size = batch_size
+        self.lookahead = lookahead
+        self.max_scheduled = max_scheduled
+        self.max_attempts = max_attempts
+        self.retry_base_delay = retry_base_delay
+        self.retry_max_delay = retry_max_delay
+        self.claim_timeout = claim_timeout
+        self.deliver = deliver or delivery_pipeline.deliver
+        if channels is None:
+            channels = delivery_pipeline.channels if deliver is None else list(ReminderType)
+        # Reminders of other channels have no transport and stay PENDING
+        self.channels = list(channels)
+        self.counters: Dict[str, int] = {
+            "claimed": 0,
+            "claims_lost": 0,
+            "sent": 0,
+            "failed": 0,
+            "retries_scheduled": 0,
+            "dead_lettered": 0,
+            "batches": 0,
+            "refills": 0,
+            "errors": 0,
+        }
+        self._heap: List[Tuple[datetime, int]] = []
+        # Every pending reminder due before the horizon is on the heap
+        self._horizon: Optional[datetime] = None
+        self._wakeup: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task] = None
+        self._drains: Dict[ReminderType, asyncio.Task] = {}
+        # Channels that became due again while their drain was running
+        self._redrain: Set[ReminderType] = set()
+
+    def schedule(self, reminder_id: int, reminder_time: datetime) -> None:
+        """Tell every worker about a new or rescheduled pending reminder."""
+        message_bus.publish_nowait(SCHEDULE_CHANNEL, f"{reminder_id} {reminder_time.isoformat()}")
+
+    def _push(self, reminder_id: int, reminder_time: datetime) -> None:
+        # Reminders past the horizon are picked up by the next refill
+        if self._horizon is None or reminder_time > self._horizon:
+            return
+        if len(self._heap) >= self.max_scheduled:
+            return
+        heapq.heappush(self._heap, (reminder_time, reminder_id))
+        if self._wakeup is not None and self._heap[0][1] == reminder_id:
+            self._wakeup.set()
+
+    async def _refill(self) -> None:
+        """Reload the heap with the reminders due or retrying within the lookahead."""
+        table = Reminder.__table__
+        horizon = datetime.utcnow() + timedelta(seconds=self.lookahead)
+        loaded: List[Tuple[datetime, int]] = []
+        async with database.AsyncSessionLocal() as session:
+            for status, due_at in (
+                (ReminderStatus.PENDING, table.c.reminder_time),
+                (ReminderStatus.FAILED, table.c.next_attempt_at),
+            ):
+                rows = (await session.execute(
+                    select(due_at, table.c.id)
+                    .where(table.c.status == status)
+                    .where(table.c.reminder_type.in_(self.channels))
+                    .where(due_at <= horizon)
+                    .order_by(due_at)
+                    .limit(self.max_scheduled)
+                )).all()
+                loaded.extend((row[0], row[1]) for row in rows)
+        loaded.sort()
+        # A truncated load only covers reminders up to the last one loaded
+        if len(loaded) >= self.max_scheduled:
+            loaded = loaded[:self.max_scheduled]
+            horizon = loaded[-1][0]
+        self._heap = loaded
+        self._horizon = horizon
+        self.counters["refills"] += 1
+
+    def _retry_delay(self, attempts: int) -> float:
+        """Exponential backoff with equal jitter after ``attempts`` failures."""
+        delay = min(self.retry_max_delay, self.retry_base_delay * 2 ** (attempts - 1))
+        return delay / 2 + random.uniform(0, delay / 2)
+
+    async def dispatch_batch(self, channel: Optional[ReminderType] = None, retry: bool = False) -> int:
+        """Claim, deliver and mark one batch of due reminders.
+
+        Args:
+            channel: Only claim reminders of this type
+            retry: Claim FAILED reminders whose next attempt is due instead
+                of due PENDING ones
+
+        Returns:
+            int: Number of reminders claimed
+        """
+        table = Reminder.__table__
+        users = User.__table__
+        status, due_at = (
+            (ReminderStatus.FAILED, table.c.next_attempt_at) if retry
+            else (ReminderStatus.PENDING, table.c.reminder_time)
+        )
+        async with database.AsyncSessionLocal() as session:
+            async with session.begin():
+                now = datetime.utcnow()
+                claimable = and_(
+                    table.c.status == status,
+                    or_(table.c.claimed_until.is_(None), table.c.claimed_until <= now),
+                )
+                query = select(table.c.id).where(claimable).where(due_at <= now)
+                if channel is not None:
+                    query = query.where(table.c.reminder_type == channel)
+                else:
+                    query = query.where(table.c.reminder_type.in_(self.channels))
+                ids = (await session.execute(
+                    query.order_by(due_at).limit(self.batch_size).with_for_update(skip_locked=True)
+                )).scalars().all()
+                if not ids:
+                    return 0
+
+                # Mark the batch in flight. The claim condition is repeated
+                # because SELECT ... FOR UPDATE locks nothing on SQLite: rows a
+                # concurrent worker claimed first are skipped here, not sent twice
+                lease = now + timedelta(seconds=self.claim_timeout)
+                await session.execute(
+                    update(table).where(table.c.id.in_(ids)).where(claimable).values(claimed_until=lease)
+                )
+                reminders = (await session.execute(
+                    select(table, users.c.email.label("owner_email"))
+                    .select_from(table.join(users, table.c.owner_id == users.c.id))
+                    .where(table.c.id.in_(ids))
+                    .where(table.c.claimed_until == lease)
+                    .order_by(due_at)
+                )).mappings().all()
+        if not reminders:
+            return 0
+
+        # Delivered with no transaction open: the claim has committed, so no
+        # row locks or pooled connection are held while providers respond
+        delivered: Set[int] = set(await self.deliver(list(reminders)))
+        now = datetime.utcnow()
+        sent, dead, retries, attempts = [], [], [], []
+        for reminder in reminders:
+            attempt = reminder["attempts"] + 1
+            if reminder["id"] in delivered:
+                sent.append(reminder["id"])
+                outcome = "sent"
+            elif attempt >= self.max_attempts:
+                dead.append(reminder["id"])
+                outcome = "dead_letter"
+            else:
+                retries.append({
+                    "b_id": reminder["id"],
+                    "b_attempts": attempt,
+                    "b_next_attempt_at": now + timedelta(seconds=self._retry_delay(attempt)),
+                })
+                outcome = "failed"
+            attempts.append({
+                "reminder_id": reminder["id"],
+                "attempt": attempt,
+                "channel": ReminderType(reminder["reminder_type"]).value,
+                "outcome": outcome,
+                "created_at": now,
+                "updated_at": now,
+            })
+
+        # Outcomes only land on rows still held by this claim, which a lease
+        # that ran out before delivery finished no longer is: another worker
+        # may have claimed the row again. The rows still held are read and
+        # locked first, so the UPDATEs below match exactly those
+        claimed = table.c.claimed_until == lease
+        async with database.AsyncSessionLocal() as session:
+            async with session.begin():
+                held = set((await session.execute(
+                    select(table.c.id)
+                    .where(table.c.id.in_([reminder["id"] for reminder in reminders]))
+                    .where(claimed)
+                    .with_for_update()
+                )).scalars().all())
+                sent = [reminder_id for reminder_id in sent if reminder_id in held]
+                dead = [reminder_id for reminder_id in dead if reminder_id in held]
+                retries = [retry_row for retry_row in retries if retry_row["b_id"] in held]
+                if sent:
+                    await session.execute(
+                        update(table)
+                        .where(table.c.id.in_(sent))
+                        .where(claimed)
+                        .values(
+                            status=ReminderStatus.SENT,
+                            sent_at=now,
+                            attempts=table.c.attempts + 1,
+                            next_attempt_at=None,
+                            claimed_until=None,
+                            updated_at=now,
+                        )
+                    )
+                if dead:
+                    await session.execute(
+                        update(table)
+                        .where(table.c.id.in_(dead))
+                        .where(claimed)
+                        .values(
+                            status=ReminderStatus.DEAD_LETTER,
+                            attempts=table.c.attempts + 1,
+                            next_attempt_at=None,
+                            claimed_until=None,
+                            updated_at=now,
+                        )
+                    )
+                if retries:
+                    # Every row gets its own jittered retry time
+                    await session.execute(
+                        update(table)
+                        .where(table.c.id == bindparam("b_id"))
+                        .where(claimed)
+                        .values(
+                            status=ReminderStatus.FAILED,
+                            attempts=bindparam("b_attempts"),
+                            next_attempt_at=bindparam("b_next_attempt_at"),
+                            claimed_until=None,
+                            updated_at=now,
+                        ),
+                        retries,
+                    )
+                # Every delivery attempt is logged, on held rows or not
+                await session.execute(insert(DeliveryAttempt.__table__), attempts)
+
+        # Stamped for delta sync once the outcomes have committed: advancing
+        # the owners' sequences locks their user rows, which writes through
+        # the API lock before the reminders, never after. Rows whose claim
+        # was lost were not written and are left to their new claimant
+        if held:
+            async with database.AsyncSessionLocal() as session:
+                async with session.begin():
+                    await stamps[table].stamp(session, held)
+            push_hub.publish(
+                (reminder["owner_id"], "reminder", "updated", reminder["id"])
+                for reminder in reminders if reminder["id"] in held
+            )
+
+        for retry_row in retries:
+            self._push(retry_row["b_id"], retry_row["b_next_attempt_at"])
+        self.counters["batches"] += 1
+        self.counters["claimed"] += len(reminders)
+        self.counters["claims_lost"] += len(reminders) - len(held)
+        self.counters["sent"] += len(sent)
+        self.counters["failed"] += len(held) - len(sent)
+        self.counters["retries_scheduled"] += len(retries)
+        self.counters["dead_lettered"] += len(dead)
+        return len(reminders)
+
+    async def _drain(self, channel: ReminderType) -> int:
+        """Dispatch batches of one channel until none is left unclaimed."""
+        total = 0
+        while True:
+            self._redrain.discard(channel)
+            claimed = await self.dispatch_batch(channel)
+            retried = await self.dispatch_batch(channel, retry=True)
+            total += claimed + retried
+            if max(claimed, retried) < self.batch_size and channel not in self._redrain:
+                return total
+
+    async def dispatch_due(self) -> int:
+        """Dispatch every due reminder, draining the channels concurrently."""
+        totals = await asyncio.gather(*(self._drain(channel) for channel in self.channels))
+        self._pop_due()
+        return sum(totals)
+
+    def _pop_due(self) -> None:
+        now = datetime.utcnow()
+        while self._heap and self._heap[0][0] <= now:
+            heapq.heappop(self._heap)
+
+    def _start_drains(self) -> None:
+        # Drains run as separate tasks so the loop keeps waking up for other
+        # channels while a slow one is still delivering
+        loop = asyncio.get_running_loop()
+        for channel in self.channels:
+            task = self._drains.get(channel)
+            if task is not None and not task.done():
+                self._redrain.add(channel)
+                continue
+            if task is not None and not task.cancelled() and task.exception() is not None:
+                self.counters["errors"] += 1
+                logger.error(f"Reminder dispatch for {channel.value} failed: {str(task.exception())}")
+            self._drains[channel] = loop.create_task(self._drain(channel))
+        self._pop_due()
+
+    async def _run(self) -> None:
+        next_refill = 0.0
+        backoff = 1.0
+        while True:
+            try:
+                if database.AsyncSessionLocal is None:
+                    database.initialize_async_database()
+                if time.monotonic() >= next_refill:
+                    await self._refill()
+                    next_refill = time.monotonic() + self.lookahead
+                if self._heap and self._heap[0][0] <= datetime.utcnow():
+                    self._start_drains()
+                backoff = 1.0
+
+                timeout = next_refill - time.monotonic()
+                if self._heap:
+                    due_in = (self._heap[0][0] - datetime.utcnow()).total_seconds()
+                    timeout = min(timeout, due_in)
+                self._wakeup.clear()
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), max(timeout, 0))
+                except asyncio.TimeoutError:
+                    pass
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self.counters["errors"] += 1
+                logger.error(f"Reminder dispatch failed, retrying in {backoff:.0f}s: {str(e)}")
+                await asyncio.sleep(backoff)
+                backoff = min(backoff * 2, 30.0)
+
+    def start(self) -> None:
+        """Start dispatching on the running event loop."""
+        if self._task is not None and not self._task.done():
+            return
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            logger.warning("No running event loop, reminder dispatcher not started")
+            return
+        self._wakeup = asyncio.Event()
+        self._task = loop.create_task(self._run())
+        logger.info(f"Reminder dispatcher started (batch size: {self.batch_size})")
+
+    async def stop(self) -> None:
+        """Stop the dispatch loop."""
+        if self._task is None:
+            return
+        self._task.cancel()
+        for task in self._drains.values():
+            task.cancel()
+        await asyncio.gather(self._task, *self._drains.values(), return_exceptions=True)
+        self._task = None
+        self._drains = {}
+
+    def stats(self) -> Dict[str, Any]:
+        """Return the dispatcher state and counters."""
+        return {
+            "running": self._task is not None and not self._task.done(),
+            "scheduled": len(self._heap),
+            "next_due_at": self._heap[0][0].isoformat() if self._heap else None,
+            "batch_size": self.batch_size,
+            "lookahead_seconds": self.lookahead,
+            "channels": [channel.value for channel in self.channels],
+            "counters": dict(self.counters),
+        }
+
+
+def _on_scheduled(message: str) -> None:
+    try:
+        reminder_id, reminder_time = message.split(" ", 1)
+        reminder_dispatcher._push(int(reminder_id), datetime.fromisoformat(reminder_time))
+    except ValueError:
+        logger.warning(f"Ignoring malformed reminder schedule message: {message}")
+
+
+settings = get_settings()
+reminder_dispatcher = ReminderDispatcher(
+    batch_size=settings.REMINDER_DISPATCH_BATCH_SIZE,
+    lookahead=settings.REMINDER_DISPATCH_LOOKAHEAD,
+    max_scheduled=settings.REMINDER_DISPATCH_MAX_SCHEDULED,
+    max_attempts=settings.REMINDER_MAX_ATTEMPTS,
+    retry_base_delay=settings.REMINDER_RETRY_BASE_DELAY,
+    retry_max_delay=settings.REMINDER_RETRY_MAX_DELAY,
+    claim_timeout=settings.REMINDER_CLAIM_TIMEOUT,
+)
+message_bus.subscribe(SCHEDULE_CHANNEL, _on_scheduled)
@@ -0,0 +1,186 @@
+"""Free/busy computation.
+
+A user's busy time in a window is the union of their events and recurring
+occurrences overlapping it, clipped to the window. Only the start and end
+of single events are read: through the range index on PostgreSQL, or
+straight from the in-memory interval tree elsewhere (app.core.conflicts).
+Intervals are merged with a vectorized sort and running maximum when NumPy
+is installed (``pip install -e ".[speedups]"``), in plain Python otherwise.
+
+Merged busy lists are cached per (user, window) and dropped when one of the
+user's events is written.
+"""
+import logging
+import threading
+from collections import OrderedDict
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Tuple
+
+from sqlalchemy import BigInteger, cast, func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from .bus import message_bus
+from .config import get_settings
+from .conflicts import USE_RANGE_INDEX, conflict_index, find_occurrences, is_active, overlaps
+from .utils import to_naive_utc
+from ..models import Event
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+logger = logging.getLogger(__name__)
+
+INVALIDATION_CHANNEL = "freebusy-cache:invalidate"
+
+# Longest window a free/busy query may cover
+MAX_WINDOW = timedelta(days=366)
+
+Busy = List[Tuple[datetime, datetime]]
+
+
+def merge_busy(starts: Any, ends: Any, window_start: datetime, window_end: datetime) -> Busy:
+    """Merge intervals into sorted, disjoint busy blocks clipped to a window.
+
+    Overlapping and touching intervals become one block. With NumPy,
+    ``starts`` and ``ends`` are datetime64[us] arrays; without it, lists of
+    datetimes.
+    """
+    if not len(starts):
+        return []
+    if np is not None:
+        begin = np.maximum(starts, np.datetime64(window_start, "us"))
+        finish = np.minimum(ends, np.datetime64(window_end, "us"))
+        order = np.argsort(begin, kind="stable")
+        begin = begin[order]
+        # Latest end so far: a block ends where the next start is past it
+        finish = np.maximum.accumulate(finish[order])
+        breaks = np.flatnonzero(begin[1:] > finish[:-1])
+        first = np.concatenate(([0], breaks + 1))
+        last = np.concatenate((breaks, [len(begin) - 1]))
+        return list(zip(begin[first].tolist(), finish[last].tolist()))
+
+    busy: Busy = []
+    for start, end in sorted(zip(starts, ends)):
+        start, end = max(start, window_start), min(end, window_end)
+        if busy and start <= busy[-1][1]:
+            if end > busy[-1][1]:
+                busy[-1] = (busy[-1][0], end)
+        else:
+            busy.append((start, end))
+    return busy
+
+
+def _epoch_us(column: Any) -> Any:
+    return cast(func.extract("epoch", column) * 1000000, BigInteger)
+
+
+class FreeBusyCache:
+    """LRU cache of merged busy blocks per (user, window).
+
+    Entries carry the user's generation, which every write bumps, so
+    invalidation is O(1) and stale entries simply age out.
+    """
+
+    def __init__(self, maxsize: int = 10000) -> None:
+        self.maxsize = maxsize
+        self.counters: Dict[str, int] = {"hits": 0, "misses": 0, "evictions": 0, "invalidations": 0}
+        self._entries: "OrderedDict[tuple, tuple]" = OrderedDict()
+        self._generations: Dict[int, int] = {}
+        self._lock = threading.Lock()
+
+    async def get(self, db: AsyncSession, owner_id: int, start: datetime, end: datetime) -> Busy:
+        """Return the user's busy blocks in [start, end), computing them if needed."""
+        start, end = to_naive_utc(start), to_naive_utc(end)
+        key = (owner_id, start, end)
+        with self._lock:
+            generation = self._generations.get(owner_id, 0)
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] == generation:
+                self._entries.move_to_end(key)
+                self.counters["hits"] += 1
+                return entry[1]
+            self.counters["misses"] += 1
+
+        busy = await compute_busy(db, owner_id, start, end)
+        with self._lock:
+            # A write during the computation leaves the result uncached
+            if self._generations.get(owner_id, 0) == generation:
+                self._entries[key] = (generation, busy)
+                self._entries.move_to_end(key)
+                while len(self._entries) > self.maxsize:
+                    self._entries.popitem(last=False)
+                    self.counters["evictions"] += 1
+        return busy
+
+    def discard(self, owner_id: int) -> None:
+        """Drop a user's cached windows from this worker."""
+        with self._lock:
+            self._generations[owner_id] = self._generations.get(owner_id, 0) + 1
+            self.counters["invalidations"] += 1
+
+    def invalidate(self, owner_id: int) -> None:
+        """Drop a user's cached windows from every worker."""
+        self.discard(owner_id)
+        message_bus.publish_nowait(INVALIDATION_CHANNEL, str(owner_id))
+
+    def stats(self) -> Dict[str, Any]:
+        """Return cache size and counters."""
+        with self._lock:
+            size = len(self._entries)
+        return {"size": size, "maxsize": self.maxsize, "counters": dict(self.counters)}
+
+
+async def compute_busy(db: AsyncSession, owner_id: int, start: datetime, end: datetime) -> Busy:
+    """Compute a user's busy blocks in [start, end) without the cache.
+
+    Aware bounds are converted to naive UTC, as event times are stored.
+    """
+    start, end = to_naive_utc(start), to_naive_utc(end)
+    events = Event.__table__
+    if USE_RANGE_INDEX:
+        # With NumPy, read epoch microseconds: converting datetimes is the slow part
+        columns = (
+            (_epoch_us(events.c.start_time), _epoch_us(events.c.end_time))
+            if np is not None else (events.c.start_time, events.c.end_time)
+        )
+        rows = (await db.execute(
+            select(*columns)
+            .where(events.c.owner_id == owner_id)
+            .where(events.c.recurrence_rule.is_(None))
+            .where(is_active(events))
+            .where(overlaps(events, start, end))
+        )).all()
+        if np is not None:
+            spans = np.array(rows, dtype=np.int64).reshape(-1, 2).astype("datetime64[us]")
+            starts, ends = spans[:, 0], spans[:, 1]
+        else:
+            starts, ends = [row[0] for row in rows], [row[1] for row in rows]
+    else:
+        tree = await conflict_index.get(db, owner_id)
+        starts, ends = tree.span_arrays(start, end) if np is not None else tree.spans(start, end)
+
+    occurrences = await find_occurrences(db, [owner_id], start, end)
+    if occurrences:
+        occurrence_starts = [occurrence["start_time"] for occurrence in occurrences]
+        occurrence_ends = [occurrence["end_time"] for occurrence in occurrences]
+        if np is not None:
+            starts = np.concatenate((starts, np.array(occurrence_starts, dtype="datetime64[us]")))
+            ends = np.concatenate((ends, np.array(occurrence_ends, dtype="datetime64[us]")))
+        else:
+            starts += occurrence_starts
+            ends += occurrence_ends
+    return merge_busy(starts, ends, start, end)
+
+
+def _on_remote_invalidation(message: str) -> None:
+    try:
+        freebusy_cache.discard(int(message))
+    except ValueError:
+        logger.warning(f"Ignoring malformed free/busy cache invalidation: {message}")
+
+
+settings = get_settings()
+freebusy_cache = FreeBusyCache(maxsize=settings.FREEBUSY_CACHE_MAX_SIZE)
+message_bus.subscribe(INVALIDATION_CHANNEL, _on_remote_invalidation)
@@ -0,0 +1,152 @@
+"""Keyset (cursor) pagination for list endpoints.
+
+Pages are addressed by the sort key of a boundary row instead of an offset,
+so fetching a deep page costs one index range scan instead of scanning and
+discarding every earlier row. Cursors are opaque URL-safe strings.
+"""
+import base64
+import binascii
+import heapq
+import json
+from collections.abc import Mapping
+from datetime import datetime
+from itertools import islice
+from typing import Any, List, Optional, Sequence, Tuple
+
+from fastapi import HTTPException, status
+from sqlalchemy import DateTime, tuple_
+from sqlalchemy.sql import Select
+from sqlalchemy.sql.elements import ColumnElement
+
+NEXT = "next"
+PREV = "prev"
+
+
+def encode_cursor(values: Sequence[Any], direction: str) -> str:
+    """Encode a sort key and paging direction as an opaque cursor."""
+    data = {
+        "v": [value.isoformat() if isinstance(value, datetime) else value for value in values],
+        "d": direction,
+    }
+    raw = json.dumps(data, separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str, columns: Sequence[ColumnElement]) -> Tuple[List[Any], str]:
+    """Decode a cursor produced by ``encode_cursor`` for the given sort columns.
+
+    Raises:
+        HTTPException: 400 if the cursor is malformed or for another listing
+    """
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        data = json.loads(raw)
+        values, direction = data["v"], data["d"]
+        if direction not in (NEXT, PREV) or len(values) != len(columns):
+            raise ValueError("cursor does not match this listing")
+        return [
+            datetime.fromisoformat(value) if isinstance(column.type, DateTime) else value
+            for column, value in zip(columns, values)
+        ], direction
+    except (ValueError, KeyError, TypeError, binascii.Error):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid pagination cursor",
+        )
+
+
+def _row_value(row: Any, key: str) -> Any:
+    return row[key] if isinstance(row, Mapping) else getattr(row, key)
+
+
+class KeysetPage:
+    """One page of a listing ordered by ``columns``.
+
+    Without a cursor the legacy ``skip`` offset still applies, so existing
+    clients keep working; the page they get now carries cursors as well.
+    """
+
+    def __init__(
+        self,
+        columns: Sequence[ColumnElement],
+        cursor: Optional[str] = None,
+        limit: int = 100,
+        skip: int = 0,
+    ) -> None:
+        self.columns = list(columns)
+        self.limit = limit
+        self.skip = skip
+        self.values: Optional[List[Any]] = None
+        self.direction = NEXT
+        if cursor:
+            self.values, self.direction = decode_cursor(cursor, self.columns)
+
+    def apply(self, query: Select, offset: bool = True) -> Select:
+        """Add the keyset condition, ordering and limit to a query.
+
+        One extra row is fetched to tell whether another page exists. Pass
+        ``offset=False`` when the rows are to be ``merge``d with generated
+        ones; the legacy offset is then applied after merging.
+        """
+        limit = self.limit + 1
+        key = tuple_(*self.columns)
+        if self.values is not None:
+            boundary = tuple_(*self.values)
+            query = query.where(key > boundary if self.direction == NEXT else key < boundary)
+        elif self.skip:
+            if offset:
+                query = query.offset(self.skip)
+            else:
+                limit += self.skip
+
+        if self.direction == NEXT:
+            query = query.order_by(*self.columns)
+        else:
+            query = query.order_by(*[column.desc() for column in self.columns])
+        return query.limit(limit)
+
+    def _key(self, row: Any) -> Tuple[Any, ...]:
+        return tuple(_row_value(row, column.key) for column in self.columns)
+
+    def merge(self, rows: Sequence[Any], generated: Sequence[Any]) -> List[Any]:
+        """Merge rows fetched with ``apply(query, offset=False)`` with rows built in Python.
+
+        The generated rows, e.g. occurrences of recurring events, get the
+        keyset condition, ordering and offset the query applied to the others.
+        """
+        reverse = self.direction == PREV
+        if self.values is not None:
+            boundary = tuple(self.values)
+            generated = [
+                row for row in generated
+                if (self._key(row) < boundary if reverse else self._key(row) > boundary)
+            ]
+        generated = sorted(generated, key=self._key, reverse=reverse)
+        start = self.skip if self.values is None else 0
+        merged = heapq.merge(rows, generated, key=self._key, reverse=reverse)
+        return list(islice(merged, start, start + self.limit + 1))
+
+    def _cursor(self, row: Any, direction: str) -> str:
+        return encode_cursor([_row_value(row, column.key) for column in self.columns], direction)
+
+    def paginate(self, rows: Sequence[Any]) -> Tuple[List[Any], Optional[str], Optional[str]]:
+        """Trim the extra row and compute the neighbouring cursors.
+
+        Returns:
+            tuple: (rows in ascending order, next_cursor, prev_cursor)
+        """
+        rows = list(rows)
+        has_more = len(rows) > self.limit
+        rows = rows[:self.limit]
+        if not rows:
+            return rows, None, None
+
+        if self.direction == PREV:
+            rows.reverse()
+            next_cursor = self._cursor(rows[-1], NEXT)
+            prev_cursor = self._cursor(rows[0], PREV) if has_more else None
+        else:
+            next_cursor = self._cursor(rows[-1], NEXT) if has_more else None
+            came_from_earlier = self.values is not None or self.skip > 0
+            prev_cursor = self._cursor(rows[0], PREV) if came_from_earlier else None
+        return rows, next_cursor, prev_cursor
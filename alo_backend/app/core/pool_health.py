@@ -0,0 +1,188 @@
+"""Background health monitoring for the database connection pools.
+
+Idle connections are validated on a schedule instead of on every checkout,
+so the request path no longer pays for ``pool_pre_ping`` or a ``SELECT 1``
+probe. Disconnects seen by real queries are still handled by SQLAlchemy,
+which invalidates the pool so stale connections are replaced on next use.
+"""
+import asyncio
+import logging
+from datetime import datetime
+from typing import Any, Dict, Optional, Union
+
+from sqlalchemy import event, exc, text
+from sqlalchemy.engine import Engine
+from sqlalchemy.ext.asyncio import AsyncEngine
+from starlette.concurrency import run_in_threadpool
+
+from .config import get_settings
+
+logger = logging.getLogger(__name__)
+
+AnyEngine = Union[Engine, AsyncEngine]
+
+
+class PoolHealthMonitor:
+    """Validate idle pooled connections in the background and count pool events."""
+
+    def __init__(self, interval: float = 30.0) -> None:
+        self.interval = interval
+        self.healthy = True
+        self.last_ok_at: Optional[datetime] = None
+        self.last_failure_at: Optional[datetime] = None
+        self.last_error: Optional[str] = None
+        self.counters: Dict[str, int] = {
+            "checkouts": 0,
+            "connections_opened": 0,
+            "connections_recycled": 0,
+            "background_pings": 0,
+            "failed_pings": 0,
+            "disconnects": 0,
+        }
+        self._engines: Dict[str, AnyEngine] = {}
+        self._task: Optional[asyncio.Task] = None
+
+    def register(self, name: str, engine: AnyEngine) -> None:
+        """Attach counters to an engine and include it in background validation.
+
+        Registering a new engine under an existing name replaces the old one,
+        which is what happens when the database is reinitialized.
+        """
+        sync_engine = self._sync_engine(engine)
+        event.listen(sync_engine, "checkout", self._on_checkout)
+        event.listen(sync_engine, "connect", self._on_connect)
+        event.listen(sync_engine, "invalidate", self._on_invalidate)
+        event.listen(sync_engine, "handle_error", self._on_error)
+        self._engines[name] = engine
+
+    @staticmethod
+    def _sync_engine(engine: AnyEngine) -> Engine:
+        return engine.sync_engine if isinstance(engine, AsyncEngine) else engine
+
+    def unregister(self, name: str) -> None:
+        """Stop validating the engine registered under ``name``."""
+        self._engines.pop(name, None)
+
+    # Pool event listeners
+    def _on_checkout(self, dbapi_connection, connection_record, connection_proxy) -> None:
+        self.counters["checkouts"] += 1
+
+    def _on_connect(self, dbapi_connection, connection_record) -> None:
+        self.counters["connections_opened"] += 1
+
+    def _on_invalidate(self, dbapi_connection, connection_record, exception) -> None:
+        self.counters["connections_recycled"] += 1
+
+    def _on_error(self, context) -> None:
+        if context.is_disconnect:
+            self.counters["disconnects"] += 1
+            self._record_failure(context.original_exception)
+
+    def _record_ok(self) -> None:
+        if not self.healthy:
+            logger.info("Database pool health restored")
+        self.healthy = True
+        self.last_ok_at = datetime.utcnow()
+
+    def _record_failure(self, error: BaseException) -> None:
+        self.healthy = False
+        self.last_failure_at = datetime.utcnow()
+        self.last_error = str(error)
+
+    @staticmethod
+    def _idle_count(pool) -> int:
+        # Pools without a checked-in count (SQLite memory pools) hold a single connection
+        checkedin = getattr(pool, "checkedin", None)
+        return checkedin() if callable(checkedin) else 1
+
+    def _validate_sync(self, engine: Engine) -> None:
+        # QueuePool hands out idle connections FIFO, so checking out and
+        # returning one at a time walks every idle connection once
+        for _ in range(self._idle_count(engine.pool)):
+            with engine.connect() as conn:
+                conn.execute(text("SELECT 1"))
+            self.counters["background_pings"] += 1
+
+    async def _validate_async(self, engine: AsyncEngine) -> None:
+        for _ in range(self._idle_count(engine.sync_engine.pool)):
+            async with engine.connect() as conn:
+                await conn.execute(text("SELECT 1"))
+            self.counters["background_pings"] += 1
+
+    async def check(self) -> bool:
+        """Validate the idle connections of every registered engine once.
+
+        A failing connection is invalidated by SQLAlchemy as part of the
+        failed query; nothing is rebuilt unless a real error occurs.
+
+        Returns:
+            bool: True if every engine validated successfully
+        """
+        ok = True
+        for name, engine in list(self._engines.items()):
+            try:
+                if isinstance(engine, AsyncEngine):
+                    await self._validate_async(engine)
+                else:
+                    await run_in_threadpool(self._validate_sync, engine)
+            except exc.SQLAlchemyError as e:
+                ok = False
+                self.counters["failed_pings"] += 1
+                self._record_failure(e)
+                logger.error(f"Background validation of {name} pool failed: {str(e)}")
+        if ok:
+            self._record_ok()
+        return ok
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.interval)
+            try:
+                await self.check()
+            except Exception as e:
+                logger.error(f"Unexpected error in pool health monitor: {str(e)}")
+
+    def start(self) -> None:
+        """Start the background validation task on the running event loop."""
+        if self._task is not None and not self._task.done():
+            return
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            logger.warning("No running event loop, pool health monitor not started")
+            return
+        self._task = loop.create_task(self._run())
+        logger.info(f"Pool health monitor started (interval: {self.interval}s)")
+
+    async def stop(self) -> None:
+        """Cancel the background validation task."""
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    def stats(self) -> Dict[str, Any]:
+        """Return health state, counters and per-engine pool status."""
+        counters = dict(self.counters)
+        # Every checkout used to cost a pre-ping; background pings are the replacement
+        counters["pings_avoided"] = max(0, counters["checkouts"] - counters["background_pings"])
+        return {
+            "healthy": self.healthy,
+            "running": self._task is not None and not self._task.done(),
+            "interval_seconds": self.interval,
+            "last_ok_at": self.last_ok_at,
+            "last_failure_at": self.last_failure_at,
+            "last_error": self.last_error,
+            "counters": counters,
+            "pools": {
+                name: self._sync_engine(engine).pool.status()
+                for name, engine in self._engines.items()
+            },
+        }
+
+
+pool_health_monitor = PoolHealthMonitor(interval=get_settings().DATABASE_HEALTH_CHECK_INTERVAL)
@@ -0,0 +1,215 @@
+"""Purging of deleted accounts.
+
+Deleting a user (``DELETE /users/{id}``) only deactivates the account and
+sets ``deleted_at``, and the request returns 202. This job then removes
+what the user owns in chunks of ``PURGE_BATCH_SIZE`` rows, each deleted in
+its own transaction, so no statement locks or logs the whole account at
+once and nothing is loaded into Python:
+
+1. the user's reminders
+2. the user's events; the database deletes what still hangs off them
+   (other users' reminders, occurrence exceptions, delivery attempts)
+   through ON DELETE CASCADE. The other users' reminders get tombstones
+   and their owners' change sequences advance first, for delta sync
+3. the user's archived events and reminders, which have no foreign keys
+4. the user row, with its group memberships (ON DELETE CASCADE)
+
+Chunks are selected from the data alone, so an interrupted purge carries
+on where it stopped on the next run. Deletions wake the background job
+(``PURGE_ENABLED``), which also sweeps every ``PURGE_INTERVAL`` seconds to
+pick up accounts left behind by a restart; without it, run
+``python -m app.core.purge`` from cron.
+"""
+import asyncio
+import logging
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+from sqlalchemy import delete, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.sql.schema import Table
+
+from . import database
+from .config import get_settings
+from .conflicts import conflict_index
+from .freebusy import freebusy_cache
+from .push import push_hub
+from .sync import record_deletes
+from .user_cache import user_cache
+from ..models import Event, Reminder, User, events_archive, reminders_archive
+
+logger = logging.getLogger(__name__)
+
+
+class PurgeJob:
+    """Delete the rows of deleted accounts in batched, resumable chunks."""
+
+    def __init__(self, batch_size: int = 5000, interval: float = 300.0) -> None:
+        self.batch_size = batch_size
+        self.interval = interval
+        self.counters: Dict[str, int] = {
+            "users": 0, "events": 0, "reminders": 0, "foreign_reminders": 0, "archived": 0,
+            "chunks": 0, "runs": 0, "errors": 0,
+        }
+        self.last_run_at: Optional[datetime] = None
+        self._task: Optional[asyncio.Task] = None
+        self._wake: Optional[asyncio.Event] = None
+
+    async def _delete_chunk(self, table: Table, owner_id: int) -> int:
+        cascaded: List[Tuple[int, int]] = []
+        async with database.AsyncSessionLocal() as session:
+            async with session.begin():
+                ids = (await session.execute(
+                    select(table.c.id)
+                    .where(table.c.owner_id == owner_id)
+                    .order_by(table.c.id)
+                    .limit(self.batch_size)
+                    .with_for_update(skip_locked=True)
+                )).scalars().all()
+                if ids and table is Event.__table__:
+                    cascaded = await self._record_cascaded_reminders(session, ids)
+                if ids:
+                    await session.execute(delete(table).where(table.c.id.in_(ids)))
+        if cascaded:
+            self.counters["foreign_reminders"] += len(cascaded)
+            push_hub.publish([(owner, "reminder", "deleted", reminder_id) for reminder_id, owner in cascaded])
+        return len(ids)
+
+    async def _record_cascaded_reminders(self, session: AsyncSession, event_ids: List[int]) -> List[Tuple[int, int]]:
+        """Leave tombstones for the reminders the cascade deletes with these events.
+
+        The purged user's own are gone by now, so these are other users'
+        reminders on the user's events; their owners' sequences advance.
+
+        Returns:
+            list: The id and owner of each reminder
+        """
+        reminders = Reminder.__table__
+        cascaded = [tuple(row) for row in await session.execute(
+            select(reminders.c.id, reminders.c.owner_id).where(reminders.c.event_id.in_(event_ids))
+        )]
+        if cascaded:
+            await record_deletes(session, reminders.c.id, [reminder_id for reminder_id, _ in cascaded])
+        return cascaded
+
+    async def purge_user(self, user_id: int) -> Dict[str, int]:
+        """Delete everything a deleted user owns, then the user.
+
+        Returns:
+            dict: Number of rows deleted, by kind
+        """
+        purged = {"events": 0, "reminders": 0, "archived": 0}
+        for kind, table in (
+            ("reminders", Reminder.__table__),
+            ("events", Event.__table__),
+            ("archived", events_archive),
+            ("archived", reminders_archive),
+        ):
+            while True:
+                deleted = await self._delete_chunk(table, user_id)
+                if not deleted:
+                    break
+                purged[kind] += deleted
+                self.counters[kind] += deleted
+                self.counters["chunks"] += 1
+
+        users = User.__table__
+        async with database.AsyncSessionLocal() as session:
+            async with session.begin():
+                result = await session.execute(delete(users).where(users.c.id == user_id))
+        if result.rowcount:
+            self.counters["users"] += 1
+            conflict_index.invalidate(user_id)
+            freebusy_cache.invalidate(user_id)
+            user_cache.invalidate(user_id)
+        logger.info(
+            f"Purged user {user_id}: {purged['events']} events, {purged['reminders']} reminders, "
+            f"{purged['archived']} archived rows"
+        )
+        return purged
+
+    async def run_once(self) -> Dict[str, int]:
+        """Purge every account queued for deletion, oldest first.
+
+        Returns:
+            dict: Number of users and rows deleted by this run
+        """
+        if database.AsyncSessionLocal is None:
+            database.initialize_async_database()
+        users = User.__table__
+        async with database.AsyncSessionLocal() as session:
+            user_ids = (await session.execute(
+                select(users.c.id).where(users.c.deleted_at.isnot(None)).order_by(users.c.deleted_at, users.c.id)
+            )).scalars().all()
+
+        purged = {"users": 0, "events": 0, "reminders": 0, "archived": 0}
+        for user_id in user_ids:
+            for kind, count in (await self.purge_user(user_id)).items():
+                purged[kind] += count
+            purged["users"] += 1
+        self.counters["runs"] += 1
+        self.last_run_at = datetime.utcnow()
+        return purged
+
+    async def _run(self) -> None:
+        while True:
+            self._wake.clear()
+            try:
+                await self.run_once()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self.counters["errors"] += 1
+                logger.error(f"Purge run failed: {str(e)}")
+            try:
+                await asyncio.wait_for(self._wake.wait(), timeout=self.interval)
+            except asyncio.TimeoutError:
+                pass
+
+    def wake(self) -> None:
+        """Start a run now, e.g. after a deletion; a no-op if the job is not running."""
+        if self._wake is not None:
+            self._wake.set()
+
+    def start(self) -> None:
+        """Run the job on the running event loop, on wake-ups and every ``interval`` seconds."""
+        if self._task is not None and not self._task.done():
+            return
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            logger.warning("No running event loop, purge job not started")
+            return
+        self._wake = asyncio.Event()
+        self._task = loop.create_task(self._run())
+        logger.info(f"Purge job started (batch size: {self.batch_size})")
+
+    async def stop(self) -> None:
+        """Stop the background job; an interrupted purge resumes on the next start."""
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+        self._wake = None
+
+    def stats(self) -> Dict[str, Any]:
+        """Return the job settings and counters."""
+        return {
+            "running": self._task is not None and not self._task.done(),
+            "batch_size": self.batch_size,
+            "last_run_at": self.last_run_at.isoformat() if self.last_run_at else None,
+            "counters": dict(self.counters),
+        }
+
+
+settings = get_settings()
+purge_job = PurgeJob(batch_size=settings.PURGE_BATCH_SIZE, interval=settings.PURGE_INTERVAL)
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    print(asyncio.run(purge_job.run_once()))
@@ -0,0 +1,149 @@
+"""Push of calendar changes to connected clients.
+
+Clients keep one Server-Sent Events stream (``GET /push/sse``) or
+WebSocket (``/push/ws``) open per device instead of polling the listings.
+After a write to events or reminders commits, the API publishes what
+changed, as ``{"changes": [{"type", "op", "id"}, ...]}``, and every open
+connection of the owner receives it. A message is a hint: clients fetch
+the changes themselves with ``GET /sync``, on connecting and whenever a
+message arrives, so one that is missed or dropped loses nothing.
+
+Messages go over the message bus (app.core.bus), so with ``REDIS_URL``
+set a write on one worker reaches connections held by every worker. Each
+worker fans them out in process through ``PushHub``: connections are
+grouped by user, and an idle one costs a small queue object and the task
+serving it, never a database connection.
+"""
+import asyncio
+import logging
+from collections import deque
+from typing import Any, Deque, Dict, Iterable, List, Optional, Set, Tuple
+
+from .bus import message_bus
+from .config import get_settings
+from .serialization import dumps
+
+logger = logging.getLogger(__name__)
+
+PUSH_CHANNEL = "push:changes"
+
+# (owner id, "event" or "reminder", "created", "updated" or "deleted", row id)
+Change = Tuple[int, str, str, int]
+
+
+class Subscription:
+    """Messages waiting to be sent to one connection."""
+
+    __slots__ = ("user_id", "closed", "_messages", "_waiter")
+
+    def __init__(self, user_id: int, maxsize: int) -> None:
+        self.user_id = user_id
+        self.closed = False
+        # A slow client loses its oldest messages, which the next sync covers
+        self._messages: Deque[str] = deque(maxlen=maxsize)
+        self._waiter: Optional[asyncio.Future] = None
+
+    def put(self, message: str) -> bool:
+        """Queue a message; returns False if it pushed out the oldest one."""
+        full = len(self._messages) == self._messages.maxlen
+        self._messages.append(message)
+        self._wake()
+        return not full
+
+    def close(self) -> None:
+        """Stop the connection; a pending ``get`` returns None."""
+        self.closed = True
+        self._wake()
+
+    def _wake(self) -> None:
+        if self._waiter is not None and not self._waiter.done():
+            self._waiter.set_result(None)
+
+    async def get(self, timeout: Optional[float] = None) -> Optional[str]:
+        """Return the next message, or None once closed or after ``timeout`` seconds."""
+        if not self._messages and not self.closed:
+            self._waiter = asyncio.get_running_loop().create_future()
+            try:
+                await asyncio.wait_for(self._waiter, timeout)
+            except asyncio.TimeoutError:
+                pass
+            finally:
+                self._waiter = None
+        if self._messages and not self.closed:
+            return self._messages.popleft()
+        return None
+
+
+class PushHub:
+    """This worker's push connections, by user, and the fanout of changes to them."""
+
+    def __init__(self, queue_size: int = 100, enabled: bool = True) -> None:
+        self.queue_size = queue_size
+        self.enabled = enabled
+        self.counters: Dict[str, int] = {
+            "published": 0, "received": 0, "delivered": 0, "dropped": 0, "connections": 0,
+        }
+        self._subscriptions: Dict[int, Set[Subscription]] = {}
+
+    def subscribe(self, user_id: int) -> Subscription:
+        """Open a subscription to a user's changes; ``unsubscribe`` it when the connection ends."""
+        subscription = Subscription(user_id, self.queue_size)
+        self._subscriptions.setdefault(user_id, set()).add(subscription)
+        self.counters["connections"] += 1
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        subscription.close()
+        subscriptions = self._subscriptions.get(subscription.user_id)
+        if subscriptions is not None:
+            subscriptions.discard(subscription)
+            if not subscriptions:
+                del self._subscriptions[subscription.user_id]
+
+    def publish(self, changes: Iterable[Change]) -> None:
+        """Announce committed changes to their owners' connections on every worker.
+
+        Call after the commit, so clients syncing on the message see the changes.
+        """
+        if not self.enabled:
+            return
+        by_owner: Dict[int, List[Dict[str, Any]]] = {}
+        for owner_id, kind, op, row_id in changes:
+            by_owner.setdefault(owner_id, []).append({"type": kind, "op": op, "id": row_id})
+        for owner_id, owner_changes in by_owner.items():
+            # Rendered once here and sent to every connection as is
+            payload = dumps({"changes": owner_changes}).decode("utf-8")
+            message_bus.publish_nowait(PUSH_CHANNEL, f"{owner_id} {payload}")
+            self.counters["published"] += 1
+
+    def deliver(self, message: str) -> None:
+        """Hand a published message to this worker's connections of its user."""
+        user_id, _, payload = message.partition(" ")
+        try:
+            subscriptions = self._subscriptions.get(int(user_id))
+        except ValueError:
+            logger.warning(f"Ignoring malformed push message: {message[:100]}")
+            return
+        self.counters["received"] += 1
+        if not subscriptions:
+            return
+        for subscription in subscriptions:
+            if subscription.put(payload):
+                self.counters["delivered"] += 1
+            else:
+                self.counters["dropped"] += 1
+
+    def stats(self) -> Dict[str, Any]:
+        """Return open connections, connected users and counters."""
+        return {
+            "enabled": self.enabled,
+            "open_connections": sum(len(subscriptions) for subscriptions in self._subscriptions.values()),
+            "users": len(self._subscriptions),
+            "queue_size": self.queue_size,
+            "counters": dict(self.counters),
+        }
+
+
+settings = get_settings()
+push_hub = PushHub(queue_size=settings.PUSH_QUEUE_SIZE, enabled=settings.PUSH_ENABLED)
+message_bus.subscribe(PUSH_CHANNEL, push_hub.deliver)
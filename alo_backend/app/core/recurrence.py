@@ -0,0 +1,387 @@
+"""Recurring event expansion.
+
+A recurring event is stored once, with an iCal-style rule in
+``recurrence_rule``: ``{"freq": "DAILY"|"WEEKLY"|"MONTHLY"|"YEARLY",
+"interval": n, "count": n, "until": iso-datetime, "byweekday": ["MO", ...]}``.
+Occurrences are never materialized. ``occurrences`` computes the first one
+inside a window directly from the rule (no walking from the series start)
+and yields the rest lazily, so a one-week window into a ten-year daily
+series costs a handful of steps. Cancelled or edited occurrences are stored
+as ``event_exceptions`` keyed by their original start.
+
+Expanded windows are cached per (event, window) and keyed by the event's
+``updated_at``, so any change to the series, or to one of its exceptions,
+which touches the series, invalidates them.
+"""
+import math
+import threading
+from bisect import bisect_left
+from calendar import monthrange
+from collections import OrderedDict
+from datetime import datetime, timedelta
+from enum import Enum
+from functools import lru_cache
+from typing import Any, Dict, Iterable, Iterator, List, Mapping, Optional, Sequence, Tuple
+
+from sqlalchemy import event
+
+from .bus import message_bus
+from .config import get_settings
+from .utils import to_naive_utc
+from ..models import Event
+
+FREQUENCIES = ("DAILY", "WEEKLY", "MONTHLY", "YEARLY")
+WEEKDAYS = ("MO", "TU", "WE", "TH", "FR", "SA", "SU")
+# The Gregorian calendar repeats every 400 years
+CALENDAR_CYCLE_MONTHS = 400 * 12
+
+INVALIDATION_CHANNEL = "occurrence-cache:invalidate"
+
+
+def _value(value: Any) -> Any:
+    return value.value if isinstance(value, Enum) else value
+
+
+def normalize_rule(rule: Optional[Mapping[str, Any]]) -> Optional[Dict[str, Any]]:
+    """Return a JSON-safe rule with every key present, or None."""
+    if not rule:
+        return None
+    until = rule.get("until")
+    return {
+        "freq": _value(rule["freq"]),
+        "interval": int(rule.get("interval") or 1),
+        "count": rule.get("count"),
+        "until": until.isoformat() if isinstance(until, datetime) else until,
+        "byweekday": [_value(day) for day in rule["byweekday"]] if rule.get("byweekday") else None,
+    }
+
+
+def _add_months(start: datetime, months: int) -> Optional[datetime]:
+    # None when the month has no such day; those months are skipped
+    month_index = start.month - 1 + months
+    year, month = start.year + month_index // 12, month_index % 12 + 1
+    if start.day > monthrange(year, month)[1]:
+        return None
+    return start.replace(year=year, month=month)
+
+
+def _months_between(start: datetime, later: datetime) -> int:
+    return (later.year - start.year) * 12 + later.month - start.month
+
+
+@lru_cache(maxsize=1024)
+def _month_cycle(year: int, month: int, day: int, months: int) -> Tuple[int, Tuple[int, ...]]:
+    # Which periods of a monthly or yearly series have its start day repeats
+    # with the calendar: every year for the 30th and 31st, every 400 years
+    # (leap days) for the 29th. Returns the cycle length in periods and the
+    # periods within it that exist
+    if day <= 28:
+        return 1, (0,)
+    calendar_months = CALENDAR_CYCLE_MONTHS if day == 29 else 12
+    length = calendar_months // math.gcd(months, calendar_months)
+    start = datetime(2000 + year % 400, month, day)
+    return length, tuple(k for k in range(length) if _add_months(start, k * months) is not None)
+
+
+def _existing_periods(dtstart: datetime, months: int, periods: int) -> int:
+    # Number of the first ``periods`` periods whose month has the start day
+    length, existing = _month_cycle(dtstart.year, dtstart.month, dtstart.day, months)
+    cycles, rest = divmod(periods, length)
+    return cycles * len(existing) + bisect_left(existing, rest)
+
+
+def _nth_existing_period(dtstart: datetime, months: int, n: int) -> int:
+    # Period of the n-th (from 0) month that has the start day
+    length, existing = _month_cycle(dtstart.year, dtstart.month, dtstart.day, months)
+    cycles, rest = divmod(n, len(existing))
+    return cycles * length + existing[rest]
+
+
+def _until(rule: Mapping[str, Any]) -> Optional[datetime]:
+    until = rule.get("until")
+    if isinstance(until, str):
+        until = datetime.fromisoformat(until)
+    return to_naive_utc(until)
+
+
+def occurrences(
+    rule: Mapping[str, Any], dtstart: datetime, after: datetime, before: datetime
+) -> Iterator[datetime]:
+    """Lazily yield the occurrence starts of a series within [after, before].
+
+    Args:
+        rule: Recurrence rule, as stored in ``Event.recurrence_rule``
+        dtstart: Start of the first occurrence
+        after: Earliest start to yield
+        before: Latest start to yield
+    """
+    freq = rule["freq"]
+    interval = rule.get("interval") or 1
+    count = rule.get("count")
+    until = _until(rule)
+    last = min(before, until) if until else before
+    after = max(after, dtstart)
+    if after > last:
+        return
+
+    try:
+        if freq in ("DAILY", "WEEKLY") and not (freq == "WEEKLY" and rule.get("byweekday")):
+            step = timedelta(days=interval * (7 if freq == "WEEKLY" else 1))
+            # Jump straight to the first occurrence at or after the window start
+            index = math.ceil((after - dtstart) / step)
+            while count is None or index < count:
+                start = dtstart + index * step
+                if start > last:
+                    return
+                yield start
+                index += 1
+
+        elif freq == "WEEKLY":
+            offsets = sorted({WEEKDAYS.index(day) for day in rule["byweekday"]})
+            period = timedelta(weeks=interval)
+            week0 = dtstart - timedelta(days=dtstart.weekday())
+            in_first_week = sum(1 for offset in offsets if week0 + timedelta(days=offset) >= dtstart)
+            week = max(0, (after - week0) // period)
+            while True:
+                # Occurrences in the weeks before this one
+                index = in_first_week + (week - 1) * len(offsets) if week else 0
+                for offset in offsets:
+                    start = week0 + week * period + timedelta(days=offset)
+                    if start < dtstart:
+                        continue
+                    if count is not None and index >= count:
+                        return
+                    index += 1
+                    if start > last:
+                        return
+                    if start >= after:
+                        yield start
+                week += 1
+
+        else:
+            months = interval * (12 if freq == "YEARLY" else 1)
+            period = max(0, _months_between(dtstart, after) // months)
+            if count is not None:
+                # Months without the start day are skipped and not counted
+                index = _existing_periods(dtstart, months, period)
+            while count is None or index < count:
+                start = _add_months(dtstart, period * months)
+                period += 1
+                if start is None:
+                    continue
+                if count is not None:
+                    index += 1
+                if start > last:
+                    return
+                if start >= after:
+                    yield start
+    except (OverflowError, ValueError):
+        # Past datetime.max (ValueError for a month past year 9999)
+        return
+
+
+def _nth_start(rule: Mapping[str, Any], dtstart: datetime, n: int) -> datetime:
+    # Start of the n-th (from 0) occurrence, ignoring ``count`` and ``until``
+    freq = rule["freq"]
+    interval = rule.get("interval") or 1
+    if freq in ("DAILY", "WEEKLY") and not (freq == "WEEKLY" and rule.get("byweekday")):
+        return dtstart + n * timedelta(days=interval * (7 if freq == "WEEKLY" else 1))
+    if freq == "WEEKLY":
+        offsets = sorted({WEEKDAYS.index(day) for day in rule["byweekday"]})
+        week0 = dtstart - timedelta(days=dtstart.weekday())
+        first_week = [offset for offset in offsets if week0 + timedelta(days=offset) >= dtstart]
+        if n < len(first_week):
+            return week0 + timedelta(days=first_week[n])
+        week, position = divmod(n - len(first_week), len(offsets))
+        return week0 + (week + 1) * timedelta(weeks=interval) + timedelta(days=offsets[position])
+    months = interval * (12 if freq == "YEARLY" else 1)
+    return _add_months(dtstart, _nth_existing_period(dtstart, months, n) * months)
+
+
+def _last_start(rule: Mapping[str, Any], dtstart: datetime, until: datetime) -> Optional[datetime]:
+    # Start of the last occurrence at or before ``until``, ignoring ``count``
+    if until < dtstart:
+        return None
+    freq = rule["freq"]
+    interval = rule.get("interval") or 1
+    if freq in ("DAILY", "WEEKLY") and not (freq == "WEEKLY" and rule.get("byweekday")):
+        step = timedelta(days=interval * (7 if freq == "WEEKLY" else 1))
+        return dtstart + ((until - dtstart) // step) * step
+    if freq == "WEEKLY":
+        offsets = sorted({WEEKDAYS.index(day) for day in rule["byweekday"]}, reverse=True)
+        period = timedelta(weeks=interval)
+        week0 = dtstart - timedelta(days=dtstart.weekday())
+        week = (until - week0) // period
+        # Every day of the weeks after the first is on or after dtstart, so
+        # the week before has an occurrence unless it is the first
+        for w in (week, week - 1):
+            for offset in offsets:
+                start = week0 + w * period + timedelta(days=offset)
+                if dtstart <= start <= until:
+                    return start
+        return None
+    months = interval * (12 if freq == "YEARLY" else 1)
+    # At most a few periods back: months lacking the start day are rare
+    period = _months_between(dtstart, until) // months
+    while period >= 0:
+        start = _add_months(dtstart, period * months)
+        if start is not None and start <= until:
+            return start
+        period -= 1
+    return None
+
+
+def series_end(rule: Optional[Mapping[str, Any]], start: datetime, end: datetime) -> Optional[datetime]:
+    """End of the last occurrence, or None for a series without an end."""
+    if not rule:
+        return end
+    count, until = rule.get("count"), _until(rule)
+    if count is None and until is None:
+        return None
+    # Computed from the rule, not by walking the series
+    try:
+        last = _nth_start(rule, start, count - 1) if count is not None else None
+        if until is not None:
+            bounded = _last_start(rule, start, until)
+            last = bounded if bounded is None or last is None else min(last, bounded)
+        return (last or start) + (end - start)
+    except (OverflowError, ValueError):
+        # The series runs past datetime.max, so it has no representable end
+        return None
+
+
+def recurrence_columns(rule: Optional[Mapping[str, Any]], start: datetime, end: datetime) -> Dict[str, Any]:
+    """Stored ``recurrence_rule`` and ``recurrence_end`` of an event."""
+    rule = normalize_rule(rule)
+    return {"recurrence_rule": rule, "recurrence_end": series_end(rule, start, end) if rule else None}
+
+
+class OccurrenceCache:
+    """LRU cache of expanded occurrence starts per (event, window)."""
+
+    def __init__(self, maxsize: int = 10000) -> None:
+        self.maxsize = maxsize
+        self.counters: Dict[str, int] = {"hits": 0, "misses": 0, "evictions": 0}
+        self._entries: "OrderedDict[tuple, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def expand(self, series: Mapping[str, Any], after: datetime, before: datetime) -> List[datetime]:
+        """Return the occurrence starts of an event row within [after, before]."""
+        key = (series["id"], after, before)
+        version = series["updated_at"]
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] == version:
+                self._entries.move_to_end(key)
+                self.counters["hits"] += 1
+                return entry[1]
+            self.counters["misses"] += 1
+
+        starts = list(occurrences(series["recurrence_rule"], series["start_time"], after, before))
+        with self._lock:
+            self._entries[key] = (version, starts)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.counters["evictions"] += 1
+        return starts
+
+    def discard(self, event_id: int) -> None:
+        """Drop every cached window of an event from this worker."""
+        with self._lock:
+            for key in [key for key in self._entries if key[0] == event_id]:
+                del self._entries[key]
+
+    def invalidate(self, event_id: int) -> None:
+        """Drop every cached window of an event from every worker."""
+        self.discard(event_id)
+        message_bus.publish_nowait(INVALIDATION_CHANNEL, str(event_id))
+
+    def stats(self) -> Dict[str, Any]:
+        """Return cache size and counters."""
+        with self._lock:
+            size = len(self._entries)
+        return {"size": size, "maxsize": self.maxsize, "counters": dict(self.counters)}
+
+
+def expand_series(
+    series_rows: Iterable[Mapping[str, Any]],
+    exceptions: Sequence[Mapping[str, Any]],
+    after: datetime,
+    before: datetime,
+    overlapping: bool = False,
+) -> List[Dict[str, Any]]:
+    """Expand recurring event rows into occurrence rows within a window.
+
+    Occurrences keep the columns of their series with their own start and
+    end, plus ``recurrence_id``: the original start, which identifies them.
+    Exceptions cancel or override single occurrences, and an override can
+    move an occurrence into or out of the window.
+
+    Args:
+        series_rows: Recurring event rows
+        exceptions: ``event_exceptions`` rows of those events
+        after: Start of the window
+        before: End of the window
+        overlapping: Include occurrences overlapping the window, not only
+            those inside it
+    """
+    def in_window(start: datetime, end: datetime) -> bool:
+        return start < before and end > after if overlapping else after <= start and end <= before
+
+    by_event: Dict[int, Dict[datetime, Mapping[str, Any]]] = {}
+    for row in exceptions:
+        by_event.setdefault(row["event_id"], {})[row["original_start"]] = row
+
+    result = []
+    for series in series_rows:
+        duration = series["end_time"] - series["start_time"]
+        # Range of original starts, inclusive, whose occurrence is in the window
+        if overlapping:
+            first, last = after - duration + timedelta.resolution, before - timedelta.resolution
+        else:
+            first, last = after, before - duration
+        starts = occurrence_cache.expand(series, first, last)
+        series_exceptions = by_event.get(series["id"], {})
+        # Overrides can move an occurrence in from outside the window
+        moved_in = [
+            original for original, row in series_exceptions.items()
+            if not row["is_cancelled"] and (row["start_time"] is not None or row["end_time"] is not None)
+            and not first <= original <= last
+        ]
+        for original in starts + moved_in:
+            occurrence = dict(series)
+            occurrence.update(start_time=original, end_time=original + duration, recurrence_id=original)
+            exception = series_exceptions.get(original)
+            if exception is not None:
+                if exception["is_cancelled"]:
+                    continue
+                for field in ("title", "description", "location", "start_time", "end_time"):
+                    if exception[field] is not None:
+                        occurrence[field] = exception[field]
+                if exception["start_time"] is not None and exception["end_time"] is None:
+                    occurrence["end_time"] = exception["start_time"] + duration
+                if not in_window(occurrence["start_time"], occurrence["end_time"]):
+                    continue
+            result.append(occurrence)
+    return result
+
+
+@event.listens_for(Event, "before_insert")
+@event.listens_for(Event, "before_update")
+def _on_event_write(mapper: Any, connection: Any, target: Event) -> None:
+    # Keep the stored rule JSON-safe and the series end in step with it
+    for key, value in recurrence_columns(target.recurrence_rule, target.start_time, target.end_time).items():
+        setattr(target, key, value)
+
+
+def _on_remote_invalidation(message: str) -> None:
+    try:
+        occurrence_cache.discard(int(message))
+    except ValueError:
+        pass
+
+
+settings = get_settings()
+occurrence_cache = OccurrenceCache(maxsize=settings.OCCURRENCE_CACHE_MAX_SIZE)
+message_bus.subscribe(INVALIDATION_CHANNEL, _on_remote_invalidation)
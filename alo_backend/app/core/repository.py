@@ -0,0 +1,205 @@
+"""Owner-scoped row access by id.
+
+Endpoints reading or writing one row by id go through an
+``OwnedRepository``. The ownership check is part of the statement's WHERE
+clause (the id and the owner for users, the id alone for superusers), and
+writes read the written row back with ``INSERT/UPDATE/DELETE ... RETURNING``,
+so a request fetches nothing before its permission check. Only when no row
+matched is the id looked up again, to tell a missing row (404) from someone
+else's (403).
+
+Every statement is built once per repository with bound parameters for the
+id and owner. Requests only bind values, so neither the statement nor its
+cache key is generated again, and SQLAlchemy's compiled cache serves the
+SQL. Updates setting SQL expressions rather than values are the exception.
+
+Databases without RETURNING support in SQLAlchemy (SQLite) run the same
+writes with a SELECT after the statement, or before it for deletes.
+
+Writes to events and reminders also advance the owner's change sequence
+and stamp the row with it, and deletes leave tombstones, for delta sync
+(app.core.sync).
+"""
+from typing import Any, Dict, List, Mapping, Tuple
+
+from fastapi import HTTPException, status
+from sqlalchemy import Column, Table, and_, bindparam, delete, insert, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.sql.elements import ClauseElement
+
+from .database import supports_returning
+from .sync import KINDS, OwnerSequences, Tombstones, advance
+from ..models import Event, Reminder, User
+
+Row = Dict[str, Any]
+
+
+class OwnedRepository:
+    """Rows of one table, each owned by the user in ``owner_key``.
+
+    Statements come in pairs indexed by ``user.is_superuser``: superusers
+    may read and change every row, other users only their own.
+    """
+
+    def __init__(self, table: Table, noun: str, owner_key: str = "owner_id") -> None:
+        self.table = table
+        self.noun = noun
+        by_id = table.c.id == bindparam("row_id")
+        owned = and_(by_id, table.c[owner_key] == bindparam("user_id"))
+        self._where = {False: owned, True: by_id}
+        self._select = {superuser: select(table).where(where) for superuser, where in self._where.items()}
+        self._exists = {superuser: select(table.c.id).where(where) for superuser, where in self._where.items()}
+        self._update = {superuser: update(table).where(where) for superuser, where in self._where.items()}
+        self._delete = {superuser: delete(table).where(where) for superuser, where in self._where.items()}
+        self._insert = insert(table)
+        # RETURNING variants, only executed where the database supports them
+        self._update_returning = {
+            superuser: statement.returning(*table.c) for superuser, statement in self._update.items()
+        }
+        self._delete_returning = {
+            superuser: statement.returning(*table.c) for superuser, statement in self._delete.items()
+        }
+        self._insert_returning = self._insert.returning(*table.c)
+        # Change tracking of events and reminders
+        self.tracked = table in KINDS
+        if self.tracked:
+            self._owners = {
+                superuser: OwnerSequences(select(table.c.owner_id).where(where))
+                for superuser, where in self._where.items()
+            }
+            self._tombstones = {superuser: Tombstones(table, where) for superuser, where in self._where.items()}
+        # Built on first use, per referencing column
+        self._dependents: Dict[Column, Any] = {}
+        self._delete_dependents: Dict[Tuple[Column, bool], Tuple[Any, Any, Any, Any]] = {}
+
+    def _params(self, row_id: int, user: Any) -> Dict[str, Any]:
+        if user.is_superuser:
+            return {"row_id": row_id}
+        return {"row_id": row_id, "user_id": user.id}
+
+    async def error(self, db: AsyncSession, row_id: int, action: str) -> HTTPException:
+        """The error for a request that matched no row: 404 if it does not exist, else 403."""
+        exists = (await db.execute(self._exists[True], {"row_id": row_id})).first()
+        if exists is None:
+            return HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"{self.noun} not found",
+            )
+        return HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail=f"Not enough permissions to {action} this {self.noun.lower()}",
+        )
+
+    async def get(self, db: AsyncSession, row_id: int, user: Any, action: str = "access") -> Row:
+        """Return a row the user may ``action``, or raise 404/403."""
+        row = (await db.execute(self._select[user.is_superuser], self._params(row_id, user))).mappings().first()
+        if row is None:
+            raise await self.error(db, row_id, action)
+        return dict(row)
+
+    async def check(self, db: AsyncSession, row_id: int, user: Any, action: str) -> None:
+        """Raise 404/403 unless the row exists and the user may ``action`` it."""
+        if (await db.execute(self._exists[user.is_superuser], self._params(row_id, user))).first() is None:
+            raise await self.error(db, row_id, action)
+
+    async def insert(self, db: AsyncSession, values: Mapping[str, Any]) -> Row:
+        """Insert a row and return it, column defaults included."""
+        if self.tracked:
+            sequences = await advance(db, [values["owner_id"]])
+            values = {**values, "change_seq": sequences[values["owner_id"]]}
+        if supports_returning(db):
+            result = await db.execute(self._insert_returning, values)
+            return dict(result.mappings().one())
+        result = await db.execute(self._insert, values)
+        row_id = result.inserted_primary_key[0]
+        return dict((await db.execute(self._select[True], {"row_id": row_id})).mappings().one())
+
+    async def update(
+        self, db: AsyncSession, row_id: int, user: Any, values: Mapping[str, Any], action: str = "update"
+    ) -> Row:
+        """Update a row the user may ``action`` and return it, or raise 404/403.
+
+        Values may be SQL expressions, such as a CASE on the stored row.
+        """
+        if self.tracked:
+            sequences = await self._owners[user.is_superuser].advance(db, self._params(row_id, user))
+            if not sequences:
+                raise await self.error(db, row_id, action)
+            values = {**values, "change_seq": next(iter(sequences.values()))}
+        returning = supports_returning(db)
+        statements = self._update_returning if returning else self._update
+        statement = statements[user.is_superuser]
+        expressions = {key: value for key, value in values.items() if isinstance(value, ClauseElement)}
+        if expressions:
+            statement = statement.values(expressions)
+        params = {key: value for key, value in values.items() if key not in expressions}
+        params.update(self._params(row_id, user))
+        if returning:
+            row = (await db.execute(statement, params)).mappings().first()
+        else:
+            result = await db.execute(statement, params)
+            row = (
+                (await db.execute(self._select[True], {"row_id": row_id})).mappings().first()
+                if result.rowcount else None
+            )
+        if row is None:
+            raise await self.error(db, row_id, action)
+        return dict(row)
+
+    async def delete(self, db: AsyncSession, row_id: int, user: Any) -> Row:
+        """Delete a row the user may delete and return it, or raise 404/403."""
+        params = self._params(row_id, user)
+        if self.tracked and not await self._tombstones[user.is_superuser].record(db, params):
+            raise await self.error(db, row_id, "delete")
+        if supports_returning(db):
+            row = (await db.execute(self._delete_returning[user.is_superuser], params)).mappings().first()
+        else:
+            row = (await db.execute(self._select[user.is_superuser], params)).mappings().first()
+            if row is not None:
+                await db.execute(self._delete[True], {"row_id": row_id})
+        if row is None:
+            raise await self.error(db, row_id, "delete")
+        return dict(row)
+
+    async def dependents(self, db: AsyncSession, column: Column, row_id: int) -> List[Row]:
+        """Rows of another table referencing a row through ``column``, by id."""
+        statement = self._dependents.get(column)
+        if statement is None:
+            statement = self._dependents[column] = (
+                select(column.table).where(column == bindparam("row_id")).order_by(column.table.c.id)
+            )
+        return [dict(row) for row in (await db.execute(statement, {"row_id": row_id})).mappings()]
+
+    async def delete_dependents(self, db: AsyncSession, column: Column, row_id: int, user: Any) -> List[Row]:
+        """Delete the rows referencing a row through ``column``, if the user may delete it.
+
+        Returns the deleted rows by id. Run before deleting the row itself,
+        whose ON DELETE CASCADE would otherwise remove them unseen.
+        """
+        key = (column, user.is_superuser)
+        statements = self._delete_dependents.get(key)
+        if statements is None:
+            where = column.in_(select(self.table.c.id).where(self._where[user.is_superuser]))
+            statements = self._delete_dependents[key] = (
+                select(column.table).where(where),
+                delete(column.table).where(where),
+                delete(column.table).where(where).returning(*column.table.c),
+                Tombstones(column.table, where) if column.table in KINDS else None,
+            )
+        select_statement, delete_statement, delete_returning, tombstones = statements
+        params = self._params(row_id, user)
+        if tombstones is not None:
+            await tombstones.record(db, params)
+        if supports_returning(db):
+            rows = (await db.execute(delete_returning, params)).mappings().all()
+        else:
+            rows = (await db.execute(select_statement, params)).mappings().all()
+            if rows:
+                await db.execute(delete_statement, params)
+        return sorted((dict(row) for row in rows), key=lambda row: row["id"])
+
+
+event_repository = OwnedRepository(Event.__table__, "Event")
+reminder_repository = OwnedRepository(Reminder.__table__, "Reminder")
+# A user owns their own row
+user_repository = OwnedRepository(User.__table__, "User", owner_key="id")
@@ -1,27 +1,149 @@
+import asyncio
+import hashlib
+import math
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
 from datetime import datetime, timedelta
-from typing import Any, Optional, Union
+from typing import Any, Callable, Dict, Optional, Tuple, Union
 
 from jose import JWTError, jwt
 from passlib.context import CryptContext
-from fastapi import Depends, HTTPException, status
+from fastapi import HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
 
 from app.core.config import get_settings
-from app.models import User
 
 settings = get_settings()
 
-# Password hashing
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# Password hashing. Pinning min/max rounds to the configured cost makes
+# hashes created with any other cost "need update", so login rehashes them.
+pwd_context = CryptContext(
+    schemes=["bcrypt"],
+    deprecated="auto",
+    bcrypt__default_rounds=settings.BCRYPT_ROUNDS,
+    bcrypt__min_rounds=settings.BCRYPT_ROUNDS,
+    bcrypt__max_rounds=settings.BCRYPT_ROUNDS,
+)
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     """Verify a password against a hash."""
     return pwd_context.verify(plain_password, hashed_password)
 
+def verify_and_update_password(
+    plain_password: str, hashed_password: str
+) -> Tuple[bool, Optional[str]]:
+    """Verify a password and return a new hash if the stored cost is outdated."""
+    return pwd_context.verify_and_update(plain_password, hashed_password)
+
 def get_password_hash(password: str) -> str:
     """Generate a password hash."""
     return pwd_context.hash(password)
 
+
+class PasswordHasher:
+    """Bounded executor for bcrypt hashing and verification.
+
+    Each bcrypt call is a CPU-bound operation of a few hundred milliseconds.
+    Running them on a dedicated pool keeps login bursts from starving the
+    threadpool and event loop used by every other endpoint. Work beyond
+    ``workers + queue_size`` in-flight operations is rejected with 503 and a
+    Retry-After estimate instead of queueing forever.
+    """
+
+    def __init__(self, workers: int, queue_size: int, use_processes: bool = False) -> None:
+        self.workers = workers
+        self.queue_size = queue_size
+        self.use_processes = use_processes
+        self.counters: Dict[str, int] = {"completed": 0, "rejected": 0, "rehashed": 0}
+        self._in_flight = 0
+        self._avg_seconds = 0.25
+        self._executor: Optional[Executor] = None
+        self._lock = threading.Lock()
+
+    @property
+    def capacity(self) -> int:
+        return self.workers + self.queue_size
+
+    def _get_executor(self) -> Executor:
+        # Created on first use so importing this module never forks workers
+        if self._executor is None:
+            if self.use_processes:
+                self._executor = ProcessPoolExecutor(max_workers=self.workers)
+            else:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.workers, thread_name_prefix="password-hasher"
+                )
+        return self._executor
+
+    def retry_after(self) -> int:
+        """Estimate seconds until the queue drains, for the Retry-After header."""
+        return max(1, math.ceil(self._in_flight / self.workers * self._avg_seconds))
+
+    async def run(self, func: Callable[..., Any], *args: Any) -> Any:
+        """Run a hashing function on the pool, or raise 503 when saturated."""
+        with self._lock:
+            if self._in_flight >= self.capacity:
+                self.counters["rejected"] += 1
+                raise HTTPException(
+                    status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                    detail="Too many concurrent authentication requests",
+                    headers={"Retry-After": str(self.retry_after())},
+                )
+            self._in_flight += 1
+
+        started = time.monotonic()
+        try:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._get_executor(), func, *args)
+        finally:
+            elapsed = time.monotonic() - started
+            with self._lock:
+                self._in_flight -= 1
+                self.counters["completed"] += 1
+                # Moving average of operation time, including queueing
+                self._avg_seconds = 0.9 * self._avg_seconds + 0.1 * elapsed
+
+    async def hash(self, password: str) -> str:
+        """Hash a password on the pool."""
+        return await self.run(get_password_hash, password)
+
+    async def verify_and_update(
+        self, plain_password: str, hashed_password: str
+    ) -> Tuple[bool, Optional[str]]:
+        """Verify a password on the pool, returning a new hash if the cost changed."""
+        valid, new_hash = await self.run(
+            verify_and_update_password, plain_password, hashed_password
+        )
+        if new_hash is not None:
+            self.counters["rehashed"] += 1
+        return valid, new_hash
+
+    def shutdown(self) -> None:
+        """Stop the worker pool."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+
+    def stats(self) -> Dict[str, Any]:
+        """Return pool sizing, queue depth and counters."""
+        return {
+            "workers": self.workers,
+            "queue_size": self.queue_size,
+            "executor": "process" if self.use_processes else "thread",
+            "in_flight": self._in_flight,
+            "avg_seconds": round(self._avg_seconds, 4),
+            "counters": dict(self.counters),
+        }
+
+
+password_hasher = PasswordHasher(
+    workers=settings.PASSWORD_HASH_WORKERS,
+    queue_size=settings.PASSWORD_HASH_QUEUE_SIZE,
+    use_processes=settings.PASSWORD_HASH_EXECUTOR == "process",
+)
+
 # OAuth2 scheme
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl=f"{settings.API_V1_STR}/auth/login")
 
@@ -42,59 +164,85 @@ def create_access_token(
     )
     return encoded_jwt
 
-def decode_token(token: str) -> dict:
-    """Decode a JWT token."""
-    try:
+class TokenCache:
+    """Bounded cache of verified JWT payloads keyed by a digest of the token.
+
+    Entries expire at the token's own ``exp`` claim, so a cached payload is
+    never served for a token jose would now reject as expired.
+    """
+
+    def __init__(self, maxsize: int = 10000) -> None:
+        self.maxsize = maxsize
+        self.counters: Dict[str, int] = {"hits": 0, "misses": 0, "evictions": 0}
+        self._entries: "OrderedDict[bytes, Tuple[float, dict]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _key(token: str) -> bytes:
+        return hashlib.sha256(token.encode()).digest()
+
+    def get(self, token: str) -> Optional[dict]:
+        """Return the cached payload of a still-valid token."""
+        key = self._key(token)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] > time.time():
+                self._entries.move_to_end(key)
+                self.counters["hits"] += 1
+                return entry[1]
+            if entry is not None:
+                del self._entries[key]
+            self.counters["misses"] += 1
+            return None
+
+    def set(self, token: str, payload: dict) -> None:
+        """Cache a verified payload until its ``exp`` claim."""
+        exp = payload.get("exp")
+        if not isinstance(exp, (int, float)):
+            # Tokens without an expiry are verified every time
+            return
+        key = self._key(token)
+        with self._lock:
+            self._entries[key] = (float(exp), payload)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.counters["evictions"] += 1
+
+    def stats(self) -> Dict[str, Any]:
+        """Return cache size and counters."""
+        with self._lock:
+            size = len(self._entries)
+        return {"size": size, "maxsize": self.maxsize, "counters": dict(self.counters)}
+
+
+token_cache = TokenCache(maxsize=settings.TOKEN_CACHE_MAX_SIZE)
+
+def verify_token(token: str) -> dict:
+    """Verify a JWT token and return its claims.
+
+    Verified payloads are cached, so repeat requests with the same bearer
+    token skip the HMAC check and claim parsing. The returned dict is shared
+    with the cache and must not be modified.
+
+    Raises:
+        JWTError: If the token is invalid or expired
+    """
+    payload = token_cache.get(token)
+    if payload is None:
         payload = jwt.decode(
             token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM]
         )
-        return payload
+        token_cache.set(token, payload)
+    return payload
+
+def decode_token(token: str) -> dict:
+    """Decode a JWT token."""
+    try:
+        return verify_token(token)
     except JWTError:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Could not validate credentials",
             headers={"WWW-Authenticate": "Bearer"},
         )
-
-async def get_current_user(
-    token: str = Depends(oauth2_scheme), db = None
-) -> User:
-    """Get the current authenticated user."""
-    credentials_exception = HTTPException(
-        status_code=status.HTTP_401_UNAUTHORIZED,
-        detail="Could not validate credentials",
-        headers={"WWW-Authenticate": "Bearer"},
-    )
-    
-    try:
-        payload = decode_token(token)
-        user_id: str = payload.get("sub")
-        if user_id is None:
-            raise credentials_exception
-    except JWTError:
-        raise credentials_exception
-    
-    if db is None:
-        from app.core.database import SessionLocal
-        db = SessionLocal()
-        try:
-            user = db.query(User).filter(User.id == int(user_id)).first()
-            if user is None:
-                raise credentials_exception
-            return user
-        finally:
-            db.close()
-    else:
-        user = db.query(User).filter(User.id == int(user_id)).first()
-        if user is None:
-            raise credentials_exception
-        return user
-
-# Dependency to get the current active user
-async def get_current_active_user(
-    current_user: User = Depends(get_current_user),
-) -> User:
-    """Get the current active user."""
-    if not current_user.is_active:
-        raise HTTPException(status_code=400, detail="Inactive user")
-    return current_user
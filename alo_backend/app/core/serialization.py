@@ -0,0 +1,111 @@
+"""Fast JSON serialization for list endpoints.
+
+List endpoints render database rows straight to JSON bytes instead of
+building ORM objects, converting them to dicts and having FastAPI validate
+them again through the response model. The output matches the response
+schemas field for field.
+"""
+import json
+from datetime import date, datetime
+from enum import Enum
+from typing import Any, Dict, Iterable, List, Mapping
+
+from fastapi.responses import Response
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def _default(value: Any) -> Any:
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, Enum):
+        return value.value
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def dumps(content: Any) -> bytes:
+    """Serialize content to JSON bytes, using orjson when it is installed."""
+    if orjson is not None:
+        return orjson.dumps(content, default=_default)
+    return json.dumps(content, default=_default, separators=(",", ":")).encode("utf-8")
+
+
+class FastJSONResponse(Response):
+    """JSON response rendered with ``dumps`` and no response-model validation."""
+
+    media_type = "application/json"
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
+
+
+def _enum_value(value: Any) -> Any:
+    return value.value if isinstance(value, Enum) else value
+
+
+def reminder_row_to_dict(row: Mapping[str, Any]) -> Dict[str, Any]:
+    """Shape a ``reminders`` row like ``schemas.ReminderResponse``."""
+    return {
+        "message": row["message"],
+        "reminder_time": row["reminder_time"],
+        "reminder_type": _enum_value(row["reminder_type"]),
+        "status": _enum_value(row["status"]),
+        "event_id": row["event_id"],
+        "id": row["id"],
+        "owner_id": row["owner_id"],
+        "created_at": row["created_at"],
+        "updated_at": row["updated_at"],
+        "sent_at": row["sent_at"],
+        "attempts": row["attempts"],
+        "next_attempt_at": row["next_attempt_at"],
+    }
+
+
+def event_row_to_dict(
+    row: Mapping[str, Any], reminders: Iterable[Mapping[str, Any]] = ()
+) -> Dict[str, Any]:
+    """Shape an ``events`` row and its reminder rows like ``schemas.EventResponse``."""
+    return {
+        "title": row["title"],
+        "description": row["description"],
+        "start_time": row["start_time"],
+        "end_time": row["end_time"],
+        "location": row["location"],
+        "is_all_day": row["is_all_day"],
+        "id": row["id"],
+        "owner_id": row["owner_id"],
+        "created_at": row["created_at"],
+        "updated_at": row["updated_at"],
+        "status": row["status"],
+        "recurrence_rule": row["recurrence_rule"],
+        "recurrence_id": row.get("recurrence_id"),
+        "reminders": [reminder_row_to_dict(reminder) for reminder in reminders],
+    }
+
+
+def event_exception_row_to_dict(row: Mapping[str, Any]) -> Dict[str, Any]:
+    """Shape an ``event_exceptions`` row like ``schemas.EventExceptionResponse``."""
+    return {
+        "title": row["title"],
+        "description": row["description"],
+        "start_time": row["start_time"],
+        "end_time": row["end_time"],
+        "location": row["location"],
+        "id": row["id"],
+        "event_id": row["event_id"],
+        "original_start": row["original_start"],
+        "is_cancelled": row["is_cancelled"],
+        "created_at": row["created_at"],
+        "updated_at": row["updated_at"],
+    }
+
+
+def group_by(rows: Iterable[Mapping[str, Any]], key: str) -> Dict[Any, List[Mapping[str, Any]]]:
+    """Group rows by the value of one column, preserving row order."""
+    groups: Dict[Any, List[Mapping[str, Any]]] = {}
+    for row in rows:
+        groups.setdefault(row[key], []).append(row)
+    return groups
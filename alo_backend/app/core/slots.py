@@ -0,0 +1,203 @@
+"""Meeting slot suggestions.
+
+A user's window is laid out as a grid of minutes: busy wherever one of
+their events or occurrences is (the cached free/busy blocks of
+app.core.freebusy), available where it is not busy and inside working
+hours. With NumPy (``pip install -e ".[speedups]"``) the grid is a boolean
+array and free runs are found with vectorized run-length scans; without it
+the same runs are computed from the busy blocks as intervals.
+
+Candidates start on multiples of ``step`` minutes past midnight and fit in
+an available run. They are ranked by the free time around them, up to
+``BUFFER_MINUTES`` on each side, so slots away from other events come
+first, and then by start; suggestions never overlap each other.
+"""
+from datetime import datetime, time, timedelta
+from typing import Any, List, Sequence, Tuple
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from .freebusy import freebusy_cache
+from .utils import to_naive_utc, to_utc_clock
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# Free time on either side of a slot that still improves its rank
+BUFFER_MINUTES = 30
+
+# Most suggestions one request may ask for
+MAX_SUGGESTIONS = 50
+
+MINUTE = timedelta(minutes=1)
+MINUTES_PER_DAY = 24 * 60
+
+Slot = Tuple[datetime, datetime, int]
+Runs = List[Tuple[int, int]]
+
+
+def _minutes(value: time) -> int:
+    return value.hour * 60 + value.minute
+
+
+def _ceil_minute(value: datetime) -> datetime:
+    floor = value.replace(second=0, microsecond=0)
+    return floor if floor == value else floor + MINUTE
+
+
+def _candidates_numpy(
+    busy: Sequence[Tuple[int, int]], size: int, origin: datetime, duration: int, step: int,
+    work_start: int, work_end: int, weekends: bool,
+) -> Tuple[Any, Any]:
+    # Busy blocks are sorted, and rounding to minutes can only make them touch,
+    # so their bounds are the edges of alternating free and busy runs
+    bounds = np.maximum.accumulate(np.array(busy, dtype=np.int64).ravel()) if busy else np.empty(0, np.int64)
+    lengths = np.diff(np.concatenate(([0], bounds, [size])))
+    free = np.repeat(np.arange(len(lengths)) % 2 == 0, lengths)
+
+    # Day masks laid out over the days the grid touches
+    offset = _minutes(origin.time())
+    days = (offset + size - 1) // MINUTES_PER_DAY + 1
+    of_day = np.arange(MINUTES_PER_DAY)
+    workdays = np.ones(days, dtype=bool) if weekends else (origin.weekday() + np.arange(days)) % 7 < 5
+    working = np.outer(workdays, (of_day >= work_start) & (of_day < work_end)).ravel()[offset:offset + size]
+    aligned = np.tile(of_day % step == 0, days)[offset:offset + size]
+
+    available = free & working
+    # The buffer margins are only looked at, never booked
+    available[:BUFFER_MINUTES] = False
+    available[size - BUFFER_MINUTES:] = False
+
+    starts = np.flatnonzero(available & aligned)
+    run_starts, run_ends = _runs(available)
+    fits = run_ends[np.searchsorted(run_starts, starts, "right") - 1] - starts >= duration
+    starts = starts[fits]
+
+    free_starts, free_ends = _runs(free)
+    run = np.searchsorted(free_starts, starts, "right") - 1
+    scores = (
+        np.minimum(starts - free_starts[run], BUFFER_MINUTES)
+        + np.minimum(free_ends[run] - starts - duration, BUFFER_MINUTES)
+    )
+    return starts, scores
+
+
+def _runs(mask: Any) -> Tuple[Any, Any]:
+    # Starts and ends of the runs of True: the edges of the padded mask alternate
+    padded = np.concatenate(([False], mask, [False]))
+    edges = np.flatnonzero(padded[1:] != padded[:-1])
+    return edges[::2], edges[1::2]
+
+
+def _candidates_python(
+    busy: Sequence[Tuple[int, int]], size: int, origin: datetime, duration: int, step: int,
+    work_start: int, work_end: int, weekends: bool,
+) -> Tuple[List[int], List[int]]:
+    free: Runs = []
+    cursor = 0
+    for start, end in busy:
+        if start > cursor:
+            free.append((cursor, start))
+        cursor = max(cursor, end)
+    if size > cursor:
+        free.append((cursor, size))
+
+    offset = _minutes(origin.time())
+    working: Runs = []
+    for day in range(-offset, size, MINUTES_PER_DAY):
+        if weekends or (origin.weekday() + (day + offset) // MINUTES_PER_DAY) % 7 < 5:
+            start = max(day + work_start, BUFFER_MINUTES)
+            end = min(day + work_end, size - BUFFER_MINUTES)
+            if start < end:
+                working.append((start, end))
+
+    starts, scores = [], []
+    index = 0
+    for free_start, free_end in free:
+        while index < len(working) and working[index][1] <= free_start:
+            index += 1
+        for day_start, day_end in working[index:]:
+            if day_start >= free_end:
+                break
+            low, high = max(free_start, day_start), min(free_end, day_end)
+            # Working hours never cross midnight, so the run is within one day
+            start = low + (-(offset + low) % MINUTES_PER_DAY) % step
+            while start + duration <= high:
+                starts.append(start)
+                scores.append(
+                    min(start - free_start, BUFFER_MINUTES) + min(free_end - start - duration, BUFFER_MINUTES)
+                )
+                start += step
+    return starts, scores
+
+
+async def suggest_slots(
+    db: AsyncSession,
+    owner_id: int,
+    start: datetime,
+    end: datetime,
+    duration: timedelta,
+    work_start: time = time(9),
+    work_end: time = time(17),
+    weekends: bool = False,
+    step: timedelta = timedelta(minutes=15),
+    limit: int = 10,
+) -> List[Slot]:
+    """Suggest free slots of a given length for a user.
+
+    Args:
+        db: Database session
+        owner_id: User whose calendar is searched
+        start: Earliest start of a slot; times with a UTC offset are
+            converted to naive UTC, like event times
+        end: Latest end of a slot
+        duration: Length of a slot, in whole minutes
+        work_start: Start of working hours, in the clock of event times
+            (naive UTC); an offset is converted to that clock
+        work_end: End of working hours; must be after ``work_start``
+        weekends: Also suggest slots on Saturdays and Sundays
+        step: Slots start on multiples of this many minutes past midnight
+        limit: Most suggestions to return
+
+    Returns:
+        list: (start, end, score) of the best slots, best first; the score
+            is the free minutes around the slot, up to ``BUFFER_MINUTES``
+            on each side
+    """
+    start, end = to_naive_utc(start), to_naive_utc(end)
+    work_start, work_end = to_utc_clock(work_start), to_utc_clock(work_end)
+    # The grid reaches a buffer beyond the window to rank slots at its edges
+    origin = _ceil_minute(start) - BUFFER_MINUTES * MINUTE
+    limit_time = end.replace(second=0, microsecond=0) + BUFFER_MINUTES * MINUTE
+    size = (limit_time - origin) // MINUTE
+    length = duration // MINUTE
+    if size <= 2 * BUFFER_MINUTES or length <= 0:
+        return []
+
+    busy = [
+        ((busy_start - origin) // MINUTE, -((origin - busy_end) // MINUTE))
+        for busy_start, busy_end in await freebusy_cache.get(db, owner_id, origin, limit_time)
+    ]
+    candidates = _candidates_numpy if np is not None else _candidates_python
+    starts, scores = candidates(
+        busy, size, origin, length, max(1, step // MINUTE), _minutes(work_start), _minutes(work_end), weekends
+    )
+    if np is not None:
+        order = np.lexsort((starts, -scores)).tolist()
+        starts, scores = starts.tolist(), scores.tolist()
+    else:
+        order = sorted(range(len(starts)), key=lambda index: (-scores[index], starts[index]))
+
+    chosen: List[int] = []
+    slots: List[Slot] = []
+    for index in order:
+        slot_start = starts[index]
+        if any(slot_start < other + length and other < slot_start + length for other in chosen):
+            continue
+        chosen.append(slot_start)
+        slots.append((origin + slot_start * MINUTE, origin + (slot_start + length) * MINUTE, scores[index]))
+        if len(slots) >= limit:
+            break
+    return slots
@@ -0,0 +1,276 @@
+"""Delta sync: per-user change sequences and tombstones.
+
+Every user has a counter, ``users.change_seq``. A transaction writing
+events or reminders first advances the counter of each owner it touches
+and stamps the rows it writes with the owner's new value; deleted rows
+leave a tombstone stamped the same way. Advancing the counter locks the
+user row until commit, so one user's changes commit in sequence order.
+
+``GET /sync`` reads the counter first and then everything stamped after
+the client's cursor, up to the counter. Every change up to it has
+committed by then and every later one gets a higher value, so nothing is
+skipped. The ``(owner_id, change_seq, id)`` indexes on events, reminders
+and tombstones make a sync cost O(changes), not O(calendar size).
+
+Rows written before change tracking have sequence 0 and come with the
+first sync, which has no cursor. Archived rows (app.core.archive) leave
+no tombstone: they can no longer change, so clients keep them.
+"""
+import heapq
+from datetime import datetime
+from itertools import islice
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Tuple
+
+from fastapi import HTTPException, status
+from sqlalchemy import DateTime, Integer, bindparam, insert, literal, select, tuple_, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.sql.elements import ClauseElement, ColumnClause
+from sqlalchemy.sql.schema import Column, Table
+
+from .database import supports_returning
+from .pagination import NEXT, decode_cursor, encode_cursor
+from .serialization import event_exception_row_to_dict, event_row_to_dict, group_by, reminder_row_to_dict
+from ..models import Event, EventException, Reminder, Tombstone, User
+
+# Largest number of changes returned by one sync
+MAX_CHANGES = 1000
+
+users = User.__table__
+tombstones = Tombstone.__table__
+
+# Tombstone kind of each tracked table
+KINDS = {Event.__table__: "event", Reminder.__table__: "reminder"}
+
+# A sync returns changes ordered by (sequence, source, id), sources in this
+# order: tombstones first, so a deletion comes before a new row of the same
+# sequence that reuses the deleted id (SQLite reuses the highest rowid)
+SOURCES = (tombstones, Event.__table__, Reminder.__table__)
+
+# Cursors hold that key of the last change returned
+CURSOR_KEY = [ColumnClause("change_seq", Integer), ColumnClause("source", Integer), ColumnClause("id", Integer)]
+
+
+class OwnerSequences:
+    """Advance the change sequences of the users in ``owners``.
+
+    ``owners`` is a SELECT of user ids or an expanding bound parameter;
+    its parameters are passed to ``advance``.
+    """
+
+    def __init__(self, owners: Any) -> None:
+        where = users.c.id.in_(owners)
+        # The user row itself is not updated
+        self._update = (
+            update(users)
+            .where(where)
+            .values(change_seq=users.c.change_seq + 1, updated_at=users.c.updated_at)
+        )
+        self._update_returning = self._update.returning(users.c.id, users.c.change_seq)
+        self._select = select(users.c.id, users.c.change_seq).where(where)
+
+    async def advance(self, db: AsyncSession, params: Dict[str, Any]) -> Dict[int, int]:
+        """Advance the sequences, locking the user rows until commit.
+
+        Returns:
+            dict: The new sequence of each user, by id; empty if none matched
+        """
+        if supports_returning(db):
+            return dict((await db.execute(self._update_returning, params)).all())
+        await db.execute(self._update, params)
+        return dict((await db.execute(self._select, params)).all())
+
+
+class Tombstones:
+    """Record the deletion of the rows of a tracked table that ``where`` matches."""
+
+    def __init__(self, table: Table, where: ClauseElement) -> None:
+        self.owners = OwnerSequences(select(table.c.owner_id).where(where))
+        deleted_at = bindparam("deleted_at", type_=DateTime)
+        self._insert = insert(tombstones).from_select(
+            ["owner_id", "kind", "row_id", "change_seq", "created_at", "updated_at"],
+            select(
+                table.c.owner_id,
+                literal(KINDS[table]),
+                table.c.id,
+                users.c.change_seq,
+                deleted_at,
+                deleted_at,
+            )
+            .select_from(table.join(users, users.c.id == table.c.owner_id))
+            .where(where),
+        )
+
+    async def record(self, db: AsyncSession, params: Dict[str, Any]) -> Dict[int, int]:
+        """Advance the owners' sequences and leave a tombstone for each row.
+
+        Run before deleting the rows.
+
+        Returns:
+            dict: The new sequence of each owner, by id; empty if no row matched
+        """
+        sequences = await self.owners.advance(db, params)
+        if sequences:
+            await db.execute(self._insert, {**params, "deleted_at": datetime.utcnow()})
+        return sequences
+
+
+_users = OwnerSequences(bindparam("owner_ids", expanding=True))
+
+
+async def advance(db: AsyncSession, owner_ids: Iterable[int]) -> Dict[int, int]:
+    """Advance the change sequences of users by id; see ``OwnerSequences.advance``."""
+    owner_ids = sorted(set(owner_ids))
+    if not owner_ids:
+        return {}
+    return await _users.advance(db, {"owner_ids": owner_ids})
+
+
+# Built on first use, per column
+_tombstones: Dict[Column, Tombstones] = {}
+
+
+async def record_deletes(db: AsyncSession, column: Column, values: Iterable[Any]) -> Dict[int, int]:
+    """Leave tombstones for the rows of a tracked table whose ``column`` is in ``values``.
+
+    See ``Tombstones.record``.
+    """
+    tombstones = _tombstones.get(column)
+    if tombstones is None:
+        tombstones = _tombstones[column] = Tombstones(
+            column.table, column.in_(bindparam("values", expanding=True))
+        )
+    return await tombstones.record(db, {"values": list(values)})
+
+
+class Stamps:
+    """Stamp rows of a tracked table, by id, with a new sequence of their owners."""
+
+    def __init__(self, table: Table) -> None:
+        where = table.c.id.in_(bindparam("row_ids", expanding=True))
+        self.owners = OwnerSequences(select(table.c.owner_id).where(where))
+        self._update = (
+            update(table)
+            .where(where)
+            .values(
+                change_seq=select(users.c.change_seq).where(users.c.id == table.c.owner_id).scalar_subquery(),
+                updated_at=table.c.updated_at,
+            )
+        )
+
+    async def stamp(self, db: AsyncSession, row_ids: Iterable[int]) -> None:
+        """Stamp rows changed by a transaction that could not lock their owners first."""
+        params = {"row_ids": list(row_ids)}
+        if await self.owners.advance(db, params):
+            await db.execute(self._update, params)
+
+
+stamps = {table: Stamps(table) for table in KINDS}
+
+
+_current = select(users.c.change_seq).where(users.c.id == bindparam("user_id"))
+_exceptions = (
+    select(EventException.__table__)
+    .where(EventException.__table__.c.event_id.in_(bindparam("event_ids", expanding=True)))
+    .order_by(EventException.__table__.c.event_id, EventException.__table__.c.original_start)
+)
+
+
+def _changes_query(source: int, after: Optional[int]) -> Any:
+    """Changes of one source up to the user's sequence, after a cursor of another or the same source."""
+    table = SOURCES[source]
+    query = (
+        select(table)
+        .where(table.c.owner_id == bindparam("user_id"))
+        .where(table.c.change_seq <= bindparam("current"))
+    )
+    if after is not None:
+        if source < after:
+            query = query.where(table.c.change_seq > bindparam("after_seq"))
+        elif source > after:
+            query = query.where(table.c.change_seq >= bindparam("after_seq"))
+        else:
+            query = query.where(
+                tuple_(table.c.change_seq, table.c.id) > tuple_(bindparam("after_seq"), bindparam("after_id"))
+            )
+    return query.order_by(table.c.change_seq, table.c.id).limit(bindparam("limit"))
+
+
+_queries = {
+    (source, after): _changes_query(source, after)
+    for source in range(len(SOURCES))
+    for after in (None, *range(len(SOURCES) + 1))
+}
+
+
+def _event_to_dict(row: Mapping[str, Any], exceptions: Iterable[Mapping[str, Any]]) -> Dict[str, Any]:
+    """Shape an ``events`` row and its exception rows like ``schemas.SyncEvent``."""
+    event = event_row_to_dict(row)
+    # Reminders are synced on their own, and series are never expanded
+    del event["reminders"], event["recurrence_id"]
+    event["exceptions"] = [event_exception_row_to_dict(exception) for exception in exceptions]
+    return event
+
+
+async def changes_since(
+    db: AsyncSession, user_id: int, cursor: Optional[str], limit: int = MAX_CHANGES
+) -> Dict[str, Any]:
+    """Everything of a user's that changed after ``cursor``, in sequence order.
+
+    Without a cursor every event and reminder is returned. Recurring events
+    come with their occurrence exceptions.
+
+    Returns:
+        dict: ``events``, ``reminders``, ``deleted`` (tombstones), the
+        ``cursor`` to pass next time and ``has_more`` if the page is full
+    """
+    current = (await db.execute(_current, {"user_id": user_id})).scalar_one()
+    after: Optional[Tuple[int, int, int]] = None
+    if cursor:
+        values, _ = decode_cursor(cursor, CURSOR_KEY)
+        after = tuple(values)
+        if not all(isinstance(value, int) for value in after) or not 0 <= after[1] <= len(SOURCES):
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Invalid pagination cursor",
+            )
+        if after[0] > current:
+            raise HTTPException(
+                status_code=status.HTTP_410_GONE,
+                detail="Sync cursor is not valid for this account; sync again without a cursor",
+            )
+
+    params = {"user_id": user_id, "current": current, "limit": limit + 1}
+    if after is not None:
+        params.update(after_seq=after[0], after_id=after[2])
+    streams = []
+    for source in range(len(SOURCES)):
+        rows = (await db.execute(
+            _queries[source, None if after is None else after[1]], params
+        )).mappings().all()
+        streams.append([(row["change_seq"], source, row["id"], row) for row in rows])
+    changes = list(islice(heapq.merge(*streams, key=lambda change: change[:3]), limit + 1))
+    has_more = len(changes) > limit
+    changes = changes[:limit]
+
+    by_source: List[List[Any]] = [[] for _ in SOURCES]
+    for _, source, _, row in changes:
+        by_source[source].append(row)
+    tombstone_rows, event_rows, reminder_rows = by_source
+    series_ids = [row["id"] for row in event_rows if row["recurrence_rule"]]
+    exceptions = group_by(
+        (await db.execute(_exceptions, {"event_ids": series_ids})).mappings().all() if series_ids else (),
+        "event_id",
+    )
+
+    # A full page continues after its last change, otherwise after everything up to now
+    last = changes[-1][:3] if has_more else (current, len(SOURCES), 0)
+    return {
+        "events": [_event_to_dict(row, exceptions.get(row["id"], ())) for row in event_rows],
+        "reminders": [reminder_row_to_dict(row) for row in reminder_rows],
+        "deleted": [
+            {"type": row["kind"], "id": row["row_id"], "deleted_at": row["created_at"]}
+            for row in tombstone_rows
+        ],
+        "cursor": encode_cursor(list(last), NEXT),
+        "has_more": has_more,
+    }
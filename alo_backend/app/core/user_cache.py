@@ -0,0 +1,135 @@
+"""In-process cache of authenticated users.
+
+``deps.get_current_user`` runs on every authenticated request, and loading
+the user row was the most frequent query we issued. Slim user records
+(every column except the password hash) are kept in a TTL + LRU cache keyed
+by user id. Invalidations go through the message bus so every worker drops
+its copy when a user changes.
+"""
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+
+from sqlalchemy import event
+from sqlalchemy.orm import make_transient_to_detached
+from sqlalchemy.orm.attributes import set_committed_value
+
+from .bus import message_bus
+from .config import get_settings
+from ..models import User
+
+logger = logging.getLogger(__name__)
+
+INVALIDATION_CHANNEL = "user-cache:invalidate"
+
+# Never cached: the hash is only needed by login, which queries it directly
+EXCLUDED_COLUMNS = {"hashed_password"}
+
+
+class UserCache:
+    """TTL + LRU cache of slim user records keyed by user id."""
+
+    def __init__(self, maxsize: int = 10000, ttl: float = 60.0) -> None:
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.counters: Dict[str, int] = {
+            "hits": 0,
+            "misses": 0,
+            "evictions": 0,
+            "expirations": 0,
+            "invalidations": 0,
+        }
+        self._entries: "OrderedDict[int, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._columns = [
+            column.key for column in User.__table__.columns
+            if column.key not in EXCLUDED_COLUMNS
+        ]
+
+    def get(self, user_id: int) -> Optional[User]:
+        """Return a detached User built from the cached record, if fresh.
+
+        The instance is detached (not transient), so adding it to a session
+        makes it persistent without a SELECT and later updates to it are
+        flushed as UPDATEs.
+        """
+        with self._lock:
+            entry = self._entries.get(user_id)
+            if entry is None:
+                self.counters["misses"] += 1
+                return None
+            expires_at, record = entry
+            if expires_at <= time.monotonic():
+                del self._entries[user_id]
+                self.counters["expirations"] += 1
+                self.counters["misses"] += 1
+                return None
+            self._entries.move_to_end(user_id)
+            self.counters["hits"] += 1
+
+        # Populate as committed state: no attribute events, no pending changes
+        user = User.__mapper__.class_manager.new_instance()
+        for key, value in record.items():
+            set_committed_value(user, key, value)
+        make_transient_to_detached(user)
+        return user
+
+    def set(self, user: User) -> None:
+        """Cache the slim record of a loaded user."""
+        record = {key: getattr(user, key) for key in self._columns}
+        with self._lock:
+            self._entries[user.id] = (time.monotonic() + self.ttl, record)
+            self._entries.move_to_end(user.id)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.counters["evictions"] += 1
+
+    def discard(self, user_id: int) -> None:
+        """Drop a user from this worker's cache only."""
+        with self._lock:
+            if self._entries.pop(user_id, None) is not None:
+                self.counters["invalidations"] += 1
+
+    def invalidate(self, user_id: int) -> None:
+        """Drop a user from the cache of every worker."""
+        self.discard(user_id)
+        message_bus.publish_nowait(INVALIDATION_CHANNEL, str(user_id))
+
+    def clear(self) -> None:
+        """Drop every cached user from this worker."""
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """Return cache size, limits and counters."""
+        with self._lock:
+            size = len(self._entries)
+        lookups = self.counters["hits"] + self.counters["misses"]
+        return {
+            "size": size,
+            "maxsize": self.maxsize,
+            "ttl_seconds": self.ttl,
+            "hit_rate": self.counters["hits"] / lookups if lookups else 0.0,
+            "counters": dict(self.counters),
+        }
+
+
+def _on_remote_invalidation(message: str) -> None:
+    try:
+        user_cache.discard(int(message))
+    except ValueError:
+        logger.warning(f"Ignoring malformed user cache invalidation: {message}")
+
+
+@event.listens_for(User.is_active, "set")
+def _on_is_active_change(target: User, value: Any, oldvalue: Any, initiator: Any) -> None:
+    # Deactivation must take effect on every worker, whichever code path sets it
+    if target.id is not None and value != oldvalue:
+        user_cache.invalidate(target.id)
+
+
+settings = get_settings()
+user_cache = UserCache(maxsize=settings.USER_CACHE_MAX_SIZE, ttl=settings.USER_CACHE_TTL)
+message_bus.subscribe(INVALIDATION_CHANNEL, _on_remote_invalidation)
@@ -1,8 +1,10 @@
+from datetime import date, datetime, time, timezone
 from typing import Any, Dict, Optional, Union
 
 from fastapi import HTTPException, status
 from fastapi.encoders import jsonable_encoder
 from pydantic import BaseModel
+from starlette.datastructures import URL
 
 
 def get_error_response(
@@ -42,6 +44,21 @@ def validate_request(
     return data
 
 
+def to_naive_utc(value: Optional[datetime]) -> Optional[datetime]:
+    """Convert an aware datetime to naive UTC, as times are stored; naive ones are kept."""
+    if value is None or value.tzinfo is None:
+        return value
+    return value.astimezone(timezone.utc).replace(tzinfo=None)
+
+
+def to_utc_clock(value: time) -> time:
+    """Convert a time of day with a UTC offset to the naive UTC clock; naive ones are kept."""
+    if value.tzinfo is None:
+        return value
+    # Any date will do: the offsets of a fixed-offset tzinfo do not depend on it
+    return to_naive_utc(datetime.combine(date(2000, 1, 1), value)).time()
+
+
 def get_pagination_links(
     url: str, skip: int, limit: int, total: int
 ) -> Dict[str, Optional[str]]:
@@ -59,3 +76,20 @@ def get_pagination_links(
         prev_url = None
     
     return {"next": next_url, "prev": prev_url}
+
+
+def get_cursor_links(
+    url: URL, next_cursor: Optional[str], prev_cursor: Optional[str]
+) -> Dict[str, Optional[str]]:
+    """Generate cursor pagination links, keeping the other query parameters."""
+    base_url = url.remove_query_params("skip")
+    return {
+        "next": str(base_url.include_query_params(cursor=next_cursor)) if next_cursor else None,
+        "prev": str(base_url.include_query_params(cursor=prev_cursor)) if prev_cursor else None,
+    }
+
+
+def format_link_header(links: Dict[str, Optional[str]]) -> Optional[str]:
+    """Format pagination links as an RFC 8288 Link header value."""
+    parts = [f'<{href}>; rel="{rel}"' for rel, href in links.items() if href]
+    return ", ".join(parts) or None
@@ -5,24 +5,23 @@ from fastapi.middleware.cors import CORSMiddleware
 from fastapi.openapi.docs import get_swagger_ui_html
 from fastapi.openapi.utils import get_openapi
 from fastapi.responses import HTMLResponse, JSONResponse
-from contextlib import asynccontextmanager
 
 # Configure logging
 logger = logging.getLogger(__name__)
 
 from app.core.config import get_settings
 from app.api.api_v1.api import api_router
+from app.core.archive import archive_job
+from app.core.bus import message_bus
+from app.core.database import dispose_async_database
+from app.core.delivery import delivery_pipeline
+from app.core.dispatcher import reminder_dispatcher
+from app.core.pool_health import pool_health_monitor
+from app.core.purge import purge_job
+from app.core.security import password_hasher
 
 settings = get_settings()
 
-@asynccontextmanager
-async def lifespan(app: FastAPI):
-    # Startup: Initialize resources
-    print("Starting ALO API...")
-    yield
-    # Shutdown: Clean up resources
-    print("Shutting down ALO API...")
-
 def create_application() -> FastAPI:
     # Determine if we're in a production environment
     is_production = os.getenv("RAILWAY_ENVIRONMENT") == "production"
@@ -74,7 +73,6 @@ def create_application() -> FastAPI:
         version="0.1.0",
         docs_url="/docs",
         redoc_url="/redoc",
-        lifespan=lifespan,
         openapi_url="/openapi.json",
         servers=servers
     )
@@ -96,6 +94,34 @@ def create_application() -> FastAPI:
 # Create FastAPI application
 app = create_application()
 
+# FastAPI 0.68 has no lifespan argument; hooks are registered as events
+@app.on_event("startup")
+async def startup() -> None:
+    # Startup: Initialize resources
+    print("Starting ALO API...")
+    # Subscribe to cross-worker invalidations before the first cache fill
+    message_bus.start()
+    pool_health_monitor.start()
+    if settings.REMINDER_DISPATCHER_ENABLED:
+        reminder_dispatcher.start()
+    if settings.ARCHIVE_ENABLED:
+        archive_job.start()
+    if settings.PURGE_ENABLED:
+        purge_job.start()
+
+@app.on_event("shutdown")
+async def shutdown() -> None:
+    # Shutdown: Clean up resources
+    print("Shutting down ALO API...")
+    await reminder_dispatcher.stop()
+    await archive_job.stop()
+    await purge_job.stop()
+    await delivery_pipeline.stop()
+    await pool_health_monitor.stop()
+    await dispose_async_database()
+    await message_bus.stop()
+    password_hasher.shutdown()
+
 # Custom documentation routes for faster loading
 @app.get("/docs", include_in_schema=False)
 async def custom_swagger_ui_html(request: Request):
@@ -3,6 +3,11 @@ from .base import Base
 from .user import User
 from .event import Event
 from .reminder import Reminder, ReminderType, ReminderStatus
+from .delivery_attempt import DeliveryAttempt
+from .event_exception import EventException
+from .archive import events_archive, reminders_archive
+from .tombstone import Tombstone
+from .group import Group, group_members
 
 __all__ = [
     'Base',
@@ -11,4 +16,11 @@ __all__ = [
     'Reminder',
     'ReminderType',
     'ReminderStatus',
+    'DeliveryAttempt',
+    'EventException',
+    'events_archive',
+    'reminders_archive',
+    'Tombstone',
+    'Group',
+    'group_members',
 ]
@@ -0,0 +1,38 @@
+from sqlalchemy import Column, DateTime, Index, Table
+
+from .base import Base
+from .event import Event
+from .reminder import Reminder
+
+def _archive_table(source: Table, name: str, *indexes: Index) -> Table:
+    """Cold copy of a table: same columns, no foreign keys, plus archived_at."""
+    columns = [
+        Column(
+            column.name,
+            column.type,
+            primary_key=column.primary_key,
+            nullable=column.nullable,
+            autoincrement=False,
+        )
+        for column in source.columns
+    ]
+    return Table(
+        name,
+        Base.metadata,
+        *columns,
+        Column("archived_at", DateTime, nullable=False),
+        *indexes,
+    )
+
+# Rows moved out of the hot tables by the archival job (app.core.archive)
+events_archive = _archive_table(
+    Event.__table__,
+    "events_archive",
+    Index("ix_events_archive_owner_id_start_time", "owner_id", "start_time"),
+)
+reminders_archive = _archive_table(
+    Reminder.__table__,
+    "reminders_archive",
+    Index("ix_reminders_archive_owner_id_reminder_time", "owner_id", "reminder_time"),
+    Index("ix_reminders_archive_event_id", "event_id"),
+)
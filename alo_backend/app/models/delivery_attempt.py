@@ -0,0 +1,18 @@
+from sqlalchemy import Column, Integer, String, ForeignKey
+
+from .base import Base
+
+class DeliveryAttempt(Base):
+    """One delivery attempt of a reminder, written with its status change."""
+    
+    __tablename__ = "delivery_attempts"
+    
+    reminder_id = Column(
+        Integer, ForeignKey("reminders.id", ondelete="CASCADE"), nullable=False, index=True
+    )
+    attempt = Column(Integer, nullable=False)
+    channel = Column(String(20), nullable=False)
+    outcome = Column(String(20), nullable=False)  # sent, failed, dead_letter
+    
+    def __repr__(self) -> str:
+        return f"<DeliveryAttempt {self.attempt} of reminder {self.reminder_id}: {self.outcome}>"
@@ -1,7 +1,8 @@
 from datetime import datetime
 from typing import List, Optional
 
-from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, Enum, Boolean
+from sqlalchemy import BigInteger, Column, Integer, String, Text, DateTime, ForeignKey, Enum, Boolean, Index, JSON, DDL, event, text
+from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.orm import relationship
 
 from .base import Base
@@ -10,6 +11,21 @@ class Event(Base):
     """Calendar event model."""
     
     __tablename__ = "events"
+    __table_args__ = (
+        # Every listing is scoped to one owner and filtered or ordered by time
+        Index("ix_events_owner_id_start_time", "owner_id", "start_time"),
+        Index("ix_events_owner_id_end_time", "owner_id", "end_time"),
+        # Recurring series are looked up separately and expanded in Python
+        Index(
+            "ix_events_recurring_owner_id_start_time",
+            "owner_id",
+            "start_time",
+            postgresql_where=text("recurrence_rule IS NOT NULL"),
+            sqlite_where=text("recurrence_rule IS NOT NULL"),
+        ),
+        # Delta sync reads an owner's changes in sequence order
+        Index("ix_events_owner_id_change_seq", "owner_id", "change_seq", "id"),
+    )
     
     title = Column(String(100), nullable=False)
     description = Column(Text)
@@ -19,12 +35,20 @@ class Event(Base):
     is_all_day = Column(Boolean, default=False)
     status = Column(String(20), default="scheduled")  # scheduled, cancelled, completed
     
+    # Recurring series (app.core.recurrence); start/end_time are the first occurrence
+    recurrence_rule = Column(JSON(none_as_null=True).with_variant(JSONB(none_as_null=True), "postgresql"))
+    recurrence_end = Column(DateTime)  # end of the last occurrence, NULL if the series never ends
+    
+    # The owner's change sequence at the last write (app.core.sync)
+    change_seq = Column(BigInteger, nullable=False, default=0, server_default="0")
+    
     # Foreign keys
-    owner_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    owner_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
     
     # Relationships
     owner = relationship("User", back_populates="events")
-    reminders = relationship("Reminder", back_populates="event", cascade="all, delete-orphan")
+    # The database deletes reminders with their event (ON DELETE CASCADE)
+    reminders = relationship("Reminder", back_populates="event", cascade="all, delete-orphan", passive_deletes=True)
     
     def __repr__(self) -> str:
         return f"<Event {self.title} ({self.start_time} - {self.end_time})>"
@@ -44,3 +68,13 @@ class Event(Base):
         """Check if the event is currently ongoing."""
         now = datetime.utcnow()
         return self.start_time <= now <= self.end_time
+
+# Conflict detection (app.core.conflicts) finds overlapping events through a
+# GiST range index on PostgreSQL. It has no portable form, so it is created
+# here for init_db and by migration 7c2e5a9d4b18.
+for ddl in (
+    "CREATE EXTENSION IF NOT EXISTS btree_gist",
+    "CREATE INDEX IF NOT EXISTS ix_events_owner_id_time_range ON events "
+    "USING gist (owner_id, tsrange(start_time, end_time, '[)')) WHERE recurrence_rule IS NULL",
+):
+    event.listen(Event.__table__, "after_create", DDL(ddl).execute_if(dialect="postgresql"))
@@ -0,0 +1,26 @@
+from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, Boolean, UniqueConstraint
+
+from .base import Base
+
+class EventException(Base):
+    """A cancelled or edited occurrence of a recurring event."""
+    
+    __tablename__ = "event_exceptions"
+    __table_args__ = (
+        UniqueConstraint("event_id", "original_start", name="uq_event_exceptions_event_id_original_start"),
+    )
+    
+    event_id = Column(Integer, ForeignKey("events.id", ondelete="CASCADE"), nullable=False)
+    # Start of the occurrence as generated by the rule (its RECURRENCE-ID)
+    original_start = Column(DateTime, nullable=False)
+    is_cancelled = Column(Boolean, default=False, nullable=False)
+    
+    # Overrides; NULL keeps the value of the series
+    title = Column(String(100))
+    description = Column(Text)
+    start_time = Column(DateTime)
+    end_time = Column(DateTime)
+    location = Column(String(255))
+    
+    def __repr__(self) -> str:
+        return f"<EventException of event {self.event_id} at {self.original_start}>"
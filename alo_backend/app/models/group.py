@@ -0,0 +1,24 @@
+from sqlalchemy import Column, ForeignKey, Index, Integer, String, Table
+
+from .base import Base
+
+# Membership of users in groups; a user may query the availability of the
+# members of the groups they are in (app.api.api_v1.endpoints.availability)
+group_members = Table(
+    "group_members",
+    Base.metadata,
+    Column("group_id", Integer, ForeignKey("groups.id", ondelete="CASCADE"), primary_key=True),
+    Column("user_id", Integer, ForeignKey("users.id", ondelete="CASCADE"), primary_key=True),
+    # A user's groups, then their members, without touching the table
+    Index("ix_group_members_user_id_group_id", "user_id", "group_id"),
+)
+
+class Group(Base):
+    """A group of users who may see each other's common free time."""
+    
+    __tablename__ = "groups"
+    
+    name = Column(String(100), nullable=False)
+    
+    def __repr__(self) -> str:
+        return f"<Group {self.name}>"
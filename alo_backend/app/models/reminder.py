@@ -1,7 +1,7 @@
 from datetime import datetime
 from enum import Enum as PyEnum
 
-from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Enum
+from sqlalchemy import BigInteger, Column, Integer, String, DateTime, ForeignKey, Enum, Index, text
 from sqlalchemy.orm import relationship
 
 from .base import Base
@@ -16,6 +16,7 @@ class ReminderStatus(PyEnum):
     PENDING = "pending"
     SENT = "sent"
     FAILED = "failed"
+    DEAD_LETTER = "dead_letter"
 
 class Reminder(Base):
     """Reminder model for event notifications."""
@@ -28,14 +29,45 @@ class Reminder(Base):
     status = Column(Enum(ReminderStatus), default=ReminderStatus.PENDING)
     sent_at = Column(DateTime, nullable=True)
     
+    # Delivery retries: FAILED reminders are retried from next_attempt_at
+    # until attempts reaches the limit, then moved to DEAD_LETTER
+    attempts = Column(Integer, nullable=False, default=0, server_default="0")
+    next_attempt_at = Column(DateTime, nullable=True)
+    # Lease of the dispatcher delivering it; claimable again once it has passed
+    claimed_until = Column(DateTime, nullable=True)
+    
+    # The owner's change sequence at the last write (app.core.sync)
+    change_seq = Column(BigInteger, nullable=False, default=0, server_default="0")
+    
     # Foreign keys
-    event_id = Column(Integer, ForeignKey("events.id"), nullable=True)  # Optional for standalone reminders
-    owner_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    event_id = Column(Integer, ForeignKey("events.id", ondelete="CASCADE"), nullable=True, index=True)  # Optional for standalone reminders
+    owner_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
     
     # Relationships
     owner = relationship("User", back_populates="reminders")
     event = relationship("Event", back_populates="reminders")
     
+    __table_args__ = (
+        Index("ix_reminders_owner_id_event_id", "owner_id", "event_id"),
+        Index("ix_reminders_owner_id_reminder_time", "owner_id", "reminder_time"),
+        # Delta sync reads an owner's changes in sequence order
+        Index("ix_reminders_owner_id_change_seq", "owner_id", "change_seq", "id"),
+        # Due-reminder scan; the enum is stored by name
+        Index(
+            "ix_reminders_pending_reminder_time",
+            "reminder_time",
+            postgresql_where=text("status = 'PENDING'"),
+            sqlite_where=text("status = 'PENDING'"),
+        ),
+        # Retry sweep
+        Index(
+            "ix_reminders_failed_next_attempt_at",
+            "next_attempt_at",
+            postgresql_where=text("status = 'FAILED'"),
+            sqlite_where=text("status = 'FAILED'"),
+        ),
+    )
+    
     def __repr__(self) -> str:
         return f"<Reminder {self.id} for {self.reminder_time}>"
     
@@ -0,0 +1,20 @@
+from sqlalchemy import BigInteger, Column, Integer, String, ForeignKey, Index
+
+from .base import Base
+
+class Tombstone(Base):
+    """A deleted event or reminder, kept for delta sync (app.core.sync)."""
+    
+    __tablename__ = "tombstones"
+    __table_args__ = (
+        Index("ix_tombstones_owner_id_change_seq", "owner_id", "change_seq", "id"),
+    )
+    
+    owner_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
+    kind = Column(String(20), nullable=False)  # event, reminder
+    row_id = Column(Integer, nullable=False)
+    # The owner's change sequence at the delete; created_at is the time of the delete
+    change_seq = Column(BigInteger, nullable=False)
+    
+    def __repr__(self) -> str:
+        return f"<Tombstone of {self.kind} {self.row_id}>"
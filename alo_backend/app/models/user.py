@@ -1,7 +1,7 @@
 from datetime import datetime
 from typing import Optional, List
 
-from sqlalchemy import Boolean, Column, DateTime, Integer, String, ForeignKey
+from sqlalchemy import BigInteger, Boolean, Column, DateTime, Integer, String, ForeignKey, Index, text
 from sqlalchemy.orm import relationship
 
 from .base import Base
@@ -10,6 +10,15 @@ class User(Base):
     """User model for authentication and authorization."""
     
     __tablename__ = "users"
+    __table_args__ = (
+        # Accounts queued for purging
+        Index(
+            "ix_users_deleted_at",
+            "deleted_at",
+            postgresql_where=text("deleted_at IS NOT NULL"),
+            sqlite_where=text("deleted_at IS NOT NULL"),
+        ),
+    )
     
     email = Column(String(255), unique=True, index=True, nullable=False)
     hashed_password = Column(String(255), nullable=False)
@@ -17,10 +26,15 @@ class User(Base):
     is_active = Column(Boolean(), default=True)
     is_superuser = Column(Boolean(), default=False)
     last_login = Column(DateTime, nullable=True)
+    deleted_at = Column(DateTime, nullable=True)  # queued for purging (app.core.purge)
+    # Advanced by every write to the user's events and reminders (app.core.sync)
+    change_seq = Column(BigInteger, nullable=False, default=0, server_default="0")
     
     # Relationships
-    events = relationship("Event", back_populates="owner", cascade="all, delete-orphan")
-    reminders = relationship("Reminder", back_populates="owner", cascade="all, delete-orphan")
+    # The database deletes owned rows with the user (ON DELETE CASCADE); large
+    # accounts are purged in batches by app.core.purge instead
+    events = relationship("Event", back_populates="owner", cascade="all, delete-orphan", passive_deletes=True)
+    reminders = relationship("Reminder", back_populates="owner", cascade="all, delete-orphan", passive_deletes=True)
     
     def __repr__(self) -> str:
         return f"<User {self.email}>"
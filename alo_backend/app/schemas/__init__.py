@@ -1,5 +1,14 @@
 # Import all schemas to make them available when importing from app.schemas
 from .user import UserBase, UserCreate, UserInDB, UserResponse, UserUpdate
 from .token import Token, TokenPayload
-from .event import EventBase, EventCreate, EventUpdate, EventInDBBase, EventResponse
+from .event import (
+    EventBase, EventCreate, EventUpdate, EventInDBBase, EventResponse,
+    EventOccurrenceUpdate, EventExceptionResponse, Frequency, RecurrenceRule, Weekday,
+    BusyInterval, FreeBusy, SuggestedSlot,
+)
 from .reminder import ReminderBase, ReminderCreate, ReminderUpdate, ReminderInDBBase, ReminderResponse, ReminderStatus, ReminderType
+from .pagination import Page
+from .availability import FreeWindow, GroupAvailability
+from .group import GroupCreate, GroupResponse
+from .batch import BatchItem, BatchItemResult, BatchOperation, BatchRequest, BatchResponse
+from .sync import SyncDeletion, SyncEvent, SyncResponse
@@ -0,0 +1,15 @@
+from datetime import datetime
+from typing import List
+from pydantic import BaseModel
+
+class FreeWindow(BaseModel):
+    """A block of time in which every member is free."""
+    start: datetime
+    end: datetime
+
+class GroupAvailability(BaseModel):
+    """Common free windows of a group of users within a window."""
+    start: datetime
+    end: datetime
+    user_ids: List[int]
+    free: List[FreeWindow] = []
@@ -0,0 +1,32 @@
+from enum import Enum
+from typing import Any, Dict, List, Optional
+
+from pydantic import BaseModel
+
+class BatchOperation(str, Enum):
+    CREATE = "create"
+    UPDATE = "update"
+    DELETE = "delete"
+
+class BatchItem(BaseModel):
+    """One operation of a batch; ``id`` is required to update or delete."""
+    op: BatchOperation
+    id: Optional[int] = None
+    data: Dict[str, Any] = {}
+
+class BatchRequest(BaseModel):
+    """Operations applied together; atomic batches apply all or none."""
+    items: List[BatchItem]
+    atomic: bool = True
+
+class BatchItemResult(BaseModel):
+    """Outcome of one operation, with the status code a single call would return."""
+    index: int
+    op: BatchOperation
+    status: int
+    id: Optional[int] = None
+    error: Optional[Any] = None
+
+class BatchResponse(BaseModel):
+    """Outcomes of a batch, in request order."""
+    results: List[BatchItemResult]
@@ -1,8 +1,66 @@
 from datetime import datetime
+from enum import Enum
 from typing import Optional, List
-from pydantic import BaseModel, validator
+from pydantic import BaseModel, root_validator, validator
+from app.core.utils import to_naive_utc
 from app.schemas.reminder import ReminderResponse
 
+# Bounds on a series, so its last occurrence stays a representable datetime
+MAX_RECURRENCE_COUNT = 10000
+MAX_RECURRENCE_UNTIL = datetime(2200, 1, 1)
+
+class Frequency(str, Enum):
+    """Recurrence frequency."""
+    DAILY = "DAILY"
+    WEEKLY = "WEEKLY"
+    MONTHLY = "MONTHLY"
+    YEARLY = "YEARLY"
+
+class Weekday(str, Enum):
+    """Weekday, as in iCal BYDAY."""
+    MO = "MO"
+    TU = "TU"
+    WE = "WE"
+    TH = "TH"
+    FR = "FR"
+    SA = "SA"
+    SU = "SU"
+
+class RecurrenceRule(BaseModel):
+    """Recurrence rule, a subset of the iCal RRULE."""
+    freq: Frequency
+    interval: int = 1
+    count: Optional[int] = None
+    until: Optional[datetime] = None
+    byweekday: Optional[List[Weekday]] = None
+
+    @validator('interval', 'count')
+    def must_be_positive(cls, v):
+        if v is not None and v < 1:
+            raise ValueError('must be at least 1')
+        return v
+
+    @validator('count')
+    def count_must_be_bounded(cls, v):
+        if v is not None and v > MAX_RECURRENCE_COUNT:
+            raise ValueError(f'must be at most {MAX_RECURRENCE_COUNT}')
+        return v
+
+    @validator('until')
+    def until_must_be_bounded(cls, v):
+        v = to_naive_utc(v)
+        if v is not None and v >= MAX_RECURRENCE_UNTIL:
+            raise ValueError(f'must be before {MAX_RECURRENCE_UNTIL.date()}')
+        return v
+
+    @root_validator(skip_on_failure=True)
+    def check_rule(cls, values):
+        if values.get('count') is not None and values.get('until') is not None:
+            raise ValueError('count and until are mutually exclusive')
+        if values.get('byweekday') and values.get('freq') != Frequency.WEEKLY:
+            raise ValueError('byweekday is only supported with WEEKLY recurrence')
+        return values
+
 class EventBase(BaseModel):
     """Base event schema."""
     title: str
@@ -11,6 +69,11 @@ class EventBase(BaseModel):
     end_time: datetime
     location: Optional[str] = None
     is_all_day: bool = False
+    recurrence_rule: Optional[RecurrenceRule] = None
+
+    @validator('start_time', 'end_time')
+    def times_to_naive_utc(cls, v):
+        return to_naive_utc(v)
 
     @validator('end_time')
     def end_time_must_be_after_start_time(cls, v, values, **kwargs):
@@ -31,6 +94,52 @@ class EventUpdate(BaseModel):
     location: Optional[str] = None
     is_all_day: Optional[bool] = None
     status: Optional[str] = None
+    recurrence_rule: Optional[RecurrenceRule] = None
+
+    @validator('start_time', 'end_time')
+    def times_to_naive_utc(cls, v):
+        return to_naive_utc(v)
+
+class EventOccurrenceUpdate(BaseModel):
+    """Schema for editing one occurrence of a recurring event."""
+    title: Optional[str] = None
+    description: Optional[str] = None
+    start_time: Optional[datetime] = None
+    end_time: Optional[datetime] = None
+    location: Optional[str] = None
+
+    @validator('start_time', 'end_time')
+    def times_to_naive_utc(cls, v):
+        return to_naive_utc(v)
+
+class EventExceptionResponse(EventOccurrenceUpdate):
+    """A cancelled or edited occurrence of a recurring event."""
+    id: int
+    event_id: int
+    original_start: datetime
+    is_cancelled: bool
+    created_at: datetime
+    updated_at: datetime
+
+    class Config:
+        orm_mode = True
+
+class BusyInterval(BaseModel):
+    """A block of time taken by one or more events."""
+    start: datetime
+    end: datetime
+
+class FreeBusy(BaseModel):
+    """Busy blocks of a user within a window."""
+    start: datetime
+    end: datetime
+    busy: List[BusyInterval] = []
+
+class SuggestedSlot(BaseModel):
+    """A free slot suggested for a new event."""
+    start: datetime
+    end: datetime
+    score: int
 
 class EventInDBBase(EventBase):
     """Base schema for event in database."""
@@ -45,6 +154,8 @@ class EventInDBBase(EventBase):
 
 class EventResponse(EventInDBBase):
     """Event response schema."""
+    # Set on occurrences of a recurring event: the start the rule generated
+    recurrence_id: Optional[datetime] = None
     reminders: List[ReminderResponse] = []
     
     class Config(EventInDBBase.Config):
@@ -0,0 +1,16 @@
+from datetime import datetime
+from typing import List
+from pydantic import BaseModel
+
+class GroupCreate(BaseModel):
+    """Schema for creating a group."""
+    name: str
+    member_ids: List[int] = []
+
+class GroupResponse(BaseModel):
+    """A group and the ids of its members."""
+    id: int
+    name: str
+    member_ids: List[int] = []
+    created_at: datetime
+    updated_at: datetime
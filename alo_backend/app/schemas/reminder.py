@@ -14,6 +14,7 @@ class ReminderStatus(str, Enum):
     PENDING = "pending"
     SENT = "sent"
     FAILED = "failed"
+    DEAD_LETTER = "dead_letter"
 
 class ReminderBase(BaseModel):
     """Base reminder schema."""
@@ -23,6 +24,11 @@ class ReminderBase(BaseModel):
     status: ReminderStatus = ReminderStatus.PENDING
     event_id: Optional[int] = None
 
+    @validator('reminder_type', 'status', pre=True)
+    def unwrap_model_enum(cls, v):
+        # ORM rows carry app.models enums, which only match these by value
+        return getattr(v, 'value', v)
+
 class ReminderCreate(ReminderBase):
     """Schema for creating a reminder."""
     pass
@@ -33,6 +39,7 @@ class ReminderUpdate(BaseModel):
     reminder_time: Optional[datetime] = None
     reminder_type: Optional[ReminderType] = None
     status: Optional[ReminderStatus] = None
+    event_id: Optional[int] = None
 
 class ReminderInDBBase(ReminderBase):
     """Base schema for reminder in database."""
@@ -41,6 +48,8 @@ class ReminderInDBBase(ReminderBase):
     created_at: datetime
     updated_at: datetime
     sent_at: Optional[datetime] = None
+    attempts: int = 0
+    next_attempt_at: Optional[datetime] = None
 
     class Config:
         orm_mode = True
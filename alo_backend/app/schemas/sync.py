@@ -0,0 +1,25 @@
+from datetime import datetime
+from typing import List
+
+from pydantic import BaseModel
+
+from .event import EventExceptionResponse, EventInDBBase
+from .reminder import ReminderResponse
+
+class SyncEvent(EventInDBBase):
+    """An event as synced: a series is not expanded and carries its exceptions."""
+    exceptions: List[EventExceptionResponse] = []
+
+class SyncDeletion(BaseModel):
+    """A deleted event or reminder."""
+    type: str  # event, reminder
+    id: int
+    deleted_at: datetime
+
+class SyncResponse(BaseModel):
+    """Everything that changed after a sync cursor."""
+    events: List[SyncEvent] = []
+    reminders: List[ReminderResponse] = []
+    deleted: List[SyncDeletion] = []
+    cursor: str
+    has_more: bool = False
@@ -0,0 +1,59 @@
+"""Shared fixtures for the API tests.
+
+Settings are read when ``app`` is first imported, so the test database and
+settings are chosen here, before any import from ``app``. Tests run against
+a temporary SQLite file through the async engine; background jobs are off.
+"""
+import os
+import shutil
+import tempfile
+import uuid
+from typing import AsyncIterator, Dict
+
+_db_dir = tempfile.mkdtemp(prefix="alo-tests-")
+os.environ["DATABASE_URL"] = f"sqlite:///{_db_dir}/test.db"
+os.environ["REMINDER_DISPATCHER_ENABLED"] = "false"
+os.environ["ARCHIVE_ENABLED"] = "false"
+os.environ["PURGE_ENABLED"] = "false"
+os.environ["BCRYPT_ROUNDS"] = "4"
+# No providers or Redis: delivery and the message bus stay in process
+for setting in ("SMTP_URL", "PUSH_PROVIDER_URL", "SMS_PROVIDER_URL", "REDIS_URL"):
+    os.environ[setting] = ""
+os.environ["DELIVERY_STUB_TRANSPORTS"] = "false"
+
+import httpx  # noqa: E402
+import pytest  # noqa: E402
+
+from app.core.config import get_settings  # noqa: E402
+from app.core.database import init_db  # noqa: E402
+from app.main import app  # noqa: E402
+
+API = get_settings().API_V1_STR
+
+
+@pytest.fixture(scope="session", autouse=True)
+def database() -> None:
+    init_db()
+    yield
+    shutil.rmtree(_db_dir, ignore_errors=True)
+
+
+@pytest.fixture
+async def client() -> AsyncIterator[httpx.AsyncClient]:
+    async with httpx.AsyncClient(app=app, base_url="http://test") as client:
+        yield client
+
+
+async def create_user(client: httpx.AsyncClient) -> Dict[str, str]:
+    """Register and log in a new user; returns its Authorization header."""
+    email = f"user-{uuid.uuid4().hex[:12]}@example.com"
+    response = await client.post(f"{API}/auth/register", json={"email": email, "password": "password123"})
+    assert response.status_code == 200, response.text
+    response = await client.post(f"{API}/auth/login", data={"username": email, "password": "password123"})
+    assert response.status_code == 200, response.text
+    return {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+
+@pytest.fixture
+async def auth_headers(client: httpx.AsyncClient) -> Dict[str, str]:
+    return await create_user(client)
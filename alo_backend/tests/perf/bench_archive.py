@@ -0,0 +1,159 @@
+"""Table size, index size and list latency before and after archival.
+
+Fills ``--users`` calendars with ``--events`` events each, spread over the
+last three years and the coming month, every event with a reminder (SENT
+once it has passed). Then measures the size of the hot tables and their
+indexes and the latency of the listings, runs the archival job with the
+default one-year horizon, and measures again. The listings are the first
+page of ``GET /events``, the last 30 days of ``GET /events``, the pending
+reminders of ``GET /reminders`` and the first page with
+``include_archived=true``.
+
+Sizes come from ``dbstat`` on SQLite and ``pg_relation_size`` on
+PostgreSQL.
+
+    python -m tests.perf.bench_archive [--users 20] [--events 10000] [--repeat 50]
+"""
+import argparse
+import asyncio
+import time
+import uuid
+from datetime import datetime, timedelta
+
+from tests.perf.common import summarize, use_database
+
+use_database()
+
+import httpx  # noqa: E402
+from sqlalchemy import insert, select, text  # noqa: E402
+
+from app.core import database  # noqa: E402
+from app.core.archive import ArchiveJob  # noqa: E402
+from app.core.config import get_settings  # noqa: E402
+from app.core.database import init_db  # noqa: E402
+from app.main import app  # noqa: E402
+from app.models import Event, Reminder, ReminderStatus, ReminderType  # noqa: E402
+
+API = get_settings().API_V1_STR
+CHUNK = 50_000
+TABLES = ("events", "reminders")
+
+
+async def register(client: httpx.AsyncClient) -> tuple:
+    email = f"bench-archive-{uuid.uuid4().hex[:8]}@example.com"
+    owner_id = (await client.post(f"{API}/auth/register", json={"email": email, "password": "password123"})).json()["id"]
+    response = await client.post(f"{API}/auth/login", data={"username": email, "password": "password123"})
+    return owner_id, {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+
+async def fill(owner_ids: list, per_user: int) -> None:
+    now = datetime.utcnow().replace(microsecond=0)
+    first = now - timedelta(days=3 * 365)
+    step = (now + timedelta(days=30) - first) / per_user
+    events, reminders = Event.__table__, Reminder.__table__
+    async with database.AsyncSessionLocal() as session:
+        async with session.begin():
+            for owner_id in owner_ids:
+                rows = [
+                    {
+                        "title": f"event {i}",
+                        "start_time": first + step * i,
+                        "end_time": first + step * i + timedelta(hours=1),
+                        "owner_id": owner_id,
+                        "created_at": now,
+                        "updated_at": now,
+                    }
+                    for i in range(per_user)
+                ]
+                for offset in range(0, len(rows), CHUNK):
+                    await session.execute(insert(events), rows[offset:offset + CHUNK])
+                owned = (await session.execute(
+                    select(events.c.id, events.c.start_time).where(events.c.owner_id == owner_id)
+                )).all()
+                await session.execute(insert(reminders), [
+                    {
+                        "message": "m",
+                        "reminder_time": start - timedelta(minutes=15),
+                        "reminder_type": ReminderType.IN_APP,
+                        "status": ReminderStatus.SENT if start < now else ReminderStatus.PENDING,
+                        "event_id": event_id,
+                        "owner_id": owner_id,
+                        "created_at": now,
+                        "updated_at": now,
+                    }
+                    for event_id, start in owned
+                ])
+
+
+async def sizes() -> dict:
+    """Bytes of each hot table and of its indexes."""
+    async with database.AsyncSessionLocal() as session:
+        if database.async_engine.dialect.name == "postgresql":
+            rows = await session.execute(text(
+                "SELECT relname, pg_relation_size(oid), pg_indexes_size(oid) FROM pg_class "
+                "WHERE relname IN ('events', 'reminders')"
+            ))
+            return {name: (table, indexes) for name, table, indexes in rows}
+        rows = (await session.execute(text(
+            "SELECT s.name, m.tbl_name, m.type, SUM(s.pgsize) FROM dbstat s "
+            "JOIN sqlite_master m ON m.name = s.name GROUP BY s.name"
+        ))).all()
+        return {
+            table: (
+                sum(size for _, owner, kind, size in rows if owner == table and kind == "table"),
+                sum(size for _, owner, kind, size in rows if owner == table and kind == "index"),
+            )
+            for table in TABLES
+        }
+
+
+async def measure(client: httpx.AsyncClient, headers: list, repeat: int, label: str) -> None:
+    for table, (table_bytes, index_bytes) in (await sizes()).items():
+        print(f"{label}: {table:9s} table {table_bytes / 2 ** 20:7.1f} MiB, indexes {index_bytes / 2 ** 20:7.1f} MiB")
+    now = datetime.utcnow()
+    for name, path, params in (
+        ("events, first page", "events/", {}),
+        ("events, last 30 days", "events/", {"start_date": (now - timedelta(days=30)).isoformat(), "end_date": now.isoformat()}),
+        ("pending reminders", "reminders/", {"status": "pending"}),
+        ("events, include_archived", "events/", {"include_archived": "true"}),
+    ):
+        samples = []
+        for _ in range(repeat):
+            for user_headers in headers:
+                started = time.perf_counter()
+                response = await client.get(f"{API}/{path}", headers=user_headers, params=params)
+                samples.append((time.perf_counter() - started) * 1000)
+                assert response.status_code == 200, response.text
+        print(summarize(f"{label}, {name}", samples))
+
+
+async def run(users: int, per_user: int, repeat: int) -> None:
+    async with httpx.AsyncClient(app=app, base_url="http://bench", timeout=None) as client:
+        registered = [await register(client) for _ in range(users)]
+        started = time.perf_counter()
+        await fill([owner_id for owner_id, _ in registered], per_user)
+        print(f"filled {users * per_user} events and reminders in {time.perf_counter() - started:.1f} s")
+        headers = [user_headers for _, user_headers in registered]
+
+        await measure(client, headers, repeat, "before")
+        job = ArchiveJob(after_days=365, batch_size=get_settings().ARCHIVE_BATCH_SIZE)
+        started = time.perf_counter()
+        archived = await job.run_once()
+        print(f"archived {archived} in {time.perf_counter() - started:.1f} s, {job.counters['chunks']} chunks")
+        await measure(client, headers, repeat, "after")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--users", type=int, default=20)
+    parser.add_argument("--events", type=int, default=10_000)
+    parser.add_argument("--repeat", type=int, default=50)
+    args = parser.parse_args()
+
+    init_db()
+    database.initialize_async_database()
+    asyncio.run(run(args.users, args.events, args.repeat))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,161 @@
+"""Requests/sec of the sync and async database paths at 200 concurrent clients.
+
+One uvicorn worker serves the same listing two ways: a sync ``def``
+handler on Starlette's threadpool using the QueuePool engine of
+``database.initialize_database`` (what the API used before), and an ``async def`` handler using
+``get_async_db``. Each is driven by concurrent keep-alive clients for a
+fixed time.
+
+    python -m tests.perf.bench_async_engine [--clients 200] [--seconds 10]
+
+Set DATABASE_URL to a PostgreSQL database for the case the async engine was
+built for; on SQLite both paths serialize on the database file.
+"""
+import argparse
+import asyncio
+import os
+import socket
+import subprocess
+import sys
+import time
+import uuid
+from datetime import datetime, timedelta
+from typing import Any, Dict, Iterator, List, Tuple
+
+from tests.perf.common import summarize, use_database
+
+use_database()
+
+from fastapi import Depends, FastAPI  # noqa: E402
+from sqlalchemy import select  # noqa: E402
+from sqlalchemy.ext.asyncio import AsyncSession  # noqa: E402
+from sqlalchemy.orm import Session  # noqa: E402
+
+from app.core import database  # noqa: E402
+from app.models import Event, User  # noqa: E402
+
+EVENTS = 200
+PAGE = 50
+
+app = FastAPI()
+
+
+def _page(owner_id: int):
+    return (
+        select(Event.id, Event.title, Event.start_time, Event.end_time)
+        .where(Event.owner_id == owner_id)
+        .order_by(Event.start_time)
+        .limit(PAGE)
+    )
+
+
+def get_sync_db() -> Iterator[Session]:
+    # Not database.get_db: its scoped_session is thread-local, and Starlette
+    # runs the dependency and the handler on different threadpool threads, so
+    # concurrent requests would share sessions
+    _, SessionLocal = database.initialize_database()
+    db = SessionLocal.session_factory()
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+@app.get("/sync/{owner_id}")
+def sync_events(owner_id: int, db: Session = Depends(get_sync_db)) -> List[Dict[str, Any]]:
+    return [dict(row._mapping) for row in db.execute(_page(owner_id))]
+
+
+@app.get("/async/{owner_id}")
+async def async_events(owner_id: int, db: AsyncSession = Depends(database.get_async_db)) -> List[Dict[str, Any]]:
+    return [dict(row._mapping) for row in await db.execute(_page(owner_id))]
+
+
+def seed() -> int:
+    database.init_db()
+    _, SessionLocal = database.initialize_database()
+    with SessionLocal() as db:
+        user = User(email=f"bench-{uuid.uuid4().hex}@example.com", hashed_password="x")
+        db.add(user)
+        db.flush()
+        db.add_all(
+            Event(
+                title=f"event {i}",
+                start_time=datetime(2026, 1, 1) + timedelta(hours=i),
+                end_time=datetime(2026, 1, 1) + timedelta(hours=i, minutes=30),
+                owner_id=user.id,
+            )
+            for i in range(EVENTS)
+        )
+        db.commit()
+        return user.id
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+async def drive(url: str, clients: int, seconds: float) -> Tuple[List[float], int]:
+    import httpx
+
+    latencies: List[float] = []
+    errors = 0
+    limits = httpx.Limits(max_connections=clients, max_keepalive_connections=clients)
+    async with httpx.AsyncClient(limits=limits, timeout=60) as client:
+        deadline = time.monotonic() + seconds
+
+        async def worker() -> None:
+            nonlocal errors
+            while time.monotonic() < deadline:
+                started = time.perf_counter()
+                try:
+                    response = await client.get(url)
+                except httpx.TransportError:
+                    errors += 1
+                    continue
+                response.raise_for_status()
+                latencies.append((time.perf_counter() - started) * 1000)
+
+        await asyncio.gather(*(worker() for _ in range(clients)))
+    return latencies, errors
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--clients", type=int, default=200)
+    parser.add_argument("--seconds", type=float, default=10.0)
+    parser.add_argument("--serve", type=int, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.serve:
+        import uvicorn
+
+        uvicorn.run(app, host="127.0.0.1", port=args.serve, log_level="warning")
+        return
+
+    owner_id = seed()
+    port = free_port()
+    server = subprocess.Popen([sys.executable, "-m", "tests.perf.bench_async_engine", "--serve", str(port)], env=os.environ)
+    try:
+        while True:
+            try:
+                socket.create_connection(("127.0.0.1", port), timeout=0.1).close()
+                break
+            except OSError:
+                time.sleep(0.1)
+        print(f"{args.clients} clients, {args.seconds:.0f} s per mode, {os.environ['DATABASE_URL']}")
+        for mode in ("sync", "async"):
+            url = f"http://127.0.0.1:{port}/{mode}/{owner_id}"
+            asyncio.run(drive(url, args.clients, 1.0))  # warm up the pool
+            latencies, errors = asyncio.run(drive(url, args.clients, args.seconds))
+            print(f"{mode:5s} {len(latencies) / args.seconds:8.1f} req/s  {errors} connection errors")
+            print(summarize(f"  {mode} latency", latencies))
+    finally:
+        server.terminate()
+        server.wait()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+"""Per-request auth overhead with and without the verified-token cache.
+
+Times ``security.verify_token`` on its own, then a whole authenticated
+``GET /users/me`` request through the ASGI app, each with the token cache
+bypassed (every call runs python-jose's signature check and claim parsing,
+as before) and with it enabled.
+
+    python -m tests.perf.bench_auth [--calls 20000] [--requests 2000]
+"""
+import argparse
+import asyncio
+from contextlib import contextmanager, nullcontext
+from typing import Iterator
+
+from tests.perf.common import summarize, time_calls, use_database
+
+use_database()
+
+import httpx  # noqa: E402
+
+from app.core import security  # noqa: E402
+from app.core.config import get_settings  # noqa: E402
+from app.core.database import init_db  # noqa: E402
+from app.main import app  # noqa: E402
+
+API = get_settings().API_V1_STR
+
+
+@contextmanager
+def token_cache_bypassed() -> Iterator[None]:
+    get = security.token_cache.get
+    security.token_cache.get = lambda token: None
+    try:
+        yield
+    finally:
+        security.token_cache.get = get
+
+
+async def time_requests(requests: int) -> None:
+    async with httpx.AsyncClient(app=app, base_url="http://bench") as client:
+        credentials = {"email": "bench-auth@example.com", "password": "password123"}
+        await client.post(f"{API}/auth/register", json=credentials)
+        response = await client.post(
+            f"{API}/auth/login", data={"username": credentials["email"], "password": credentials["password"]}
+        )
+        token = response.json()["access_token"]
+        headers = {"Authorization": f"Bearer {token}"}
+
+        async def request_ms() -> float:
+            loop = asyncio.get_running_loop()
+            started = loop.time()
+            response = await client.get(f"{API}/users/me", headers=headers)
+            assert response.status_code == 200, response.text
+            return (loop.time() - started) * 1000
+
+        for label, bypass in (("GET /users/me, no token cache", True), ("GET /users/me, token cache", False)):
+            with token_cache_bypassed() if bypass else nullcontext():
+                for _ in range(100):
+                    await request_ms()
+                print(summarize(label, [await request_ms() for _ in range(requests)]))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--calls", type=int, default=20000)
+    parser.add_argument("--requests", type=int, default=2000)
+    args = parser.parse_args()
+
+    token = security.create_access_token(42)
+    with token_cache_bypassed():
+        print(summarize("verify_token, no token cache", time_calls(lambda: security.verify_token(token), args.calls)))
+    print(summarize("verify_token, token cache", time_calls(lambda: security.verify_token(token), args.calls)))
+
+    init_db()
+    asyncio.run(time_requests(args.requests))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,120 @@
+"""Batch writes against the same writes as single calls.
+
+For each of ``--sizes``, creates that many events, updates and deletes
+them, then does the same with reminders, once with one call per item and
+once through ``:batch``, and reports the time per item and the speedup.
+Both paths write updates with the same statements (one UPDATE per row,
+stamped for sync), so the difference is the per-request work: routing,
+authentication, the ownership lookups and one commit per call.
+
+    python -m tests.perf.bench_batch [--sizes 10 100 1000] [--repeat 5]
+"""
+import argparse
+import asyncio
+import time
+import uuid
+
+from tests.perf.common import use_database
+
+use_database()
+
+import httpx  # noqa: E402
+
+from app.core import database  # noqa: E402
+from app.core.config import get_settings  # noqa: E402
+from app.core.database import init_db  # noqa: E402
+from app.main import app  # noqa: E402
+
+API = get_settings().API_V1_STR
+DATA = {
+    "events": lambda i: {
+        "title": f"event {i}",
+        "start_time": f"2026-07-01T{i % 24:02d}:00:00Z",
+        "end_time": f"2026-07-01T{i % 24:02d}:30:00Z",
+    },
+    "reminders": lambda i: {"message": f"reminder {i}", "reminder_time": "2026-07-01T09:00:00Z", "reminder_type": "in_app"},
+}
+CHANGES = {"events": {"title": "renamed", "end_time": "2026-07-02T00:00:00Z"}, "reminders": {"status": "sent"}}
+
+
+async def register(client: httpx.AsyncClient) -> dict:
+    email = f"bench-batch-{uuid.uuid4().hex[:8]}@example.com"
+    await client.post(f"{API}/auth/register", json={"email": email, "password": "password123"})
+    response = await client.post(f"{API}/auth/login", data={"username": email, "password": "password123"})
+    return {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+
+async def check(response: httpx.Response, expected: int) -> httpx.Response:
+    assert response.status_code == expected, response.text
+    return response
+
+
+async def singles(client: httpx.AsyncClient, headers: dict, kind: str, size: int) -> dict:
+    timings = {}
+    started = time.perf_counter()
+    ids = [
+        (await check(await client.post(f"{API}/{kind}/", headers=headers, json=DATA[kind](i)), 201)).json()["id"]
+        for i in range(size)
+    ]
+    timings["create"] = time.perf_counter() - started
+    started = time.perf_counter()
+    for row_id in ids:
+        await check(await client.put(f"{API}/{kind}/{row_id}", headers=headers, json=CHANGES[kind]), 200)
+    timings["update"] = time.perf_counter() - started
+    started = time.perf_counter()
+    for row_id in ids:
+        await check(await client.delete(f"{API}/{kind}/{row_id}", headers=headers), 200)
+    timings["delete"] = time.perf_counter() - started
+    return timings
+
+
+async def batched(client: httpx.AsyncClient, headers: dict, kind: str, size: int) -> dict:
+    async def batch(items: list) -> list:
+        response = await check(await client.post(f"{API}/{kind}:batch", headers=headers, json={"items": items}), 200)
+        return [result["id"] for result in response.json()["results"]]
+
+    timings = {}
+    started = time.perf_counter()
+    ids = await batch([{"op": "create", "data": DATA[kind](i)} for i in range(size)])
+    timings["create"] = time.perf_counter() - started
+    started = time.perf_counter()
+    await batch([{"op": "update", "id": row_id, "data": CHANGES[kind]} for row_id in ids])
+    timings["update"] = time.perf_counter() - started
+    started = time.perf_counter()
+    await batch([{"op": "delete", "id": row_id} for row_id in ids])
+    timings["delete"] = time.perf_counter() - started
+    return timings
+
+
+async def run(sizes: list, repeat: int) -> None:
+    async with httpx.AsyncClient(app=app, base_url="http://bench", timeout=None) as client:
+        headers = await register(client)
+        for kind in DATA:
+            for size in sizes:
+                totals = {"single": {}, "batch": {}}
+                for _ in range(repeat):
+                    for label, write in (("single", singles), ("batch", batched)):
+                        for op, seconds in (await write(client, headers, kind, size)).items():
+                            totals[label][op] = totals[label].get(op, 0.0) + seconds
+                for op in ("create", "update", "delete"):
+                    single, batch = totals["single"][op], totals["batch"][op]
+                    per_item = 1000 / (size * repeat)
+                    print(
+                        f"{kind:9s} {op:6s} x{size:<5d} single {single * per_item:7.3f} ms/item  "
+                        f"batch {batch * per_item:7.3f} ms/item  {single / batch:5.1f}x"
+                    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10, 100, 1000])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    init_db()
+    database.initialize_async_database()
+    asyncio.run(run(args.sizes, args.repeat))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,127 @@
+"""Conflict detection over calendars of up to 1M events per user.
+
+For each of ``--sizes``, fills one calendar with that many events, back to
+back with random lengths so neighbours overlap, then times for random
+one-hour windows:
+
+- ``find_conflicts``, which on SQLite asks the owner's interval tree for
+  the overlapping ids and loads those rows (the GiST range index on
+  PostgreSQL);
+- the tree query alone, in memory;
+- the plain overlap query without either, ``start_time < end AND
+  end_time > start`` on the ``(owner_id, start_time)`` index, which reads
+  every event starting before the window.
+
+Also reports how long the tree takes to build and to apply one insert.
+
+    python -m tests.perf.bench_conflicts [--sizes 10000 100000 1000000] [--repeat 200]
+"""
+import argparse
+import asyncio
+import random
+import time
+import uuid
+from datetime import datetime, timedelta
+
+from tests.perf.common import summarize, time_calls, use_database
+
+use_database()
+
+from sqlalchemy import insert, select  # noqa: E402
+
+from app.core import database  # noqa: E402
+from app.core.conflicts import USE_RANGE_INDEX, conflict_index, find_conflicts  # noqa: E402
+from app.core.database import init_db  # noqa: E402
+from app.models import Event, User  # noqa: E402
+
+START = datetime(2020, 1, 1)
+CHUNK = 50_000
+events = Event.__table__
+
+
+async def fill(size: int) -> int:
+    rng = random.Random(size)
+    now = datetime.utcnow()
+    users_table = User.__table__
+    email = f"bench-conflicts-{uuid.uuid4().hex[:8]}@example.com"
+    async with database.AsyncSessionLocal() as session:
+        async with session.begin():
+            await session.execute(insert(users_table), [{"email": email, "hashed_password": "x"}])
+            owner_id = (await session.execute(select(users_table.c.id).where(users_table.c.email == email))).scalar_one()
+            for offset in range(0, size, CHUNK):
+                rows = []
+                for i in range(offset, min(offset + CHUNK, size)):
+                    start = START + timedelta(minutes=30 * i)
+                    rows.append({
+                        "title": "busy",
+                        "start_time": start,
+                        "end_time": start + timedelta(minutes=rng.choice((15, 30, 45, 60, 90))),
+                        "owner_id": owner_id,
+                        "created_at": now,
+                        "updated_at": now,
+                    })
+                await session.execute(insert(events), rows)
+    return owner_id
+
+
+def windows(size: int, repeat: int) -> list:
+    rng = random.Random(0)
+    span = 30 * size
+    return [
+        (START + timedelta(minutes=minute), START + timedelta(minutes=minute + 60))
+        for minute in (rng.randrange(span) for _ in range(repeat))
+    ]
+
+
+async def run(sizes: list, repeat: int) -> None:
+    print("range index (PostgreSQL)" if USE_RANGE_INDEX else "interval trees")
+    for size in sizes:
+        owner_id = await fill(size)
+        queries = windows(size, repeat)
+        async with database.AsyncSessionLocal() as session:
+            if not USE_RANGE_INDEX:
+                started = time.perf_counter()
+                tree = await conflict_index.get(session, owner_id)
+                print(f"{size} events: tree built in {(time.perf_counter() - started) * 1000:.0f} ms")
+                samples = []
+                for start, end in queries:
+                    samples += time_calls(lambda: tree.overlapping(start, end), 1)
+                print(summarize(f"tree query, {size}", samples))
+                late = START + timedelta(minutes=30 * size + 60)
+                samples = []
+                for i in range(1, 1001):
+                    samples += time_calls(lambda: tree.insert(late, late + timedelta(minutes=30), -i), 1)
+                print(summarize(f"tree insert, {size}", samples))
+                for i in range(1, 1001):
+                    tree.remove(-i)
+
+            for label, query in (
+                ("find_conflicts", lambda start, end: find_conflicts(session, owner_id, start, end)),
+                ("plain overlap query", lambda start, end: session.execute(
+                    select(events)
+                    .where(events.c.owner_id == owner_id)
+                    .where(events.c.start_time < end)
+                    .where(events.c.end_time > start)
+                )),
+            ):
+                samples = []
+                for start, end in queries:
+                    began = time.perf_counter()
+                    await query(start, end)
+                    samples.append((time.perf_counter() - began) * 1000)
+                print(summarize(f"{label}, {size}", samples))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000, 1_000_000])
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args()
+
+    init_db()
+    database.initialize_async_database()
+    asyncio.run(run(args.sizes, args.repeat))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,128 @@
+"""Per-channel delivery throughput and latency, with a slow SMS provider.
+
+Runs the delivery pipeline offline against local providers: EMAIL through
+``SMTPTransport`` to an SMTP sink on localhost, PUSH and SMS through
+``HTTPTransport`` to a mock HTTP provider answering after ``--push-ms``
+and ``--sms-ms`` per call, and IN_APP as in production. ``--reminders``
+of each channel are delivered at once, and each channel reports when it
+finished, its throughput and its pool's queue-to-outcome latency. The
+slow SMS provider holds back only SMS reminders.
+
+    python -m tests.perf.bench_delivery [--reminders 5000] [--workers 4] [--push-ms 20] [--sms-ms 500]
+"""
+import argparse
+import asyncio
+import json
+import time
+
+import httpx
+
+from app.core.delivery import DeliveryPipeline, HTTPTransport, InAppTransport, SMTPTransport
+from app.models import ReminderType
+
+
+class SMTPSink(asyncio.Protocol):
+    """Accepts every message and discards it."""
+
+    def connection_made(self, transport: asyncio.Transport) -> None:
+        self.transport = transport
+        self.buffer = b""
+        self.in_data = False
+        transport.write(b"220 sink ESMTP\r\n")
+
+    def data_received(self, data: bytes) -> None:
+        self.buffer += data
+        while b"\r\n" in self.buffer:
+            line, self.buffer = self.buffer.split(b"\r\n", 1)
+            if self.in_data:
+                if line == b".":
+                    self.in_data = False
+                    self.transport.write(b"250 queued\r\n")
+                continue
+            command = line[:4].upper()
+            if command == b"EHLO":
+                self.transport.write(b"250-sink\r\n250 8BITMIME\r\n")
+            elif command == b"DATA":
+                self.in_data = True
+                self.transport.write(b"354 go ahead\r\n")
+            elif command == b"QUIT":
+                self.transport.write(b"221 bye\r\n")
+                self.transport.close()
+            else:
+                self.transport.write(b"250 ok\r\n")
+
+
+def mock_provider(latency: float) -> httpx.MockTransport:
+    """An HTTP provider that accepts every message after ``latency`` seconds."""
+
+    async def handle(request: httpx.Request) -> httpx.Response:
+        json.loads(request.content)
+        await asyncio.sleep(latency)
+        return httpx.Response(200, json={"failed": []})
+
+    return httpx.MockTransport(handle)
+
+
+def http_transport(channel: ReminderType, latency: float) -> HTTPTransport:
+    transport = HTTPTransport(channel, "http://provider.local/send")
+    transport._client = httpx.AsyncClient(transport=mock_provider(latency))
+    return transport
+
+
+async def run(reminders: int, workers: int, push_ms: int, sms_ms: int) -> None:
+    server = await asyncio.get_running_loop().create_server(SMTPSink, "127.0.0.1", 0)
+    port = server.sockets[0].getsockname()[1]
+    pipeline = DeliveryPipeline(
+        [
+            InAppTransport(ReminderType.IN_APP),
+            SMTPTransport(f"smtp://127.0.0.1:{port}", "reminders@example.com"),
+            http_transport(ReminderType.PUSH, push_ms / 1000),
+            http_transport(ReminderType.SMS, sms_ms / 1000),
+        ],
+        workers=workers,
+        queue_size=1000,
+    )
+
+    started = time.perf_counter()
+    finished = {}
+
+    async def deliver(channel: ReminderType, offset: int) -> None:
+        batch = [
+            {"id": offset + i, "reminder_type": channel, "owner_id": 1,
+             "owner_email": f"user{i}@example.com", "message": "Reminder"}
+            for i in range(reminders)
+        ]
+        delivered = await pipeline.deliver(batch)
+        assert len(delivered) == reminders
+        finished[channel] = time.perf_counter() - started
+
+    await asyncio.gather(*(
+        deliver(channel, n * reminders) for n, channel in enumerate(pipeline.channels)
+    ))
+    stats = pipeline.stats()
+    await pipeline.stop()
+    server.close()
+
+    for channel in pipeline.channels:
+        pool = stats[channel.value]
+        latency = pool["latency_ms"]
+        print(
+            f"{channel.value:7s} done in {finished[channel]:7.2f} s  "
+            f"{reminders / finished[channel]:9,.0f} /s  {pool['counters']['calls']:5d} calls  "
+            f"latency p50={latency['p50']} ms p99={latency['p99']} ms"
+        )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--reminders", type=int, default=5000)
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--push-ms", type=int, default=20)
+    parser.add_argument("--sms-ms", type=int, default=500)
+    args = parser.parse_args()
+
+    asyncio.run(run(args.reminders, args.workers, args.push_ms, args.sms_ms))
+
+
+if __name__ == "__main__":
+    main()
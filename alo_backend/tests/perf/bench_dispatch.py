@@ -0,0 +1,106 @@
+"""Dispatcher throughput over 1M due reminders.
+
+Fills ``--reminders`` due EMAIL reminders spread over ``--users`` owners,
+then drains them with ``ReminderDispatcher.dispatch_due`` and a delivery
+function that accepts every reminder at once, so the figures are the
+dispatcher's own cost: claim, outcome UPDATEs, delivery attempt rows,
+sync stamps and pushes. Reports reminders per second and the latency of
+each batch for every ``--batch-sizes`` value.
+
+    python -m tests.perf.bench_dispatch [--reminders 1000000] [--users 1000] [--batch-sizes 500 5000]
+"""
+import argparse
+import asyncio
+import time
+import uuid
+from datetime import datetime, timedelta
+
+from tests.perf.common import summarize, use_database
+
+use_database()
+
+from sqlalchemy import func, insert, select  # noqa: E402
+
+from app.core import database  # noqa: E402
+from app.core.database import init_db  # noqa: E402
+from app.core.dispatcher import ReminderDispatcher  # noqa: E402
+from app.models import Reminder, ReminderStatus, ReminderType, User  # noqa: E402
+
+CHUNK = 50_000
+
+
+async def fill(reminders: int, users: int) -> None:
+    now = datetime.utcnow()
+    prefix = f"bench-dispatch-{uuid.uuid4().hex[:8]}-"
+    users_table = User.__table__
+    async with database.AsyncSessionLocal() as session:
+        async with session.begin():
+            await session.execute(
+                insert(users_table),
+                [{"email": f"{prefix}{i}@example.com", "hashed_password": "x"} for i in range(users)],
+            )
+            user_ids = list((await session.execute(
+                select(users_table.c.id).where(users_table.c.email.startswith(prefix))
+            )).scalars())
+            for offset in range(0, reminders, CHUNK):
+                await session.execute(insert(Reminder.__table__), [
+                    {
+                        "message": f"due {i}",
+                        "reminder_time": now - timedelta(seconds=i % 3600),
+                        "reminder_type": ReminderType.EMAIL,
+                        "status": ReminderStatus.PENDING,
+                        "owner_id": user_ids[i % users],
+                        "created_at": now,
+                        "updated_at": now,
+                    }
+                    for i in range(offset, min(offset + CHUNK, reminders))
+                ])
+
+
+async def pending() -> int:
+    table = Reminder.__table__
+    async with database.AsyncSessionLocal() as session:
+        return (await session.execute(
+            select(func.count()).select_from(table).where(table.c.status == ReminderStatus.PENDING)
+        )).scalar_one()
+
+
+async def run(reminders: int, users: int, batch_sizes: list) -> None:
+    async def deliver(batch):
+        return [reminder["id"] for reminder in batch]
+
+    for batch_size in batch_sizes:
+        started = time.perf_counter()
+        await fill(reminders, users)
+        print(f"filled {reminders} reminders in {time.perf_counter() - started:.1f} s")
+
+        dispatcher = ReminderDispatcher(batch_size=batch_size, deliver=deliver, channels=[ReminderType.EMAIL])
+        samples = []
+        started = time.perf_counter()
+        while True:
+            batch_started = time.perf_counter()
+            if not await dispatcher.dispatch_batch(ReminderType.EMAIL):
+                break
+            samples.append((time.perf_counter() - batch_started) * 1000)
+        elapsed = time.perf_counter() - started
+
+        assert await pending() == 0
+        sent = dispatcher.counters["sent"]
+        print(f"batch size {batch_size}: {sent} sent in {elapsed:.1f} s, {sent / elapsed:,.0f} reminders/s")
+        print(summarize(f"batch of {batch_size}", samples))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--reminders", type=int, default=1_000_000)
+    parser.add_argument("--users", type=int, default=1000)
+    parser.add_argument("--batch-sizes", type=int, nargs="+", default=[500, 5000])
+    args = parser.parse_args()
+
+    init_db()
+    database.initialize_async_database()
+    asyncio.run(run(args.reminders, args.users, args.batch_sizes))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,141 @@
+"""Polling with and without ETags, replaying one request trace.
+
+Builds a trace of ``--requests`` requests from ``--users`` clients, each
+with ``--events`` events and a reminder per event. Most requests poll
+the first page of ``GET /events`` or ``GET /reminders``; ``--write-ratio``
+of them rename one of the client's events instead. The trace is replayed
+twice on the same data: once by clients that send the last ETag they got
+as ``If-None-Match``, once by clients that do not. Reports the poll
+latency, the share answered with 304 and the bytes sent.
+
+    python -m tests.perf.bench_etag [--users 50] [--events 200] [--requests 20000] [--write-ratio 0.02]
+"""
+import argparse
+import asyncio
+import random
+import time
+import uuid
+from datetime import datetime, timedelta
+
+from tests.perf.common import summarize, use_database
+
+use_database()
+
+import httpx  # noqa: E402
+from sqlalchemy import insert, select  # noqa: E402
+
+from app.core import database  # noqa: E402
+from app.core.config import get_settings  # noqa: E402
+from app.core.database import init_db  # noqa: E402
+from app.main import app  # noqa: E402
+from app.models import Event, Reminder, ReminderStatus, ReminderType  # noqa: E402
+
+API = get_settings().API_V1_STR
+POLLS = ("events/", "reminders/")
+
+
+async def register(client: httpx.AsyncClient) -> tuple:
+    email = f"bench-etag-{uuid.uuid4().hex[:8]}@example.com"
+    owner_id = (await client.post(f"{API}/auth/register", json={"email": email, "password": "password123"})).json()["id"]
+    response = await client.post(f"{API}/auth/login", data={"username": email, "password": "password123"})
+    return owner_id, {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+
+async def fill(owner_id: int, count: int) -> list:
+    now = datetime.utcnow().replace(microsecond=0)
+    events, reminders = Event.__table__, Reminder.__table__
+    async with database.AsyncSessionLocal() as session:
+        async with session.begin():
+            await session.execute(insert(events), [
+                {
+                    "title": f"event {i}",
+                    "start_time": now + timedelta(hours=i),
+                    "end_time": now + timedelta(hours=i, minutes=30),
+                    "owner_id": owner_id,
+                    "created_at": now,
+                    "updated_at": now,
+                }
+                for i in range(count)
+            ])
+            owned = (await session.execute(
+                select(events.c.id, events.c.start_time).where(events.c.owner_id == owner_id)
+            )).all()
+            await session.execute(insert(reminders), [
+                {
+                    "message": "m",
+                    "reminder_time": start - timedelta(minutes=15),
+                    "reminder_type": ReminderType.IN_APP,
+                    "status": ReminderStatus.PENDING,
+                    "event_id": event_id,
+                    "owner_id": owner_id,
+                    "created_at": now,
+                    "updated_at": now,
+                }
+                for event_id, start in owned
+            ])
+    return [event_id for event_id, _ in owned]
+
+
+def make_trace(users: int, requests: int, write_ratio: float) -> list:
+    rng = random.Random(0)
+    return [
+        (rng.randrange(users), "write" if rng.random() < write_ratio else rng.choice(POLLS))
+        for _ in range(requests)
+    ]
+
+
+async def replay(client: httpx.AsyncClient, clients: list, trace: list, conditional: bool) -> None:
+    rng = random.Random(1)
+    label = "If-None-Match" if conditional else "unconditional"
+    known = {}
+    samples, not_modified, sent = [], 0, 0
+    for user, request in trace:
+        headers, event_ids = clients[user]
+        if request == "write":
+            response = await client.put(
+                f"{API}/events/{rng.choice(event_ids)}", headers=headers, json={"title": f"renamed {rng.random()}"}
+            )
+            assert response.status_code == 200, response.text
+            continue
+        request_headers = dict(headers)
+        if conditional and (user, request) in known:
+            request_headers["If-None-Match"] = known[user, request]
+        started = time.perf_counter()
+        response = await client.get(f"{API}/{request}", headers=request_headers)
+        samples.append((time.perf_counter() - started) * 1000)
+        assert response.status_code in (200, 304), response.text
+        known[user, request] = response.headers["ETag"]
+        not_modified += response.status_code == 304
+        sent += len(response.content)
+    print(summarize(f"poll, {label}", samples))
+    print(f"{label}: {not_modified / len(samples):.1%} answered 304, {sent / 2 ** 20:.1f} MiB of bodies sent")
+
+
+async def run(users: int, events: int, requests: int, write_ratio: float) -> None:
+    async with httpx.AsyncClient(app=app, base_url="http://bench", timeout=None) as client:
+        clients = []
+        for _ in range(users):
+            owner_id, headers = await register(client)
+            clients.append((headers, await fill(owner_id, events)))
+        trace = make_trace(users, requests, write_ratio)
+        writes = sum(request == "write" for _, request in trace)
+        print(f"trace: {requests} requests from {users} clients, {writes} writes")
+        for conditional in (True, False):
+            await replay(client, clients, trace, conditional)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--users", type=int, default=50)
+    parser.add_argument("--events", type=int, default=200)
+    parser.add_argument("--requests", type=int, default=20_000)
+    parser.add_argument("--write-ratio", type=float, default=0.02)
+    args = parser.parse_args()
+
+    init_db()
+    database.initialize_async_database()
+    asyncio.run(run(args.users, args.events, args.requests, args.write_ratio))
+
+
+if __name__ == "__main__":
+    main()
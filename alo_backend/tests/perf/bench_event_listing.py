@@ -0,0 +1,154 @@
+"""Event listings of 100, 1,000 and 10,000 events with 3 reminders each.
+
+For each size, fills one calendar and lists it in one page, counting the
+SQL statements of each listing and timing it:
+
+- ``GET /events`` through the ASGI app: the page's events and all their
+  reminders in two queries, rendered straight to JSON;
+- the listing as it was before: ORM events, one reminder query per event
+  (the lazy load), hand-built dicts re-validated through ``EventResponse``
+  and encoded by FastAPI's ``jsonable_encoder``.
+
+    python -m tests.perf.bench_event_listing [--sizes 100 1000 10000] [--repeat 10]
+"""
+import argparse
+import asyncio
+import json
+import time
+import uuid
+from datetime import datetime, timedelta
+
+from tests.perf.common import summarize, use_database
+
+use_database()
+
+import httpx  # noqa: E402
+from fastapi.encoders import jsonable_encoder  # noqa: E402
+from sqlalchemy import event, insert, select  # noqa: E402
+
+from app import schemas  # noqa: E402
+from app.core import database  # noqa: E402
+from app.core.config import get_settings  # noqa: E402
+from app.core.database import init_db  # noqa: E402
+from app.main import app  # noqa: E402
+from app.models import Event, Reminder, ReminderType  # noqa: E402
+
+API = get_settings().API_V1_STR
+START = datetime(2026, 1, 1, 9)
+
+
+class StatementCounter:
+    """Count the statements run on the async engine."""
+
+    def __init__(self) -> None:
+        self.count = 0
+        event.listen(database.async_engine.sync_engine, "before_cursor_execute", self._count)
+
+    def _count(self, *args: object) -> None:
+        self.count += 1
+
+
+async def fill(owner_id: int, size: int) -> None:
+    now = datetime.utcnow()
+    async with database.AsyncSessionLocal() as session:
+        async with session.begin():
+            await session.execute(insert(Event.__table__), [
+                {
+                    "title": f"event {i}",
+                    "start_time": START + timedelta(hours=i),
+                    "end_time": START + timedelta(hours=i, minutes=30),
+                    "owner_id": owner_id,
+                    "created_at": now,
+                    "updated_at": now,
+                }
+                for i in range(size)
+            ])
+            event_ids = (await session.execute(
+                select(Event.__table__.c.id).where(Event.__table__.c.owner_id == owner_id)
+            )).scalars().all()
+            await session.execute(insert(Reminder.__table__), [
+                {
+                    "message": "m",
+                    "reminder_time": START,
+                    "reminder_type": ReminderType.IN_APP,
+                    "event_id": event_id,
+                    "owner_id": owner_id,
+                    "created_at": now,
+                    "updated_at": now,
+                }
+                for event_id in event_ids
+                for _ in range(3)
+            ])
+
+
+def _enum_value(value: object) -> object:
+    return value.value if hasattr(value, "value") else value
+
+
+async def listing_per_event(owner_id: int, limit: int) -> bytes:
+    """The listing before batch loading and direct serialization."""
+    async with database.AsyncSessionLocal() as session:
+        events = (await session.execute(
+            select(Event).where(Event.owner_id == owner_id).order_by(Event.start_time, Event.id).limit(limit)
+        )).scalars().all()
+        items = []
+        for row in events:
+            item = {column.key: getattr(row, column.key) for column in Event.__table__.columns}
+            reminders = (await session.execute(select(Reminder).where(Reminder.event_id == row.id))).scalars().all()
+            item["reminders"] = [
+                {column.key: _enum_value(getattr(reminder, column.key)) for column in Reminder.__table__.columns}
+                for reminder in reminders
+            ]
+            items.append(schemas.EventResponse.parse_obj(item))
+        return json.dumps(jsonable_encoder(items)).encode()
+
+
+async def register(client: httpx.AsyncClient) -> tuple:
+    email = f"bench-listing-{uuid.uuid4().hex[:8]}@example.com"
+    owner_id = (await client.post(f"{API}/auth/register", json={"email": email, "password": "password123"})).json()["id"]
+    response = await client.post(f"{API}/auth/login", data={"username": email, "password": "password123"})
+    return owner_id, {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+
+async def run(sizes: list, repeat: int) -> None:
+    counter = StatementCounter()
+    async with httpx.AsyncClient(app=app, base_url="http://bench") as client:
+        for size in sizes:
+            owner_id, headers = await register(client)
+            await fill(owner_id, size)
+
+            async def batched() -> int:
+                response = await client.get(f"{API}/events/", headers=headers, params={"limit": size})
+                assert response.status_code == 200, response.text
+                return len(response.json())
+
+            for label, listing in (
+                (f"GET /events, {size}", batched),
+                (f"one query per event, {size}", lambda: listing_per_event(owner_id, size)),
+            ):
+                await listing()
+                before = counter.count
+                await listing()
+                statements = counter.count - before
+                samples = []
+                for _ in range(repeat):
+                    started = time.perf_counter()
+                    await listing()
+                    samples.append((time.perf_counter() - started) * 1000)
+                print(f"{statements} statements")
+                print(summarize(label, samples))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100, 1000, 10000])
+    parser.add_argument("--repeat", type=int, default=10)
+    args = parser.parse_args()
+
+    init_db()
+    database.initialize_async_database()
+    asyncio.run(run(args.sizes, args.repeat))
+
+
+if __name__ == "__main__":
+    main()
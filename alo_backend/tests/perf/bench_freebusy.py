@@ -0,0 +1,116 @@
+"""Free/busy over a year of dense calendars.
+
+Fills ``--users`` calendars with ``--per-day`` overlapping events every day
+of a year, then times ``compute_busy`` for the whole year (uncached, with
+the owner's interval tree or range index warm) with NumPy and in plain
+Python, and a cached ``freebusy_cache.get``. The target is under 5 ms
+uncached with NumPy.
+
+    python -m tests.perf.bench_freebusy [--users 5] [--per-day 10] [--repeat 50]
+"""
+import argparse
+import asyncio
+import random
+import time
+import uuid
+from datetime import datetime, timedelta
+
+from tests.perf.common import summarize, use_database
+
+use_database()
+
+from sqlalchemy import insert, select  # noqa: E402
+
+from app.core import database, freebusy  # noqa: E402
+from app.core.database import init_db  # noqa: E402
+from app.models import Event, User  # noqa: E402
+
+YEAR = (datetime(2026, 1, 1), datetime(2027, 1, 1))
+
+
+async def fill(users: int, per_day: int) -> list:
+    rng = random.Random(16)
+    now = datetime.utcnow()
+    # Unique per run, so the script can be rerun against the same database
+    prefix = f"bench-freebusy-{uuid.uuid4().hex[:8]}-"
+    users_table = User.__table__
+    async with database.AsyncSessionLocal() as session:
+        async with session.begin():
+            await session.execute(
+                insert(users_table),
+                [{"email": f"{prefix}{i}@example.com", "hashed_password": "x"} for i in range(users)],
+            )
+            user_ids = list((await session.execute(
+                select(users_table.c.id).where(users_table.c.email.startswith(prefix)).order_by(users_table.c.id)
+            )).scalars())
+            rows = []
+            for owner_id in user_ids:
+                for day in range((YEAR[1] - YEAR[0]).days):
+                    morning = YEAR[0] + timedelta(days=day, hours=8)
+                    for _ in range(per_day):
+                        start = morning + timedelta(minutes=5 * rng.randrange(120))
+                        rows.append({
+                            "title": "busy",
+                            "start_time": start,
+                            "end_time": start + timedelta(minutes=rng.choice((15, 30, 45, 60, 90))),
+                            "owner_id": owner_id,
+                            "created_at": now,
+                            "updated_at": now,
+                        })
+            await session.execute(insert(Event.__table__), rows)
+    return user_ids
+
+
+async def time_busy(user_ids: list, repeat: int, label: str) -> None:
+    samples = []
+    async with database.AsyncSessionLocal() as session:
+        for owner_id in user_ids:
+            # Warm the owner's tree (or the range index's pages)
+            await freebusy.compute_busy(session, owner_id, *YEAR)
+            for _ in range(repeat):
+                started = time.perf_counter()
+                await freebusy.compute_busy(session, owner_id, *YEAR)
+                samples.append((time.perf_counter() - started) * 1000)
+    print(summarize(label, samples))
+
+
+async def run(users: int, per_day: int, repeat: int) -> None:
+    user_ids = await fill(users, per_day)
+    async with database.AsyncSessionLocal() as session:
+        blocks = await freebusy.compute_busy(session, user_ids[0], *YEAR)
+    print(f"{users} calendars of {per_day * 365} events each, {len(blocks)} busy blocks in the first")
+
+    numpy = freebusy.np
+    if numpy is not None:
+        await time_busy(user_ids, repeat, "compute_busy, year, NumPy")
+    freebusy.np = None
+    try:
+        await time_busy(user_ids, repeat, "compute_busy, year, Python")
+    finally:
+        freebusy.np = numpy
+
+    samples = []
+    async with database.AsyncSessionLocal() as session:
+        for owner_id in user_ids:
+            await freebusy.freebusy_cache.get(session, owner_id, *YEAR)
+            for _ in range(repeat):
+                started = time.perf_counter()
+                await freebusy.freebusy_cache.get(session, owner_id, *YEAR)
+                samples.append((time.perf_counter() - started) * 1000)
+    print(summarize("freebusy_cache.get, cached", samples))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--users", type=int, default=5)
+    parser.add_argument("--per-day", type=int, default=10)
+    parser.add_argument("--repeat", type=int, default=50)
+    args = parser.parse_args()
+
+    init_db()
+    database.initialize_async_database()
+    asyncio.run(run(args.users, args.per_day, args.repeat))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,134 @@
+"""Group availability for 50 users with 5,000 events each.
+
+Fills ``--users`` calendars with ``--events`` events in working hours over
+a year and puts them in one group with a registered caller, then times
+``group_free_windows`` over a week, a month and the year, and
+``GET /availability/group`` for the week. For each window it also reports
+the peak Python memory of one call (``tracemalloc``), which stays at about
+one streamed batch of rows however many events the window holds.
+
+    python -m tests.perf.bench_group_availability [--users 50] [--events 5000] [--repeat 20]
+"""
+import argparse
+import asyncio
+import random
+import time
+import tracemalloc
+import uuid
+from datetime import datetime, timedelta
+
+from tests.perf.common import summarize, use_database
+
+use_database()
+
+import httpx  # noqa: E402
+from sqlalchemy import insert, select  # noqa: E402
+
+from app.core import database  # noqa: E402
+from app.core.availability import group_free_windows  # noqa: E402
+from app.core.config import get_settings  # noqa: E402
+from app.core.database import init_db  # noqa: E402
+from app.main import app  # noqa: E402
+from app.models import Event, Group, User, group_members  # noqa: E402
+
+API = get_settings().API_V1_STR
+YEAR = datetime(2026, 1, 1)
+WINDOWS = {
+    "week": (datetime(2026, 3, 2), datetime(2026, 3, 9)),
+    "month": (datetime(2026, 3, 1), datetime(2026, 4, 1)),
+    "year": (YEAR, datetime(2027, 1, 1)),
+}
+
+
+async def fill(users: int, events: int, caller_id: int) -> list:
+    rng = random.Random(17)
+    now = datetime.utcnow()
+    # Unique per run, so the script can be rerun against the same database
+    prefix = f"bench-group-{uuid.uuid4().hex[:8]}-"
+    users_table = User.__table__
+    async with database.AsyncSessionLocal() as session:
+        async with session.begin():
+            await session.execute(
+                insert(users_table),
+                [{"email": f"{prefix}{i}@example.com", "hashed_password": "x"} for i in range(users)],
+            )
+            user_ids = list((await session.execute(
+                select(users_table.c.id).where(users_table.c.email.startswith(prefix)).order_by(users_table.c.id)
+            )).scalars())
+            rows = []
+            for owner_id in user_ids:
+                for _ in range(events):
+                    start = YEAR + timedelta(days=rng.randrange(365), hours=rng.randrange(8, 18), minutes=15 * rng.randrange(4))
+                    rows.append({
+                        "title": "busy",
+                        "start_time": start,
+                        "end_time": start + timedelta(minutes=rng.choice((15, 30, 60, 90))),
+                        "owner_id": owner_id,
+                        "created_at": now,
+                        "updated_at": now,
+                    })
+            await session.execute(insert(Event.__table__), rows)
+            group = Group(name=prefix)
+            session.add(group)
+            await session.flush()
+            await session.execute(
+                insert(group_members),
+                [{"group_id": group.id, "user_id": member_id} for member_id in [caller_id, *user_ids]],
+            )
+    return user_ids
+
+
+async def run(users: int, events: int, repeat: int) -> None:
+    async with httpx.AsyncClient(app=app, base_url="http://bench") as client:
+        credentials = {"email": f"bench-group-{uuid.uuid4().hex[:8]}@example.com", "password": "password123"}
+        caller_id = (await client.post(f"{API}/auth/register", json=credentials)).json()["id"]
+        response = await client.post(
+            f"{API}/auth/login", data={"username": credentials["email"], "password": credentials["password"]}
+        )
+        headers = {"Authorization": f"Bearer {response.json()['access_token']}"}
+        user_ids = await fill(users, events, caller_id)
+        member_ids = [caller_id, *user_ids]
+        print(f"{users} users x {events} events")
+
+        async with database.AsyncSessionLocal() as session:
+            for label, window in WINDOWS.items():
+                tracemalloc.start()
+                free = await group_free_windows(session, member_ids, *window)
+                peak = tracemalloc.get_traced_memory()[1]
+                tracemalloc.stop()
+                samples = []
+                for _ in range(repeat):
+                    started = time.perf_counter()
+                    await group_free_windows(session, member_ids, *window)
+                    samples.append((time.perf_counter() - started) * 1000)
+                print(f"{label}: {len(free)} free windows, peak memory {peak / 2 ** 10:.0f} KiB")
+                print(summarize(f"group_free_windows, {label}", samples))
+
+        params = {
+            "start_time": WINDOWS["week"][0].isoformat(),
+            "end_time": WINDOWS["week"][1].isoformat(),
+            "user_ids": user_ids,
+        }
+        samples = []
+        for _ in range(repeat):
+            started = time.perf_counter()
+            response = await client.get(f"{API}/availability/group", headers=headers, params=params)
+            samples.append((time.perf_counter() - started) * 1000)
+            assert response.status_code == 200, response.text
+        print(summarize("GET /availability/group, week", samples))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--users", type=int, default=50)
+    parser.add_argument("--events", type=int, default=5000)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    init_db()
+    database.initialize_async_database()
+    asyncio.run(run(args.users, args.events, args.repeat))
+
+
+if __name__ == "__main__":
+    main()
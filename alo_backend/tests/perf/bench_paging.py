@@ -0,0 +1,112 @@
+"""Deep pages of a 1M-event calendar: skip offset against keyset cursor.
+
+Fills one calendar with ``--rows`` events, then reads a page of
+``--limit`` events through ``GET /events`` at increasing depths, once with
+the legacy ``skip`` offset and once with a cursor at the same position,
+and checks both return the same rows. An offset page scans and discards
+every earlier row; a cursor page is one range scan of the
+``(owner_id, start_time)`` index.
+
+    python -m tests.perf.bench_paging [--rows 1000000] [--limit 100] [--repeat 20]
+"""
+import argparse
+import asyncio
+import time
+import uuid
+from datetime import datetime, timedelta
+
+from tests.perf.common import summarize, use_database
+
+use_database()
+
+import httpx  # noqa: E402
+from sqlalchemy import insert, select  # noqa: E402
+
+from app.core import database  # noqa: E402
+from app.core.config import get_settings  # noqa: E402
+from app.core.database import init_db  # noqa: E402
+from app.core.pagination import NEXT, encode_cursor  # noqa: E402
+from app.main import app  # noqa: E402
+from app.models import Event  # noqa: E402
+
+API = get_settings().API_V1_STR
+START = datetime(2026, 1, 1)
+CHUNK = 50_000
+
+
+async def fill(owner_id: int, rows: int) -> None:
+    now = datetime.utcnow()
+    async with database.AsyncSessionLocal() as session:
+        async with session.begin():
+            for offset in range(0, rows, CHUNK):
+                await session.execute(insert(Event.__table__), [
+                    {
+                        # Ten events share each start time, so pages split ties
+                        "title": f"event {i}",
+                        "start_time": START + timedelta(minutes=i // 10),
+                        "end_time": START + timedelta(minutes=i // 10 + 30),
+                        "owner_id": owner_id,
+                        "created_at": now,
+                        "updated_at": now,
+                    }
+                    for i in range(offset, min(offset + CHUNK, rows))
+                ])
+
+
+async def boundary(owner_id: int, depth: int) -> str:
+    """The cursor after the first ``depth`` events, as a client would hold it."""
+    events = Event.__table__
+    async with database.AsyncSessionLocal() as session:
+        row = (await session.execute(
+            select(events.c.start_time, events.c.id)
+            .where(events.c.owner_id == owner_id)
+            .order_by(events.c.start_time, events.c.id)
+            .offset(depth - 1)
+            .limit(1)
+        )).one()
+    return encode_cursor([row.start_time, row.id], NEXT)
+
+
+async def run(rows: int, limit: int, repeat: int) -> None:
+    async with httpx.AsyncClient(app=app, base_url="http://bench", timeout=None) as client:
+        email = f"bench-paging-{uuid.uuid4().hex[:8]}@example.com"
+        owner_id = (await client.post(f"{API}/auth/register", json={"email": email, "password": "password123"})).json()["id"]
+        response = await client.post(f"{API}/auth/login", data={"username": email, "password": "password123"})
+        headers = {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+        started = time.perf_counter()
+        await fill(owner_id, rows)
+        print(f"filled {rows} events in {time.perf_counter() - started:.1f} s")
+
+        async def page(params: dict) -> list:
+            response = await client.get(f"{API}/events/", headers=headers, params={"limit": limit, **params})
+            assert response.status_code == 200, response.text
+            body = response.json()
+            return [event["id"] for event in (body["items"] if "items" in body else body)]
+
+        for depth in sorted({limit, rows // 10, rows // 2, rows - limit}):
+            cursor = await boundary(owner_id, depth)
+            assert await page({"skip": depth}) == await page({"cursor": cursor})
+            for label, params in (("skip", {"skip": depth}), ("cursor", {"cursor": cursor})):
+                samples = []
+                for _ in range(repeat):
+                    started = time.perf_counter()
+                    await page(params)
+                    samples.append((time.perf_counter() - started) * 1000)
+                print(summarize(f"{label}, depth {depth}", samples))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--limit", type=int, default=100)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    init_db()
+    database.initialize_async_database()
+    asyncio.run(run(args.rows, args.limit, args.repeat))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+"""Login bursts mixed with event reads.
+
+Registers ``--users`` accounts, then fires a burst of ``--logins``
+concurrent logins while one client reads ``GET /events`` in a loop, and
+reports the read latency during the burst next to an idle baseline, and
+the logins answered 200 and 503 (pool saturated). It runs twice: with
+bcrypt on the bounded hashing pool, and with bcrypt called inline on the
+event loop, as before the pool. ``BCRYPT_ROUNDS`` sets the cost (default
+12, about 250 ms a hash); ``PASSWORD_HASH_WORKERS`` and
+``PASSWORD_HASH_QUEUE_SIZE`` size the pool.
+
+    python -m tests.perf.bench_password_hashing [--users 20] [--logins 200]
+"""
+import argparse
+import asyncio
+import time
+import uuid
+from collections import Counter
+from contextlib import contextmanager, nullcontext
+from typing import Iterator
+
+from tests.perf.common import summarize, use_database
+
+use_database()
+
+import httpx  # noqa: E402
+
+from app.core import security  # noqa: E402
+from app.core.config import get_settings  # noqa: E402
+from app.core.database import init_db  # noqa: E402
+from app.main import app  # noqa: E402
+
+API = get_settings().API_V1_STR
+
+
+@contextmanager
+def hashing_inline() -> Iterator[None]:
+    async def run(func, *args):
+        return func(*args)
+
+    security.password_hasher.run = run
+    try:
+        yield
+    finally:
+        del security.password_hasher.run
+
+
+async def read_latencies(client: httpx.AsyncClient, headers: dict, stop: asyncio.Event) -> list:
+    samples = []
+    while not stop.is_set():
+        started = time.perf_counter()
+        response = await client.get(f"{API}/events/", headers=headers)
+        samples.append((time.perf_counter() - started) * 1000)
+        assert response.status_code == 200, response.text
+        await asyncio.sleep(0.005)
+    return samples
+
+
+async def run(users: int, logins: int) -> None:
+    async with httpx.AsyncClient(app=app, base_url="http://bench", timeout=None) as client:
+        prefix = f"bench-hash-{uuid.uuid4().hex[:8]}-"
+        emails = [f"{prefix}{i}@example.com" for i in range(users)]
+        for email in emails:
+            response = await client.post(f"{API}/auth/register", json={"email": email, "password": "password123"})
+            assert response.status_code == 200, response.text
+        response = await client.post(f"{API}/auth/login", data={"username": emails[0], "password": "password123"})
+        headers = {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+        stop = asyncio.Event()
+        reader = asyncio.ensure_future(read_latencies(client, headers, stop))
+        await asyncio.sleep(1)
+        stop.set()
+        print(summarize("GET /events, idle", await reader))
+
+        for label, mode in (("pool", None), ("inline", hashing_inline)):
+            with mode() if mode else nullcontext():
+                stop = asyncio.Event()
+                reader = asyncio.ensure_future(read_latencies(client, headers, stop))
+                started = time.perf_counter()
+                responses = await asyncio.gather(*(
+                    client.post(f"{API}/auth/login", data={"username": emails[i % users], "password": "password123"})
+                    for i in range(logins)
+                ))
+                elapsed = time.perf_counter() - started
+                stop.set()
+                samples = await reader
+            statuses = Counter(response.status_code for response in responses)
+            print(f"{label}: {logins} logins in {elapsed:.2f} s, statuses {dict(sorted(statuses.items()))}")
+            print(summarize(f"GET /events, burst, {label}", samples))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--users", type=int, default=20)
+    parser.add_argument("--logins", type=int, default=200)
+    args = parser.parse_args()
+
+    init_db()
+    print(f"bcrypt rounds {security.settings.BCRYPT_ROUNDS}, {security.password_hasher.stats()}")
+    asyncio.run(run(args.users, args.logins))
+
+
+if __name__ == "__main__":
+    main()
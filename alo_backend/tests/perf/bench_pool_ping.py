@@ -0,0 +1,98 @@
+"""Per-request database overhead with and without connection pings.
+
+Before the pool health monitor, every request checked out a connection
+with ``pool_pre_ping`` and then ran ``SELECT 1`` in ``get_db`` before its
+real query. This times the shape of most requests, a session checkout and
+one primary-key lookup, both ways against the same database, and counts
+the round trips each one makes.
+
+    python -m tests.perf.bench_pool_ping [--requests 5000] [--rtt-ms 0]
+
+SQLite has no network between the app and the database; ``--rtt-ms``
+adds a simulated round trip to every statement and ping so the difference
+shows as it would against a remote PostgreSQL.
+"""
+import argparse
+import asyncio
+import time
+import uuid
+from typing import List, Tuple
+
+from tests.perf.common import summarize, use_database
+
+use_database()
+
+from sqlalchemy import event, text  # noqa: E402
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine  # noqa: E402
+from sqlalchemy.orm import sessionmaker  # noqa: E402
+from sqlalchemy.pool import AsyncAdaptedQueuePool  # noqa: E402
+
+from app.core import database  # noqa: E402
+from app.core.config import get_settings  # noqa: E402
+from app.models import User  # noqa: E402
+
+
+def seed() -> int:
+    database.init_db()
+    _, SessionLocal = database.initialize_database()
+    with SessionLocal() as db:
+        user = User(email=f"bench-{uuid.uuid4().hex}@example.com", hashed_password="x")
+        db.add(user)
+        db.commit()
+        return user.id
+
+
+async def run(ping: bool, user_id: int, requests: int, rtt: float) -> Tuple[List[float], int]:
+    """Time ``requests`` requests; returns per-request milliseconds and round trips."""
+    # A queue pool on SQLite too, so checkouts reuse connections as on PostgreSQL
+    engine = create_async_engine(
+        database.get_async_database_url(get_settings().DATABASE_URL),
+        poolclass=AsyncAdaptedQueuePool,
+        pool_pre_ping=ping,
+    )
+    round_trips = 0
+
+    def round_trip(*args: object) -> None:
+        nonlocal round_trips
+        round_trips += 1
+        if rtt:
+            time.sleep(rtt)
+
+    event.listen(engine.sync_engine, "before_cursor_execute", round_trip)
+    do_ping = engine.dialect.do_ping
+
+    def counted_ping(dbapi_connection: object) -> bool:
+        round_trip()
+        return do_ping(dbapi_connection)
+
+    engine.dialect.do_ping = counted_ping
+    Session = sessionmaker(bind=engine, class_=AsyncSession, expire_on_commit=False)
+
+    samples = []
+    for _ in range(requests):
+        started = time.perf_counter()
+        async with Session() as db:
+            if ping:
+                await db.execute(text("SELECT 1"))
+            await db.get(User, user_id)
+        samples.append((time.perf_counter() - started) * 1000)
+    await engine.dispose()
+    return samples, round_trips
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=5000)
+    parser.add_argument("--rtt-ms", type=float, default=0.0)
+    args = parser.parse_args()
+
+    user_id = seed()
+    for label, ping in (("pre-ping + SELECT 1", True), ("background monitor", False)):
+        asyncio.run(run(ping, user_id, 100, 0))  # warm up
+        samples, round_trips = asyncio.run(run(ping, user_id, args.requests, args.rtt_ms / 1000))
+        print(summarize(label, samples))
+        print(f"{'':32s} {round_trips / args.requests:.2f} round trips per request")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,130 @@
+"""Purging a deleted account of 500k rows, in chunks and in one go.
+
+Fills two accounts with ``--events`` events each, every event with a
+reminder of its owner, and every hundredth also with one of another user
+(cascaded with the event, with a tombstone). The first account is purged
+by ``PurgeJob`` in chunks of ``--batch-size`` rows, one transaction each;
+the second with one DELETE per table in a single transaction, as a
+purge without chunks would. Reports the total time, the rows deleted per
+second and the latency of each chunk, which is how long a purge holds its
+locks and its connection at a time.
+
+    python -m tests.perf.bench_purge [--events 250000] [--batch-size 5000]
+"""
+import argparse
+import asyncio
+import time
+import uuid
+from datetime import datetime, timedelta
+
+from tests.perf.common import summarize, use_database
+
+use_database()
+
+from sqlalchemy import delete, insert, select  # noqa: E402
+
+from app.core import database  # noqa: E402
+from app.core.database import init_db  # noqa: E402
+from app.core.purge import PurgeJob  # noqa: E402
+from app.models import Event, Reminder, ReminderStatus, ReminderType, User  # noqa: E402
+
+CHUNK = 50_000
+events, reminders, users = Event.__table__, Reminder.__table__, User.__table__
+
+
+async def create_user(session, label: str) -> int:
+    email = f"bench-purge-{label}-{uuid.uuid4().hex[:8]}@example.com"
+    await session.execute(insert(users), [{"email": email, "hashed_password": "x"}])
+    return (await session.execute(select(users.c.id).where(users.c.email == email))).scalar_one()
+
+
+def reminder(event_id: int, owner_id: int, at: datetime) -> dict:
+    return {
+        "message": "m",
+        "reminder_time": at,
+        "reminder_type": ReminderType.IN_APP,
+        "status": ReminderStatus.PENDING,
+        "event_id": event_id,
+        "owner_id": owner_id,
+        "created_at": at,
+        "updated_at": at,
+    }
+
+
+async def fill(count: int) -> tuple:
+    now = datetime.utcnow()
+    async with database.AsyncSessionLocal() as session:
+        async with session.begin():
+            other_id = await create_user(session, "other")
+            owner_ids = [await create_user(session, "chunked"), await create_user(session, "single")]
+            for owner_id in owner_ids:
+                for offset in range(0, count, CHUNK):
+                    await session.execute(insert(events), [
+                        {
+                            "title": f"event {i}",
+                            "start_time": now + timedelta(hours=i),
+                            "end_time": now + timedelta(hours=i, minutes=30),
+                            "owner_id": owner_id,
+                            "created_at": now,
+                            "updated_at": now,
+                        }
+                        for i in range(offset, min(offset + CHUNK, count))
+                    ])
+                event_ids = (await session.execute(
+                    select(events.c.id).where(events.c.owner_id == owner_id).order_by(events.c.id)
+                )).scalars().all()
+                for offset in range(0, count, CHUNK):
+                    chunk = event_ids[offset:offset + CHUNK]
+                    await session.execute(insert(reminders), [reminder(event_id, owner_id, now) for event_id in chunk])
+                    await session.execute(insert(reminders), [reminder(event_id, other_id, now) for event_id in chunk[::100]])
+    return owner_ids
+
+
+async def run(count: int, batch_size: int) -> None:
+    started = time.perf_counter()
+    chunked_id, single_id = await fill(count)
+    rows = 2 * count + count // 100
+    print(f"filled 2 accounts of {rows} rows in {time.perf_counter() - started:.1f} s")
+
+    job = PurgeJob(batch_size=batch_size)
+    samples = []
+    delete_chunk = job._delete_chunk
+
+    async def timed_chunk(table, owner_id):
+        chunk_started = time.perf_counter()
+        deleted = await delete_chunk(table, owner_id)
+        if deleted:
+            samples.append((time.perf_counter() - chunk_started) * 1000)
+        return deleted
+
+    job._delete_chunk = timed_chunk
+    started = time.perf_counter()
+    purged = await job.purge_user(chunked_id)
+    elapsed = time.perf_counter() - started
+    print(f"chunked: {purged}, {job.counters['foreign_reminders']} cascaded reminders with tombstones")
+    print(f"chunked: {elapsed:.1f} s, {rows / elapsed:,.0f} rows/s, {len(samples)} chunks of {batch_size}")
+    print(summarize("chunk (one transaction)", samples))
+
+    started = time.perf_counter()
+    async with database.AsyncSessionLocal() as session:
+        async with session.begin():
+            await session.execute(delete(reminders).where(reminders.c.owner_id == single_id))
+            await session.execute(delete(events).where(events.c.owner_id == single_id))
+            await session.execute(delete(users).where(users.c.id == single_id))
+    elapsed = time.perf_counter() - started
+    print(f"one transaction: {elapsed:.1f} s, {rows / elapsed:,.0f} rows/s, locks held throughout")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--events", type=int, default=250_000)
+    parser.add_argument("--batch-size", type=int, default=5000)
+    args = parser.parse_args()
+
+    init_db()
+    database.initialize_async_database()
+    asyncio.run(run(args.events, args.batch_size))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,159 @@
+"""Ten thousand idle push connections on one worker.
+
+Opens ``--connections`` Server-Sent Events streams and WebSockets, half
+each, for ``--users`` users through the ASGI app, then reports:
+
+- the time to open them, and the database connections they hold once
+  open, counted by pool checkout and checkin events (none: authentication
+  closes its session before the stream starts);
+- the memory an idle connection costs, from tracemalloc, and the CPU the
+  worker spends while ``--idle`` seconds pass with nothing to send;
+- the latency of one change per user reaching every connection;
+- that every subscription is gone once the clients disconnect.
+
+Connections are in process, without sockets, so the numbers are the
+app's own cost per connection, not the server's.
+
+    python -m tests.perf.bench_push_connections [--connections 10000] [--users 1000] [--idle 5]
+"""
+import argparse
+import asyncio
+import time
+import tracemalloc
+import uuid
+from collections import Counter
+
+from tests.perf.common import summarize, use_database
+
+use_database()
+
+from sqlalchemy import event, insert, select  # noqa: E402
+
+from app.core import database  # noqa: E402
+from app.core.config import get_settings  # noqa: E402
+from app.core.database import init_db  # noqa: E402
+from app.core.push import push_hub  # noqa: E402
+from app.core.security import create_access_token  # noqa: E402
+from app.main import app  # noqa: E402
+from app.models import User  # noqa: E402
+
+API = get_settings().API_V1_STR
+
+
+class Connection:
+    """One ASGI connection to the app, open until the client disconnects."""
+
+    def __init__(self, websocket: bool, token: str) -> None:
+        path = f"{API}/push/ws" if websocket else f"{API}/push/sse"
+        self.websocket = websocket
+        scope = {
+            "type": "websocket" if websocket else "http",
+            "asgi": {"version": "3.0"},
+            "http_version": "1.1",
+            "method": "GET",
+            "scheme": "ws" if websocket else "http",
+            "path": path,
+            "raw_path": path.encode(),
+            "query_string": f"access_token={token}".encode(),
+            "root_path": "",
+            "headers": [(b"host", b"bench")],
+            "client": ("127.0.0.1", 50000),
+            "server": ("bench", 80),
+            "subprotocols": [],
+        }
+        self.inbox: asyncio.Queue = asyncio.Queue()
+        self.outbox: asyncio.Queue = asyncio.Queue()
+        self.inbox.put_nowait({"type": "websocket.connect"} if websocket else {"type": "http.request", "body": b""})
+        self.task = asyncio.ensure_future(app(scope, self.inbox.get, self.outbox.put))
+
+    async def opened(self) -> None:
+        message = await self.outbox.get()
+        assert message["type"] in ("websocket.accept", "http.response.start"), message
+
+    async def received(self) -> None:
+        while True:
+            message = await self.outbox.get()
+            if message.get("text") or message.get("body", b"").startswith(b"data: "):
+                return
+
+    def disconnect(self) -> None:
+        self.inbox.put_nowait({"type": "websocket.disconnect", "code": 1000} if self.websocket else {"type": "http.disconnect"})
+
+
+async def create_users(count: int) -> list:
+    prefix = f"bench-push-{uuid.uuid4().hex[:8]}"
+    users = User.__table__
+    async with database.AsyncSessionLocal() as session:
+        async with session.begin():
+            await session.execute(insert(users), [
+                {"email": f"{prefix}-{i}@example.com", "hashed_password": "x"} for i in range(count)
+            ])
+            return (await session.execute(
+                select(users.c.id).where(users.c.email.like(f"{prefix}-%")).order_by(users.c.id)
+            )).scalars().all()
+
+
+async def run(count: int, user_count: int, idle: float) -> None:
+    user_ids = await create_users(user_count)
+    tokens = {user_id: create_access_token(user_id) for user_id in user_ids}
+    pool = database.async_engine.sync_engine.pool
+    checkouts = Counter()
+    event.listen(pool, "checkout", lambda *args: checkouts.update(["out"]))
+    event.listen(pool, "checkin", lambda *args: checkouts.update(["in"]))
+
+    tracemalloc.start()
+    baseline = tracemalloc.get_traced_memory()[0]
+    started = time.perf_counter()
+    connections = []
+    samples = []
+    for i in range(count):
+        user_id = user_ids[i % user_count]
+        opened = time.perf_counter()
+        connection = Connection(websocket=i % 2 == 1, token=tokens[user_id])
+        await connection.opened()
+        samples.append((time.perf_counter() - opened) * 1000)
+        connections.append((user_id, connection))
+    elapsed = time.perf_counter() - started
+    # Let every stream reach its wait for a message
+    await asyncio.sleep(0.5)
+    memory = tracemalloc.get_traced_memory()[0] - baseline
+    tracemalloc.stop()
+    print(f"opened {count} connections for {user_count} users in {elapsed:.1f} s")
+    print(summarize("open a connection", samples))
+    print(f"hub: {push_hub.stats()['open_connections']} open, {push_hub.stats()['users']} users")
+    print(f"database connections held: {checkouts['out'] - checkouts['in']} ({checkouts['out']} checkouts while opening)")
+    print(f"memory per idle connection: {memory / count / 1024:.1f} KiB ({memory / 2 ** 20:.1f} MiB in all)")
+
+    cpu = time.process_time()
+    await asyncio.sleep(idle)
+    print(f"CPU while idle for {idle:.0f} s: {(time.process_time() - cpu) * 1000:.1f} ms")
+
+    started = time.perf_counter()
+    push_hub.publish([(user_id, "event", "updated", 1) for user_id in user_ids])
+    await asyncio.gather(*(connection.received() for _, connection in connections))
+    print(f"one change per user reached all {count} connections in {(time.perf_counter() - started) * 1000:.1f} ms")
+
+    started = time.perf_counter()
+    for _, connection in connections:
+        connection.disconnect()
+    await asyncio.gather(*(connection.task for _, connection in connections))
+    print(
+        f"closed in {(time.perf_counter() - started) * 1000:.0f} ms, "
+        f"{push_hub.stats()['open_connections']} subscriptions left"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--connections", type=int, default=10_000)
+    parser.add_argument("--users", type=int, default=1000)
+    parser.add_argument("--idle", type=float, default=5.0)
+    args = parser.parse_args()
+
+    init_db()
+    database.initialize_async_database()
+    asyncio.run(run(args.connections, args.users, args.idle))
+
+
+if __name__ == "__main__":
+    main()
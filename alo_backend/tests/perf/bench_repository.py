@@ -0,0 +1,169 @@
+"""Statement cache hit rates and CPU time of owner-scoped row access.
+
+Two measurements, both after a warm-up round:
+
+- Lookups by id in one session, ``--calls`` each: the repository's
+  prebuilt statement, the same statement built anew per call (what the
+  endpoints did before), and the ORM load followed by an owner comparison
+  in Python.
+- Whole requests through the ASGI app, ``--requests`` each: reading,
+  updating and deleting events and reminders.
+
+Every statement executed is classified by SQLAlchemy's compiled cache
+(``ExecutionContext.cache_hit``): a hit, a miss that compiled it, or not
+cacheable. CPU time is ``time.process_time`` per call, which includes the
+driver and, for requests, routing and serialization.
+
+    python -m tests.perf.bench_repository [--calls 5000] [--requests 500]
+"""
+import argparse
+import asyncio
+import time
+import uuid
+from collections import Counter
+from types import SimpleNamespace
+
+from tests.perf.common import summarize, use_database
+
+use_database()
+
+import httpx  # noqa: E402
+from sqlalchemy import and_, event, select  # noqa: E402
+from sqlalchemy.engine import default  # noqa: E402
+
+from app.core import database  # noqa: E402
+from app.core.config import get_settings  # noqa: E402
+from app.core.database import init_db  # noqa: E402
+from app.core.repository import event_repository  # noqa: E402
+from app.main import app  # noqa: E402
+from app.models import Event  # noqa: E402
+
+API = get_settings().API_V1_STR
+EVENT = {"title": "t", "start_time": "2026-08-01T09:00:00Z", "end_time": "2026-08-01T10:00:00Z"}
+OUTCOMES = {
+    default.CACHE_HIT: "hit",
+    default.CACHE_MISS: "miss",
+    default.CACHING_DISABLED: "disabled",
+    default.NO_CACHE_KEY: "no key",
+    default.NO_DIALECT_SUPPORT: "no key",
+}
+events = Event.__table__
+
+
+class CacheStats:
+    def __init__(self) -> None:
+        self.outcomes: Counter = Counter()
+
+    def listen(self, engine) -> None:
+        event.listen(engine, "after_cursor_execute", self._executed)
+
+    def _executed(self, conn, cursor, statement, parameters, context, executemany) -> None:
+        self.outcomes[OUTCOMES.get(context.cache_hit, "no key")] += 1
+
+    def take(self) -> str:
+        total = sum(self.outcomes.values())
+        report = ", ".join(f"{name} {count / total:6.1%}" for name, count in sorted(self.outcomes.items()))
+        self.outcomes.clear()
+        return f"{total} statements: {report}"
+
+
+async def register(client: httpx.AsyncClient) -> dict:
+    email = f"bench-repository-{uuid.uuid4().hex[:8]}@example.com"
+    await client.post(f"{API}/auth/register", json={"email": email, "password": "password123"})
+    response = await client.post(f"{API}/auth/login", data={"username": email, "password": "password123"})
+    return {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+
+async def time_lookups(stats: CacheStats, event_id: int, owner_id: int, calls: int) -> None:
+    user = SimpleNamespace(id=owner_id, is_superuser=False)
+
+    async def prebuilt(session):
+        await event_repository.get(session, event_id, user)
+
+    async def built_per_call(session):
+        statement = select(events).where(and_(events.c.id == event_id, events.c.owner_id == owner_id))
+        (await session.execute(statement)).mappings().first()
+
+    async def orm_then_compare(session):
+        row = (await session.execute(select(Event).filter(Event.id == event_id))).scalars().first()
+        assert row.owner_id == owner_id
+        session.expunge_all()
+
+    async with database.AsyncSessionLocal() as session:
+        for label, lookup in (
+            ("repository statement", prebuilt),
+            ("statement built per call", built_per_call),
+            ("ORM load, owner compared", orm_then_compare),
+        ):
+            for _ in range(100):
+                await lookup(session)
+            stats.take()
+            samples = []
+            for _ in range(calls):
+                started = time.process_time()
+                await lookup(session)
+                samples.append((time.process_time() - started) * 1000)
+            print(f"{label}: {stats.take()}")
+            print(summarize(f"{label}, CPU", samples))
+
+
+async def time_requests(stats: CacheStats, requests: int) -> None:
+    async with httpx.AsyncClient(app=app, base_url="http://bench", timeout=None) as client:
+        headers = await register(client)
+
+        async def call(method: str, path: str, expected: int, **kwargs) -> dict:
+            response = await client.request(method, f"{API}/{path}", headers=headers, **kwargs)
+            assert response.status_code == expected, response.text
+            return response.json()
+
+        async def round_of_requests(samples: dict) -> None:
+            async def timed(label: str, *args, **kwargs) -> dict:
+                started = time.process_time()
+                body = await call(*args, **kwargs)
+                samples.setdefault(label, []).append((time.process_time() - started) * 1000)
+                return body
+
+            event_id = (await call("POST", "events/", 201, json=EVENT))["id"]
+            reminder_id = (await call("POST", "reminders/", 201, json={
+                "message": "m", "reminder_time": "2026-08-01T08:45:00Z", "reminder_type": "in_app", "event_id": event_id,
+            }))["id"]
+            await timed("GET /events/{id}", "GET", f"events/{event_id}", 200)
+            await timed("PUT /events/{id}", "PUT", f"events/{event_id}", 200, json={"title": "renamed"})
+            await timed("GET /reminders/{id}", "GET", f"reminders/{reminder_id}", 200)
+            await timed("PUT /reminders/{id}", "PUT", f"reminders/{reminder_id}", 200, json={"status": "sent"})
+            await timed("DELETE /events/{id}", "DELETE", f"events/{event_id}", 200)
+
+        for _ in range(20):
+            await round_of_requests({})
+        stats.take()
+        samples: dict = {}
+        for _ in range(requests):
+            await round_of_requests(samples)
+        print(f"requests: {stats.take()}")
+        for label, values in samples.items():
+            print(summarize(f"{label}, CPU", values))
+
+
+async def run(calls: int, requests: int) -> None:
+    stats = CacheStats()
+    stats.listen(database.async_engine.sync_engine)
+    async with httpx.AsyncClient(app=app, base_url="http://bench", timeout=None) as client:
+        headers = await register(client)
+        created = (await client.post(f"{API}/events/", headers=headers, json=EVENT)).json()
+    await time_lookups(stats, created["id"], created["owner_id"], calls)
+    await time_requests(stats, requests)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--calls", type=int, default=5000)
+    parser.add_argument("--requests", type=int, default=500)
+    args = parser.parse_args()
+
+    init_db()
+    database.initialize_async_database()
+    asyncio.run(run(args.calls, args.requests))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,140 @@
+"""Retry sweeps over 100k failing reminders.
+
+Fills ``--reminders`` due reminders whose delivery always fails and runs
+them through ``max_attempts`` (3) rounds: the first attempt, then retries
+until every reminder is dead-lettered, making the retries due between
+rounds, a quarter of them first. Reports the batch latency of each round
+and the cost of a retry sweep that finds nothing due among 100k FAILED
+reminders, and on SQLite the plan of the claim. The sweep reads the
+``ix_reminders_failed_next_attempt_at`` partial index up to the first row
+not yet due, so its cost follows the batch size, not the FAILED count.
+
+    python -m tests.perf.bench_retries [--reminders 100000] [--batch-size 500]
+"""
+import argparse
+import asyncio
+import time
+import uuid
+from datetime import datetime, timedelta
+
+from tests.perf.common import summarize, use_database
+
+use_database()
+
+from sqlalchemy import func, insert, select, text, update  # noqa: E402
+
+from app.core import database  # noqa: E402
+from app.core.database import init_db  # noqa: E402
+from app.core.dispatcher import ReminderDispatcher  # noqa: E402
+from app.models import Reminder, ReminderStatus, ReminderType, User  # noqa: E402
+
+CHUNK = 50_000
+reminders = Reminder.__table__
+
+
+async def fill(count: int) -> None:
+    now = datetime.utcnow()
+    users_table = User.__table__
+    email = f"bench-retries-{uuid.uuid4().hex[:8]}@example.com"
+    async with database.AsyncSessionLocal() as session:
+        async with session.begin():
+            await session.execute(insert(users_table), [{"email": email, "hashed_password": "x"}])
+            owner_id = (await session.execute(select(users_table.c.id).where(users_table.c.email == email))).scalar_one()
+            for offset in range(0, count, CHUNK):
+                await session.execute(insert(reminders), [
+                    {
+                        "message": f"failing {i}",
+                        "reminder_time": now - timedelta(seconds=i % 3600),
+                        "reminder_type": ReminderType.SMS,
+                        "status": ReminderStatus.PENDING,
+                        "owner_id": owner_id,
+                        "created_at": now,
+                        "updated_at": now,
+                    }
+                    for i in range(offset, min(offset + CHUNK, count))
+                ])
+
+
+async def make_due(attempts: int, limit: int) -> None:
+    """Make up to ``limit`` of the reminders that failed ``attempts`` times due."""
+    async with database.AsyncSessionLocal() as session:
+        async with session.begin():
+            ids = (
+                select(reminders.c.id)
+                .where(reminders.c.status == ReminderStatus.FAILED)
+                .where(reminders.c.attempts == attempts)
+                .order_by(reminders.c.id)
+            )
+            await session.execute(
+                update(reminders)
+                .where(reminders.c.id.in_(ids.limit(limit).scalar_subquery()))
+                .values(next_attempt_at=datetime.utcnow() - timedelta(seconds=1))
+            )
+
+
+async def counts() -> dict:
+    async with database.AsyncSessionLocal() as session:
+        rows = await session.execute(select(reminders.c.status, func.count()).group_by(reminders.c.status))
+        return {status.value: count for status, count in rows}
+
+
+async def drain(dispatcher: ReminderDispatcher, retry: bool, label: str) -> None:
+    samples = []
+    started = time.perf_counter()
+    while True:
+        batch_started = time.perf_counter()
+        if not await dispatcher.dispatch_batch(ReminderType.SMS, retry=retry):
+            break
+        samples.append((time.perf_counter() - batch_started) * 1000)
+    print(f"{label}: {len(samples)} batches in {time.perf_counter() - started:.1f} s, now {await counts()}")
+    print(summarize(label, samples))
+
+
+async def time_empty_sweeps(dispatcher: ReminderDispatcher, label: str, repeat: int = 50) -> None:
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        assert await dispatcher.dispatch_batch(ReminderType.SMS, retry=True) == 0
+        samples.append((time.perf_counter() - started) * 1000)
+    print(summarize(label, samples))
+
+
+async def run(count: int, batch_size: int) -> None:
+    async def deliver(batch):
+        return []
+
+    await fill(count)
+    dispatcher = ReminderDispatcher(batch_size=batch_size, max_attempts=3, deliver=deliver, channels=[ReminderType.SMS])
+
+    await drain(dispatcher, retry=False, label="attempt 1")
+    await time_empty_sweeps(dispatcher, f"empty sweep, {count} FAILED")
+    if database.async_engine.dialect.name == "sqlite":
+        async with database.AsyncSessionLocal() as session:
+            plan = await session.execute(text(
+                "EXPLAIN QUERY PLAN SELECT id FROM reminders WHERE status = 'FAILED' "
+                "AND next_attempt_at <= :now ORDER BY next_attempt_at LIMIT :limit"
+            ), {"now": datetime.utcnow(), "limit": batch_size})
+            print("claim plan:", "; ".join(row[-1] for row in plan))
+
+    await make_due(1, count // 4)
+    await drain(dispatcher, retry=True, label="attempt 2, a quarter due")
+    await make_due(1, count)
+    await drain(dispatcher, retry=True, label="attempt 2, the rest")
+    await make_due(2, count)
+    await drain(dispatcher, retry=True, label="attempt 3, dead letter")
+    print(dispatcher.counters)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--reminders", type=int, default=100_000)
+    parser.add_argument("--batch-size", type=int, default=500)
+    args = parser.parse_args()
+
+    init_db()
+    database.initialize_async_database()
+    asyncio.run(run(args.reminders, args.batch_size))
+
+
+if __name__ == "__main__":
+    main()
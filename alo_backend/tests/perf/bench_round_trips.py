@@ -0,0 +1,113 @@
+"""Statements per write request and their latency.
+
+Runs every single-row write endpoint ``--repeat`` times through the ASGI
+app and counts the statements each request sends, with a
+``before_cursor_execute`` listener, and its commits. Authentication is
+served by the token and user caches after the first request, so the counts
+are the endpoint's own. Writes refused with 403 or 404 are counted too:
+they cost the failed write and one lookup by id.
+
+On SQLite, where SQLAlchemy 1.4 has no RETURNING, a write runs one more
+SELECT than on PostgreSQL.
+
+    python -m tests.perf.bench_round_trips [--repeat 200]
+"""
+import argparse
+import asyncio
+import time
+import uuid
+from collections import defaultdict
+
+from tests.perf.common import summarize, use_database
+
+use_database()
+
+import httpx  # noqa: E402
+from sqlalchemy import event  # noqa: E402
+
+from app.core import database  # noqa: E402
+from app.core.config import get_settings  # noqa: E402
+from app.core.database import init_db  # noqa: E402
+from app.main import app  # noqa: E402
+
+API = get_settings().API_V1_STR
+EVENT = {"title": "t", "start_time": "2026-08-01T09:00:00Z", "end_time": "2026-08-01T10:00:00Z"}
+
+
+class Counter:
+    def __init__(self) -> None:
+        self.statements = self.commits = 0
+
+    def listen(self, engine) -> None:
+        event.listen(engine, "before_cursor_execute", self._statement)
+        event.listen(engine, "commit", self._commit)
+
+    def _statement(self, *args) -> None:
+        self.statements += 1
+
+    def _commit(self, *args) -> None:
+        self.commits += 1
+
+
+async def register(client: httpx.AsyncClient) -> dict:
+    email = f"bench-round-trips-{uuid.uuid4().hex[:8]}@example.com"
+    await client.post(f"{API}/auth/register", json={"email": email, "password": "password123"})
+    response = await client.post(f"{API}/auth/login", data={"username": email, "password": "password123"})
+    return {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+
+async def run(repeat: int) -> None:
+    counter = Counter()
+    counter.listen(database.async_engine.sync_engine)
+    counts = defaultdict(list)
+    samples = defaultdict(list)
+
+    async with httpx.AsyncClient(app=app, base_url="http://bench", timeout=None) as client:
+        headers, other_headers = await register(client), await register(client)
+        foreign = (await client.post(f"{API}/events/", headers=other_headers, json=EVENT)).json()["id"]
+        # Warms the token and user caches
+        await client.get(f"{API}/users/me", headers=headers)
+
+        async def measure(label: str, expected: int, method: str, path: str, **kwargs) -> dict:
+            statements, commits = counter.statements, counter.commits
+            started = time.perf_counter()
+            response = await client.request(method, f"{API}/{path}", headers=headers, **kwargs)
+            samples[label].append((time.perf_counter() - started) * 1000)
+            assert response.status_code == expected, response.text
+            counts[label].append((counter.statements - statements, counter.commits - commits))
+            return response.json()
+
+        for _ in range(repeat):
+            event_id = (await measure("create event", 201, "POST", "events/", json=EVENT))["id"]
+            await measure("update event", 200, "PUT", f"events/{event_id}", json={"title": "renamed"})
+            reminder_id = (await measure("create reminder", 201, "POST", "reminders/", json={
+                "message": "m", "reminder_time": "2026-08-01T08:45:00Z", "reminder_type": "in_app", "event_id": event_id,
+            }))["id"]
+            await measure("update reminder", 200, "PUT", f"reminders/{reminder_id}", json={"status": "sent"})
+            await measure("delete reminder", 200, "DELETE", f"reminders/{reminder_id}")
+            await measure("delete event", 200, "DELETE", f"events/{event_id}")
+            await measure("update me", 200, "PUT", "users/me", json={"full_name": "bench"})
+            await measure("update foreign event", 403, "PUT", f"events/{foreign}", json={"title": "x"})
+            await measure("update missing event", 404, "PUT", f"events/{event_id}", json={"title": "x"})
+
+    print(f"{database.async_engine.dialect.name}, {repeat} requests each")
+    for label, per_request in counts.items():
+        statements = sorted({count for count, _ in per_request})
+        commits = sorted({count for _, count in per_request})
+        print(f"{label:22s} statements {statements}  commits {commits}")
+    for label, values in samples.items():
+        print(summarize(label, values))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args()
+
+    init_db()
+    database.initialize_async_database()
+    asyncio.run(run(args.repeat))
+
+
+if __name__ == "__main__":
+    main()
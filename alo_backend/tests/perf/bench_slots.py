@@ -0,0 +1,113 @@
+"""Slot suggestions over 30 days of a busy calendar.
+
+Fills ``--users`` calendars with ``--per-day`` events in working hours every
+day of a year, then times the top 10 one-hour ``suggest_slots`` over 30 days
+with NumPy and in plain Python, with the free/busy blocks cached (the usual
+case) and uncached (the owner's interval tree or range index warm). The
+target is single-digit milliseconds.
+
+    python -m tests.perf.bench_slots [--users 5] [--per-day 8] [--repeat 50]
+"""
+import argparse
+import asyncio
+import random
+import time
+import uuid
+from datetime import datetime, timedelta
+
+from tests.perf.common import summarize, use_database
+
+use_database()
+
+from sqlalchemy import insert, select  # noqa: E402
+
+from app.core import database, slots  # noqa: E402
+from app.core.database import init_db  # noqa: E402
+from app.core.freebusy import freebusy_cache  # noqa: E402
+from app.models import Event, User  # noqa: E402
+
+YEAR = datetime(2026, 1, 1)
+WINDOW = (datetime(2026, 3, 2), datetime(2026, 4, 1))
+DURATION = timedelta(hours=1)
+
+
+async def fill(users: int, per_day: int) -> list:
+    rng = random.Random(18)
+    now = datetime.utcnow()
+    # Unique per run, so the script can be rerun against the same database
+    prefix = f"bench-slots-{uuid.uuid4().hex[:8]}-"
+    users_table = User.__table__
+    async with database.AsyncSessionLocal() as session:
+        async with session.begin():
+            await session.execute(
+                insert(users_table),
+                [{"email": f"{prefix}{i}@example.com", "hashed_password": "x"} for i in range(users)],
+            )
+            user_ids = list((await session.execute(
+                select(users_table.c.id).where(users_table.c.email.startswith(prefix)).order_by(users_table.c.id)
+            )).scalars())
+            rows = []
+            for owner_id in user_ids:
+                for day in range(365):
+                    morning = YEAR + timedelta(days=day, hours=8)
+                    for _ in range(per_day):
+                        start = morning + timedelta(minutes=15 * rng.randrange(40))
+                        rows.append({
+                            "title": "busy",
+                            "start_time": start,
+                            "end_time": start + timedelta(minutes=rng.choice((15, 30, 45, 60))),
+                            "owner_id": owner_id,
+                            "created_at": now,
+                            "updated_at": now,
+                        })
+            await session.execute(insert(Event.__table__), rows)
+    return user_ids
+
+
+async def time_slots(user_ids: list, repeat: int, cached: bool) -> list:
+    samples = []
+    async with database.AsyncSessionLocal() as session:
+        for owner_id in user_ids:
+            # Warm the owner's tree (or the range index's pages)
+            await slots.suggest_slots(session, owner_id, *WINDOW, DURATION)
+            for _ in range(repeat):
+                if not cached:
+                    freebusy_cache.discard(owner_id)
+                started = time.perf_counter()
+                await slots.suggest_slots(session, owner_id, *WINDOW, DURATION)
+                samples.append((time.perf_counter() - started) * 1000)
+    return samples
+
+
+async def run(users: int, per_day: int, repeat: int) -> None:
+    user_ids = await fill(users, per_day)
+    async with database.AsyncSessionLocal() as session:
+        found = await slots.suggest_slots(session, user_ids[0], *WINDOW, DURATION)
+    print(f"{users} calendars of {per_day * 365} events each, {len(found)} slots in the first")
+
+    numpy = slots.np
+    modes = [("NumPy", numpy)] if numpy is not None else []
+    for label, module in modes + [("Python", None)]:
+        slots.np = module
+        try:
+            for cached in (True, False):
+                samples = await time_slots(user_ids, repeat, cached)
+                print(summarize(f"suggest_slots, 30 days, {label}, {'cached' if cached else 'uncached'}", samples))
+        finally:
+            slots.np = numpy
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--users", type=int, default=5)
+    parser.add_argument("--per-day", type=int, default=8)
+    parser.add_argument("--repeat", type=int, default=50)
+    args = parser.parse_args()
+
+    init_db()
+    database.initialize_async_database()
+    asyncio.run(run(args.users, args.per_day, args.repeat))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,53 @@
+"""Helpers shared by the benchmark scripts in this package.
+
+The scripts are not collected by pytest; run them from ``alo_backend`` as
+``python -m tests.perf.<script>``. They use a temporary SQLite database
+unless ``DATABASE_URL`` is set, so point that at PostgreSQL for numbers
+that match production.
+"""
+import atexit
+import os
+import statistics
+import tempfile
+import time
+from typing import Callable, List, Sequence
+
+
+def use_database() -> str:
+    """Point ``DATABASE_URL`` at a fresh SQLite file unless it is already set.
+
+    Call before importing anything from ``app``: settings are read at import.
+    Background jobs are turned off so they do not skew the measurements.
+    """
+    if "DATABASE_URL" not in os.environ:
+        fd, path = tempfile.mkstemp(prefix="alo-bench-", suffix=".db")
+        os.close(fd)
+        atexit.register(os.remove, path)
+        os.environ["DATABASE_URL"] = f"sqlite:///{path}"
+    for setting in ("REMINDER_DISPATCHER_ENABLED", "ARCHIVE_ENABLED", "PURGE_ENABLED"):
+        os.environ.setdefault(setting, "false")
+    return os.environ["DATABASE_URL"]
+
+
+def time_calls(fn: Callable[[], object], repeat: int) -> List[float]:
+    """Call ``fn`` ``repeat`` times and return each call's duration in milliseconds."""
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - started) * 1000)
+    return samples
+
+
+def summarize(label: str, samples_ms: Sequence[float]) -> str:
+    """Format the median, p95, p99 and mean of ``samples_ms``."""
+    ordered = sorted(samples_ms)
+
+    def percentile(p: float) -> float:
+        return ordered[min(len(ordered) - 1, int(len(ordered) * p))]
+
+    return (
+        f"{label:32s} n={len(ordered):6d}  p50={percentile(0.50):8.3f} ms  "
+        f"p95={percentile(0.95):8.3f} ms  p99={percentile(0.99):8.3f} ms  "
+        f"mean={statistics.fmean(ordered):8.3f} ms"
+    )
@@ -0,0 +1,30 @@
+from datetime import datetime, timedelta
+
+from app.core.archive import ArchiveJob
+
+from .conftest import API
+
+
+async def test_archiving_drops_cached_conflicts_and_busy_blocks(client, auth_headers):
+    start = datetime.utcnow().replace(microsecond=0) - timedelta(days=400)
+    window = {"start_time": start.isoformat(), "end_time": (start + timedelta(days=1)).isoformat()}
+    response = await client.post(
+        f"{API}/events/",
+        headers=auth_headers,
+        json={"title": "old", "start_time": start.isoformat(), "end_time": (start + timedelta(hours=1)).isoformat()},
+    )
+    assert response.status_code == 201, response.text
+    event_id = response.json()["id"]
+
+    # Build the owner's conflict tree and cache the free/busy window
+    conflicts = await client.get(f"{API}/events/conflicts", headers=auth_headers, params=window)
+    assert [event["id"] for event in conflicts.json()] == [event_id]
+    busy = await client.get(f"{API}/events/freebusy", headers=auth_headers, params=window)
+    assert len(busy.json()["busy"]) == 1
+
+    assert (await ArchiveJob(after_days=365).run_once())["events"] >= 1
+
+    conflicts = await client.get(f"{API}/events/conflicts", headers=auth_headers, params=window)
+    assert conflicts.json() == []
+    busy = await client.get(f"{API}/events/freebusy", headers=auth_headers, params=window)
+    assert busy.json()["busy"] == []
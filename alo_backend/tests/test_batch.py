@@ -0,0 +1,133 @@
+from .conftest import API, create_user
+
+EVENT = {"title": "t", "start_time": "2026-07-01T09:00:00Z", "end_time": "2026-07-01T10:00:00Z"}
+
+
+async def create_event(client, headers, **values):
+    response = await client.post(f"{API}/events/", headers=headers, json={**EVENT, **values})
+    assert response.status_code == 201, response.text
+    return response.json()["id"]
+
+
+async def titles(client, headers, *event_ids):
+    return [(await client.get(f"{API}/events/{event_id}", headers=headers)).json()["title"] for event_id in event_ids]
+
+
+async def test_atomic_batch_with_a_failing_item_writes_nothing(client, auth_headers):
+    event_id = await create_event(client, auth_headers)
+
+    response = await client.post(f"{API}/events:batch", headers=auth_headers, json={"items": [
+        {"op": "update", "id": event_id, "data": {"title": "renamed"}},
+        {"op": "create", "data": {**EVENT, "title": "new"}},
+        {"op": "update", "id": event_id + 10_000, "data": {"title": "missing"}},
+    ]})
+    assert response.status_code == 400, response.text
+    assert [(result["status"], result["error"]) for result in response.json()["results"]] == [
+        (424, "Not applied: another item failed"),
+        (424, "Not applied: another item failed"),
+        (404, "Event not found"),
+    ]
+    assert await titles(client, auth_headers, event_id) == ["t"]
+    response = await client.get(f"{API}/events/", headers=auth_headers)
+    assert [event["title"] for event in response.json()] == ["t"]
+
+
+async def test_best_effort_batch_reports_each_item_like_a_single_call(client, auth_headers):
+    own, deleted = await create_event(client, auth_headers), await create_event(client, auth_headers)
+    other_headers = await create_user(client)
+    foreign = await create_event(client, other_headers)
+
+    response = await client.post(f"{API}/events:batch", headers=auth_headers, json={"atomic": False, "items": [
+        {"op": "update", "id": own, "data": {"title": "renamed"}},
+        {"op": "update", "id": foreign, "data": {"title": "stolen"}},
+        {"op": "delete", "id": foreign + 10_000},
+        {"op": "update", "id": deleted, "data": {"start_time": "not a time"}},
+        {"op": "create", "data": {**EVENT, "end_time": "2026-07-01T08:00:00Z"}},
+        {"op": "update", "id": deleted, "data": {"title": "twice"}},
+        {"op": "delete", "id": deleted},
+    ]})
+    assert response.status_code == 200, response.text
+    results = response.json()["results"]
+    assert [result["status"] for result in results] == [200, 403, 404, 422, 422, 400, 400]
+    assert results[1]["error"] == "Not enough permissions to update this event"
+    assert results[5]["error"] == "Only one operation per id is allowed"
+
+    # Each single call fails the same way
+    for event_id, status_code in ((foreign, 403), (foreign + 10_000, 404)):
+        response = await client.put(f"{API}/events/{event_id}", headers=auth_headers, json={"title": "x"})
+        assert response.status_code == status_code, response.text
+    response = await client.put(f"{API}/events/{own}", headers=auth_headers, json={"start_time": "not a time"})
+    assert response.status_code == 422, response.text
+
+    assert await titles(client, auth_headers, own, deleted) == ["renamed", "t"]
+    assert await titles(client, other_headers, foreign) == ["t"]
+
+
+async def test_batch_update_writes_what_a_single_update_writes(client, auth_headers):
+    single, batched = await create_event(client, auth_headers), await create_event(client, auth_headers)
+    change = {
+        "start_time": "2026-07-02T09:00:00+02:00",
+        "end_time": "2026-07-02T08:30:00Z",
+        "recurrence_rule": {"freq": "DAILY", "count": 3},
+    }
+    # Builds the owner's conflict tree, which both writes update
+    response = await client.get(f"{API}/events/conflicts", headers=auth_headers, params=EVENT)
+    assert {event["id"] for event in response.json()} == {single, batched}
+
+    response = await client.put(f"{API}/events/{single}", headers=auth_headers, json=change)
+    assert response.status_code == 200, response.text
+    response = await client.post(
+        f"{API}/events:batch", headers=auth_headers, json={"items": [{"op": "update", "id": batched, "data": change}]}
+    )
+    assert response.status_code == 200, response.text
+
+    fields = ("start_time", "end_time", "recurrence_rule")
+    rows = [(await client.get(f"{API}/events/{event_id}", headers=auth_headers)).json() for event_id in (single, batched)]
+    assert [tuple(row[field] for field in fields) for row in rows] == [(
+        "2026-07-02T07:00:00",
+        "2026-07-02T08:30:00",
+        {"freq": "DAILY", "interval": 1, "count": 3, "until": None, "byweekday": None},
+    )] * 2
+    response = await client.get(f"{API}/events/conflicts", headers=auth_headers, params=EVENT)
+    assert response.json() == []
+    # The series end follows the rule: the third occurrence, and no fourth
+    response = await client.get(
+        f"{API}/events/", headers=auth_headers,
+        params={"start_date": "2026-07-04T00:00:00Z", "end_date": "2026-07-06T00:00:00Z"},
+    )
+    assert sorted((event["id"], event["recurrence_id"]) for event in response.json()) == [
+        (single, "2026-07-04T07:00:00"), (batched, "2026-07-04T07:00:00"),
+    ]
+
+    # A partial update ending the event before it starts fails either way
+    late = {"start_time": "2026-07-02T09:00:00Z"}
+    response = await client.put(f"{API}/events/{single}", headers=auth_headers, json=late)
+    assert response.status_code == 400, response.text
+    response = await client.post(
+        f"{API}/events:batch", headers=auth_headers, json={"items": [{"op": "update", "id": batched, "data": late}]}
+    )
+    assert response.json()["results"][0]["status"] == 400
+
+
+async def test_batch_reminder_updates_follow_status_transitions(client, auth_headers):
+    reminder = {"message": "m", "reminder_time": "2026-07-01T08:45:00Z", "reminder_type": "email"}
+    response = await client.post(f"{API}/reminders:batch", headers=auth_headers, json={"items": [
+        {"op": "create", "data": reminder}, {"op": "create", "data": reminder},
+    ]})
+    assert response.status_code == 200, response.text
+    ids = [result["id"] for result in response.json()["results"]]
+    other_headers = await create_user(client)
+
+    response = await client.post(f"{API}/reminders:batch", headers=other_headers, json={"atomic": False, "items": [
+        {"op": "update", "id": ids[0], "data": {"status": "sent"}},
+    ]})
+    assert response.json()["results"][0]["status"] == 403
+
+    response = await client.post(f"{API}/reminders:batch", headers=auth_headers, json={"items": [
+        {"op": "update", "id": ids[0], "data": {"status": "sent"}},
+        {"op": "update", "id": ids[1], "data": {"message": "edited"}},
+    ]})
+    assert response.status_code == 200, response.text
+    sent, edited = [(await client.get(f"{API}/reminders/{reminder_id}", headers=auth_headers)).json() for reminder_id in ids]
+    assert (sent["status"], sent["sent_at"] is not None) == ("sent", True)
+    assert (edited["status"], edited["message"], edited["sent_at"]) == ("pending", "edited", None)
@@ -0,0 +1,72 @@
+import asyncio
+import time
+
+from app.core import database
+from app.core.config import get_settings
+
+from .conftest import API
+
+DEAD_DATABASE_URL = "sqlite:////nonexistent/alo/test.db"
+
+
+async def test_outage_opens_circuit_and_recovers(client, auth_headers, monkeypatch):
+    breaker = database.db_circuit_breaker
+    settings = get_settings()
+    healthy_url = settings.DATABASE_URL
+    monkeypatch.setattr(breaker, "failure_threshold", 3)
+    monkeypatch.setattr(breaker, "reset_timeout", 0.5)
+
+    # Kill the database: engines built from now on cannot open it
+    settings.DATABASE_URL = DEAD_DATABASE_URL
+    recovered = False
+    try:
+        await database.reinitialize_async_database(database.async_engine)
+
+        rebuilds = []
+        initialize = database.initialize_async_database
+
+        def counting_initialize(force=False):
+            rebuilds.append(settings.DATABASE_URL)
+            return initialize(force=force)
+
+        monkeypatch.setattr(database, "initialize_async_database", counting_initialize)
+
+        # Concurrent load: every request in flight fails, and only one rebuilds the engine
+        results = await asyncio.gather(
+            *(client.get(f"{API}/events/", headers=auth_headers) for _ in range(50)),
+            return_exceptions=True,
+        )
+        assert all(isinstance(result, Exception) or result.status_code >= 500 for result in results)
+        assert breaker.state == breaker.OPEN
+        assert rebuilds == [DEAD_DATABASE_URL]
+
+        # While open, requests fail fast without touching the database
+        response = await client.get(f"{API}/events/", headers=auth_headers)
+        assert response.status_code == 503
+        assert int(response.headers["Retry-After"]) >= 1
+
+        # Bring the database back and measure how long until requests succeed
+        settings.DATABASE_URL = healthy_url
+        restored_at = time.monotonic()
+        while True:
+            try:
+                response = await client.get(f"{API}/events/", headers=auth_headers)
+                if response.status_code == 200:
+                    break
+            except Exception:
+                pass
+            assert time.monotonic() - restored_at < 10, "database did not recover"
+            await asyncio.sleep(0.05)
+        recovery = time.monotonic() - restored_at
+        recovered = True
+
+        # A failed probe on the dead engine rebuilds it, the next probe closes the circuit
+        assert breaker.state == breaker.CLOSED
+        assert rebuilds == [DEAD_DATABASE_URL, healthy_url]
+        assert recovery < 4 * breaker.reset_timeout + 1
+        assert breaker.counters["rejected"] > 0
+    finally:
+        settings.DATABASE_URL = healthy_url
+        if not recovered:
+            await database.reinitialize_async_database(database.async_engine)
+            breaker.record_success()
@@ -0,0 +1,91 @@
+import random
+from datetime import datetime, timedelta
+
+from app.core.conflicts import ConflictIndex, DynamicIntervalTree, conflict_index
+
+from .conftest import API
+
+START = datetime(2026, 1, 1)
+
+
+def test_dynamic_tree_matches_a_scan():
+    rng = random.Random(15)
+    tree = DynamicIntervalTree()
+    spans = {}
+    for step in range(3000):
+        event_id = rng.randrange(400)
+        if rng.random() < 0.35:
+            tree.remove(event_id)
+            spans.pop(event_id, None)
+        else:
+            start = START + timedelta(minutes=15 * rng.randrange(5000))
+            spans[event_id] = (start, start + timedelta(minutes=15 * rng.randrange(1, 40)))
+            tree.insert(*spans[event_id], event_id)
+        if step % 50 == 0:
+            low = START + timedelta(minutes=15 * rng.randrange(5000))
+            high = low + timedelta(hours=rng.randrange(1, 200))
+            expected = sorted(
+                (start, end, event_id) for event_id, (start, end) in spans.items() if start < high and end > low
+            )
+            assert sorted(tree.overlapping(low, high)) == sorted(event_id for _, _, event_id in expected)
+            assert list(zip(*tree.spans(low, high))) == [(start, end) for start, end, _ in expected]
+            starts, ends = tree.span_arrays(low, high)
+            assert sorted(zip(starts.tolist(), ends.tolist())) == [(start, end) for start, end, _ in expected]
+    assert len(tree) == len(spans)
+
+
+def test_older_changes_are_skipped():
+    index = ConflictIndex()
+    tree = DynamicIntervalTree([(START, START + timedelta(hours=1), 1)])
+    index._trees[7], index._versions[7] = tree, {1: (5, 0)}
+    moved = START + timedelta(days=1)
+
+    index.apply_local(7, [(1, moved, moved + timedelta(hours=1), (6, 0))])
+    # A late copy of an earlier write, then of the one applied
+    index.apply_local(7, [(1, START, START + timedelta(hours=1), (5, 0))])
+    index.apply_local(7, [(1, moved, moved + timedelta(hours=1), (6, 0))])
+    assert tree.overlapping(START, moved + timedelta(hours=1)) == [1]
+    assert tree.overlapping(START, moved) == []
+
+    # A deletion outranks the write of the same sequence, a reused id does not
+    index.apply_local(7, [(1, None, None, (6, 1))])
+    index.apply_local(7, [(1, moved, moved + timedelta(hours=1), (6, 0))])
+    assert len(tree) == 0
+    index.apply_local(7, [(1, START, START + timedelta(hours=1), (8, 0))])
+    assert tree.overlapping(START, moved) == [1]
+
+
+async def test_writes_update_the_tree_in_place(client, auth_headers):
+    async def create(day, **params):
+        start = START + timedelta(days=day)
+        return await client.post(
+            f"{API}/events/",
+            headers=auth_headers,
+            params=params,
+            json={"title": "t", "start_time": start.isoformat(), "end_time": (start + timedelta(hours=1)).isoformat()},
+        )
+
+    async def conflicts(start, end):
+        response = await client.get(
+            f"{API}/events/conflicts", headers=auth_headers, params={"start_time": start, "end_time": end}
+        )
+        assert response.status_code == 200, response.text
+        return [event["id"] for event in response.json()]
+
+    first = (await create(0)).json()["id"]
+    # Aware bounds are compared in UTC
+    assert await conflicts("2026-01-01T01:30:00+02:00", "2026-01-01T00:30:00Z") == [first]
+    builds = conflict_index.counters["builds"]
+
+    second = (await create(1)).json()["id"]
+    assert (await create(1, reject_on_conflict="true")).status_code == 409
+    response = await client.put(
+        f"{API}/events/{first}",
+        headers=auth_headers,
+        json={"start_time": "2026-01-03T00:00:00Z", "end_time": "2026-01-03T01:00:00Z"},
+    )
+    assert response.status_code == 200, response.text
+    assert await conflicts("2026-01-01T00:00:00Z", "2026-01-04T00:00:00Z") == [second, first]
+    assert (await client.delete(f"{API}/events/{second}", headers=auth_headers)).status_code == 200
+    assert await conflicts("2026-01-01T00:00:00Z", "2026-01-04T00:00:00Z") == [first]
+    assert conflict_index.counters["builds"] == builds
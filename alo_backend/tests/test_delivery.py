@@ -0,0 +1,91 @@
+import smtplib
+
+from sqlalchemy import select
+
+from app.core import database
+from app.core.config import get_settings
+from app.core.delivery import SMTPTransport, StubTransport, create_pipeline
+from app.core.dispatcher import ReminderDispatcher
+from app.models import Reminder, ReminderStatus, ReminderType
+
+from .test_dispatcher import create_due_reminders
+
+reminders = Reminder.__table__
+
+
+def reminder(reminder_id, reminder_type=ReminderType.EMAIL):
+    return {
+        "id": reminder_id,
+        "reminder_type": reminder_type,
+        "owner_id": 1,
+        "owner_email": f"user{reminder_id}@example.com",
+        "message": "m",
+    }
+
+
+async def test_unconfigured_channels_have_no_transport():
+    pipeline = create_pipeline()
+
+    assert pipeline.channels == [ReminderType.IN_APP]
+    delivered = await pipeline.deliver([reminder(1, ReminderType.EMAIL), reminder(2, ReminderType.IN_APP)])
+    await pipeline.stop()
+    assert list(delivered) == [2]
+
+
+async def test_stub_transports_are_opt_in(monkeypatch):
+    monkeypatch.setattr(get_settings(), "DELIVERY_STUB_TRANSPORTS", True)
+    pipeline = create_pipeline()
+
+    assert set(pipeline.channels) == set(ReminderType)
+    assert isinstance(pipeline.pools[ReminderType.SMS].transport, StubTransport)
+    await pipeline.stop()
+
+
+async def test_reminders_of_unconfigured_channels_stay_pending(client, auth_headers):
+    email_ids = await create_due_reminders(client, auth_headers, 2)
+    pipeline = create_pipeline()
+    dispatcher = ReminderDispatcher(deliver=pipeline.deliver, channels=pipeline.channels)
+
+    await dispatcher.dispatch_due()
+    await pipeline.stop()
+
+    async with database.AsyncSessionLocal() as session:
+        rows = await session.execute(
+            select(reminders.c.status, reminders.c.attempts, reminders.c.claimed_until)
+            .where(reminders.c.id.in_(email_ids))
+        )
+        assert set(rows) == {(ReminderStatus.PENDING, 0, None)}
+
+
+class BreakingSMTP:
+    """SMTP connection that drops after ``sends`` messages."""
+
+    def __init__(self, sends):
+        self.sends = sends
+        self.sent = []
+        self.closed = False
+
+    def send_message(self, message):
+        if message["To"] == "user2@example.com":
+            raise smtplib.SMTPRecipientsRefused({message["To"]: (550, b"no such user")})
+        if len(self.sent) == self.sends:
+            raise smtplib.SMTPServerDisconnected("Connection unexpectedly closed")
+        self.sent.append(message["To"])
+
+    def close(self):
+        self.closed = True
+
+
+async def test_smtp_partial_failure_returns_the_sent_ids(monkeypatch):
+    transport = SMTPTransport("smtp://localhost:2525", "reminders@example.com")
+    connections = [BreakingSMTP(sends=2), BreakingSMTP(sends=10)]
+    monkeypatch.setattr(transport, "_connect", lambda: connections.pop(0))
+
+    # 1 sent, 2 refused, 3 sent, then the connection drops before 4
+    first = connections[0]
+    assert list(await transport.send([reminder(i) for i in range(1, 6)])) == [1, 3]
+    assert first.closed and transport._idle == []
+
+    # The next batch opens a fresh connection and keeps it for reuse
+    assert list(await transport.send([reminder(4), reminder(5)])) == [4, 5]
+    assert len(transport._idle) == 1
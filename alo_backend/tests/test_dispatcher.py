@@ -0,0 +1,136 @@
+import asyncio
+from collections import Counter
+from datetime import datetime, timedelta
+
+from sqlalchemy import insert, select, update
+
+from app.core import database
+from app.core.dispatcher import ReminderDispatcher
+from app.core.push import push_hub
+from app.models import Reminder, ReminderStatus, ReminderType
+
+from .conftest import API, create_user
+
+reminders = Reminder.__table__
+
+
+async def create_due_reminders(client, auth_headers, count, **values):
+    owner_id = (await client.get(f"{API}/users/me", headers=auth_headers)).json()["id"]
+    now = datetime.utcnow()
+    rows = [
+        {
+            "message": f"due {i}",
+            "reminder_time": now - timedelta(minutes=1),
+            "reminder_type": ReminderType.EMAIL,
+            "status": ReminderStatus.PENDING,
+            "owner_id": owner_id,
+            "created_at": now,
+            "updated_at": now,
+            **values,
+        }
+        for i in range(count)
+    ]
+    async with database.AsyncSessionLocal() as session:
+        async with session.begin():
+            await session.execute(insert(reminders), rows)
+        result = await session.execute(select(reminders.c.id).where(reminders.c.owner_id == owner_id))
+        return set(result.scalars().all())
+
+
+async def statuses(ids):
+    async with database.AsyncSessionLocal() as session:
+        rows = await session.execute(
+            select(reminders.c.id, reminders.c.status, reminders.c.claimed_until).where(reminders.c.id.in_(ids))
+        )
+        return {row.id: (row.status, row.claimed_until) for row in rows}
+
+
+async def test_claim_commits_before_delivery(client, auth_headers):
+    ids = await create_due_reminders(client, auth_headers, 3)
+    seen_during_delivery = {}
+
+    async def deliver(batch):
+        # The claim is visible to other sessions and nothing holds the rows:
+        # a concurrent write goes through while delivery is in progress
+        seen_during_delivery.update(await statuses(ids))
+        async with database.AsyncSessionLocal() as session:
+            async with session.begin():
+                await session.execute(update(reminders).where(reminders.c.id.in_(ids)).values(message="edited"))
+        return [reminder["id"] for reminder in batch]
+
+    dispatcher = ReminderDispatcher(batch_size=100, deliver=deliver)
+    assert await dispatcher.dispatch_batch(ReminderType.EMAIL) >= 3
+
+    assert all(claimed_until is not None for _, claimed_until in seen_during_delivery.values())
+    assert await statuses(ids) == {reminder_id: (ReminderStatus.SENT, None) for reminder_id in ids}
+
+
+async def test_concurrent_workers_deliver_each_reminder_once(client, auth_headers):
+    ids = await create_due_reminders(client, auth_headers, 20)
+    deliveries = Counter()
+
+    async def deliver(batch):
+        await asyncio.sleep(0.05)
+        deliveries.update(reminder["id"] for reminder in batch)
+        return [reminder["id"] for reminder in batch]
+
+    workers = [ReminderDispatcher(batch_size=5, deliver=deliver) for _ in range(4)]
+
+    async def drain(dispatcher):
+        while True:
+            try:
+                if not await dispatcher.dispatch_batch(ReminderType.EMAIL):
+                    return
+            except Exception:
+                # SQLite reports a claim racing another writer as locked
+                await asyncio.sleep(0.01)
+
+    await asyncio.gather(*(drain(worker) for worker in workers))
+
+    assert {reminder_id: deliveries[reminder_id] for reminder_id in ids} == {reminder_id: 1 for reminder_id in ids}
+    assert {status for status, _ in (await statuses(ids)).values()} == {ReminderStatus.SENT}
+
+
+async def test_expired_claim_is_claimed_again(client, auth_headers):
+    now = datetime.utcnow()
+    in_flight = await create_due_reminders(client, auth_headers, 1, claimed_until=now + timedelta(minutes=5))
+    headers = await create_user(client)
+    abandoned = await create_due_reminders(client, headers, 1, claimed_until=now - timedelta(seconds=1))
+    delivered = []
+
+    async def deliver(batch):
+        delivered.extend(reminder["id"] for reminder in batch)
+        return [reminder["id"] for reminder in batch]
+
+    await ReminderDispatcher(batch_size=100, deliver=deliver).dispatch_batch(ReminderType.EMAIL)
+
+    assert abandoned <= set(delivered)
+    assert not in_flight & set(delivered)
+    assert (await statuses(in_flight))[next(iter(in_flight))][0] == ReminderStatus.PENDING
+
+
+async def test_outcome_skips_rows_claimed_again_during_delivery(client, auth_headers, monkeypatch):
+    kept, taken = sorted(await create_due_reminders(client, auth_headers, 2))
+    published = []
+    monkeypatch.setattr(push_hub, "publish", lambda changes: published.extend(changes))
+    other_lease = datetime.utcnow() + timedelta(hours=1)
+
+    async def deliver(batch):
+        # The lease on ``taken`` ran out and another worker claimed it again
+        async with database.AsyncSessionLocal() as session:
+            async with session.begin():
+                await session.execute(update(reminders).where(reminders.c.id == taken).values(claimed_until=other_lease))
+        return [reminder["id"] for reminder in batch]
+
+    dispatcher = ReminderDispatcher(batch_size=100, deliver=deliver)
+    await dispatcher.dispatch_batch(ReminderType.EMAIL)
+
+    assert await statuses({kept, taken}) == {kept: (ReminderStatus.SENT, None), taken: (ReminderStatus.PENDING, other_lease)}
+    async with database.AsyncSessionLocal() as session:
+        sequences = dict((await session.execute(
+            select(reminders.c.id, reminders.c.change_seq).where(reminders.c.id.in_([kept, taken]))
+        )).all())
+    assert sequences[kept] > 0 and sequences[taken] == 0
+    assert kept in [row_id for _, _, _, row_id in published]
+    assert taken not in [row_id for _, _, _, row_id in published]
+    assert dispatcher.counters["claims_lost"] == 1
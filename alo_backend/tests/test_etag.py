@@ -0,0 +1,110 @@
+from datetime import datetime
+
+from sqlalchemy import insert
+
+from app.core import database
+from app.core.dispatcher import ReminderDispatcher
+from app.core.purge import PurgeJob
+from app.models import Reminder, ReminderStatus, ReminderType
+
+from .conftest import API, create_user
+from .test_dispatcher import create_due_reminders
+from .test_groups import make_superuser, user_id
+
+EVENT = {"title": "t", "start_time": "2026-11-02T09:00:00Z", "end_time": "2026-11-02T10:00:00Z"}
+
+
+async def create_event(client, headers, **values):
+    response = await client.post(f"{API}/events/", headers=headers, json={**EVENT, **values})
+    assert response.status_code == 201, response.text
+    return response.json()["id"]
+
+
+async def etags(client, headers, event_id):
+    """The ETag of each calendar read, after checking it revalidates with 304."""
+    tags = {}
+    for path in ("events/", f"events/{event_id}", "reminders/"):
+        response = await client.get(f"{API}/{path}", headers=headers)
+        assert response.status_code == 200, response.text
+        tags[path] = response.headers["ETag"]
+        response = await client.get(f"{API}/{path}", headers={**headers, "If-None-Match": tags[path]})
+        assert (response.status_code, response.content, response.headers["ETag"]) == (304, b"", tags[path])
+    return tags
+
+
+async def test_matching_if_none_match_returns_304(client, auth_headers):
+    event_id = await create_event(client, auth_headers)
+    tags = await etags(client, auth_headers, event_id)
+    assert len(set(tags.values())) == 3
+
+    # Weak and listed tags match too; others do not
+    path = f"{API}/events/{event_id}"
+    for header, status_code in ((f"W/{tags[f'events/{event_id}']}", 304), (f'"other", {tags["events/"]}', 200), ("*", 304)):
+        response = await client.get(path, headers={**auth_headers, "If-None-Match": header})
+        assert response.status_code == status_code, header
+
+
+async def test_every_write_changes_the_etag(client, auth_headers):
+    event_id = await create_event(client, auth_headers)
+    series_id = await create_event(client, auth_headers, recurrence_rule={"freq": "DAILY", "count": 3})
+    (due_id,) = await create_due_reminders(client, auth_headers, 1, reminder_type=ReminderType.PUSH)
+
+    # Another user's event with one of our reminders on it, as a shared
+    # calendar would create them
+    other_headers = await create_user(client)
+    other_event_id = await create_event(client, other_headers)
+    now = datetime.utcnow()
+    async with database.AsyncSessionLocal() as session:
+        async with session.begin():
+            await session.execute(insert(Reminder.__table__), [{
+                "message": "on their event",
+                "reminder_time": now,
+                "reminder_type": ReminderType.EMAIL,
+                "status": ReminderStatus.SENT,
+                "event_id": other_event_id,
+                "owner_id": await user_id(client, auth_headers),
+                "created_at": now,
+                "updated_at": now,
+            }])
+
+    async def deliver(batch):
+        return [reminder["id"] for reminder in batch]
+
+    async def dispatch():
+        await ReminderDispatcher(deliver=deliver).dispatch_batch(ReminderType.PUSH)
+
+    async def purge():
+        await PurgeJob().purge_user(await user_id(client, other_headers))
+
+    writes = [
+        ("single write", client.put(f"{API}/events/{event_id}", headers=auth_headers, json={"title": "renamed"})),
+        ("batch", client.post(f"{API}/events:batch", headers=auth_headers, json={"items": [
+            {"op": "update", "id": event_id, "data": {"title": "batched"}},
+        ]})),
+        ("occurrence edit", client.put(
+            f"{API}/events/{series_id}/occurrences/2026-11-03T09:00:00", headers=auth_headers, json={"title": "moved"}
+        )),
+        ("dispatcher outcome", dispatch()),
+        ("purge", purge()),
+    ]
+    seen = [await etags(client, auth_headers, event_id)]
+    for label, write in writes:
+        response = await write
+        if response is not None:
+            assert response.status_code == 200, response.text
+        tags = await etags(client, auth_headers, event_id)
+        assert all(tags[path] != previous[path] for previous in seen for path in tags), label
+        seen.append(tags)
+
+    response = await client.get(f"{API}/reminders/{due_id}", headers=auth_headers)
+    assert response.json()["status"] == "sent"
+
+
+async def test_superusers_get_no_etag_for_single_rows(client, auth_headers):
+    other_headers = await create_user(client)
+    event_id = await create_event(client, other_headers)
+    await make_superuser(client, auth_headers)
+
+    response = await client.get(f"{API}/events/{event_id}", headers={**auth_headers, "If-None-Match": "*"})
+    assert response.status_code == 200, response.text
+    assert "ETag" not in response.headers
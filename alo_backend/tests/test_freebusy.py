@@ -0,0 +1,21 @@
+from .conftest import API
+
+
+async def test_freebusy_window_with_utc_offsets(client, auth_headers):
+    for start, end in (("2026-05-04T09:00:00Z", "2026-05-04T10:00:00Z"), ("2026-05-04T11:30:00+02:00", "2026-05-04T11:00:00Z")):
+        response = await client.post(
+            f"{API}/events/", headers=auth_headers, json={"title": "t", "start_time": start, "end_time": end}
+        )
+        assert response.status_code == 201, response.text
+
+    response = await client.get(
+        f"{API}/events/freebusy",
+        headers=auth_headers,
+        params={"start_time": "2026-05-04T11:30:00+02:00", "end_time": "2026-05-04T12:00:00Z"},
+    )
+    assert response.status_code == 200, response.text
+    assert response.json() == {
+        "start": "2026-05-04T09:30:00",
+        "end": "2026-05-04T12:00:00",
+        "busy": [{"start": "2026-05-04T09:30:00", "end": "2026-05-04T11:00:00"}],
+    }
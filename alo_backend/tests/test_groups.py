@@ -0,0 +1,100 @@
+from sqlalchemy import update
+
+from app.core import database
+from app.core.user_cache import user_cache
+from app.models import User
+
+from .conftest import API, create_user
+
+WINDOW = {"start_time": "2026-06-01T09:00:00Z", "end_time": "2026-06-01T17:00:00+00:00"}
+
+
+async def user_id(client, headers):
+    return (await client.get(f"{API}/users/me", headers=headers)).json()["id"]
+
+
+async def make_superuser(client, headers):
+    superuser_id = await user_id(client, headers)
+    async with database.AsyncSessionLocal() as session:
+        async with session.begin():
+            await session.execute(update(User.__table__).where(User.id == superuser_id).values(is_superuser=True))
+    user_cache.invalidate(superuser_id)
+
+
+async def availability(client, headers, *user_ids):
+    return await client.get(
+        f"{API}/availability/group", headers=headers, params={**WINDOW, "user_ids": list(user_ids)}
+    )
+
+
+async def test_availability_is_limited_to_shared_groups(client, auth_headers):
+    other_headers = await create_user(client)
+    other = await user_id(client, other_headers)
+    unknown = other + 1000
+
+    # A user outside the caller's groups looks exactly like an unknown one
+    outside = await availability(client, auth_headers, other)
+    missing = await availability(client, auth_headers, unknown)
+    assert (outside.status_code, missing.status_code) == (404, 404)
+    assert outside.json()["detail"] == f"Users not found: {other}"
+    assert missing.json()["detail"] == f"Users not found: {unknown}"
+
+    admin_headers = await create_user(client)
+    assert (await client.post(f"{API}/groups/", headers=auth_headers, json={"name": "team"})).status_code == 403
+    await make_superuser(client, admin_headers)
+    response = await client.post(
+        f"{API}/groups/",
+        headers=admin_headers,
+        json={"name": "team", "member_ids": [await user_id(client, auth_headers), other]},
+    )
+    assert response.status_code == 201, response.text
+    group = response.json()
+
+    response = await availability(client, auth_headers, other)
+    assert response.status_code == 200, response.text
+    assert response.json()["free"] == [{"start": "2026-06-01T09:00:00", "end": "2026-06-01T17:00:00"}]
+    groups = (await client.get(f"{API}/groups/", headers=other_headers)).json()
+    assert [item["id"] for item in groups] == [group["id"]]
+
+    # Superusers may query anyone
+    assert (await availability(client, admin_headers, other)).status_code == 200
+
+    response = await client.delete(f"{API}/groups/{group['id']}/members/{other}", headers=admin_headers)
+    assert response.status_code == 200, response.text
+    assert (await availability(client, auth_headers, other)).status_code == 404
+
+
+async def test_groups_are_managed_by_admins(client, auth_headers):
+    member_headers = await create_user(client)
+    member = await user_id(client, member_headers)
+    admin_headers = await create_user(client)
+    await make_superuser(client, admin_headers)
+
+    assert (await client.post(f"{API}/groups/", headers=auth_headers, json={"name": "ops"})).status_code == 403
+    response = await client.post(
+        f"{API}/groups/", headers=admin_headers, json={"name": "ops", "member_ids": [member, member + 1000]}
+    )
+    assert response.status_code == 404
+    assert response.json()["detail"] == f"Users not found: {member + 1000}"
+    response = await client.post(f"{API}/groups/", headers=admin_headers, json={"name": "ops"})
+    assert response.status_code == 201, response.text
+    group_id = response.json()["id"]
+    assert response.json()["member_ids"] == []
+
+    members_url = f"{API}/groups/{group_id}/members/{member}"
+    assert (await client.put(members_url, headers=member_headers)).status_code == 403
+    for _ in range(2):
+        # Adding a member again does nothing
+        response = await client.put(members_url, headers=admin_headers)
+        assert response.status_code == 200, response.text
+        assert response.json()["member_ids"] == [member]
+    assert [group["id"] for group in (await client.get(f"{API}/groups/", headers=member_headers)).json()] == [group_id]
+    assert (await client.get(f"{API}/groups/", headers=auth_headers)).json() == []
+
+    assert (await client.delete(members_url, headers=admin_headers)).json()["member_ids"] == []
+    assert (await client.delete(members_url, headers=admin_headers)).status_code == 404
+    assert (await client.put(members_url, headers=admin_headers)).status_code == 200
+    response = await client.delete(f"{API}/groups/{group_id}", headers=admin_headers)
+    assert response.status_code == 200, response.text
+    assert (await client.get(f"{API}/groups/", headers=member_headers)).json() == []
+    assert (await client.put(members_url, headers=admin_headers)).status_code == 404
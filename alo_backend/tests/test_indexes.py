@@ -0,0 +1,130 @@
+"""The owner-scoped and partial indexes are used at realistic data sizes.
+
+The schema comes from running the Alembic migrations on a scratch SQLite
+database, which is filled and ANALYZEd before each hot query's
+``EXPLAIN QUERY PLAN`` is checked.
+"""
+import random
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import pytest
+from alembic import command
+from alembic.config import Config
+from sqlalchemy import create_engine, select
+
+from app.core.config import get_settings
+from app.core.pagination import KeysetPage
+from app.models import Event, Reminder, ReminderStatus, ReminderType, User
+
+ALEMBIC_DIR = Path(__file__).resolve().parent.parent / "alembic"
+
+USERS = 500
+EVENTS_PER_USER = 200
+PENDING_SHARE = 0.02
+START = datetime(2025, 1, 1)
+
+events = Event.__table__
+reminders = Reminder.__table__
+
+
+@pytest.fixture(scope="module")
+def engine(tmp_path_factory):
+    url = f"sqlite:///{tmp_path_factory.mktemp('indexes') / 'indexes.db'}"
+    settings = get_settings()
+    test_url = settings.DATABASE_URL
+    # alembic/env.py migrates the database in the settings
+    settings.DATABASE_URL = url
+    try:
+        config = Config()
+        config.set_main_option("script_location", str(ALEMBIC_DIR))
+        command.upgrade(config, "head")
+    finally:
+        settings.DATABASE_URL = test_url
+
+    engine = create_engine(url)
+    rng = random.Random(9)
+    with engine.begin() as conn:
+        conn.execute(
+            User.__table__.insert(),
+            [{"email": f"user{i}@example.com", "hashed_password": "x"} for i in range(USERS)],
+        )
+        rows = []
+        for owner_id in range(1, USERS + 1):
+            for _ in range(EVENTS_PER_USER):
+                start = START + timedelta(minutes=30 * rng.randrange(2 * 365 * 48))
+                rows.append({"title": "e", "start_time": start, "end_time": start + timedelta(hours=1), "owner_id": owner_id})
+        conn.execute(events.insert(), rows)
+        conn.execute(
+            reminders.insert(),
+            [
+                {
+                    "message": "m",
+                    "reminder_time": row["start_time"] - timedelta(minutes=15),
+                    "reminder_type": ReminderType.EMAIL,
+                    "status": ReminderStatus.PENDING if rng.random() < PENDING_SHARE else ReminderStatus.SENT,
+                    "event_id": event_id,
+                    "owner_id": row["owner_id"],
+                }
+                for event_id, row in enumerate(rows, start=1)
+            ],
+        )
+        conn.exec_driver_sql("ANALYZE")
+    yield engine
+    engine.dispose()
+
+
+def query_plan(engine, query) -> str:
+    sql = query.compile(dialect=engine.dialect, compile_kwargs={"literal_binds": True})
+    with engine.connect() as conn:
+        return " | ".join(row[-1] for row in conn.exec_driver_sql(f"EXPLAIN QUERY PLAN {sql}"))
+
+
+def listing(query, columns):
+    # The pages the listing endpoints request
+    return KeysetPage(columns, None, 100, 0).apply(query)
+
+
+def test_event_window_listing_uses_owner_start_time_index(engine):
+    query = (
+        select(events)
+        .where(events.c.owner_id == 7)
+        .where(events.c.start_time >= datetime(2025, 3, 1))
+        .where(events.c.end_time <= datetime(2025, 4, 1))
+    )
+    plan = query_plan(engine, listing(query, [events.c.start_time, events.c.id]))
+    assert "USING INDEX ix_events_owner_id_start_time" in plan, plan
+
+
+def test_event_end_time_filter_uses_owner_end_time_index(engine):
+    query = select(events.c.id).where(events.c.owner_id == 7).where(events.c.end_time <= datetime(2025, 2, 1))
+    plan = query_plan(engine, query)
+    # Only indexed columns are read, so SQLite reports a covering index
+    assert "USING COVERING INDEX ix_events_owner_id_end_time" in plan, plan
+
+
+def test_reminder_listing_uses_owner_reminder_time_index(engine):
+    query = select(reminders).where(reminders.c.owner_id == 7)
+    plan = query_plan(engine, listing(query, [reminders.c.reminder_time, reminders.c.id]))
+    assert "USING INDEX ix_reminders_owner_id_reminder_time" in plan, plan
+    assert "TEMP B-TREE" not in plan, plan
+
+
+def test_reminders_of_event_use_owner_event_index(engine):
+    query = select(reminders).where(reminders.c.owner_id == 7).where(reminders.c.event_id == 1234)
+    plan = query_plan(engine, listing(query, [reminders.c.reminder_time, reminders.c.id]))
+    assert "USING INDEX ix_reminders_owner_id_event_id" in plan, plan
+
+
+def test_due_reminder_scan_uses_partial_pending_index(engine):
+    # The dispatcher's claim of due reminders
+    query = (
+        select(reminders.c.id)
+        .where(reminders.c.status == ReminderStatus.PENDING)
+        .where(reminders.c.reminder_time <= datetime(2025, 6, 1))
+        .order_by(reminders.c.reminder_time)
+        .limit(500)
+    )
+    plan = query_plan(engine, query)
+    assert "USING INDEX ix_reminders_pending_reminder_time" in plan, plan
+    assert "TEMP B-TREE" not in plan, plan
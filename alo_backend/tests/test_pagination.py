@@ -0,0 +1,80 @@
+from app.core.pagination import NEXT, encode_cursor
+
+from .conftest import API
+from .test_dispatcher import create_due_reminders
+
+EVENT = {"start_time": "2026-06-01T09:00:00Z", "end_time": "2026-06-01T10:00:00Z"}
+
+
+async def walk(client, auth_headers, path, direction, cursor, limit=2):
+    """Follow ``direction`` cursors from ``cursor``.
+
+    Returns the ids of each page and the cursor pointing back from the last.
+    """
+    back = "prev" if direction == "next" else "next"
+    pages = []
+    while cursor is not None:
+        response = await client.get(f"{API}/{path}", headers=auth_headers, params={"cursor": cursor, "limit": limit})
+        assert response.status_code == 200, response.text
+        page = response.json()
+        pages.append([item["id"] for item in page["items"]])
+        cursor, back_cursor = page[f"{direction}_cursor"], page[f"{back}_cursor"]
+    return pages, back_cursor
+
+
+async def assert_round_trip(client, auth_headers, path, ids):
+    forward, prev_cursor = await walk(client, auth_headers, path, "next", "")
+    # Rows sharing the leading sort key are ordered by id, none repeated or skipped
+    assert forward == [ids[0:2], ids[2:4], ids[4:5]]
+
+    backward, next_cursor = await walk(client, auth_headers, path, "prev", prev_cursor)
+    assert backward == [ids[2:4], ids[0:2]]
+
+    # And forward again from the first page
+    forward, _ = await walk(client, auth_headers, path, "next", next_cursor)
+    assert forward == [ids[2:4], ids[4:5]]
+
+
+async def test_events_page_through_equal_start_times(client, auth_headers):
+    ids = []
+    for i in range(5):
+        response = await client.post(f"{API}/events/", headers=auth_headers, json={"title": f"event {i}", **EVENT})
+        assert response.status_code == 201, response.text
+        ids.append(response.json()["id"])
+
+    await assert_round_trip(client, auth_headers, "events/", sorted(ids))
+
+
+async def test_reminders_page_through_equal_reminder_times(client, auth_headers):
+    ids = await create_due_reminders(client, auth_headers, 5)
+
+    await assert_round_trip(client, auth_headers, "reminders/", sorted(ids))
+
+
+async def test_cursor_selects_the_envelope(client, auth_headers):
+    for i in range(3):
+        await client.post(f"{API}/events/", headers=auth_headers, json={"title": f"event {i}", **EVENT})
+
+    # Without a cursor: the plain list, paged by skip, with cursors in the Link header
+    response = await client.get(f"{API}/events/", headers=auth_headers, params={"skip": 1, "limit": 1})
+    assert isinstance(response.json(), list) and len(response.json()) == 1
+    assert 'rel="next"' in response.headers["Link"] and 'rel="prev"' in response.headers["Link"]
+
+    response = await client.get(f"{API}/events/", headers=auth_headers, params={"cursor": "", "limit": 1})
+    page = response.json()
+    assert set(page) == {"items", "next_cursor", "prev_cursor"}
+    assert len(page["items"]) == 1 and page["next_cursor"] and page["prev_cursor"] is None
+    assert 'rel="next"' in response.headers["Link"] and 'rel="prev"' not in response.headers["Link"]
+
+
+async def test_malformed_cursor_is_rejected(client, auth_headers):
+    for cursor in (
+        "not a cursor",
+        encode_cursor([1], NEXT),  # a user listing cursor: one sort column, not two
+        encode_cursor(["2026-06-01T09:00:00", 1], "sideways"),
+        encode_cursor(["yesterday", 1], NEXT),
+    ):
+        for path in ("events/", "reminders/"):
+            response = await client.get(f"{API}/{path}", headers=auth_headers, params={"cursor": cursor})
+            assert response.status_code == 400, (path, cursor)
+            assert response.json() == {"detail": "Invalid pagination cursor"}
@@ -0,0 +1,72 @@
+import asyncio
+import threading
+import uuid
+
+from passlib.hash import bcrypt
+from sqlalchemy import select, update
+
+from app.core import database, security
+from app.core.security import PasswordHasher
+from app.models import User
+
+from .conftest import API
+
+users = User.__table__
+
+
+async def test_saturated_pool_rejects_with_retry_after():
+    hasher = PasswordHasher(workers=1, queue_size=1)
+    release = threading.Event()
+    running = [asyncio.ensure_future(hasher.run(release.wait)) for _ in range(2)]
+    await asyncio.sleep(0)
+
+    rejected = None
+    try:
+        await hasher.run(release.wait)
+    except Exception as exc:
+        rejected = exc
+    release.set()
+    await asyncio.gather(*running)
+    hasher.shutdown()
+
+    assert (rejected.status_code, rejected.headers["Retry-After"]) == (503, "1")
+    assert hasher.counters == {"completed": 2, "rejected": 1, "rehashed": 0}
+
+
+async def register(client):
+    email = f"user-{uuid.uuid4().hex[:12]}@example.com"
+    response = await client.post(f"{API}/auth/register", json={"email": email, "password": "password123"})
+    assert response.status_code == 200, response.text
+    return email
+
+
+async def test_login_is_rejected_when_the_pool_is_saturated(client, monkeypatch):
+    email = await register(client)
+    monkeypatch.setattr(security.password_hasher, "_in_flight", security.password_hasher.capacity)
+    response = await client.post(f"{API}/auth/login", data={"username": email, "password": "password123"})
+
+    assert response.status_code == 503
+    assert int(response.headers["Retry-After"]) >= 1
+
+
+async def test_login_rehashes_a_password_of_another_cost(client):
+    email = await register(client)
+    # As if BCRYPT_ROUNDS was 5 when the password was set
+    async with database.AsyncSessionLocal() as session:
+        async with session.begin():
+            await session.execute(
+                update(users).where(users.c.email == email).values(hashed_password=bcrypt.using(rounds=5).hash("password123"))
+            )
+    rehashed = security.password_hasher.counters["rehashed"]
+
+    response = await client.post(f"{API}/auth/login", data={"username": email, "password": "password123"})
+    assert response.status_code == 200, response.text
+    async with database.AsyncSessionLocal() as session:
+        stored = (await session.execute(select(users.c.hashed_password).where(users.c.email == email))).scalar_one()
+    assert stored.startswith("$2b$04$") and security.verify_password("password123", stored)
+    assert security.password_hasher.counters["rehashed"] == rehashed + 1
+
+    # The next login finds the configured cost and leaves the hash alone
+    response = await client.post(f"{API}/auth/login", data={"username": email, "password": "password123"})
+    assert response.status_code == 200, response.text
+    assert security.password_hasher.counters["rehashed"] == rehashed + 1
@@ -0,0 +1,62 @@
+from datetime import datetime
+
+from sqlalchemy import insert, select
+
+from app.core import database
+from app.core.purge import PurgeJob
+from app.models import Reminder, ReminderStatus, ReminderType, User
+
+from .conftest import API, create_user
+from .test_groups import user_id
+
+EVENT = {"title": "t", "start_time": "2026-09-01T09:00:00Z", "end_time": "2026-09-01T10:00:00Z"}
+reminders = Reminder.__table__
+
+
+async def test_purge_leaves_tombstones_for_other_users_reminders(client, auth_headers):
+    purged_id = await user_id(client, auth_headers)
+    event_ids = []
+    for _ in range(3):
+        response = await client.post(f"{API}/events/", headers=auth_headers, json=EVENT)
+        assert response.status_code == 201, response.text
+        event_ids.append(response.json()["id"])
+    response = await client.post(f"{API}/reminders/", headers=auth_headers, json={
+        "message": "own", "reminder_time": "2026-09-01T08:45:00Z", "reminder_type": "email", "event_id": event_ids[0],
+    })
+    assert response.status_code == 201, response.text
+
+    # Reminders of another user on the purged user's events, as a shared
+    # calendar would create them
+    other_headers = await create_user(client)
+    other_id = await user_id(client, other_headers)
+    now = datetime.utcnow()
+    async with database.AsyncSessionLocal() as session:
+        async with session.begin():
+            await session.execute(insert(reminders), [
+                {
+                    "message": "theirs",
+                    "reminder_time": now,
+                    "reminder_type": ReminderType.EMAIL,
+                    "status": ReminderStatus.PENDING,
+                    "event_id": event_id,
+                    "owner_id": other_id,
+                    "created_at": now,
+                    "updated_at": now,
+                }
+                for event_id in event_ids
+            ])
+    response = await client.get(f"{API}/sync/", headers=other_headers)
+    cursor = response.json()["cursor"]
+    theirs = {reminder["id"] for reminder in response.json()["reminders"]}
+    assert len(theirs) == 3
+
+    job = PurgeJob(batch_size=2)
+    assert await job.purge_user(purged_id) == {"events": 3, "reminders": 1, "archived": 0}
+    assert (job.counters["foreign_reminders"], job.counters["chunks"]) == (3, 3)
+
+    page = (await client.get(f"{API}/sync/", headers=other_headers, params={"cursor": cursor})).json()
+    assert page["cursor"] != cursor
+    assert {(change["type"], change["id"]) for change in page["deleted"]} == {("reminder", rid) for rid in theirs}
+    async with database.AsyncSessionLocal() as session:
+        assert (await session.execute(select(reminders.c.id).where(reminders.c.id.in_(theirs)))).all() == []
+        assert (await session.execute(select(User.id).where(User.id == purged_id))).all() == []
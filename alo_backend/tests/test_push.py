@@ -0,0 +1,124 @@
+import asyncio
+import json
+from collections import Counter
+
+from sqlalchemy import event
+
+from app.core import database
+from app.core.push import push_hub
+from app.main import app
+
+from .conftest import API
+
+EVENT = {"title": "t", "start_time": "2026-10-01T09:00:00Z", "end_time": "2026-10-01T10:00:00Z"}
+
+
+class Connection:
+    """One ASGI connection to the app, kept open until the client disconnects.
+
+    httpx reads a whole response before returning it, so streams and
+    sockets are driven through the ASGI interface directly.
+    """
+
+    def __init__(self, scope_type: str, path: str, token: str) -> None:
+        self.scope = {
+            "type": scope_type,
+            "asgi": {"version": "3.0"},
+            "http_version": "1.1",
+            "method": "GET",
+            "scheme": "ws" if scope_type == "websocket" else "http",
+            "path": path,
+            "raw_path": path.encode(),
+            "query_string": f"access_token={token}".encode(),
+            "root_path": "",
+            "headers": [(b"host", b"test")],
+            "client": ("127.0.0.1", 50000),
+            "server": ("test", 80),
+            "subprotocols": [],
+        }
+        self.inbox: asyncio.Queue = asyncio.Queue()
+        self.outbox: asyncio.Queue = asyncio.Queue()
+        self.task = asyncio.ensure_future(app(self.scope, self.inbox.get, self.outbox.put))
+
+    async def sent(self) -> dict:
+        return await asyncio.wait_for(self.outbox.get(), timeout=5)
+
+    async def closed(self) -> None:
+        await asyncio.wait_for(self.task, timeout=5)
+
+
+def token_of(headers):
+    return headers["Authorization"].split()[1]
+
+
+async def create_event(client, headers):
+    response = await client.post(f"{API}/events/", headers=headers, json=EVENT)
+    assert response.status_code == 201, response.text
+    return response.json()["id"]
+
+
+def open_connections():
+    return push_hub.stats()["open_connections"]
+
+
+async def test_sse_delivers_changes_and_unsubscribes_on_disconnect(client, auth_headers):
+    before = open_connections()
+    stream = Connection("http", f"{API}/push/sse", token_of(auth_headers))
+    await stream.inbox.put({"type": "http.request", "body": b"", "more_body": False})
+    start = await stream.sent()
+    assert start["status"] == 200
+    assert (b"content-type", b"text/event-stream; charset=utf-8") in start["headers"]
+    assert open_connections() == before + 1
+
+    event_id = await create_event(client, auth_headers)
+    body = (await stream.sent())["body"].decode()
+    assert body.startswith("data: ") and body.endswith("\n\n")
+    assert json.loads(body[len("data: "):]) == {"changes": [{"type": "event", "op": "created", "id": event_id}]}
+
+    await stream.inbox.put({"type": "http.disconnect"})
+    await stream.closed()
+    assert open_connections() == before
+
+
+async def test_websocket_delivers_changes_and_unsubscribes_on_disconnect(client, auth_headers):
+    before = open_connections()
+    token = token_of(auth_headers)
+    pool = database.async_engine.sync_engine.pool
+    connections = Counter()
+
+    def checkout(*args):
+        connections["out"] += 1
+
+    def checkin(*args):
+        connections["in"] += 1
+
+    event.listen(pool, "checkout", checkout)
+    event.listen(pool, "checkin", checkin)
+    try:
+        socket = Connection("websocket", f"{API}/push/ws", token)
+        await socket.inbox.put({"type": "websocket.connect"})
+        assert (await socket.sent())["type"] == "websocket.accept"
+    finally:
+        event.remove(pool, "checkout", checkout)
+        event.remove(pool, "checkin", checkin)
+    assert open_connections() == before + 1
+    # Authentication returned its connection before the socket was accepted
+    assert connections["out"] == connections["in"]
+
+    event_id = await create_event(client, auth_headers)
+    message = await socket.sent()
+    assert message["type"] == "websocket.send"
+    assert json.loads(message["text"]) == {"changes": [{"type": "event", "op": "created", "id": event_id}]}
+
+    # Anything the client sends is ignored
+    await socket.inbox.put({"type": "websocket.receive", "text": "hello"})
+    await socket.inbox.put({"type": "websocket.disconnect", "code": 1000})
+    await socket.closed()
+    assert open_connections() == before
+
+
+async def test_websocket_with_a_bad_token_is_closed(client):
+    socket = Connection("websocket", f"{API}/push/ws", "not-a-token")
+    await socket.inbox.put({"type": "websocket.connect"})
+    assert await socket.sent() == {"type": "websocket.close", "code": 1008}
+    await socket.closed()
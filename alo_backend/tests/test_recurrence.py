@@ -0,0 +1,78 @@
+from datetime import datetime, timedelta
+
+from app.core.recurrence import occurrences, series_end
+from app.schemas.event import MAX_RECURRENCE_COUNT
+
+from .conftest import API
+
+HOUR = timedelta(hours=1)
+
+
+def walked_end(rule, start):
+    last = start
+    for last in occurrences(rule, start, start, datetime.max):
+        pass
+    return last + HOUR
+
+
+def test_series_end_matches_the_last_occurrence():
+    rules = [
+        ({"freq": "DAILY", "interval": 3, "count": 500}, datetime(2026, 1, 1, 9)),
+        ({"freq": "WEEKLY", "byweekday": ["MO", "TH"], "count": 7}, datetime(2026, 1, 7, 9)),
+        ({"freq": "WEEKLY", "interval": 2, "byweekday": ["TU", "SU"], "until": datetime(2027, 3, 1)}, datetime(2026, 1, 7, 9)),
+        # Months without the 31st, and years without the 29th of February, are skipped
+        ({"freq": "MONTHLY", "count": 40}, datetime(2026, 1, 31, 9)),
+        ({"freq": "MONTHLY", "interval": 5, "until": datetime(2040, 1, 1)}, datetime(2026, 1, 31, 9)),
+        ({"freq": "YEARLY", "count": 30}, datetime(2028, 2, 29, 9)),
+        ({"freq": "DAILY", "until": datetime(2025, 1, 1)}, datetime(2026, 1, 1, 9)),
+    ]
+    for rule, start in rules:
+        assert series_end(rule, start, start + HOUR) == walked_end(rule, start), rule
+
+
+def test_series_end_does_not_walk_long_series():
+    start = datetime(2026, 1, 1, 9)
+    rule = {"freq": "DAILY", "count": 10 ** 9}
+    # Past datetime.max: no representable end
+    assert series_end(rule, start, start + HOUR) is None
+    rule = {"freq": "MONTHLY", "until": "2199-12-31T00:00:00"}
+    assert series_end(rule, start, start + HOUR) == datetime(2199, 12, 1, 10)
+
+
+async def test_recurring_event_with_utc_offsets(client, auth_headers):
+    response = await client.post(
+        f"{API}/events/",
+        headers=auth_headers,
+        json={
+            "title": "standup",
+            "start_time": "2026-03-02T09:00:00Z",
+            "end_time": "2026-03-02T11:15:00+02:00",
+            "recurrence_rule": {"freq": "DAILY", "until": "2026-03-06T09:00:00Z"},
+        },
+    )
+    assert response.status_code == 201, response.text
+    event = response.json()
+    assert (event["start_time"], event["end_time"]) == ("2026-03-02T09:00:00", "2026-03-02T09:15:00")
+
+    response = await client.get(
+        f"{API}/events/",
+        headers=auth_headers,
+        params={"start_date": "2026-03-03T00:00:00Z", "end_date": "2026-03-05T10:00:00+02:00"},
+    )
+    assert response.status_code == 200, response.text
+    assert [item["recurrence_id"] for item in response.json()] == ["2026-03-03T09:00:00", "2026-03-04T09:00:00"]
+
+    response = await client.delete(
+        f"{API}/events/{event['id']}/occurrences/2026-03-04T10:00:00+01:00", headers=auth_headers
+    )
+    assert response.status_code == 200, response.text
+
+
+async def test_recurrence_bounds_are_validated(client, auth_headers):
+    event = {"title": "t", "start_time": "2026-03-02T09:00:00", "end_time": "2026-03-02T10:00:00"}
+    for rule in (
+        {"freq": "DAILY", "count": MAX_RECURRENCE_COUNT + 1},
+        {"freq": "DAILY", "until": "9999-01-01T00:00:00"},
+    ):
+        response = await client.post(f"{API}/events/", headers=auth_headers, json={**event, "recurrence_rule": rule})
+        assert response.status_code == 422, response.text
@@ -0,0 +1,110 @@
+from types import SimpleNamespace
+
+import pytest
+from fastapi import HTTPException
+
+from app.core import database
+from app.core.repository import event_repository
+
+from .conftest import API, create_user
+from .test_groups import make_superuser, user_id
+
+EVENT = {"title": "t", "start_time": "2026-08-01T09:00:00Z", "end_time": "2026-08-01T10:00:00Z"}
+REMINDER = {"message": "m", "reminder_time": "2026-08-01T08:45:00Z", "reminder_type": "email"}
+
+
+async def create(client, headers, kind, data):
+    response = await client.post(f"{API}/{kind}/", headers=headers, json=data)
+    assert response.status_code == 201, response.text
+    return response.json()
+
+
+async def sync_cursor(client, headers):
+    return (await client.get(f"{API}/sync/", headers=headers)).json()["cursor"]
+
+
+async def test_writes_to_missing_or_foreign_rows_change_nothing(client, auth_headers):
+    other_headers = await create_user(client)
+    rows = {kind: await create(client, other_headers, kind, data) for kind, data in (("events", EVENT), ("reminders", REMINDER))}
+    cursor = await sync_cursor(client, other_headers)
+
+    for kind, row in rows.items():
+        noun = kind[:-1]
+        for row_id, status_code, detail in (
+            (row["id"], 403, f"Not enough permissions to update this {noun}"),
+            (row["id"] + 10_000, 404, f"{noun.capitalize()} not found"),
+        ):
+            response = await client.put(f"{API}/{kind}/{row_id}", headers=auth_headers, json={"message": "x", "title": "x"})
+            assert (response.status_code, response.json()["detail"]) == (status_code, detail)
+            response = await client.delete(f"{API}/{kind}/{row_id}", headers=auth_headers)
+            assert (response.status_code, response.json()["detail"]) == (
+                status_code, detail.replace("update", "delete")
+            )
+
+    # Neither written nor stamped for sync
+    for kind, row in rows.items():
+        assert (await client.get(f"{API}/{kind}/{row['id']}", headers=other_headers)).json() == row
+    page = (await client.get(f"{API}/sync/", headers=other_headers, params={"cursor": cursor})).json()
+    assert (page["cursor"], page["events"], page["reminders"], page["deleted"]) == (cursor, [], [], [])
+
+
+async def test_written_rows_are_returned_as_stored(client, auth_headers):
+    event = await create(client, auth_headers, "events", EVENT)
+    reminder = await create(client, auth_headers, "reminders", {**REMINDER, "event_id": event["id"]})
+
+    response = await client.put(f"{API}/reminders/{reminder['id']}", headers=auth_headers, json={"status": "sent"})
+    assert response.status_code == 200, response.text
+    updated = response.json()
+    assert updated["sent_at"] is not None and updated["updated_at"] >= reminder["updated_at"]
+    assert (await client.get(f"{API}/reminders/{reminder['id']}", headers=auth_headers)).json() == updated
+
+    response = await client.delete(f"{API}/events/{event['id']}", headers=auth_headers)
+    assert response.status_code == 200, response.text
+    assert [row["id"] for row in response.json()["reminders"]] == [reminder["id"]]
+    assert (await client.get(f"{API}/reminders/{reminder['id']}", headers=auth_headers)).status_code == 404
+
+
+async def test_error_tells_a_missing_row_from_a_foreign_one(client, auth_headers):
+    event_id = (await create(client, auth_headers, "events", EVENT))["id"]
+    owner = SimpleNamespace(id=await user_id(client, auth_headers), is_superuser=False)
+    stranger = SimpleNamespace(id=owner.id + 10_000, is_superuser=False)
+
+    async with database.AsyncSessionLocal() as session:
+        missing = await event_repository.error(session, event_id + 10_000, "update")
+        foreign = await event_repository.error(session, event_id, "update")
+        assert (missing.status_code, missing.detail) == (404, "Event not found")
+        assert (foreign.status_code, foreign.detail) == (403, "Not enough permissions to update this event")
+
+        assert (await event_repository.get(session, event_id, owner))["id"] == event_id
+        await event_repository.check(session, event_id, owner, "update")
+        for row_id, user, status_code in ((event_id, stranger, 403), (event_id + 10_000, owner, 404)):
+            with pytest.raises(HTTPException) as raised:
+                await event_repository.get(session, row_id, user)
+            assert raised.value.status_code == status_code
+            with pytest.raises(HTTPException) as raised:
+                await event_repository.check(session, row_id, user, "update")
+            assert raised.value.status_code == status_code
+
+
+async def test_superusers_bypass_the_owner_check(client, auth_headers):
+    other_headers = await create_user(client)
+    event = await create(client, other_headers, "events", EVENT)
+    reminder = await create(client, other_headers, "reminders", {**REMINDER, "event_id": event["id"]})
+    await make_superuser(client, auth_headers)
+
+    response = await client.get(f"{API}/events/{event['id']}", headers=auth_headers)
+    assert response.status_code == 200, response.text
+    response = await client.put(f"{API}/reminders/{reminder['id']}", headers=auth_headers, json={"message": "edited"})
+    assert (response.status_code, response.json()["owner_id"]) == (200, reminder["owner_id"])
+    response = await client.delete(f"{API}/events/{event['id']}", headers=auth_headers)
+    assert response.status_code == 200, response.text
+    assert [row["message"] for row in response.json()["reminders"]] == ["edited"]
+
+    # Still 404 for rows that do not exist
+    response = await client.get(f"{API}/events/{event['id']}", headers=auth_headers)
+    assert (response.status_code, response.json()["detail"]) == (404, "Event not found")
+    # The owner's sync learns of both writes
+    page = (await client.get(f"{API}/sync/", headers=other_headers)).json()
+    assert {(change["type"], change["id"]) for change in page["deleted"]} == {
+        ("event", event["id"]), ("reminder", reminder["id"]),
+    }
@@ -0,0 +1,115 @@
+from datetime import datetime, timedelta
+
+from sqlalchemy import select, update
+
+from app.core import database
+from app.core import dispatcher as dispatcher_module
+from app.core.dispatcher import ReminderDispatcher
+from app.models import DeliveryAttempt, Reminder, ReminderStatus, ReminderType
+
+from .conftest import API
+from .test_dispatcher import create_due_reminders
+
+reminders = Reminder.__table__
+attempts = DeliveryAttempt.__table__
+
+
+def test_retry_delay_backs_off_exponentially_with_jitter(monkeypatch):
+    dispatcher = ReminderDispatcher(retry_base_delay=30, retry_max_delay=3600)
+
+    # Equal jitter: half the delay is fixed, the other half random
+    monkeypatch.setattr(dispatcher_module.random, "uniform", lambda low, high: low)
+    assert [dispatcher._retry_delay(attempt) for attempt in range(1, 9)] == [15, 30, 60, 120, 240, 480, 960, 1800]
+    monkeypatch.setattr(dispatcher_module.random, "uniform", lambda low, high: high)
+    assert [dispatcher._retry_delay(attempt) for attempt in range(1, 9)] == [30, 60, 120, 240, 480, 960, 1920, 3600]
+
+    monkeypatch.undo()
+    delays = {dispatcher._retry_delay(3) for _ in range(100)}
+    assert all(60 <= delay <= 120 for delay in delays) and len(delays) > 1
+
+
+async def retry_state(ids):
+    async with database.AsyncSessionLocal() as session:
+        rows = await session.execute(
+            select(reminders.c.id, reminders.c.status, reminders.c.attempts, reminders.c.next_attempt_at)
+            .where(reminders.c.id.in_(ids))
+        )
+        return {row.id: (row.status, row.attempts, row.next_attempt_at) for row in rows}
+
+
+async def make_retries_due(ids):
+    async with database.AsyncSessionLocal() as session:
+        async with session.begin():
+            await session.execute(
+                update(reminders).where(reminders.c.id.in_(ids)).values(next_attempt_at=datetime.utcnow() - timedelta(seconds=1))
+            )
+
+
+async def test_failures_are_retried_then_dead_lettered(client, auth_headers):
+    # SMS: the other tests leave no due reminders of this channel
+    ids = await create_due_reminders(client, auth_headers, 2, reminder_type=ReminderType.SMS)
+
+    async def deliver(batch):
+        return []
+
+    dispatcher = ReminderDispatcher(max_attempts=3, retry_base_delay=30, deliver=deliver)
+    started = datetime.utcnow()
+    assert await dispatcher.dispatch_batch(ReminderType.SMS) == 2
+    state = await retry_state(ids)
+    assert {(status, count) for status, count, _ in state.values()} == {(ReminderStatus.FAILED, 1)}
+    assert all(started + timedelta(seconds=15) <= at <= datetime.utcnow() + timedelta(seconds=30) for _, _, at in state.values())
+
+    # Not retried before next_attempt_at, nor picked up as pending
+    assert await dispatcher.dispatch_batch(ReminderType.SMS, retry=True) == 0
+    assert await dispatcher.dispatch_batch(ReminderType.SMS) == 0
+
+    await make_retries_due(ids)
+    assert await dispatcher.dispatch_batch(ReminderType.SMS, retry=True) == 2
+    assert {(status, count) for status, count, _ in (await retry_state(ids)).values()} == {(ReminderStatus.FAILED, 2)}
+
+    await make_retries_due(ids)
+    assert await dispatcher.dispatch_batch(ReminderType.SMS, retry=True) == 2
+    assert set((await retry_state(ids)).values()) == {(ReminderStatus.DEAD_LETTER, 3, None)}
+    assert dispatcher.counters["retries_scheduled"] == 4 and dispatcher.counters["dead_lettered"] == 2
+
+    # Dead letters are not retried
+    await make_retries_due(ids)
+    assert await dispatcher.dispatch_batch(ReminderType.SMS, retry=True) == 0
+
+    async with database.AsyncSessionLocal() as session:
+        rows = await session.execute(
+            select(attempts.c.reminder_id, attempts.c.attempt, attempts.c.outcome)
+            .where(attempts.c.reminder_id.in_(ids))
+            .order_by(attempts.c.attempt)
+        )
+        outcomes = [(row.attempt, row.outcome) for row in rows if row.reminder_id == min(ids)]
+    assert outcomes == [(1, "failed"), (2, "failed"), (3, "dead_letter")]
+
+
+async def test_requeueing_a_dead_letter_resets_its_attempts(client, auth_headers):
+    single, batched, edited = sorted(await create_due_reminders(
+        client, auth_headers, 3,
+        status=ReminderStatus.DEAD_LETTER, attempts=5, reminder_type=ReminderType.SMS,
+    ))
+
+    response = await client.put(f"{API}/reminders/{single}", headers=auth_headers, json={"status": "pending"})
+    assert response.status_code == 200, response.text
+    assert (response.json()["status"], response.json()["attempts"]) == ("pending", 0)
+
+    response = await client.post(
+        f"{API}/reminders:batch",
+        headers=auth_headers,
+        json={"items": [{"op": "update", "id": batched, "data": {"status": "pending"}}]},
+    )
+    assert response.status_code == 200, response.text
+
+    # Other edits leave a dead letter and its attempts alone
+    response = await client.put(f"{API}/reminders/{edited}", headers=auth_headers, json={"message": "edited"})
+    assert response.status_code == 200, response.text
+
+    state = await retry_state([single, batched, edited])
+    assert state == {
+        single: (ReminderStatus.PENDING, 0, None),
+        batched: (ReminderStatus.PENDING, 0, None),
+        edited: (ReminderStatus.DEAD_LETTER, 5, None),
+    }
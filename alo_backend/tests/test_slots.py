@@ -0,0 +1,36 @@
+from .conftest import API
+
+
+async def test_suggested_slots_with_utc_offsets(client, auth_headers):
+    # Busy 09:00-12:00 UTC on Monday 2026-05-04
+    response = await client.post(
+        f"{API}/events/",
+        headers=auth_headers,
+        json={"title": "t", "start_time": "2026-05-04T11:00:00+02:00", "end_time": "2026-05-04T12:00:00Z"},
+    )
+    assert response.status_code == 201, response.text
+
+    params = {"duration_minutes": 60, "step_minutes": 60, "limit": 3}
+    naive = await client.get(
+        f"{API}/events/suggest-slots",
+        headers=auth_headers,
+        params={**params, "start_time": "2026-05-04T08:00:00", "end_time": "2026-05-04T17:00:00"},
+    )
+    assert naive.status_code == 200, naive.text
+    assert [slot["start"] for slot in naive.json()] == [
+        "2026-05-04T13:00:00", "2026-05-04T14:00:00", "2026-05-04T15:00:00",
+    ]
+
+    for start, end, work_start, work_end in (
+        ("2026-05-04T08:00:00Z", "2026-05-04T17:00:00Z", "09:00Z", "17:00Z"),
+        ("2026-05-04T10:00:00+02:00", "2026-05-04T17:00:00Z", "11:00+02:00", "19:00+02:00"),
+    ):
+        response = await client.get(
+            f"{API}/events/suggest-slots",
+            headers=auth_headers,
+            params={
+                **params, "start_time": start, "end_time": end, "work_start": work_start, "work_end": work_end,
+            },
+        )
+        assert response.status_code == 200, response.text
+        assert response.json() == naive.json()
@@ -0,0 +1,35 @@
+from .conftest import API
+
+EVENT = {"start_time": "2026-06-01T09:00:00Z", "end_time": "2026-06-01T10:00:00Z"}
+
+
+async def test_deletion_syncs_before_a_row_reusing_its_id(client, auth_headers):
+    response = await client.post(f"{API}/events/", headers=auth_headers, json={"title": "old", **EVENT})
+    assert response.status_code == 201, response.text
+    old_id = response.json()["id"]
+    cursor = (await client.get(f"{API}/sync/", headers=auth_headers)).json()["cursor"]
+    # Builds the owner's conflict tree, which the batch then updates
+    response = await client.get(f"{API}/events/conflicts", headers=auth_headers, params=EVENT)
+    assert [event["id"] for event in response.json()] == [old_id]
+
+    response = await client.post(
+        f"{API}/events:batch",
+        headers=auth_headers,
+        json={"items": [{"op": "delete", "id": old_id}, {"op": "create", "data": {"title": "new", **EVENT}}]},
+    )
+    assert response.status_code == 200, response.text
+    # SQLite hands out the highest rowid again once it is deleted
+    assert response.json()["results"][1]["id"] == old_id
+
+    pages = []
+    has_more = True
+    while has_more:
+        page = (await client.get(f"{API}/sync/", headers=auth_headers, params={"cursor": cursor, "limit": 1})).json()
+        cursor, has_more = page["cursor"], page["has_more"]
+        pages.append(([(change["type"], change["id"]) for change in page["deleted"]], [
+            (event["id"], event["title"]) for event in page["events"]
+        ]))
+    assert pages == [([("event", old_id)], []), ([], [(old_id, "new")])]
+
+    response = await client.get(f"{API}/events/conflicts", headers=auth_headers, params=EVENT)
+    assert [event["id"] for event in response.json()] == [old_id]
@@ -0,0 +1,68 @@
+from app.core import user_cache as user_cache_module
+from app.core.bus import message_bus
+from app.core.user_cache import INVALIDATION_CHANNEL, UserCache, user_cache
+from app.models import User
+
+from .conftest import API, create_user
+from .test_groups import make_superuser, user_id
+
+
+def user(user_id):
+    return User(id=user_id, email=f"user{user_id}@example.com", hashed_password="secret", is_active=True)
+
+
+def test_entries_expire_after_the_ttl(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(user_cache_module.time, "monotonic", lambda: now[0])
+    cache = UserCache(ttl=60)
+    cache.set(user(1))
+
+    now[0] += 59
+    cached = cache.get(1)
+    assert cached.email == "user1@example.com"
+    # The password hash is never cached
+    assert "hashed_password" not in cached.__dict__
+    now[0] += 1
+    assert cache.get(1) is None
+    assert cache.counters == {"hits": 1, "misses": 1, "evictions": 0, "expirations": 1, "invalidations": 0}
+
+
+def test_least_recently_used_entry_is_evicted():
+    cache = UserCache(maxsize=2)
+    cache.set(user(1))
+    cache.set(user(2))
+    cache.get(1)
+    cache.set(user(3))
+
+    assert cache.get(2) is None
+    assert cache.get(1) is not None and cache.get(3) is not None
+    assert cache.counters["evictions"] == 1
+
+
+async def test_changes_invalidate_every_worker(client, auth_headers, monkeypatch):
+    published = []
+    monkeypatch.setitem(message_bus._handlers, INVALIDATION_CHANNEL, [published.append])
+    me = await user_id(client, auth_headers)
+    assert user_cache.get(me) is not None
+
+    # A password change
+    response = await client.put(f"{API}/users/me", headers=auth_headers, json={"password": "password456"})
+    assert response.status_code == 200, response.text
+    assert user_cache.get(me) is None
+    assert published == [str(me)]
+
+    # Deactivation, through the API or any code path setting is_active
+    await user_id(client, auth_headers)
+    admin_headers = await create_user(client)
+    await make_superuser(client, admin_headers)
+    assert (await client.delete(f"{API}/users/{me}", headers=admin_headers)).status_code == 202
+    assert user_cache.get(me) is None
+    assert (await client.get(f"{API}/users/me", headers=auth_headers)).status_code == 400
+    user(me).is_active = False
+    assert published[-1] == str(me)
+
+
+def test_invalidation_from_another_worker_drops_the_entry():
+    user_cache.set(user(10 ** 9))
+    message_bus.publish_nowait(INVALIDATION_CHANNEL, str(10 ** 9))
+    assert user_cache.get(10 ** 9) is None